@@ -5,13 +5,17 @@ from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
 from typing import Dict, List, Any, Tuple
 from autogen_agentchat.conditions import TextMentionTermination, MaxMessageTermination
 import datetime
+from django.conf import settings
 
 # 导入数据准备模块
 from .data_preparation import (
     load_recruitment_criteria,
     load_candidates_data_by_group,
-    load_personality_and_fraud_data
+    load_group_candidates,
+    split_candidate_records
 )
+from .map_reduce import AutogenChat, MapReduceEvaluator
+from resume_screening.chat_checkpoint import CheckpointedGroupChat, run_checkpointed_chat
 
 # 配置LLM模型
 config_list = [
@@ -70,13 +74,45 @@ def generate_candidate_info(candidates_data, big_five_scores, fraud_scores):
     return "\n".join(candidate_infos)
 
 
-def run_interview_evaluation(group_id: str, progress_callback=None) -> Tuple[List[Dict[str, Any]], List[str]]:
+EVALUATION_MODES = ('auto', 'group_chat', 'map_reduce')
+
+
+def resolve_evaluation_mode(mode: str, candidate_count: int) -> str:
+    """
+    确定评估模式：auto 时候选人数超过 settings.FINAL_RECOMMEND_MAP_REDUCE_THRESHOLD 使用 map-reduce
+    """
+    mode = mode or getattr(settings, 'FINAL_RECOMMEND_EVALUATION_MODE', 'auto')
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"评估模式必须为 {', '.join(EVALUATION_MODES)} 之一")
+    if mode == 'auto':
+        threshold = getattr(settings, 'FINAL_RECOMMEND_MAP_REDUCE_THRESHOLD', 12)
+        return 'map_reduce' if candidate_count > threshold else 'group_chat'
+    return mode
+
+
+def run_map_reduce_evaluation(recruitment_system, candidates_data, big_five_scores, fraud_scores,
+                              progress_callback=None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """map-reduce 模式评估（大规模简历组），返回格式与 GroupChat 模式相同"""
+    evaluator = MapReduceEvaluator(
+        llm=AutogenChat(config_list, timeout=llm_config["timeout"]),
+        format_candidate=generate_candidate_info,
+        criteria=recruitment_system.criteria,
+        map_concurrency=getattr(settings, 'FINAL_RECOMMEND_MAP_CONCURRENCY', 8),
+        bucket_size=getattr(settings, 'FINAL_RECOMMEND_BUCKET_SIZE', 8),
+        advance_per_bucket=getattr(settings, 'FINAL_RECOMMEND_ADVANCE_PER_BUCKET', 3),
+        progress_callback=progress_callback
+    )
+    return evaluator.run(candidates_data, big_five_scores, fraud_scores)
+
+
+def run_interview_evaluation(group_id: str, progress_callback=None, mode: str = None) -> Tuple[List[Dict[str, Any]], List[str]]:
     """
     运行面试后评估流程的主要函数
     
     Args:
         group_id: 简历组ID
         progress_callback: 进度回调函数，用于报告当前发言者和对话轮数
+        mode: 评估模式（auto / group_chat / map_reduce），默认取 settings.FINAL_RECOMMEND_EVALUATION_MODE
         
     Returns:
         评估对话消息列表和发言者列表
@@ -84,11 +120,17 @@ def run_interview_evaluation(group_id: str, progress_callback=None) -> Tuple[Lis
     # 初始化招聘系统
     recruitment_system = RecruitmentSystem()
 
-    # 读取候选人数据
-    candidates_data = read_candidate_data(group_id)
+    # 读取候选人数据及人格测试、欺诈检测数据（一次查询）
+    candidates_data, big_five_scores, fraud_detection_scores = split_candidate_records(
+        load_group_candidates(group_id)
+    )
 
-    # 加载人格测试和欺诈检测数据
-    big_five_scores, fraud_detection_scores = load_personality_and_fraud_data(group_id)
+    # 候选人较多时整组信息放不进一段对话，改用 map-reduce 模式
+    if resolve_evaluation_mode(mode, len(candidates_data)) == 'map_reduce':
+        print(f"候选人数量: {len(candidates_data)}，使用 map-reduce 模式评估")
+        return run_map_reduce_evaluation(
+            recruitment_system, candidates_data, big_five_scores, fraud_detection_scores, progress_callback
+        )
 
     # 生成候选人信息
     candidate_info_text = generate_candidate_info(candidates_data, big_five_scores, fraud_detection_scores)
@@ -248,8 +290,8 @@ def run_interview_evaluation(group_id: str, progress_callback=None) -> Tuple[Lis
         content_str = str(content).lower()
         return any(keyword in content_str for keyword in ['APPROVE'])
 
-    # 创建群聊
-    group_chat = GroupChat(
+    # 创建群聊（每轮发言写入检查点，任务失败重试时从断点继续）
+    group_chat = CheckpointedGroupChat(
         agents=[user_proxy, assistant, hr_agent, technical_agent, manager_agent, critic_agent],
         messages=[],
         max_round=12,
@@ -267,9 +309,7 @@ def run_interview_evaluation(group_id: str, progress_callback=None) -> Tuple[Lis
     print(f"招聘职位: {recruitment_system.criteria.get('position', 'Python开发工程师')}")
     print(f"候选人数量: {len(candidates_data)}")
 
-    user_proxy.initiate_chat(
-        manager,
-        message=f"""## 面试后综合评估任务
+    evaluation_message = f"""## 面试后综合评估任务
 
     ### 评估背景
     经过初筛和面试环节，现需要对候选人进行最终评估。
@@ -295,10 +335,18 @@ def run_interview_evaluation(group_id: str, progress_callback=None) -> Tuple[Lis
     3. 生成详细评估报告和招聘顺位推荐
 
     请按流程开始评估。"""
+    messages = run_checkpointed_chat(
+        user_proxy, manager, group_chat, evaluation_message,
+        scope='final_evaluation',
+        task_key=group_id
     )
 
+    # 从检查点回放的发言不经过发言选择器，按消息补齐发言者
+    if len(speakers) < len(messages):
+        speakers[:0] = [message.get('name', '') for message in messages[:len(messages) - len(speakers)]]
+
     # 返回对话消息和发言者列表
-    return group_chat.messages, speakers
+    return messages, speakers
 
 
 # 以下代码仅用于测试目的，实际使用时应通过views.py调用run_interview_evaluation函数
@@ -1,10 +1,13 @@
 import json
 import os
-from typing import Dict, Any, Tuple
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
 
 # 直接导入 Django 模型
-from resume_screening.models import ResumeGroup, ResumeData
-from video_analysis.models import VideoAnalysis
+from resume_screening.models import ResumeData
+from resume_screening.text_blobs import prefetch_texts
 
 
 def load_recruitment_criteria(criteria_path="../position_settings/migrations/recruitment_criteria.json") -> Dict[str, Any]:
@@ -30,6 +33,153 @@ def load_recruitment_criteria(criteria_path="../position_settings/migrations/rec
         }
 
 
+# 报告JSON解码缓存：(简历文件哈希, 报告内容哈希) -> 解码结果；同一简历组重复评估时无需再次解码
+REPORT_CACHE_MAX_SIZE = 1024
+_report_cache: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+BIG_FIVE_FIELDS = {
+    'openness': 'openness_score',
+    'conscientiousness': 'conscientiousness_score',
+    'extraversion': 'extraversion_score',
+    'agreeableness': 'agreeableness_score',
+    'neuroticism': 'neuroticism_score',
+}
+
+CANDIDATE_FIELDS = (
+    'id', 'candidate_name', 'position_title', 'resume_content', 'screening_score', 'screening_summary',
+    'resume_file_hash', 'json_report_content', 'video_analysis__fraud_score',
+    *(f'video_analysis__{field}' for field in BIG_FIVE_FIELDS.values()),
+)
+
+
+@dataclass(frozen=True)
+class CandidateRecord:
+    """面试后评估所需的候选人数据"""
+    resume_id: str
+    name: str
+    position_title: str
+    resume_content: str
+    screening_score: Any
+    screening_summary: Optional[str]
+    final_recommendation: Dict[str, Any]
+    # 未关联视频分析时为 None
+    big_five: Optional[Dict[str, float]] = None
+    fraud_score: Optional[float] = None
+
+    def to_candidate_data(self) -> Dict[str, Any]:
+        """转换为 generate_candidate_info 使用的简历数据格式"""
+        return {
+            "position_title": self.position_title,
+            "resume_content": self.resume_content,
+            "screening_score": self.screening_score,
+            "screening_summary": self.screening_summary,
+            "final_recommendation": self.final_recommendation
+        }
+
+
+def decode_report_json(resume_hash: str, content: Optional[str]) -> Dict[str, Any]:
+    """
+    解码简历的JSON报告（按简历哈希和报告内容缓存，解码失败时返回空字典）
+
+    Args:
+        resume_hash: 简历文件哈希
+        content: json_report_content
+    """
+    if not content:
+        return {}
+
+    key = (resume_hash, hash(content))
+    with _report_cache_lock:
+        cached = _report_cache.get(key)
+        if cached is not None:
+            _report_cache.move_to_end(key)
+            return cached
+
+    try:
+        decoded = json.loads(content)
+    except json.JSONDecodeError:
+        decoded = {}
+    if not isinstance(decoded, dict):
+        decoded = {}
+
+    with _report_cache_lock:
+        _report_cache[key] = decoded
+        while len(_report_cache) > REPORT_CACHE_MAX_SIZE:
+            _report_cache.popitem(last=False)
+    return decoded
+
+
+def clear_report_cache():
+    """清空报告JSON解码缓存"""
+    with _report_cache_lock:
+        _report_cache.clear()
+
+
+def load_group_candidates(group_id: str) -> List[CandidateRecord]:
+    """
+    加载简历组内全部候选人（简历、初筛结果、人格测试和欺诈检测得分一次查询取回）
+
+    Args:
+        group_id: 简历组ID
+
+    Returns:
+        候选人列表；简历组不存在或没有简历时为空列表
+    """
+    try:
+        resumes = (
+            ResumeData.objects
+            .filter(group_id=group_id)
+            .select_related('video_analysis')
+            .only(*CANDIDATE_FIELDS)
+        )
+
+        candidates = []
+        # 简历、初筛总结和JSON报告为压缩文本，一次查询取回并解压
+        for resume in prefetch_texts(resumes):
+            video_analysis = resume.video_analysis
+            report = decode_report_json(resume.resume_file_hash, resume.json_report_content)
+            candidates.append(CandidateRecord(
+                resume_id=str(resume.id),
+                name=resume.candidate_name,
+                position_title=resume.position_title,
+                resume_content=resume.resume_content,
+                screening_score=resume.screening_score,
+                screening_summary=resume.screening_summary,
+                final_recommendation=report.get("final_recommendation", {}),
+                big_five={
+                    trait: getattr(video_analysis, field) or 0.0
+                    for trait, field in BIG_FIVE_FIELDS.items()
+                } if video_analysis else None,
+                fraud_score=(video_analysis.fraud_score or 0.0) if video_analysis else None,
+            ))
+
+        if not candidates:
+            print(f"简历组 {group_id} 不存在或没有简历")
+        return candidates
+    except Exception as e:
+        print(f"加载候选人数据时发生错误: {e}")
+        return []
+
+
+def split_candidate_records(
+    candidates: List[CandidateRecord]
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]], Dict[str, float]]:
+    """
+    拆分为评估流程使用的三个字典
+
+    Returns:
+        (候选人数据字典, 人格测试分数字典, 欺诈检测分数字典)，均以候选人姓名为键
+    """
+    candidates_data, big_five_scores, fraud_detection_scores = {}, {}, {}
+    for candidate in candidates:
+        candidates_data[candidate.name] = candidate.to_candidate_data()
+        if candidate.big_five is not None:
+            big_five_scores[candidate.name] = candidate.big_five
+            fraud_detection_scores[candidate.name] = candidate.fraud_score
+    return candidates_data, big_five_scores, fraud_detection_scores
+
+
 def load_candidates_data_by_group(group_id: str) -> Dict[str, Any]:
     """
     根据简历组ID加载候选人数据
@@ -40,39 +190,7 @@ def load_candidates_data_by_group(group_id: str) -> Dict[str, Any]:
     Returns:
         候选人数据字典，键为候选人姓名，值为简历数据
     """
-    try:
-        # 获取简历组
-        resume_group = ResumeGroup.objects.get(id=group_id)
-        
-        # 获取组内所有简历数据
-        resumes = ResumeData.objects.filter(group=resume_group)
-        
-        # 构建候选人数据字典
-        candidates = {}
-        for resume in resumes:
-            # 解析JSON报告内容
-            json_content = {}
-            if resume.json_report_content:
-                try:
-                    json_content = json.loads(resume.json_report_content)
-                except json.JSONDecodeError:
-                    pass
-            
-            candidates[resume.candidate_name] = {
-                "position_title": resume.position_title,
-                "resume_content": resume.resume_content,
-                "screening_score": resume.screening_score,
-                "screening_summary": resume.screening_summary,
-                "final_recommendation": json_content.get("final_recommendation", {})
-            }
-            
-        return candidates
-    except ResumeGroup.DoesNotExist:
-        print(f"未找到ID为 {group_id} 的简历组")
-        return {}
-    except Exception as e:
-        print(f"加载候选人数据时发生错误: {e}")
-        return {}
+    return split_candidate_records(load_group_candidates(group_id))[0]
 
 
 def load_personality_and_fraud_data(group_id: str) -> Tuple[Dict[str, Dict[str, float]], Dict[str, float]]:
@@ -85,38 +203,5 @@ def load_personality_and_fraud_data(group_id: str) -> Tuple[Dict[str, Dict[str,
     Returns:
         tuple: (人格测试分数字典, 欺诈检测分数字典)
     """
-
-    big_five_scores = {}
-    fraud_detection_scores = {}
-    
-    try:
-        # 获取简历组
-        resume_group = ResumeGroup.objects.get(id=group_id)
-        
-        # 获取组内所有简历数据
-        resumes = ResumeData.objects.filter(group=resume_group)
-        
-        # 遍历简历数据，查找关联的视频分析记录
-        for resume in resumes:
-            # 检查是否有关联的视频分析记录
-            if hasattr(resume, 'video_analysis') and resume.video_analysis:
-                video_analysis = resume.video_analysis
-                
-                # 提取人格测试分数
-                big_five_scores[resume.candidate_name] = {
-                    'openness': video_analysis.openness_score or 0.0,
-                    'conscientiousness': video_analysis.conscientiousness_score or 0.0,
-                    'extraversion': video_analysis.extraversion_score or 0.0,
-                    'agreeableness': video_analysis.agreeableness_score or 0.0,
-                    'neuroticism': video_analysis.neuroticism_score or 0.0,
-                }
-                
-                # 提取欺诈检测分数
-                fraud_detection_scores[resume.candidate_name] = video_analysis.fraud_score or 0.0
-                
-    except ResumeGroup.DoesNotExist:
-        print(f"未找到ID为 {group_id} 的简历组")
-    except Exception as e:
-        print(f"加载人格测试和欺诈检测数据时发生错误: {e}")
-    
-    return big_five_scores, fraud_detection_scores
\ No newline at end of file
+    _, big_five_scores, fraud_detection_scores = split_candidate_records(load_group_candidates(group_id))
+    return big_five_scores, fraud_detection_scores
@@ -0,0 +1,395 @@
+"""
+大规模简历组的面试后评估（map-reduce 模式）
+
+GroupChat 模式把组内全部候选人的信息拼进同一段对话，候选人较多时会超出上下文窗口且耗时很长。
+map-reduce 模式：
+- map：并行为每位候选人生成精简评估（HR/技术/管理三个视角的评分、风险提示和简短结论）
+- reduce：按分桶锦标赛对精简评估做横向比较，每个桶选出若干人晋级下一轮，
+  直到剩余人数不超过一个桶，再由综合评审生成最终报告和招聘顺位
+
+每次LLM调用的输入大小与组规模无关，调用次数约为 N + N/(桶大小-晋级数)，整体耗时和 token 消耗随人数线性增长。
+返回格式与 GroupChat 模式相同（对话消息列表与发言者列表，最后一条消息为最终报告）。
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from interview_assist.services.llm_client import parse_json_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAP_CONCURRENCY = 8
+DEFAULT_BUCKET_SIZE = 8
+DEFAULT_ADVANCE_PER_BUCKET = 3
+# 单个候选人送入 map 阶段的信息长度上限（字符）
+CANDIDATE_INFO_MAX_CHARS = 3000
+FRAUD_RISK_THRESHOLD = 0.6
+
+COORDINATOR = "评估协调员"
+CRITIC = "综合评审专家"
+RECRUITER = "招聘负责人"
+
+
+@dataclass
+class CandidateAssessment:
+    """map 阶段输出的候选人精简评估"""
+    name: str
+    hr_score: float = 0.0
+    technical_score: float = 0.0
+    management_score: float = 0.0
+    overall_score: float = 0.0
+    risk_flags: List[str] = field(default_factory=list)
+    summary: str = ""
+    # LLM调用失败时根据初筛得分和欺诈检测得分生成
+    fallback: bool = False
+
+    def to_prompt(self) -> str:
+        risks = "；".join(self.risk_flags) if self.risk_flags else "无"
+        return (
+            f"- {self.name}：综合{self.overall_score:.0f}分（HR {self.hr_score:.0f} / 技术 {self.technical_score:.0f}"
+            f" / 管理 {self.management_score:.0f}），风险：{risks}。{self.summary}"
+        )
+
+
+class AutogenChat:
+    """
+    基于 autogen OpenAIWrapper 的单轮调用（线程安全地累计 token 消耗）
+
+    Args:
+        config_list: autogen 模型配置列表
+        timeout: 单次请求超时（秒）
+    """
+
+    def __init__(self, config_list: List[Dict[str, Any]], timeout: float = 120):
+        from autogen import OpenAIWrapper
+
+        self._client = OpenAIWrapper(config_list=config_list, timeout=timeout, cache_seed=None)
+        self._lock = threading.Lock()
+        self.total_tokens = 0
+
+    def __call__(self, messages: List[Dict[str, str]]) -> str:
+        response = self._client.create(messages=messages, temperature=0)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            with self._lock:
+                self.total_tokens += getattr(usage, "total_tokens", 0) or 0
+        return self._client.extract_text_or_completion_object(response)[0]
+
+
+def _score(value, default: float = 0.0) -> float:
+    try:
+        return max(0.0, min(100.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+class MapReduceEvaluator:
+    """
+    map-reduce 面试后评估
+
+    Args:
+        llm: 单轮LLM调用，输入对话消息列表，返回回复文本
+        format_candidate: 生成单个候选人信息文本的函数（与 GroupChat 模式的 generate_candidate_info 相同）
+        criteria: 招聘标准
+        map_concurrency: map 阶段并发数
+        bucket_size: reduce 阶段每个桶的候选人数
+        advance_per_bucket: 每个桶晋级下一轮的人数
+        progress_callback: 进度回调（当前阶段, 已完成的LLM调用数）
+    """
+
+    def __init__(
+        self,
+        llm: Callable[[List[Dict[str, str]]], str],
+        format_candidate: Callable[[Dict, Dict, Dict], str],
+        criteria: Dict[str, Any],
+        map_concurrency: int = DEFAULT_MAP_CONCURRENCY,
+        bucket_size: int = DEFAULT_BUCKET_SIZE,
+        advance_per_bucket: int = DEFAULT_ADVANCE_PER_BUCKET,
+        progress_callback: Optional[Callable[[str, int], None]] = None
+    ):
+        if not 0 < advance_per_bucket < bucket_size:
+            raise ValueError("advance_per_bucket 必须大于0且小于 bucket_size")
+        self.llm = llm
+        self.format_candidate = format_candidate
+        self.criteria = criteria
+        self.map_concurrency = max(1, map_concurrency)
+        self.bucket_size = bucket_size
+        self.advance_per_bucket = advance_per_bucket
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+
+    # ============ 公共入口 ============
+
+    def run(
+        self,
+        candidates_data: Dict[str, Dict],
+        big_five_scores: Dict[str, Dict],
+        fraud_scores: Dict[str, float]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        执行评估
+
+        Returns:
+            (对话消息列表, 发言者列表)，格式与 GroupChat 模式一致
+        """
+        started = time.perf_counter()
+        position = self.criteria.get('position', 'Python开发工程师')
+        messages = [{
+            "name": RECRUITER,
+            "role": "user",
+            "content": f"## 面试后综合评估任务（map-reduce 模式）\n\n"
+                       f"**招聘职位**：{position}\n**候选人数量**：{len(candidates_data)}\n\n"
+                       f"先为每位候选人生成精简评估，再分组横向比较，最后给出招聘顺位推荐。"
+        }]
+        speakers = [RECRUITER]
+
+        assessments = self.map_candidates(candidates_data, big_five_scores, fraud_scores)
+        messages.append({"name": COORDINATOR, "role": "assistant", "content": self._assessment_table(assessments)})
+        speakers.append(COORDINATOR)
+
+        finalists, eliminated, round_messages = self.reduce_candidates(assessments)
+        for content in round_messages:
+            messages.append({"name": CRITIC, "role": "assistant", "content": content})
+            speakers.append(CRITIC)
+
+        final_ranking, final_report = self.final_review(finalists)
+        ranking = final_ranking + eliminated
+        messages.append({
+            "name": CRITIC,
+            "role": "assistant",
+            "content": self._final_content(final_report, ranking, assessments)
+        })
+        speakers.append(CRITIC)
+
+        logger.info(
+            f"map-reduce 评估完成：{len(assessments)} 位候选人，{self.llm_calls} 次LLM调用，"
+            f"token {getattr(self.llm, 'total_tokens', 'N/A')}，耗时 {time.perf_counter() - started:.1f}s"
+        )
+        return messages, speakers
+
+    # ============ map ============
+
+    def map_candidates(
+        self,
+        candidates_data: Dict[str, Dict],
+        big_five_scores: Dict[str, Dict],
+        fraud_scores: Dict[str, float]
+    ) -> List[CandidateAssessment]:
+        """并行生成每位候选人的精简评估（按综合得分降序）"""
+        with ThreadPoolExecutor(max_workers=self.map_concurrency) as executor:
+            futures = [
+                executor.submit(self.assess_candidate, name, resume, big_five_scores, fraud_scores)
+                for name, resume in candidates_data.items()
+            ]
+            for _ in as_completed(futures):
+                self._report_progress(COORDINATOR)
+            assessments = [future.result() for future in futures]
+        return sorted(assessments, key=lambda a: (-a.overall_score, a.name))
+
+    def assess_candidate(
+        self,
+        name: str,
+        resume: Dict,
+        big_five_scores: Dict[str, Dict],
+        fraud_scores: Dict[str, float]
+    ) -> CandidateAssessment:
+        """生成单个候选人的精简评估（LLM调用失败时退化为基于初筛得分的评估）"""
+        info = self.format_candidate({name: resume}, big_five_scores, fraud_scores)[:CANDIDATE_INFO_MAX_CHARS]
+        messages = [
+            {"role": "system", "content": self._map_system_prompt()},
+            {"role": "user", "content": f"请评估以下候选人：\n{info}"},
+        ]
+        try:
+            result = parse_json_response(self._call(messages))
+            return CandidateAssessment(
+                name=name,
+                hr_score=_score(result.get("hr_score")),
+                technical_score=_score(result.get("technical_score")),
+                management_score=_score(result.get("management_score")),
+                overall_score=_score(result.get("overall_score")),
+                risk_flags=[str(flag) for flag in result.get("risk_flags") or []],
+                summary=str(result.get("summary", ""))[:200],
+            )
+        except Exception as e:
+            logger.error(f"候选人 {name} 精简评估失败，使用初筛结果: {e}")
+            return self._fallback_assessment(name, resume, fraud_scores)
+
+    def _map_system_prompt(self) -> str:
+        return f"""你是面试后评估小组，同时从三个视角评估单个候选人：
+1. HR专家：工作经验与岗位匹配度（{self.criteria.get('min_experience', 2)}年以上经验）、学历证书、职业稳定性、尽责性/宜人性/神经质
+2. 技术专家：必备技能（{', '.join(self.criteria.get('required_skills', []))}）的匹配度与深度、项目技术复杂度、开放性
+3. 项目经理专家：项目管理经验、团队协作与沟通、领导力、外倾性与抗压能力
+欺诈检测得分0.6及以上视为存在风险。
+
+只输出JSON：
+{{"hr_score": 0-100, "technical_score": 0-100, "management_score": 0-100, "overall_score": 0-100,
+ "risk_flags": ["风险提示"], "summary": "不超过100字的综合结论"}}"""
+
+    def _fallback_assessment(self, name: str, resume: Dict, fraud_scores: Dict[str, float]) -> CandidateAssessment:
+        score = _score(resume.get("screening_score"), 50.0) if isinstance(resume, dict) else 50.0
+        risk_flags = ["精简评估失败，按初筛得分排序"]
+        fraud = fraud_scores.get(name)
+        if isinstance(fraud, (int, float)) and fraud >= FRAUD_RISK_THRESHOLD:
+            risk_flags.append(f"欺诈检测得分 {fraud:.2f}")
+        summary = (resume.get("screening_summary") or "") if isinstance(resume, dict) else ""
+        return CandidateAssessment(
+            name=name, hr_score=score, technical_score=score, management_score=score, overall_score=score,
+            risk_flags=risk_flags, summary=str(summary)[:200], fallback=True
+        )
+
+    # ============ reduce ============
+
+    def reduce_candidates(
+        self,
+        assessments: List[CandidateAssessment]
+    ) -> Tuple[List[CandidateAssessment], List[str], List[str]]:
+        """
+        分桶锦标赛：每轮把候选人蛇形分配到各桶（强者分散在不同桶），各桶并行比较后晋级前几名
+
+        人数较少的桶（不超过 advance_per_bucket 人）至少淘汰一人，保证每轮人数减少；
+        某一轮没有淘汰任何人时停止，剩余候选人直接进入终评
+
+        Returns:
+            (进入终评的候选人, 被淘汰候选人的顺位（晋级轮次越靠后越靠前）, 每轮的讨论消息)
+        """
+        pool = list(assessments)
+        eliminated_rounds: List[List[CandidateAssessment]] = []
+        round_messages = []
+        round_number = 0
+
+        while len(pool) > self.bucket_size:
+            round_number += 1
+            bucket_count = -(-len(pool) // self.bucket_size)
+            buckets = [[] for _ in range(bucket_count)]
+            for i, assessment in enumerate(pool):
+                lap, offset = divmod(i, bucket_count)
+                buckets[offset if lap % 2 == 0 else bucket_count - 1 - offset].append(assessment)
+
+            with ThreadPoolExecutor(max_workers=self.map_concurrency) as executor:
+                futures = [executor.submit(self.rank_bucket, bucket) for bucket in buckets]
+                for _ in as_completed(futures):
+                    self._report_progress(CRITIC)
+                rankings = [future.result() for future in futures]
+
+            advancing, eliminated, lines = [], [], [f"## 第{round_number}轮分组比较（{len(pool)}人，{bucket_count}组）\n"]
+            for index, ranked in enumerate(rankings, 1):
+                advance = max(1, min(self.advance_per_bucket, len(ranked) - 1))
+                advancing.extend(ranked[:advance])
+                eliminated.extend((position, a) for position, a in enumerate(ranked[advance:]))
+                lines.append(
+                    f"- 第{index}组排序：{' > '.join(a.name for a in ranked)}；"
+                    f"晋级：{'、'.join(a.name for a in ranked[:advance])}"
+                )
+            # 同轮淘汰者按组内名次、综合得分排序
+            eliminated_rounds.append(
+                [a for _, a in sorted(eliminated, key=lambda item: (item[0], -item[1].overall_score, item[1].name))]
+            )
+            round_messages.append("\n".join(lines))
+            pool = sorted(advancing, key=lambda a: (-a.overall_score, a.name))
+            if not eliminated:
+                logger.warning(f"第{round_number}轮分组比较没有淘汰任何候选人，剩余{len(pool)}人直接进入终评")
+                break
+
+        eliminated_names = [a.name for round_out in reversed(eliminated_rounds) for a in round_out]
+        return pool, eliminated_names, round_messages
+
+    def rank_bucket(self, bucket: List[CandidateAssessment]) -> List[CandidateAssessment]:
+        """对一个桶内的候选人做横向比较排序（LLM调用失败或结果不完整时按综合得分补齐）"""
+        by_name = {a.name: a for a in bucket}
+        messages = [
+            {"role": "system", "content": "你是综合评审专家，根据候选人的精简评估做横向比较，"
+                                          "综合岗位适配性、人格特质和欺诈风险给出排序。"
+                                          "只输出JSON：{\"ranking\": [\"姓名\", ...], \"reason\": \"排序理由\"}"},
+            {"role": "user", "content": "候选人精简评估：\n" + "\n".join(a.to_prompt() for a in bucket)},
+        ]
+        ranked = []
+        try:
+            result = parse_json_response(self._call(messages))
+            for name in result.get("ranking") or []:
+                if name in by_name and by_name[name] not in ranked:
+                    ranked.append(by_name[name])
+        except Exception as e:
+            logger.error(f"分组比较失败，按综合得分排序: {e}")
+        rest = sorted((a for a in bucket if a not in ranked), key=lambda a: (-a.overall_score, a.name))
+        return ranked + rest
+
+    # ============ 终评 ============
+
+    def final_review(self, finalists: List[CandidateAssessment]) -> Tuple[List[str], str]:
+        """
+        对进入终评的候选人生成最终报告
+
+        Returns:
+            (终评顺位, 报告正文)
+        """
+        ranked = list(finalists)
+        if len(finalists) > 1:
+            ranked = self.rank_bucket(finalists)
+            self._report_progress(CRITIC)
+        names = [a.name for a in ranked]
+        messages = [
+            {"role": "system", "content": """你是综合评审专家，请为进入终评的候选人生成最终评估报告：
+- 清晰的候选人对比分析（用表格呈现）
+- 人格特质对工作适应性评估
+- 欺诈风险提示
+- 具体的岗位适配性分析
+- 明确的招聘推荐顺位
+不要输出"招聘顺位推荐"结论行，系统会根据给定顺位追加。"""},
+            {"role": "user", "content": f"招聘职位：{self.criteria.get('position', 'Python开发工程师')}\n"
+                                        f"终评顺位：{' > '.join(names)}\n"
+                                        "候选人精简评估：\n" + "\n".join(a.to_prompt() for a in ranked)},
+        ]
+        try:
+            report = self._call(messages)
+        except Exception as e:
+            logger.error(f"生成终评报告失败，使用精简评估汇总: {e}")
+            report = "## 终评候选人\n\n" + "\n".join(a.to_prompt() for a in ranked)
+        self._report_progress(CRITIC)
+        return names, report
+
+    def _final_content(self, report: str, ranking: List[str], assessments: List[CandidateAssessment]) -> str:
+        return (
+            f"{report.strip()}\n\n"
+            f"{self._assessment_table(assessments, ranking)}\n\n"
+            f"招聘顺位推荐：{' > '.join(ranking)}\n\nAPPROVE"
+        )
+
+    # ============ 工具方法 ============
+
+    def _assessment_table(self, assessments: List[CandidateAssessment], ranking: Optional[List[str]] = None) -> str:
+        if ranking is not None:
+            order = {name: index for index, name in enumerate(ranking)}
+            assessments = sorted(assessments, key=lambda a: order.get(a.name, len(order)))
+        lines = [
+            "## 候选人精简评估汇总" if ranking is None else "## 全部候选人顺位",
+            "",
+            "| 顺位 | 候选人 | 综合 | HR | 技术 | 管理 | 风险提示 |",
+            "|------|--------|------|----|------|------|----------|",
+        ]
+        for index, a in enumerate(assessments, 1):
+            risks = "；".join(a.risk_flags) if a.risk_flags else "-"
+            lines.append(
+                f"| {index} | {a.name} | {a.overall_score:.0f} | {a.hr_score:.0f} | {a.technical_score:.0f}"
+                f" | {a.management_score:.0f} | {risks} |"
+            )
+        return "\n".join(lines)
+
+    def _call(self, messages: List[Dict[str, str]]) -> str:
+        try:
+            return self.llm(messages)
+        finally:
+            with self._lock:
+                self.llm_calls += 1
+
+    def _report_progress(self, stage: str):
+        """在调用方线程中上报进度（回调可能访问数据库，不在工作线程中执行）"""
+        if self.progress_callback:
+            try:
+                self.progress_callback(stage, self.llm_calls)
+            except Exception as e:
+                logger.error(f"更新评估进度失败: {e}")
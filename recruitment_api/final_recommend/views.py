@@ -3,21 +3,27 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
-from django.http import HttpResponse, Http404, FileResponse
+from django.http import HttpResponse, Http404
 from django.conf import settings
 import json
 import logging
 import threading
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 import uuid
-import os
+import posixpath
 from urllib.parse import unquote
 
 from .models import InterviewEvaluationTask
-from .after_interview import run_interview_evaluation, generate_candidate_info
+from .after_interview import EVALUATION_MODES, run_interview_evaluation, generate_candidate_info
+from resume_screening.chat_checkpoint import clear_checkpoints
+from recruitment_api.downloads import serve_stored_file
 
 logger = logging.getLogger(__name__)
 
+# 评估报告的存储目录（InterviewEvaluationTask.result_file）
+REPORTS_DIR = 'interview_evaluation_reports'
+
 @method_decorator(csrf_exempt, name='post')
 @method_decorator(csrf_exempt, name='delete')
 class InterviewEvaluationView(View):
@@ -40,6 +46,13 @@ class InterviewEvaluationView(View):
                     'message': '缺少必要的参数: group_id'
                 }, status=400)
             
+            mode = data.get('mode', 'auto')
+            if mode not in EVALUATION_MODES:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': f"mode 必须为 {', '.join(EVALUATION_MODES)} 之一"
+                }, status=400)
+            
             # 创建任务记录
             task = InterviewEvaluationTask.objects.create(
                 group_id=group_id,
@@ -47,7 +60,7 @@ class InterviewEvaluationView(View):
             )
             
             # 启动异步任务处理
-            thread = threading.Thread(target=self._process_evaluation, args=(task.id, group_id))
+            thread = threading.Thread(target=self._process_evaluation, args=(task.id, group_id, mode))
             thread.start()
             
             # 立即返回任务ID
@@ -101,9 +114,7 @@ class InterviewEvaluationView(View):
             
             # 删除关联的文件（如果存在）
             if task.result_file:
-                # 删除文件系统中的文件
-                if os.path.isfile(task.result_file.path):
-                    os.remove(task.result_file.path)
+                task.result_file.delete(save=False)
             
             # 删除数据库记录
             task.delete()
@@ -204,7 +215,7 @@ class InterviewEvaluationView(View):
                 'message': f'根据group_id获取任务状态时出错: {str(e)}'
             }, status=500)
     
-    def _process_evaluation(self, task_id, group_id):
+    def _process_evaluation(self, task_id, group_id, mode='auto'):
         """异步处理评估任务"""
         def update_speaker(speaker_name, message_count):
             """更新当前发言者和对话轮数"""
@@ -225,7 +236,7 @@ class InterviewEvaluationView(View):
             task.save()
             
             # 运行面试后评估流程，传入进度回调函数
-            messages, speakers = run_interview_evaluation(group_id, update_speaker)
+            messages, speakers = run_interview_evaluation(group_id, update_speaker, mode)
             
             if not messages:
                 raise Exception('评估流程未能生成有效结果')
@@ -260,6 +271,9 @@ class InterviewEvaluationView(View):
             task.current_speaker = '完成'
             task.save()
             
+            # 结果已保存，清理群聊检查点（任务失败时保留，重试时从断点继续）
+            clear_checkpoints('final_evaluation', group_id)
+            
         except Exception as e:
             logger.error(f"处理评估任务时出错: {e}")
             # 更新任务状态为失败
@@ -275,34 +289,26 @@ class InterviewEvaluationView(View):
 
 def download_report(request, file_path):
     """
-    下载评估报告文件
-    文件路径格式: /interview_evaluation_reports/2025/11/20/文件名.md
+    下载评估报告文件（支持断点续传、条件请求和反向代理转发，对象存储中的文件重定向到预签名URL）
+    文件路径即 result_file 的存储键: /interview_evaluation_reports/ab/cdef....md
+    （此前保存的报告为 /interview_evaluation_reports/2025/11/20/文件名.md）
     """
     try:
-        # 解码URL编码的文件路径
-        decoded_file_path = unquote(file_path)
-        
-        # 构建完整文件路径
-        full_file_path = os.path.join(settings.BASE_DIR, decoded_file_path.lstrip('/'))
+        # 解码URL编码的文件路径，只允许下载评估报告目录内的文件
+        name = posixpath.normpath(unquote(file_path).lstrip('/'))
+        if not name.startswith(REPORTS_DIR + '/'):
+            raise Http404("文件不存在")
         
-        # 检查文件是否存在
-        if not os.path.exists(full_file_path):
-            return JsonResponse({
-                'status': 'error',
-                'message': '文件不存在'
-            }, status=404)
-        
-        # 获取文件名
-        filename = os.path.basename(full_file_path)
-        
-        # 返回文件响应
-        response = FileResponse(
-            open(full_file_path, 'rb'),
-            as_attachment=True,
-            filename=filename
-        )
-        return response
+        # 存储键由内容哈希生成，下载文件名使用生成报告时的名称
+        task = InterviewEvaluationTask.objects.filter(result_file=name).first()
+        filename = f"面试后综合评估报告_{task.group_id}_{task.id}.md" if task else None
+        return serve_stored_file(request, default_storage, name, filename=filename)
         
+    except Http404:
+        return JsonResponse({
+            'status': 'error',
+            'message': '文件不存在'
+        }, status=404)
     except Exception as e:
         logger.error(f"下载文件时出错: {e}")
         return JsonResponse({
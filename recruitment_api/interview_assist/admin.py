@@ -3,7 +3,7 @@
 """
 
 from django.contrib import admin
-from .models import InterviewAssistSession, InterviewQARecord
+from .models import InterviewAssistSession, InterviewQARecord, ShallowAnswerLexicon, QuestionPoolCache, QuestionBankEntry, InterviewReportJob
 
 
 @admin.register(InterviewAssistSession)
@@ -36,3 +36,35 @@ class InterviewQARecordAdmin(admin.ModelAdmin):
             return f"{obj.evaluation.get('normalized_score', 0):.1f}"
         return '-'
     get_score.short_description = '评分'
+
+
+@admin.register(ShallowAnswerLexicon)
+class ShallowAnswerLexiconAdmin(admin.ModelAdmin):
+    list_display = ['id', 'scope_type', 'scope_key', 'is_active', 'version', 'updated_at']
+    list_filter = ['scope_type', 'is_active']
+    search_fields = ['scope_key']
+    readonly_fields = ['version', 'created_at', 'updated_at']
+
+
+@admin.register(QuestionPoolCache)
+class QuestionPoolCacheAdmin(admin.ModelAdmin):
+    list_display = ['id', 'cache_key', 'candidate_level', 'status', 'hit_count', 'updated_at']
+    list_filter = ['status', 'candidate_level']
+    search_fields = ['cache_key', 'resume_hash']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(QuestionBankEntry)
+class QuestionBankEntryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'category', 'candidate_level', 'difficulty', 'usage_count', 'answer_count', 'is_active']
+    list_filter = ['category', 'candidate_level', 'is_active']
+    search_fields = ['question']
+    readonly_fields = ['usage_count', 'answer_count', 'score_sum', 'score_sq_sum', 'created_at', 'last_used_at']
+
+
+@admin.register(InterviewReportJob)
+class InterviewReportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'session', 'status', 'created_at', 'completed_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['session__resume_data__candidate_name', 'content_hash']
+    readonly_fields = ['id', 'content_hash', 'created_at', 'started_at', 'completed_at']
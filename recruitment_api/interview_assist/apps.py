@@ -5,3 +5,6 @@ class InterviewAssistConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interview_assist'
     verbose_name = '面试辅助'
+
+    def ready(self):
+        from . import signals  # noqa: F401
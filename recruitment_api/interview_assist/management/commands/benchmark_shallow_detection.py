@@ -0,0 +1,147 @@
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from interview_assist.services.interview_assistant import InterviewAssistant
+from interview_assist.services.lexicon_matcher import CASE_INSENSITIVE_CATEGORIES, LEXICON_CATEGORIES, LexiconMatcher
+from interview_assist.services.prompts import InterviewPrompts
+
+
+def legacy_lexicon_signals(answer: str, lexicons: dict) -> dict:
+    """原实现：每个词表逐词扫描回答（O(词条数 × 回答长度)），保留用于对比"""
+    answer_lower = answer.lower()
+    return {
+        "high_level_count": sum(1 for term in lexicons["high_level"] if term in answer_lower),
+        "vague_count": sum(1 for word in lexicons["vague"] if word in answer),
+        "has_weakness": any(phrase in answer for phrase in lexicons["weakness"]),
+        "has_example": any(word in answer for word in lexicons["concrete"]),
+        "has_metrics": any(word in answer_lower for word in lexicons["metrics"]),
+        "empty_count": sum(1 for phrase in lexicons["empty"] if phrase in answer),
+    }
+
+
+def legacy_lexicon_hits(answer: str, lexicons: dict) -> list:
+    """逐词扫描并给出命中位置（与自动机产出相同的结果），用于对比包含位置时的开销"""
+    answer_lower = answer.lower()
+    hits = []
+    for category, terms in lexicons.items():
+        insensitive = category in CASE_INSENSITIVE_CATEGORIES
+        haystack = answer_lower if insensitive else answer
+        for term in dict.fromkeys(term.lower() if insensitive else term for term in terms):
+            position = haystack.find(term)
+            while position != -1:
+                hits.append((position, position + len(term), category))
+                position = haystack.find(term, position + 1)
+    return sorted(hits)
+
+
+def automaton_lexicon_signals(answer: str, matcher: LexiconMatcher) -> dict:
+    """新实现：一次扫描得到全部词表命中（同时产出命中位置）"""
+    scan = matcher.scan(answer)
+    return {
+        "high_level_count": scan.count("high_level"),
+        "vague_count": scan.count("vague"),
+        "has_weakness": scan.has("weakness"),
+        "has_example": scan.has("concrete"),
+        "has_metrics": scan.has("metrics"),
+        "empty_count": scan.count("empty"),
+    }
+
+
+class Command(BaseCommand):
+    help = '对比浅层回答检测的逐词扫描与单次扫描自动机的性能'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--answers', type=int, default=2000, help='生成的测试回答数量')
+        parser.add_argument('--length', type=int, default=400, help='每条回答的大致长度（字符）')
+        parser.add_argument('--hit-rate', type=float, default=0.05, help='回答片段中词表词条的比例')
+        parser.add_argument('--extra-terms', type=int, default=0, help='额外加入词表的随机词条数（模拟按岗位扩充的词表）')
+        parser.add_argument('--seed', type=int, default=42, help='随机种子')
+        parser.add_argument('--repeat', type=int, default=5, help='每项计时重复次数（取最快一次，减少抖动）')
+
+    def _build_lexicons(self, extra_terms, rng):
+        lexicons = {
+            category: list(getattr(InterviewPrompts, attr))
+            for category, attr in LEXICON_CATEGORIES.items()
+        }
+        categories = list(lexicons)
+        for i in range(extra_terms):
+            term = "".join(chr(rng.randint(0x4e00, 0x9fa5)) for _ in range(rng.randint(2, 5)))
+            lexicons[categories[i % len(categories)]].append(term)
+        return lexicons
+
+    def _generate_answers(self, lexicons, count, length, hit_rate, rng):
+        """生成模拟回答：以普通叙述为主，按比例混入各类词表词条"""
+        lexicon_terms = [term for terms in lexicons.values() for term in terms]
+        filler = [
+            "我们", "当时的系统", "负责", "这个项目", "用户", "接口", "优化了", "Redis",
+            "数据库", "上线以后", "团队", "主要是", "这部分", "排查", "日志", "，", "。", "100ms",
+        ]
+        answers = []
+        for _ in range(count):
+            parts = []
+            while sum(len(p) for p in parts) < length:
+                parts.append(rng.choice(lexicon_terms) if rng.random() < hit_rate else rng.choice(filler))
+            answers.append("".join(parts))
+        return answers
+
+    def _time(self, func, answers, repeat=1):
+        best = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            for answer in answers:
+                func(answer)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        lexicons = self._build_lexicons(options['extra_terms'], rng)
+        answers = self._generate_answers(
+            lexicons, options['answers'], options['length'], options['hit_rate'], rng
+        )
+
+        build_start = time.perf_counter()
+        matcher = LexiconMatcher(lexicons)
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        # 先校验两种实现结果一致
+        mismatches = sum(
+            1 for answer in answers
+            if legacy_lexicon_signals(answer, lexicons) != automaton_lexicon_signals(answer, matcher)
+            or legacy_lexicon_hits(answer, lexicons) != sorted(
+                (hit["start"], hit["end"], hit["category"]) for hit in matcher.scan(answer).hits
+            )
+        )
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'结果不一致: {mismatches}/{len(answers)} 条回答'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'结果一致: {len(answers)} 条回答'))
+
+        repeat = options['repeat']
+        legacy_seconds = self._time(lambda answer: legacy_lexicon_signals(answer, lexicons), answers, repeat)
+        legacy_hits_seconds = self._time(lambda answer: legacy_lexicon_hits(answer, lexicons), answers, repeat)
+        automaton_seconds = self._time(lambda answer: automaton_lexicon_signals(answer, matcher), answers, repeat)
+
+        # 计时期间屏蔽可疑回答的告警日志
+        assistant_logger = logging.getLogger('interview_assist.services.interview_assistant')
+        previous_level = assistant_logger.level
+        assistant_logger.setLevel(logging.ERROR)
+        try:
+            assistant = InterviewAssistant(lexicon_matcher=matcher)
+            detect_seconds = self._time(lambda answer: assistant.detect_shallow_answer(answer, []), answers, repeat)
+        finally:
+            assistant_logger.setLevel(previous_level)
+
+        count = len(answers)
+        term_count = sum(len(terms) for terms in lexicons.values())
+        self.stdout.write(f'词表词条数:      {term_count}（自动机构建 {build_ms:.1f}ms）')
+        self.stdout.write(f'逐词扫描:        {legacy_seconds * 1000:.1f}ms ({count / legacy_seconds:.0f} 条/秒，不含位置)')
+        self.stdout.write(f'逐词扫描含位置:  {legacy_hits_seconds * 1000:.1f}ms ({count / legacy_hits_seconds:.0f} 条/秒)')
+        self.stdout.write(f'自动机单次扫描:  {automaton_seconds * 1000:.1f}ms ({count / automaton_seconds:.0f} 条/秒)')
+        self.stdout.write(f'完整浅层检测:    {detect_seconds * 1000:.1f}ms ({count / detect_seconds:.0f} 条/秒)')
+        self.stdout.write(f'词表扫描加速比:  {legacy_seconds / automaton_seconds:.2f}x（对比不含位置的逐词扫描）')
+        self.stdout.write(f'                 {legacy_hits_seconds / automaton_seconds:.2f}x（对比产出相同结果的逐词扫描）')
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from interview_assist.models import InterviewAssistSession
+from interview_assist.services.session_stats import verify_stats
+
+
+class Command(BaseCommand):
+    help = '检查面试会话统计累计值与问答记录是否一致（--fix 时重新计算不一致的会话）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', help='只检查指定会话')
+        parser.add_argument('--fix', action='store_true', help='用重新计算的结果覆盖不一致的统计')
+
+    def handle(self, *args, **options):
+        sessions = InterviewAssistSession.objects.all()
+        if options['session']:
+            sessions = sessions.filter(id=options['session'])
+
+        checked, inconsistent = 0, []
+        for session in sessions.iterator():
+            checked += 1
+            consistent, _ = verify_stats(session, repair=options['fix'])
+            if not consistent:
+                inconsistent.append(str(session.id))
+                self.stdout.write(self.style.WARNING(f'不一致: {session.id}'))
+
+        summary = f'共检查 {checked} 个会话，{len(inconsistent)} 个不一致'
+        if inconsistent and options['fix']:
+            summary += '，已重新计算'
+        self.stdout.write(self.style.SUCCESS(summary) if not inconsistent else summary)
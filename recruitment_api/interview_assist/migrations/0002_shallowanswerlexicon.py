@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShallowAnswerLexicon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope_type', models.CharField(choices=[('default', '全局默认'), ('job_family', '岗位族'), ('position', '具体岗位')], default='position', max_length=20, verbose_name='作用范围')),
+                ('scope_key', models.CharField(blank=True, default='', max_length=200, verbose_name='岗位族/岗位名称')),
+                ('lexicons', models.JSONField(blank=True, default=dict, verbose_name='词表')),
+                ('weights', models.JSONField(blank=True, default=dict, verbose_name='评分权重')),
+                ('is_active', models.BooleanField(default=True, verbose_name='是否启用')),
+                ('version', models.PositiveIntegerField(default=1, verbose_name='版本号')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '浅层回答检测词表',
+                'verbose_name_plural': '浅层回答检测词表',
+                'db_table': 'interview_shallow_answer_lexicons',
+                'ordering': ['scope_type', 'scope_key'],
+                'unique_together': {('scope_type', 'scope_key')},
+            },
+        ),
+    ]
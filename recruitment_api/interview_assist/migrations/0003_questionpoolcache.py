@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0002_shallowanswerlexicon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionPoolCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, unique=True, verbose_name='缓存键')),
+                ('resume_hash', models.CharField(db_index=True, max_length=64, verbose_name='简历内容哈希')),
+                ('job_config_hash', models.CharField(max_length=64, verbose_name='岗位配置哈希')),
+                ('candidate_level', models.CharField(max_length=20, verbose_name='候选人级别')),
+                ('status', models.CharField(choices=[('generating', '生成中'), ('ready', '已就绪')], default='generating', max_length=20, verbose_name='状态')),
+                ('question_pool', models.JSONField(default=list, verbose_name='候选问题池')),
+                ('resume_highlights', models.JSONField(default=list, verbose_name='简历亮点')),
+                ('hit_count', models.PositiveIntegerField(default=0, verbose_name='命中次数')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '候选问题池缓存',
+                'verbose_name_plural': '候选问题池缓存',
+                'db_table': 'interview_question_pool_cache',
+                'ordering': ['-updated_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0003_questionpoolcache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionBankEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.TextField(verbose_name='问题内容')),
+                ('category', models.CharField(max_length=50, verbose_name='问题类别')),
+                ('candidate_level', models.CharField(max_length=20, verbose_name='候选人级别')),
+                ('difficulty', models.IntegerField(default=5, verbose_name='问题难度(1-10)')),
+                ('skills', models.JSONField(default=list, verbose_name='考察技能')),
+                ('source', models.CharField(default='skill_based', max_length=20, verbose_name='问题来源')),
+                ('is_active', models.BooleanField(default=True, verbose_name='是否启用')),
+                ('usage_count', models.PositiveIntegerField(default=0, verbose_name='使用次数')),
+                ('answer_count', models.PositiveIntegerField(default=0, verbose_name='回答次数')),
+                ('score_sum', models.FloatField(default=0, verbose_name='得分总和')),
+                ('score_sq_sum', models.FloatField(default=0, verbose_name='得分平方和')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='创建时间')),
+                ('last_used_at', models.DateTimeField(blank=True, null=True, verbose_name='最近使用时间')),
+            ],
+            options={
+                'verbose_name': '题库问题',
+                'verbose_name_plural': '题库问题',
+                'db_table': 'interview_question_bank',
+                'ordering': ['category', 'candidate_level', '-usage_count'],
+                'indexes': [models.Index(fields=['category', 'candidate_level', 'difficulty'], name='interview_q_categor_8956d1_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='interviewqarecord',
+            name='bank_question',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='qa_records', to='interview_assist.questionbankentry', verbose_name='题库问题'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0004_question_bank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewassistsession',
+            name='stats',
+            field=models.JSONField(blank=True, default=dict, verbose_name='问答统计'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:12
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0005_session_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewReportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('content_hash', models.CharField(max_length=64, verbose_name='会话内容哈希')),
+                ('options', models.JSONField(default=dict, verbose_name='生成参数')),
+                ('status', models.CharField(choices=[('pending', '等待中'), ('running', '生成中'), ('completed', '已完成'), ('failed', '失败')], default='pending', max_length=20, verbose_name='任务状态')),
+                ('error_message', models.TextField(blank=True, null=True, verbose_name='错误信息')),
+                ('report', models.JSONField(blank=True, null=True, verbose_name='报告内容')),
+                ('markdown_file', models.FileField(blank=True, null=True, upload_to='interview_assist_reports/%Y/%m/%d/', verbose_name='Markdown报告')),
+                ('json_file', models.FileField(blank=True, null=True, upload_to='interview_assist_reports/%Y/%m/%d/', verbose_name='JSON报告')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='创建时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to='interview_assist.interviewassistsession', verbose_name='所属会话')),
+            ],
+            options={
+                'verbose_name': '报告生成任务',
+                'verbose_name_plural': '报告生成任务',
+                'db_table': 'interview_report_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['session', 'content_hash'], name='interview_r_session_f66f8b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.14 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0006_report_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionbankentry',
+            name='skill_key',
+            field=models.CharField(blank=True, max_length=64, null=True, verbose_name='技能集合键'),
+        ),
+        migrations.AddIndex(
+            model_name='questionbankentry',
+            index=models.Index(fields=['category', 'candidate_level', 'skill_key'], name='interview_q_categor_3092c0_idx'),
+        ),
+    ]
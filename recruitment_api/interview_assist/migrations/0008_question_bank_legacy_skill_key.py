@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def clear_empty_skill_keys(apps, schema_editor):
+    # 空字符串的 skill_key 无法区分“岗位没有核心技能”和分库前的问题，统一视为分库前的问题
+    QuestionBankEntry = apps.get_model('interview_assist', 'QuestionBankEntry')
+    QuestionBankEntry.objects.filter(skill_key='').update(skill_key=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_assist', '0007_question_bank_skill_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_empty_skill_keys, migrations.RunPython.noop),
+    ]
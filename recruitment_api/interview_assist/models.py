@@ -44,6 +44,9 @@ class InterviewAssistSession(models.Model):
     # 简历亮点/兴趣点（从简历中提取的值得追问的点）
     resume_highlights = models.JSONField(default=list, verbose_name="简历亮点")
     
+    # 问答统计累计值（各维度得分总和与次数、得分趋势等，见 services.session_stats）
+    stats = models.JSONField(default=dict, blank=True, verbose_name="问答统计")
+    
     # 最终报告
     final_report = models.JSONField(null=True, blank=True, verbose_name="最终报告")
     report_file = models.FileField(
@@ -100,6 +103,15 @@ class InterviewQARecord(models.Model):
     # 关联的简历兴趣点
     related_interest_point = models.JSONField(null=True, blank=True, verbose_name="关联兴趣点")
     
+    # 问题来自题库时关联题库条目（用于统计该题的回答得分）
+    bank_question = models.ForeignKey(
+        'QuestionBankEntry',
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='qa_records',
+        verbose_name="题库问题"
+    )
+    
     # 回答信息
     answer = models.TextField(blank=True, verbose_name="候选人回答")
     answer_recorded_at = models.DateTimeField(null=True, blank=True, verbose_name="回答记录时间")
@@ -120,3 +132,191 @@ class InterviewQARecord(models.Model):
     
     def __str__(self):
         return f"第{self.round_number}轮 - {self.question[:30]}..."
+
+
+class ShallowAnswerLexicon(models.Model):
+    """
+    浅层回答检测词表配置
+    按 默认 -> 岗位族 -> 具体岗位 逐级覆盖，未配置的词表类别/权重沿用上一级（最终回落到 InterviewPrompts）
+    """
+    
+    SCOPE_CHOICES = [
+        ('default', '全局默认'),
+        ('job_family', '岗位族'),
+        ('position', '具体岗位'),
+    ]
+    
+    scope_type = models.CharField(max_length=20, choices=SCOPE_CHOICES, default='position', verbose_name="作用范围")
+    scope_key = models.CharField(max_length=200, blank=True, default='', verbose_name="岗位族/岗位名称")
+    
+    # 词表：类别 -> 词条列表（类别见 services.lexicon_matcher.LEXICON_CATEGORIES）
+    lexicons = models.JSONField(default=dict, blank=True, verbose_name="词表")
+    # 评分权重：名称 -> 分值（见 InterviewPrompts.SHALLOW_ANSWER_WEIGHTS）
+    weights = models.JSONField(default=dict, blank=True, verbose_name="评分权重")
+    
+    is_active = models.BooleanField(default=True, verbose_name="是否启用")
+    version = models.PositiveIntegerField(default=1, verbose_name="版本号")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="创建时间")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+    
+    class Meta:
+        db_table = 'interview_shallow_answer_lexicons'
+        verbose_name = "浅层回答检测词表"
+        verbose_name_plural = "浅层回答检测词表"
+        ordering = ['scope_type', 'scope_key']
+        unique_together = ['scope_type', 'scope_key']
+    
+    def __str__(self):
+        return f"{self.get_scope_type_display()} - {self.scope_key or '默认'} (v{self.version})"
+    
+    def save(self, *args, **kwargs):
+        # 每次修改递增版本号，用于缓存失效判断
+        if self.pk:
+            self.version = models.F('version') + 1
+        super().save(*args, **kwargs)
+        if self.pk and not isinstance(self.version, int):
+            self.refresh_from_db(fields=['version'])
+
+
+class QuestionPoolCache(models.Model):
+    """
+    候选问题池缓存
+    按 (简历内容, 岗位配置, 候选人级别, 生成参数) 缓存生成结果，同一候选人/岗位的重复会话直接复用
+    """
+    
+    STATUS_CHOICES = [
+        ('generating', '生成中'),
+        ('ready', '已就绪'),
+    ]
+    
+    cache_key = models.CharField(max_length=64, unique=True, verbose_name="缓存键")
+    resume_hash = models.CharField(max_length=64, db_index=True, verbose_name="简历内容哈希")
+    job_config_hash = models.CharField(max_length=64, verbose_name="岗位配置哈希")
+    candidate_level = models.CharField(max_length=20, verbose_name="候选人级别")
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='generating', verbose_name="状态")
+    question_pool = models.JSONField(default=list, verbose_name="候选问题池")
+    resume_highlights = models.JSONField(default=list, verbose_name="简历亮点")
+    
+    hit_count = models.PositiveIntegerField(default=0, verbose_name="命中次数")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="创建时间")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+    
+    class Meta:
+        db_table = 'interview_question_pool_cache'
+        verbose_name = "候选问题池缓存"
+        verbose_name_plural = "候选问题池缓存"
+        ordering = ['-updated_at']
+    
+    def __str__(self):
+        return f"{self.cache_key[:12]} ({self.get_status_display()}, 命中{self.hit_count}次)"
+
+
+class QuestionBankEntry(models.Model):
+    """
+    题库问题
+    跨会话复用的技能类问题，按类别、候选人级别、岗位核心技能集合和难度索引，
+    并累计使用次数与回答得分统计，用于选题
+    """
+    
+    question = models.TextField(verbose_name="问题内容")
+    category = models.CharField(max_length=50, verbose_name="问题类别")
+    candidate_level = models.CharField(max_length=20, verbose_name="候选人级别")
+    # 生成问题时岗位核心技能集合的规范化键（见 question_bank.skill_key），没有核心技能时为 'none'；
+    # 分库前入库的问题无法确定所属岗位，为 NULL，不再参与选题
+    skill_key = models.CharField(max_length=64, null=True, blank=True, verbose_name="技能集合键")
+    difficulty = models.IntegerField(default=5, verbose_name="问题难度(1-10)")
+    skills = models.JSONField(default=list, verbose_name="考察技能")
+    source = models.CharField(max_length=20, default='skill_based', verbose_name="问题来源")
+    is_active = models.BooleanField(default=True, verbose_name="是否启用")
+    
+    # 使用与得分统计（得分为回答评估的 normalized_score）
+    usage_count = models.PositiveIntegerField(default=0, verbose_name="使用次数")
+    answer_count = models.PositiveIntegerField(default=0, verbose_name="回答次数")
+    score_sum = models.FloatField(default=0, verbose_name="得分总和")
+    score_sq_sum = models.FloatField(default=0, verbose_name="得分平方和")
+    
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="创建时间")
+    last_used_at = models.DateTimeField(null=True, blank=True, verbose_name="最近使用时间")
+    
+    class Meta:
+        db_table = 'interview_question_bank'
+        verbose_name = "题库问题"
+        verbose_name_plural = "题库问题"
+        ordering = ['category', 'candidate_level', '-usage_count']
+        indexes = [
+            models.Index(fields=['category', 'candidate_level', 'difficulty']),
+            models.Index(fields=['category', 'candidate_level', 'skill_key']),
+        ]
+    
+    def __str__(self):
+        return f"[{self.category}/{self.candidate_level}] {self.question[:30]}"
+    
+    @property
+    def avg_score(self):
+        """回答平均分（无回答时为 None）"""
+        return self.score_sum / self.answer_count if self.answer_count else None
+    
+    @property
+    def score_std(self):
+        """回答得分标准差（少于2次回答时为 None）"""
+        if self.answer_count < 2:
+            return None
+        mean = self.score_sum / self.answer_count
+        return max(self.score_sq_sum / self.answer_count - mean * mean, 0.0) ** 0.5
+
+
+class InterviewReportJob(models.Model):
+    """
+    最终报告生成任务
+    报告在后台生成，结果按会话内容哈希（问答记录ID与评估结果、HR备注等）缓存，
+    Markdown 和 JSON 两种格式各渲染一次后存入文件存储
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', '等待中'),
+        ('running', '生成中'),
+        ('completed', '已完成'),
+        ('failed', '失败'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    session = models.ForeignKey(
+        InterviewAssistSession,
+        on_delete=models.CASCADE,
+        related_name='report_jobs',
+        verbose_name="所属会话"
+    )
+    content_hash = models.CharField(max_length=64, verbose_name="会话内容哈希")
+    options = models.JSONField(default=dict, verbose_name="生成参数")
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="任务状态")
+    error_message = models.TextField(blank=True, null=True, verbose_name="错误信息")
+    
+    report = models.JSONField(null=True, blank=True, verbose_name="报告内容")
+    markdown_file = models.FileField(
+        upload_to='interview_assist_reports/%Y/%m/%d/',
+        blank=True, null=True,
+        verbose_name="Markdown报告"
+    )
+    json_file = models.FileField(
+        upload_to='interview_assist_reports/%Y/%m/%d/',
+        blank=True, null=True,
+        verbose_name="JSON报告"
+    )
+    
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="创建时间")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="开始时间")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="完成时间")
+    
+    class Meta:
+        db_table = 'interview_report_jobs'
+        verbose_name = "报告生成任务"
+        verbose_name_plural = "报告生成任务"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['session', 'content_hash']),
+        ]
+    
+    def __str__(self):
+        return f"{self.session_id} 报告任务 ({self.get_status_display()})"
@@ -1,3 +1,4 @@
 # Interview Assist Services
 from .interview_assistant import InterviewAssistant
 from .prompts import InterviewPrompts
+from .lexicon_matcher import LexiconMatcher
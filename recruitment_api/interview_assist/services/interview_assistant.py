@@ -3,12 +3,18 @@
 迁移自HRM1的InterviewerAgent，适配人在回路模式
 """
 
+import asyncio
+import inspect
 import json
 import logging
+import time
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+from asgiref.sync import async_to_sync, sync_to_async
+
 from .prompts import InterviewPrompts
+from .lexicon_matcher import get_default_lexicon_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -31,19 +37,33 @@ class InterviewAssistant:
     提供问题生成、回答评估、追问建议等核心功能
     """
     
-    def __init__(self, llm_client=None, job_config: Dict = None, company_config: Dict = None):
+    def __init__(
+        self,
+        llm_client=None,
+        job_config: Dict = None,
+        company_config: Dict = None,
+        lexicon_matcher=None,
+        shallow_weights: Dict = None,
+        question_bank=None
+    ):
         """
         初始化面试辅助服务
         
         Args:
-            llm_client: LLM客户端实例（需要实现chat_with_json_response方法）
+            llm_client: LLM客户端实例（需要实现chat_with_json_response方法，同步或异步均可）
             job_config: 岗位配置
             company_config: 公司配置
+            lexicon_matcher: 浅层回答词表匹配器（默认使用 InterviewPrompts 词表编译的共享实例）
+            shallow_weights: 浅层回答检测的评分权重（未提供的项使用 InterviewPrompts.SHALLOW_ANSWER_WEIGHTS）
+            question_bank: 题库（提供时生成问题池优先从题库选取技能类问题）
         """
         self.llm_client = llm_client
         self.job_config = job_config or {}
         self.company_config = company_config or {}
         self.prompts = InterviewPrompts()
+        self.lexicon_matcher = lexicon_matcher or get_default_lexicon_matcher()
+        self.shallow_weights = {**InterviewPrompts.SHALLOW_ANSWER_WEIGHTS, **(shallow_weights or {})}
+        self.question_bank = question_bank
     
     def generate_resume_based_questions(
         self, 
@@ -62,49 +82,65 @@ class InterviewAssistant:
         """
         logger.info("正在基于简历生成针对性问题...")
         
-        # 构建系统提示词
-        system_prompt = self._build_system_prompt()
-        
-        # 构建用户消息
-        user_message = InterviewPrompts.RESUME_BASED_QUESTION_PROMPT.format(
-            resume_content=resume_content,
-            job_title=self.job_config.get("title", ""),
-            job_description=self.job_config.get("description", ""),
-            job_requirements=json.dumps(
-                self.job_config.get("requirements", {}), 
-                ensure_ascii=False, 
-                indent=2
-            )
-        )
-        
         try:
             if self.llm_client:
-                result = self.llm_client.chat_with_json_response(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
-                    temperature=0.7
-                )
+                result = self._chat(self._resume_question_messages(resume_content), temperature=0.7)
             else:
                 # 无LLM时返回模拟数据
                 result = self._get_mock_resume_questions(resume_content)
             
-            # 处理结果
-            interest_points = result.get("interest_points", [])
-            questions = result.get("questions", [])[:count]
+            return self._parse_resume_questions(result, count)
             
-            logger.info(f"识别到 {len(interest_points)} 个兴趣点，生成 {len(questions)} 个问题")
+        except Exception as e:
+            logger.error(f"基于简历生成问题失败: {e}")
+            return {"interest_points": [], "questions": []}
+    
+    async def agenerate_resume_based_questions(
+        self,
+        resume_content: str,
+        count: int = 3
+    ) -> Dict[str, Any]:
+        """generate_resume_based_questions 的异步版本"""
+        logger.info("正在基于简历生成针对性问题...")
+        
+        try:
+            if self.llm_client:
+                result = await self._achat(self._resume_question_messages(resume_content), temperature=0.7)
+            else:
+                result = self._get_mock_resume_questions(resume_content)
             
-            return {
-                "interest_points": interest_points,
-                "questions": questions
-            }
+            return self._parse_resume_questions(result, count)
             
         except Exception as e:
             logger.error(f"基于简历生成问题失败: {e}")
             return {"interest_points": [], "questions": []}
     
+    def _resume_question_messages(self, resume_content: str) -> List[Dict[str, str]]:
+        """构建基于简历生成问题的对话消息"""
+        user_message = InterviewPrompts.RESUME_BASED_QUESTION_PROMPT.format(
+            resume_content=resume_content,
+            job_title=self.job_config.get("title", ""),
+            job_description=self.job_config.get("description", ""),
+            job_requirements=json.dumps(
+                self.job_config.get("requirements", {}), 
+                ensure_ascii=False, 
+                indent=2
+            )
+        )
+        return self._build_messages(user_message)
+    
+    def _parse_resume_questions(self, result: Dict, count: int) -> Dict[str, Any]:
+        """处理基于简历生成问题的结果"""
+        interest_points = result.get("interest_points", [])
+        questions = result.get("questions", [])[:count]
+        
+        logger.info(f"识别到 {len(interest_points)} 个兴趣点，生成 {len(questions)} 个问题")
+        
+        return {
+            "interest_points": interest_points,
+            "questions": questions
+        }
+    
     def generate_skill_based_questions(
         self,
         category: str,
@@ -124,26 +160,9 @@ class InterviewAssistant:
         """
         logger.info(f"正在生成{category}类问题...")
         
-        system_prompt = self._build_system_prompt()
-        
-        required_skills = self.job_config.get("requirements", {}).get("required_skills", [])
-        
-        user_message = InterviewPrompts.SKILL_BASED_QUESTION_PROMPT.format(
-            job_title=self.job_config.get("title", ""),
-            candidate_level=candidate_level,
-            question_category=category,
-            required_skills=", ".join(required_skills)
-        )
-        
         try:
             if self.llm_client:
-                result = self.llm_client.chat_with_json_response(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
-                    temperature=0.7
-                )
+                result = self._chat(self._skill_question_messages(category, candidate_level), temperature=0.7)
                 questions = result.get("questions", [])[:count]
             else:
                 questions = self._get_mock_skill_questions(category, count)
@@ -154,6 +173,83 @@ class InterviewAssistant:
             logger.error(f"生成技能问题失败: {e}")
             return []
     
+    async def agenerate_skill_based_questions(
+        self,
+        category: str,
+        candidate_level: str = "senior",
+        count: int = 2
+    ) -> List[Dict]:
+        """generate_skill_based_questions 的异步版本"""
+        logger.info(f"正在生成{category}类问题...")
+        
+        try:
+            if self.llm_client:
+                result = await self._achat(self._skill_question_messages(category, candidate_level), temperature=0.7)
+                return result.get("questions", [])[:count]
+            return self._get_mock_skill_questions(category, count)
+            
+        except Exception as e:
+            logger.error(f"生成技能问题失败: {e}")
+            return []
+    
+    async def agenerate_question_pool(
+        self,
+        categories: List[str],
+        resume_content: str = "",
+        candidate_level: str = "senior",
+        count_per_category: int = 2
+    ) -> Dict[str, Any]:
+        """
+        并发生成候选问题池：简历问题与各技能类别的问题同时请求LLM，
+        总耗时取决于最慢的一次调用而不是所有调用之和
+        
+        Args:
+            categories: 问题类别（"简历相关" 由 resume_content 决定是否生成）
+            resume_content: 简历内容，为空时不生成简历相关问题
+            candidate_level: 候选人级别
+            count_per_category: 每个类别的问题数量
+            
+        Returns:
+            包含 questions（简历问题在前，其余按类别顺序）和 interest_points 的字典
+        """
+        skill_categories = [category for category in categories if category != '简历相关']
+        if self.question_bank is not None:
+            tasks = [
+                self.question_bank.afill_questions(self, category, candidate_level, count_per_category)
+                for category in skill_categories
+            ]
+        else:
+            tasks = [
+                self.agenerate_skill_based_questions(category, candidate_level, count_per_category)
+                for category in skill_categories
+            ]
+        if resume_content:
+            tasks.insert(0, self.agenerate_resume_based_questions(resume_content, count_per_category))
+        
+        results = await asyncio.gather(*tasks)
+        
+        questions, interest_points = [], []
+        if resume_content:
+            resume_result = results.pop(0)
+            questions.extend(resume_result.get("questions", []))
+            interest_points = resume_result.get("interest_points", [])
+        for skill_questions in results:
+            questions.extend(skill_questions)
+        
+        return {"questions": questions, "interest_points": interest_points}
+    
+    def _skill_question_messages(self, category: str, candidate_level: str) -> List[Dict[str, str]]:
+        """构建基于技能生成问题的对话消息"""
+        required_skills = self.job_config.get("requirements", {}).get("required_skills", [])
+        
+        user_message = InterviewPrompts.SKILL_BASED_QUESTION_PROMPT.format(
+            job_title=self.job_config.get("title", ""),
+            candidate_level=candidate_level,
+            question_category=category,
+            required_skills=", ".join(required_skills)
+        )
+        return self._build_messages(user_message)
+    
     def evaluate_answer(
         self,
         question: str,
@@ -181,49 +277,164 @@ class InterviewAssistant:
         # 先进行浅层回答检测
         shallow_detection = self.detect_shallow_answer(answer, target_skills)
         
-        system_prompt = self._build_system_prompt()
-        
-        user_message = InterviewPrompts.ANSWER_EVALUATION_PROMPT.format(
-            question=question,
-            answer=answer,
-            target_skills=", ".join(target_skills) if target_skills else "综合能力",
-            difficulty=difficulty
-        )
-        
         try:
             if self.llm_client:
-                evaluation = self.llm_client.chat_with_json_response(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
+                evaluation = self._chat(
+                    self._evaluation_messages(question, answer, target_skills, difficulty),
                     temperature=0.3
                 )
             else:
                 evaluation = self._get_mock_evaluation(answer, shallow_detection)
             
-            # 合并浅层检测结果
-            if "shallow_answer_signals" not in evaluation:
-                evaluation["shallow_answer_signals"] = shallow_detection.get("signals", [])
-            
-            # 确保有标准化分数
-            if "normalized_score" not in evaluation:
-                dimension_scores = evaluation.get("dimension_scores", {})
-                evaluation["normalized_score"] = self._calculate_normalized_score(dimension_scores)
-            
-            # 生成分数解释
-            evaluation["score_interpretation"] = self._get_score_interpretation(
-                evaluation["normalized_score"]
-            )
+            return self._finalize_evaluation(evaluation, shallow_detection)
             
-            logger.info(f"评估完成: {evaluation['normalized_score']:.1f}/100")
+        except Exception as e:
+            logger.error(f"评估失败: {e}")
+            return self._get_default_evaluation()
+    
+    async def aevaluate_answer(
+        self,
+        question: str,
+        answer: str,
+        target_skills: List[str] = None,
+        difficulty: int = 5,
+        shallow_detection: Dict = None
+    ) -> Dict[str, Any]:
+        """
+        evaluate_answer 的异步版本
+        
+        Args:
+            shallow_detection: 已有的浅层检测结果（为空时重新检测）
+        """
+        logger.info("正在评估候选人回答...")
+        
+        if target_skills is None:
+            target_skills = []
+        
+        if shallow_detection is None:
+            shallow_detection = self.detect_shallow_answer(answer, target_skills)
+        
+        try:
+            if self.llm_client:
+                evaluation = await self._achat(
+                    self._evaluation_messages(question, answer, target_skills, difficulty),
+                    temperature=0.3
+                )
+            else:
+                evaluation = self._get_mock_evaluation(answer, shallow_detection)
             
-            return evaluation
+            return self._finalize_evaluation(evaluation, shallow_detection)
             
         except Exception as e:
             logger.error(f"评估失败: {e}")
             return self._get_default_evaluation()
     
+    async def aevaluate_answer_with_followup(
+        self,
+        question: str,
+        answer: str,
+        target_skills: List[str] = None,
+        difficulty: int = 5,
+        speculative: bool = True
+    ) -> Dict[str, Any]:
+        """
+        评估回答，并在需要追问时生成追问建议
+        
+        推测执行模式下先做本地浅层检测：回答可疑时，追问建议与LLM评估同时发起，
+        省去一次串行等待；若评估结果认为无需追问，则丢弃推测生成的追问建议。
+        非推测模式与依次调用 evaluate_answer / generate_followup_suggestions 等价。
+        
+        Args:
+            question: 问题内容
+            answer: 候选人回答
+            target_skills: 目标技能（第一个技能作为追问方向）
+            difficulty: 问题难度
+            speculative: 是否启用推测执行
+            
+        Returns:
+            {"evaluation": 评估结果, "followup": 追问建议（无需追问时为None）, "speculation": 推测执行统计}
+        """
+        target_skills = target_skills or []
+        target_skill = target_skills[0] if target_skills else None
+        shallow_detection = self.detect_shallow_answer(answer, target_skills)
+        
+        speculation = {
+            "enabled": speculative,
+            "started": False,
+            "accepted": False,
+            "latency_saved_ms": 0.0,
+            "wasted_ms": 0.0
+        }
+        started = time.perf_counter()
+        
+        followup_task = None
+        if speculative and shallow_detection.get("is_suspicious"):
+            followup_task = asyncio.ensure_future(self._timed(self.agenerate_followup_suggestions(
+                question, answer, self._provisional_evaluation(shallow_detection), target_skill
+            )))
+            speculation["started"] = True
+        
+        evaluation, evaluation_ms = await self._timed(self.aevaluate_answer(
+            question, answer, target_skills, difficulty, shallow_detection=shallow_detection
+        ))
+        
+        followup = None
+        if followup_task is not None and evaluation.get("should_followup"):
+            followup, followup_ms = await followup_task
+            # 串行执行需要 评估 + 追问 的时间，推测执行只需等待两者中较慢的一个
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            speculation["accepted"] = True
+            speculation["latency_saved_ms"] = round(max(evaluation_ms + followup_ms - elapsed_ms, 0.0), 1)
+        elif followup_task is not None:
+            # 评估认为无需追问，丢弃推测结果
+            if followup_task.done() and not followup_task.cancelled() and followup_task.exception() is None:
+                speculation["wasted_ms"] = round(followup_task.result()[1], 1)
+            else:
+                followup_task.cancel()
+                speculation["wasted_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            logger.info("评估结果无需追问，丢弃推测生成的追问建议")
+        elif evaluation.get("should_followup"):
+            followup = await self.agenerate_followup_suggestions(question, answer, evaluation, target_skill)
+        
+        return {"evaluation": evaluation, "followup": followup, "speculation": speculation}
+    
+    def _evaluation_messages(
+        self,
+        question: str,
+        answer: str,
+        target_skills: List[str],
+        difficulty: int
+    ) -> List[Dict[str, str]]:
+        """构建回答评估的对话消息"""
+        user_message = InterviewPrompts.ANSWER_EVALUATION_PROMPT.format(
+            question=question,
+            answer=answer,
+            target_skills=", ".join(target_skills) if target_skills else "综合能力",
+            difficulty=difficulty
+        )
+        return self._build_messages(user_message)
+    
+    def _finalize_evaluation(self, evaluation: Dict, shallow_detection: Dict) -> Dict[str, Any]:
+        """合并浅层检测结果并补全标准化分数"""
+        # 合并浅层检测结果
+        if "shallow_answer_signals" not in evaluation:
+            evaluation["shallow_answer_signals"] = shallow_detection.get("signals", [])
+        evaluation["lexicon_hits"] = shallow_detection.get("lexicon_hits", [])
+        
+        # 确保有标准化分数
+        if "normalized_score" not in evaluation:
+            dimension_scores = evaluation.get("dimension_scores", {})
+            evaluation["normalized_score"] = self._calculate_normalized_score(dimension_scores)
+        
+        # 生成分数解释
+        evaluation["score_interpretation"] = self._get_score_interpretation(
+            evaluation["normalized_score"]
+        )
+        
+        logger.info(f"评估完成: {evaluation['normalized_score']:.1f}/100")
+        
+        return evaluation
+    
     def detect_shallow_answer(
         self, 
         answer: str, 
@@ -242,34 +453,31 @@ class InterviewAssistant:
         signals = []
         suspicion_score = 0
         
-        # 从prompts获取词汇表
-        high_level_terms = InterviewPrompts.HIGH_LEVEL_TERMS
-        vague_words = InterviewPrompts.VAGUE_WORDS
-        weakness_indicators = InterviewPrompts.WEAKNESS_INDICATORS
-        empty_phrases = InterviewPrompts.EMPTY_PHRASES
-        concrete_evidence = InterviewPrompts.CONCRETE_EVIDENCE
-        technical_metrics = InterviewPrompts.TECHNICAL_METRICS
+        weights = self.shallow_weights
+        
+        # 一次扫描得到六类词表的全部命中
+        scan = self.lexicon_matcher.scan(answer)
         
         answer_lower = answer.lower()
         answer_length = len(answer)
         
         # 信号1：使用高级术语
-        has_high_level_term = any(term in answer_lower for term in high_level_terms)
-        high_level_count = sum(1 for term in high_level_terms if term in answer_lower)
+        high_level_count = scan.count("high_level")
+        has_high_level_term = high_level_count > 0
         
         # 信号2：模糊词汇数量
-        vague_count = sum(1 for word in vague_words if word in answer)
+        vague_count = scan.count("vague")
         
         # 信号3：露怯关键词
-        has_weakness = any(phrase in answer for phrase in weakness_indicators)
+        has_weakness = scan.has("weakness")
         
         # 信号4：具体性检测
         has_numbers = any(char.isdigit() for char in answer)
-        has_example = any(word in answer for word in concrete_evidence)
-        has_metrics = any(word in answer_lower for word in technical_metrics)
+        has_example = scan.has("concrete")
+        has_metrics = scan.has("metrics")
         
         # 信号5：空话套话
-        empty_count = sum(1 for phrase in empty_phrases if phrase in answer)
+        empty_count = scan.count("empty")
         
         # === 综合判断 ===
         
@@ -277,51 +485,51 @@ class InterviewAssistant:
         if has_high_level_term and answer_length < 200:
             if not has_numbers and not has_example:
                 signals.append("使用高级术语但缺乏具体细节")
-                suspicion_score += 3
+                suspicion_score += weights["high_level_without_detail"]
         
         # 2. 多个高级术语但回答很短
         if high_level_count >= 3 and answer_length < 150:
             signals.append(f"提到{high_level_count}个技术概念但回答过短")
-            suspicion_score += 2
+            suspicion_score += weights["many_terms_short_answer"]
         
         # 3. 模糊词汇过多
         if vague_count >= 3:
             signals.append(f"使用{vague_count}个不确定词汇")
-            suspicion_score += 2
+            suspicion_score += weights["many_vague_words"]
         elif vague_count >= 2 and answer_length < 150:
             signals.append(f"回答短且使用{vague_count}个模糊词")
-            suspicion_score += 1
+            suspicion_score += weights["short_vague_answer"]
         
         # 4. 回答过短
         if answer_length < 60:
             signals.append(f"回答过短（仅{answer_length}字）")
-            suspicion_score += 3
+            suspicion_score += weights["very_short_answer"]
         elif answer_length < 100:
             signals.append(f"回答较短（{answer_length}字）")
-            suspicion_score += 1
+            suspicion_score += weights["short_answer"]
         
         # 5. 提到技术但无具体数据
         if has_high_level_term and not has_numbers and not has_metrics:
             signals.append("提到技术概念但缺少量化指标")
-            suspicion_score += 2
+            suspicion_score += weights["missing_metrics"]
         
         # 6. 缺乏具体示例
         if has_high_level_term and not has_example and answer_length < 150:
             signals.append("缺乏具体示例或案例说明")
-            suspicion_score += 2
+            suspicion_score += weights["missing_examples"]
         
         # 7. 明确承认不熟悉
         if has_weakness:
             signals.append("承认对该领域不够熟悉")
-            suspicion_score += 2
+            suspicion_score += weights["weakness_admitted"]
         
         # 8. 空话套话多
         if empty_count >= 3:
             signals.append("包含较多空话套话")
-            suspicion_score += 1
+            suspicion_score += weights["empty_phrases"]
         
         # 判断是否可疑
-        is_suspicious = suspicion_score >= 3
+        is_suspicious = suspicion_score >= weights["suspicion_threshold"]
         
         # 确定建议追问的技能
         followup_skill = None
@@ -340,7 +548,8 @@ class InterviewAssistant:
             "followup_skill": followup_skill,
             "answer_length": answer_length,
             "has_concrete_evidence": has_example or has_numbers,
-            "has_weakness_indicator": has_weakness
+            "has_weakness_indicator": has_weakness,
+            "lexicon_hits": scan.hits
         }
         
         if is_suspicious:
@@ -369,10 +578,58 @@ class InterviewAssistant:
         """
         logger.info("正在生成追问建议...")
         
-        system_prompt = self._build_system_prompt()
+        try:
+            if self.llm_client:
+                result = self._chat(
+                    self._followup_messages(original_question, answer, evaluation, target_skill),
+                    temperature=0.7
+                )
+            else:
+                result = self._get_mock_followup_suggestions(
+                    target_skill, evaluation.get("shallow_answer_signals", [])
+                )
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"生成追问建议失败: {e}")
+            return {"followup_suggestions": [], "hr_hint": "生成追问建议时出错"}
+    
+    async def agenerate_followup_suggestions(
+        self,
+        original_question: str,
+        answer: str,
+        evaluation: Dict,
+        target_skill: str = None
+    ) -> Dict[str, Any]:
+        """generate_followup_suggestions 的异步版本"""
+        logger.info("正在生成追问建议...")
         
+        try:
+            if self.llm_client:
+                return await self._achat(
+                    self._followup_messages(original_question, answer, evaluation, target_skill),
+                    temperature=0.7
+                )
+            return self._get_mock_followup_suggestions(
+                target_skill, evaluation.get("shallow_answer_signals", [])
+            )
+            
+        except Exception as e:
+            logger.error(f"生成追问建议失败: {e}")
+            return {"followup_suggestions": [], "hr_hint": "生成追问建议时出错"}
+    
+    def _followup_messages(
+        self,
+        original_question: str,
+        answer: str,
+        evaluation: Dict,
+        target_skill: str = None
+    ) -> List[Dict[str, str]]:
+        """构建追问建议的对话消息"""
         # 准备评估反馈
-        eval_feedback = f"评分: {evaluation.get('normalized_score', 0):.1f}/100\n"
+        score = evaluation.get('normalized_score')
+        eval_feedback = f"评分: {score:.1f}/100\n" if score is not None else "评分: 待评估\n"
         eval_feedback += f"信心水平: {evaluation.get('confidence_level', 'unknown')}\n"
         eval_feedback += f"反馈: {evaluation.get('feedback', '')}"
         
@@ -385,31 +642,15 @@ class InterviewAssistant:
             target_skill=target_skill or "技术细节",
             shallow_signals=", ".join(shallow_signals) if shallow_signals else "无明显信号"
         )
-        
-        try:
-            if self.llm_client:
-                result = self.llm_client.chat_with_json_response(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
-                    temperature=0.7
-                )
-            else:
-                result = self._get_mock_followup_suggestions(target_skill, shallow_signals)
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"生成追问建议失败: {e}")
-            return {"followup_suggestions": [], "hr_hint": "生成追问建议时出错"}
+        return self._build_messages(user_message)
     
     def generate_final_report(
         self,
         candidate_name: str,
         interviewer_name: str,
         qa_records: List[Dict],
-        hr_notes: str = ""
+        hr_notes: str = "",
+        stats: Dict = None
     ) -> Dict[str, Any]:
         """
         生成最终评估报告
@@ -419,22 +660,80 @@ class InterviewAssistant:
             interviewer_name: 面试官姓名
             qa_records: 问答记录列表
             hr_notes: HR备注
+            stats: 会话统计累计值（见 session_stats；为空时从 qa_records 计算）
             
         Returns:
             评估报告
         """
         logger.info("正在生成最终评估报告...")
         
+        messages, avg_score = self._final_report_messages(
+            candidate_name, interviewer_name, qa_records, hr_notes, stats
+        )
+        
+        try:
+            if self.llm_client:
+                report = self._chat(messages, temperature=0.3)
+            else:
+                report = self._get_mock_report(candidate_name, avg_score)
+            
+            logger.info("最终报告生成成功")
+            return report
+            
+        except Exception as e:
+            logger.error(f"报告生成失败: {e}")
+            return self._get_fallback_report(avg_score)
+    
+    async def agenerate_final_report(
+        self,
+        candidate_name: str,
+        interviewer_name: str,
+        qa_records: List[Dict],
+        hr_notes: str = "",
+        stats: Dict = None
+    ) -> Dict[str, Any]:
+        """generate_final_report 的异步版本"""
+        logger.info("正在生成最终评估报告...")
+        
+        messages, avg_score = self._final_report_messages(
+            candidate_name, interviewer_name, qa_records, hr_notes, stats
+        )
+        
+        try:
+            if self.llm_client:
+                report = await self._achat(messages, temperature=0.3)
+            else:
+                report = self._get_mock_report(candidate_name, avg_score)
+            
+            logger.info("最终报告生成成功")
+            return report
+            
+        except Exception as e:
+            logger.error(f"报告生成失败: {e}")
+            return self._get_fallback_report(avg_score)
+    
+    def _final_report_messages(
+        self,
+        candidate_name: str,
+        interviewer_name: str,
+        qa_records: List[Dict],
+        hr_notes: str = "",
+        stats: Dict = None
+    ) -> tuple:
+        """构建最终报告的对话消息，返回 (消息列表, 平均分)"""
         # 格式化对话记录
         conversation_log = self._format_conversation_log(qa_records)
         
-        # 计算统计数据
+        # 统计数据
         total_rounds = len(qa_records)
-        scores = [r.get("evaluation", {}).get("normalized_score", 50) for r in qa_records if r.get("evaluation")]
-        avg_score = sum(scores) / len(scores) if scores else 50
-        followup_count = sum(1 for r in qa_records if r.get("was_followed_up", False))
-        
-        system_prompt = self._build_system_prompt()
+        if stats:
+            score_count = len(stats.get("score_trend", []))
+            avg_score = stats["score_sum"] / score_count if score_count else 50
+            followup_count = stats.get("followup_count", 0)
+        else:
+            scores = [r.get("evaluation", {}).get("normalized_score", 50) for r in qa_records if r.get("evaluation")]
+            avg_score = sum(scores) / len(scores) if scores else 50
+            followup_count = sum(1 for r in qa_records if r.get("was_followed_up", False))
         
         user_message = InterviewPrompts.FINAL_REPORT_PROMPT.format(
             candidate_name=candidate_name,
@@ -450,34 +749,57 @@ class InterviewAssistant:
             followup_count=followup_count,
             hr_notes=hr_notes or "无"
         )
-        
-        try:
-            if self.llm_client:
-                report = self.llm_client.chat_with_json_response(
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
-                    temperature=0.3
-                )
-            else:
-                report = self._get_mock_report(candidate_name, avg_score)
-            
-            logger.info("最终报告生成成功")
-            return report
-            
-        except Exception as e:
-            logger.error(f"报告生成失败: {e}")
-            return {
-                "overall_assessment": {
-                    "recommendation_score": int(avg_score),
-                    "recommendation": "待定",
-                    "summary": "报告生成失败，请查看原始问答记录"
-                }
-            }
+        return self._build_messages(user_message), avg_score
     
     # ============ 辅助方法 ============
     
+    @staticmethod
+    async def _timed(awaitable):
+        """等待协程并返回 (结果, 耗时毫秒)"""
+        started = time.perf_counter()
+        result = await awaitable
+        return result, (time.perf_counter() - started) * 1000
+    
+    def _provisional_evaluation(self, shallow_detection: Dict) -> Dict[str, Any]:
+        """由本地浅层检测结果构造的临时评估，用于在LLM评估返回前生成追问建议"""
+        signals = shallow_detection.get("signals", [])
+        return {
+            "confidence_level": "uncertain",
+            "feedback": f"本地检测到可疑信号: {', '.join(signals)}" if signals else "",
+            "shallow_answer_signals": signals
+        }
+    
+    def _build_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """组装系统提示词与用户消息"""
+        return [
+            {"role": "system", "content": self._build_system_prompt()},
+            {"role": "user", "content": user_message}
+        ]
+    
+    def _chat(self, messages: List[Dict[str, str]], temperature: float) -> Dict[str, Any]:
+        """同步调用LLM（异步客户端在当前线程中等待结果）"""
+        chat = self.llm_client.chat_with_json_response
+        if inspect.iscoroutinefunction(chat):
+            return async_to_sync(chat)(messages=messages, temperature=temperature)
+        return chat(messages=messages, temperature=temperature)
+    
+    async def _achat(self, messages: List[Dict[str, str]], temperature: float) -> Dict[str, Any]:
+        """异步调用LLM（同步客户端放到线程池中执行，不阻塞事件循环）"""
+        chat = self.llm_client.chat_with_json_response
+        if inspect.iscoroutinefunction(chat):
+            return await chat(messages=messages, temperature=temperature)
+        return await sync_to_async(chat, thread_sensitive=False)(messages=messages, temperature=temperature)
+    
+    def _get_fallback_report(self, avg_score: float) -> Dict[str, Any]:
+        """报告生成失败时的兜底报告"""
+        return {
+            "overall_assessment": {
+                "recommendation_score": int(avg_score),
+                "recommendation": "待定",
+                "summary": "报告生成失败，请查看原始问答记录"
+            }
+        }
+    
     def _build_system_prompt(self) -> str:
         """构建系统提示词"""
         company_info = f"""
@@ -611,10 +933,15 @@ class InterviewAssistant:
     
     def _get_mock_skill_questions(self, category: str, count: int) -> List[Dict]:
         """模拟技能问题生成"""
+        templates = [
+            "请介绍一下您在{category}方面的经验",
+            "在{category}方面，您遇到过最有挑战的问题是什么？是如何解决的？",
+            "如果重新做一次{category}相关的工作，您会做哪些改进？",
+        ]
         return [
             {
                 "id": f"sq{i+1}",
-                "question": f"请介绍一下您在{category}方面的经验",
+                "question": templates[i % len(templates)].format(category=category),
                 "category": category,
                 "difficulty": 5,
                 "expected_skills": [category],
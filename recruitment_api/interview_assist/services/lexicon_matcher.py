@@ -0,0 +1,113 @@
+"""
+浅层回答词表匹配
+把 InterviewPrompts 中的六类词表编译为多关键词匹配器（前缀树编译成的正则，见 resume_screening/keyword_matcher.py），
+一次扫描回答即可得到所有命中的词条、所属类别及其在原文中的位置（供前端高亮）。
+
+高级术语和技术指标不区分大小写，其余词表区分大小写（与原逐词扫描一致），两组词表各编译一个匹配器。
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List
+
+from resume_screening.keyword_matcher import KeywordMatcher
+
+from .prompts import InterviewPrompts
+
+# 词表类别 -> InterviewPrompts 中对应的属性名
+LEXICON_CATEGORIES = {
+    "high_level": "HIGH_LEVEL_TERMS",
+    "vague": "VAGUE_WORDS",
+    "weakness": "WEAKNESS_INDICATORS",
+    "empty": "EMPTY_PHRASES",
+    "concrete": "CONCRETE_EVIDENCE",
+    "metrics": "TECHNICAL_METRICS",
+}
+
+# 不区分大小写匹配的类别，其余类别区分大小写
+CASE_INSENSITIVE_CATEGORIES = frozenset({"high_level", "metrics"})
+
+_default_matcher = None
+_default_matcher_lock = threading.Lock()
+
+
+class LexiconScan:
+    """一次扫描的结果"""
+
+    def __init__(self, hits: List[Dict[str, Any]]):
+        self.hits = hits
+        self._terms: Dict[str, set] = {}
+        for hit in hits:
+            self._terms.setdefault(hit["category"], set()).add(hit["term"])
+
+    def count(self, category: str) -> int:
+        """该类别命中的不同词条数"""
+        return len(self._terms.get(category, ()))
+
+    def has(self, category: str) -> bool:
+        """该类别是否有命中"""
+        return category in self._terms
+
+    def terms(self, category: str) -> List[str]:
+        """该类别命中的词条"""
+        return sorted(self._terms.get(category, ()))
+
+
+class LexiconMatcher:
+    """
+    浅层回答词表匹配器
+
+    与逐词 `term in answer` 的子串语义一致（不做单词边界判断），
+    CASE_INSENSITIVE_CATEGORIES 中的类别不区分大小写，其余类别区分大小写。
+
+    Args:
+        lexicons: 类别 -> 词条列表
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self.lexicons = {category: list(terms or []) for category, terms in lexicons.items()}
+        self._matchers = []
+        for case_sensitive in (False, True):
+            keywords = [
+                (term, category)
+                for category, terms in self.lexicons.items()
+                if (category not in CASE_INSENSITIVE_CATEGORIES) == case_sensitive
+                for term in terms
+            ]
+            if keywords:
+                self._matchers.append(
+                    KeywordMatcher(keywords, case_sensitive=case_sensitive, word_boundary=False).build()
+                )
+
+    @classmethod
+    def from_prompts(cls, prompts=InterviewPrompts) -> "LexiconMatcher":
+        """使用 InterviewPrompts 中的默认词表构建"""
+        return cls({
+            category: getattr(prompts, attr, [])
+            for category, attr in LEXICON_CATEGORIES.items()
+        })
+
+    def scan(self, text: str) -> LexiconScan:
+        """
+        扫描文本
+
+        Returns:
+            LexiconScan: hits 为按 (start, end) 排序的 {category, term, start, end} 列表
+        """
+        hits = [
+            {"category": category, "term": term, "start": start, "end": end}
+            for matcher in self._matchers
+            for start, end, term, category in matcher.iter_matches(text or "")
+        ]
+        if len(self._matchers) > 1:
+            hits.sort(key=lambda hit: (hit["start"], hit["end"]))
+        return LexiconScan(hits)
+
+
+def get_default_lexicon_matcher() -> LexiconMatcher:
+    """获取（懒构建）基于 InterviewPrompts 默认词表的共享匹配器"""
+    global _default_matcher
+    if _default_matcher is None:
+        with _default_matcher_lock:
+            if _default_matcher is None:
+                _default_matcher = LexiconMatcher.from_prompts()
+    return _default_matcher
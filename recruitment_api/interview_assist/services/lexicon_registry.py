@@ -0,0 +1,200 @@
+"""
+浅层回答检测配置注册表
+按岗位解析词表与评分权重（默认 -> 岗位族 -> 具体岗位 逐级覆盖），编译为匹配器后缓存在进程内。
+
+- 读取路径无锁：注册表状态是不可变快照，修改时构建新快照后整体替换（原子切换）
+- 本进程内的修改通过 post_save/post_delete 信号立即重新加载
+- 其他进程按 SHALLOW_LEXICON_REFRESH_SECONDS 间隔比对数据库版本戳，发现变化时重新加载
+- 相同配置来源（同一组词表记录及版本）的岗位共享同一个编译结果，不会按请求重复编译
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+
+from .lexicon_matcher import LEXICON_CATEGORIES, LexiconMatcher
+from .prompts import InterviewPrompts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class DetectionProfile:
+    """编译后的浅层回答检测配置"""
+    matcher: LexiconMatcher
+    weights: Dict[str, Any]
+    # 生效的配置来源：((scope_type, scope_key, version), ...)，为空表示使用 InterviewPrompts 默认值
+    sources: Tuple[Tuple[str, str, int], ...] = ()
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "sources": [
+                {"scope_type": scope_type, "scope_key": scope_key, "version": version}
+                for scope_type, scope_key, version in self.sources
+            ],
+            "weights": self.weights,
+        }
+
+
+@dataclass(frozen=True)
+class _RegistryState:
+    """注册表快照（不可变，整体替换）"""
+    rows: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    stamp: Optional[Tuple] = None
+    profiles: Dict[Tuple[str, str], DetectionProfile] = field(default_factory=dict)
+    compiled: Dict[Tuple, DetectionProfile] = field(default_factory=dict)
+
+
+def resolve_scope(job_config: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    从会话岗位配置中解析 (岗位族, 岗位名称)
+
+    岗位名称取 job_config 的 position 或 title 字段，岗位族取 job_family 字段。
+    """
+    job_config = job_config or {}
+    position = str(job_config.get("position") or job_config.get("title") or "").strip()
+    job_family = str(job_config.get("job_family") or "").strip()
+    return job_family, position
+
+
+def _load_rows() -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], Tuple]:
+    """从数据库读取启用的词表配置及版本戳"""
+    from ..models import ShallowAnswerLexicon
+
+    rows = {}
+    for lexicon in ShallowAnswerLexicon.objects.filter(is_active=True):
+        rows[(lexicon.scope_type, lexicon.scope_key)] = {
+            "version": lexicon.version,
+            "lexicons": lexicon.lexicons or {},
+            "weights": lexicon.weights or {},
+        }
+    return rows, _current_stamp()
+
+
+def _current_stamp() -> Tuple:
+    """数据库版本戳：记录数、最后修改时间、版本号之和，任一变化说明配置被修改"""
+    from django.db.models import Count, Max, Sum
+    from ..models import ShallowAnswerLexicon
+
+    aggregate = ShallowAnswerLexicon.objects.aggregate(
+        count=Count("id"), updated_at=Max("updated_at"), versions=Sum("version")
+    )
+    return aggregate["count"], aggregate["updated_at"], aggregate["versions"]
+
+
+def _compile_profile(rows, compiled, job_family: str, position: str) -> DetectionProfile:
+    """按 默认 -> 岗位族 -> 岗位 合并配置并编译（相同来源复用已有编译结果）"""
+    chain = [("default", "")]
+    if job_family:
+        chain.append(("job_family", job_family))
+    if position:
+        chain.append(("position", position))
+
+    sources = tuple(
+        (scope_type, scope_key, rows[(scope_type, scope_key)]["version"])
+        for scope_type, scope_key in chain
+        if (scope_type, scope_key) in rows
+    )
+    if sources in compiled:
+        return compiled[sources]
+
+    lexicons = {
+        category: list(getattr(InterviewPrompts, attr))
+        for category, attr in LEXICON_CATEGORIES.items()
+    }
+    weights = dict(InterviewPrompts.SHALLOW_ANSWER_WEIGHTS)
+    for scope_type, scope_key, _ in sources:
+        row = rows[(scope_type, scope_key)]
+        # 已配置的类别整体覆盖上一级，未配置的类别沿用上一级
+        lexicons.update({k: v for k, v in row["lexicons"].items() if k in LEXICON_CATEGORIES})
+        weights.update({k: v for k, v in row["weights"].items() if k in InterviewPrompts.SHALLOW_ANSWER_WEIGHTS})
+
+    return DetectionProfile(matcher=LexiconMatcher(lexicons), weights=weights, sources=sources)
+
+
+class LexiconRegistry:
+    """浅层回答检测配置注册表（进程内单例见 lexicon_registry）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Optional[_RegistryState] = None
+        self._checked_at = 0.0
+
+    def _refresh_interval(self) -> float:
+        return float(getattr(settings, "SHALLOW_LEXICON_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+
+    def get_profile(self, job_config: Optional[Dict[str, Any]] = None) -> DetectionProfile:
+        """
+        获取岗位对应的检测配置
+
+        Args:
+            job_config: 会话的岗位配置（position/title、job_family）
+
+        Returns:
+            DetectionProfile: 编译好的匹配器与评分权重
+        """
+        state = self._get_state()
+        key = resolve_scope(job_config)
+        profile = state.profiles.get(key)
+        if profile is not None:
+            return profile
+
+        with self._lock:
+            state = self._state or state
+            profile = state.profiles.get(key)
+            if profile is None:
+                profile = _compile_profile(state.rows, state.compiled, *key)
+                self._state = _RegistryState(
+                    rows=state.rows,
+                    stamp=state.stamp,
+                    profiles={**state.profiles, key: profile},
+                    compiled={**state.compiled, profile.sources: profile},
+                )
+        return profile
+
+    def _get_state(self) -> _RegistryState:
+        state = self._state
+        if state is None:
+            return self.reload()
+        if time.monotonic() - self._checked_at >= self._refresh_interval():
+            self._checked_at = time.monotonic()
+            try:
+                if _current_stamp() != state.stamp:
+                    return self.reload()
+            except Exception as e:
+                logger.error(f"检查词表版本失败，继续使用当前配置: {e}")
+        return state
+
+    def reload(self) -> _RegistryState:
+        """
+        从数据库重新加载配置，预先编译已缓存的岗位后整体替换快照
+
+        正在使用旧配置的请求不受影响，新请求立即使用新配置。
+        """
+        with self._lock:
+            rows, stamp = _load_rows()
+            previous = self._state
+            profiles, compiled = {}, {}
+            for job_family, position in (previous.profiles if previous else {}):
+                profile = _compile_profile(rows, compiled, job_family, position)
+                compiled[profile.sources] = profile
+                profiles[(job_family, position)] = profile
+
+            self._state = _RegistryState(rows=rows, stamp=stamp, profiles=profiles, compiled=compiled)
+            self._checked_at = time.monotonic()
+            logger.info(f"浅层回答检测词表已加载: {len(rows)} 份配置, 预编译 {len(compiled)} 个匹配器")
+            return self._state
+
+    def clear(self):
+        """清空缓存（下次访问时重新加载）"""
+        with self._lock:
+            self._state = None
+
+
+lexicon_registry = LexiconRegistry()
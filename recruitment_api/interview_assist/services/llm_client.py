@@ -0,0 +1,132 @@
+"""
+面试辅助LLM客户端
+基于 OpenAI 兼容接口的异步客户端：等待LLM响应期间不占用工作线程，
+ASGI 部署下少量工作进程即可同时服务大量面试会话。
+"""
+
+import asyncio
+import json
+import logging
+import re
+import weakref
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:  # pragma: no cover - 未安装 openai 时只能使用模拟数据
+    AsyncOpenAI = None
+
+logger = logging.getLogger(__name__)
+
+_JSON_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# 事件循环 -> {配置: 客户端}；客户端的连接池绑定在创建它的事件循环上
+_client_cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncLLMClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def parse_json_response(content: str) -> Dict[str, Any]:
+    """
+    从模型输出中解析 JSON（兼容 ```json 代码块和前后附带说明文字的情况）
+
+    Raises:
+        ValueError: 输出中没有可解析的 JSON 对象
+    """
+    content = (content or "").strip()
+    block = _JSON_BLOCK_PATTERN.search(content)
+    if block:
+        content = block.group(1).strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        start, end = content.find("{"), content.rfind("}")
+        if start != -1 and end > start:
+            return json.loads(content[start:end + 1])
+        raise ValueError(f"LLM返回内容不是有效的JSON: {content[:200]}")
+
+
+class AsyncLLMClient:
+    """
+    异步LLM客户端
+
+    Args:
+        model: 模型名称
+        api_key: API Key
+        base_url: OpenAI 兼容接口地址
+        timeout: 单次请求超时（秒）
+        max_retries: 失败重试次数
+    """
+
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        timeout: float = 120,
+        max_retries: int = 2
+    ):
+        if AsyncOpenAI is None:
+            raise ImportError("使用LLM客户端需要安装 openai 包")
+        self.model = model
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=max_retries
+        )
+
+    async def chat_with_json_response(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7
+    ) -> Dict[str, Any]:
+        """
+        发送对话并把回复解析为 JSON
+
+        Args:
+            messages: 对话消息列表
+            temperature: 采样温度
+
+        Returns:
+            解析后的 JSON 对象
+        """
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            response_format={"type": "json_object"}
+        )
+        return parse_json_response(response.choices[0].message.content)
+
+
+def get_llm_client() -> Optional[AsyncLLMClient]:
+    """
+    获取按 settings.INTERVIEW_ASSIST_LLM_CONFIG 配置的客户端
+
+    未配置或未安装 openai 时返回 None，面试助手使用模拟数据。
+    客户端内部维护连接池，同一事件循环内按配置复用同一实例
+    （ASGI 下每个工作进程只有一个事件循环，即进程内共享）。
+    """
+    config = getattr(settings, "INTERVIEW_ASSIST_LLM_CONFIG", None)
+    if not config or AsyncOpenAI is None:
+        return None
+
+    try:
+        clients = _client_cache.setdefault(asyncio.get_running_loop(), {})
+    except RuntimeError:
+        clients = {}
+
+    key = json.dumps(config, sort_keys=True)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = AsyncLLMClient(
+            model=config["model"],
+            api_key=config["api_key"],
+            base_url=config.get("base_url"),
+            timeout=config.get("timeout", 120),
+            max_retries=config.get("max_retries", 2)
+        )
+    return client
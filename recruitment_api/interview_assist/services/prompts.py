@@ -322,3 +322,18 @@ class InterviewPrompts:
         "qps", "tps", "响应时间", "并发", "延迟",
         "吞吐量", "cpu", "内存", "数据量", "请求量"
     ]
+    
+    # 浅层回答检测各信号的可疑度分值（可按岗位在 ShallowAnswerLexicon.weights 中覆盖）
+    SHALLOW_ANSWER_WEIGHTS = {
+        "high_level_without_detail": 3,   # 使用高级术语但缺乏具体细节
+        "many_terms_short_answer": 2,     # 提到多个技术概念但回答过短
+        "many_vague_words": 2,            # 模糊词汇过多
+        "short_vague_answer": 1,          # 回答短且使用多个模糊词
+        "very_short_answer": 3,           # 回答过短
+        "short_answer": 1,                # 回答较短
+        "missing_metrics": 2,             # 提到技术概念但缺少量化指标
+        "missing_examples": 2,            # 缺乏具体示例或案例说明
+        "weakness_admitted": 2,           # 承认对该领域不够熟悉
+        "empty_phrases": 1,               # 包含较多空话套话
+        "suspicion_threshold": 3,         # 可疑度达到该值判定为可疑回答
+    }
@@ -0,0 +1,294 @@
+"""
+跨会话复用的题库
+技能类问题生成后存入题库，后续会话优先从题库选题，只有题库数量不足时才调用LLM补充。
+
+- 去重：按字符 n-gram 的 TF-IDF 余弦相似度判断近似重复，相似问题只保留一条
+- 分库：问题按生成时岗位的核心技能集合（规范化后的 skill_key）分库，只在技能集合相同的岗位间复用，
+  其他岗位的问题不会计入数量，不足时调用LLM补充
+- 选题：综合区分度（回答得分的标准差）、探索加成（使用次数少的问题优先）和技能匹配度排序，
+  随着回答得分的积累，选题会自动偏向更能区分候选人水平的问题
+"""
+
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZES = (2, 3)
+DEFAULT_DUPLICATE_THRESHOLD = 0.7
+
+# 回答次数不足时假定的得分标准差（百分制）
+PRIOR_SCORE_STD = 15.0
+# 探索加成系数：使用次数越少加成越高
+EXPLORATION_WEIGHT = 10.0
+# 每命中一个岗位核心技能的加成
+SKILL_MATCH_BONUS = 5.0
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_question(text: str) -> str:
+    """去除空白和标点并转为小写"""
+    return _NON_WORD_PATTERN.sub("", (text or "").lower())
+
+
+def _ngram_counts(text: str) -> Counter:
+    normalized = normalize_question(text)
+    counts = Counter()
+    for size in NGRAM_SIZES:
+        for i in range(len(normalized) - size + 1):
+            counts[normalized[i:i + size]] += 1
+    if not counts and normalized:
+        counts[normalized] += 1
+    return counts
+
+
+class NgramTfidf:
+    """
+    字符 n-gram TF-IDF 向量化（中文问题无需分词）
+
+    Args:
+        documents: 用于计算 IDF 的文本集合
+    """
+
+    def __init__(self, documents: Iterable[str]):
+        counts = [_ngram_counts(document) for document in documents]
+        document_frequency = Counter()
+        for document_counts in counts:
+            document_frequency.update(document_counts.keys())
+
+        total = len(counts)
+        self._idf = {
+            gram: math.log((1 + total) / (1 + frequency)) + 1
+            for gram, frequency in document_frequency.items()
+        }
+        self._default_idf = math.log(1 + total) + 1
+        self.vectors = [self._weigh(document_counts) for document_counts in counts]
+
+    def _weigh(self, counts: Counter) -> Dict[str, float]:
+        vector = {gram: tf * self._idf.get(gram, self._default_idf) for gram, tf in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {gram: weight / norm for gram, weight in vector.items()} if norm else {}
+
+    def vectorize(self, text: str) -> Dict[str, float]:
+        """把文本转换为归一化的 TF-IDF 向量"""
+        return self._weigh(_ngram_counts(text))
+
+    @staticmethod
+    def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        """两个归一化向量的余弦相似度"""
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(gram, 0.0) for gram, weight in a.items())
+
+
+def _required_skills(job_config: Dict) -> List[str]:
+    requirements = (job_config or {}).get("requirements")
+    if isinstance(requirements, dict):
+        return list(requirements.get("required_skills", []))
+    return []
+
+
+# 岗位没有核心技能时的 skill_key（不会与技能集合的哈希或分库前的空值混淆）
+NO_SKILLS_KEY = "none"
+
+
+def skill_key(skills: Iterable[str]) -> str:
+    """
+    岗位核心技能集合的规范化键（忽略大小写、空白、重复和顺序）
+
+    Args:
+        skills: 核心技能列表
+
+    Returns:
+        技能集合的 SHA256；没有核心技能时为 NO_SKILLS_KEY
+    """
+    normalized = sorted({" ".join(str(skill).split()).lower() for skill in skills if str(skill).strip()})
+    if not normalized:
+        return NO_SKILLS_KEY
+    return hashlib.sha256("\n".join(normalized).encode("utf-8")).hexdigest()
+
+
+class QuestionBank:
+    """
+    题库服务
+
+    Args:
+        duplicate_threshold: 相似度不低于该值的问题视为重复
+    """
+
+    def __init__(self, duplicate_threshold: Optional[float] = None):
+        self._duplicate_threshold = duplicate_threshold
+
+    @property
+    def duplicate_threshold(self) -> float:
+        if self._duplicate_threshold is not None:
+            return self._duplicate_threshold
+        return getattr(settings, "QUESTION_BANK_DUPLICATE_THRESHOLD", DEFAULT_DUPLICATE_THRESHOLD)
+
+    def add_questions(
+        self,
+        questions: Sequence[Dict],
+        category: str,
+        candidate_level: str,
+        job_skills: Sequence[str] = ()
+    ) -> List[Any]:
+        """
+        把生成的问题存入题库（与同一技能集合下已有问题及本批问题互相去重）
+
+        Args:
+            questions: 问题列表（generate_skill_based_questions 的返回格式）
+            category: 问题类别
+            candidate_level: 候选人级别
+            job_skills: 生成问题时岗位的核心技能
+
+        Returns:
+            与输入顺序对应的题库条目（重复问题对应已有条目，已停用的重复问题被丢弃）
+        """
+        from ..models import QuestionBankEntry
+
+        key = skill_key(job_skills)
+        existing = list(QuestionBankEntry.objects.filter(
+            category=category, candidate_level=candidate_level, skill_key=key
+        ))
+        texts = [(question.get("question") or "").strip() for question in questions]
+        index = NgramTfidf([entry.question for entry in existing] + [text for text in texts if text])
+        bank = list(zip(index.vectors, existing))
+
+        entries, seen = [], set()
+        for question, text in zip(questions, texts):
+            if not text:
+                continue
+            vector = index.vectorize(text)
+            duplicate = max(bank, key=lambda item: NgramTfidf.cosine(vector, item[0]), default=None)
+            if duplicate is not None and NgramTfidf.cosine(vector, duplicate[0]) >= self.duplicate_threshold:
+                entry = duplicate[1]
+                if not entry.is_active or entry.pk in seen:
+                    continue
+            else:
+                entry = QuestionBankEntry.objects.create(
+                    question=text,
+                    category=category,
+                    candidate_level=candidate_level,
+                    skill_key=key,
+                    difficulty=question.get("difficulty", 5),
+                    skills=question.get("expected_skills", []),
+                    source=question.get("source", "skill_based"),
+                )
+                bank.append((vector, entry))
+            seen.add(entry.pk)
+            entries.append(entry)
+        return entries
+
+    def priority(self, entry, total_usage: int, skills: Sequence[str] = ()) -> float:
+        """选题优先级：区分度 + 探索加成 + 技能匹配加成"""
+        score_std = entry.score_std
+        discrimination = score_std if score_std is not None else PRIOR_SCORE_STD
+        exploration = EXPLORATION_WEIGHT * math.sqrt(math.log(total_usage + 1) / (entry.usage_count + 1))
+        wanted = {skill.lower() for skill in skills}
+        matched = sum(1 for skill in entry.skills or [] if str(skill).lower() in wanted)
+        return discrimination + exploration + SKILL_MATCH_BONUS * matched
+
+    def select(
+        self,
+        category: str,
+        candidate_level: str,
+        count: int,
+        skills: Sequence[str] = (),
+        exclude_ids: Iterable[int] = ()
+    ) -> List[Any]:
+        """按优先级从题库选题（只选技能集合与岗位相同的问题）"""
+        from ..models import QuestionBankEntry
+
+        entries = list(
+            QuestionBankEntry.objects
+            .filter(category=category, candidate_level=candidate_level, skill_key=skill_key(skills), is_active=True)
+            .exclude(id__in=list(exclude_ids))
+        )
+        total_usage = sum(entry.usage_count for entry in entries)
+        entries.sort(key=lambda entry: (-self.priority(entry, total_usage, skills), entry.pk))
+        return entries[:count]
+
+    def mark_used(self, entries: Sequence[Any]):
+        """累计问题被选入问题池的次数"""
+        from ..models import QuestionBankEntry
+
+        QuestionBankEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            usage_count=F("usage_count") + 1, last_used_at=timezone.now()
+        )
+
+    @staticmethod
+    def record_answer(entry_id: int, score: float) -> int:
+        """累计该题的回答得分（normalized_score），返回更新的条目数"""
+        from ..models import QuestionBankEntry
+
+        score = float(score)
+        return QuestionBankEntry.objects.filter(pk=entry_id).update(
+            answer_count=F("answer_count") + 1,
+            score_sum=F("score_sum") + score,
+            score_sq_sum=F("score_sq_sum") + score * score,
+        )
+
+    async def afill_questions(
+        self,
+        assistant,
+        category: str,
+        candidate_level: str = "senior",
+        count: int = 2
+    ) -> List[Dict]:
+        """
+        获取某类别的问题：优先从题库中技能集合相同的问题选题，数量不足时调用LLM生成并入库
+
+        Args:
+            assistant: 面试助手（提供岗位配置和LLM客户端）
+            category: 问题类别
+            candidate_level: 候选人级别
+            count: 问题数量
+
+        Returns:
+            问题列表（带 bank_question_id）
+        """
+        skills = _required_skills(assistant.job_config)
+        entries = await sync_to_async(self.select)(category, candidate_level, count, skills)
+
+        if len(entries) < count:
+            logger.info(f"题库中{category}类问题不足（{len(entries)}/{count}），调用LLM补充")
+            generated = await assistant.agenerate_skill_based_questions(category, candidate_level, count)
+            added = await sync_to_async(self.add_questions)(generated, category, candidate_level, skills)
+            chosen = {entry.pk for entry in entries}
+            entries.extend([entry for entry in added if entry.pk not in chosen][:count - len(entries)])
+
+        await sync_to_async(self.mark_used)(entries)
+        return [self.to_question(entry) for entry in entries]
+
+    @staticmethod
+    def to_question(entry) -> Dict[str, Any]:
+        """题库条目转换为问题池中的问题格式"""
+        return {
+            "id": f"qb{entry.pk}",
+            "question": entry.question,
+            "category": entry.category,
+            "difficulty": entry.difficulty,
+            "expected_skills": entry.skills,
+            "source": entry.source,
+            "bank_question_id": entry.pk,
+        }
+
+
+_question_bank = QuestionBank()
+
+
+def get_question_bank() -> Optional[QuestionBank]:
+    """获取共享题库（settings.INTERVIEW_ASSIST_QUESTION_BANK_ENABLED 为 False 时返回 None）"""
+    if not getattr(settings, "INTERVIEW_ASSIST_QUESTION_BANK_ENABLED", True):
+        return None
+    return _question_bank
@@ -0,0 +1,316 @@
+"""
+候选问题池预生成与缓存
+会话创建后在后台线程中预先生成问题池，生成结果按
+(简历内容哈希, 岗位配置哈希, 候选人级别, 生成参数) 缓存在 QuestionPoolCache 中，
+面试官点击"生成问题"时直接读取缓存；同一候选人/岗位的重复会话无需再次调用LLM。
+预生成和未命中缓存的请求都先认领缓存记录（status=generating，cache_key 唯一）再调用LLM，
+同一问题池同时只有一个生成者，其他请求等待其结果。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .interview_assistant import InterviewAssistant
+from .llm_client import get_llm_client
+from .question_bank import get_question_bank
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORIES = ['简历相关', '专业能力', '行为面试']
+DEFAULT_CANDIDATE_LEVEL = 'senior'
+DEFAULT_COUNT_PER_CATEGORY = 2
+
+# 生成中的缓存记录超过该时间仍未完成，视为生成失败，由后续请求接管
+DEFAULT_GENERATION_TIMEOUT = 120
+POLL_INTERVAL = 0.5
+
+
+def _hash(value: Any) -> str:
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def question_pool_cache_key(
+    resume_content: str,
+    job_config: Dict,
+    company_config: Dict,
+    candidate_level: str,
+    categories: List[str],
+    count_per_category: int
+) -> Tuple[str, str, str]:
+    """
+    计算问题池缓存键
+
+    公司配置、问题类别和每类数量同样影响生成结果，一并计入缓存键。
+
+    Returns:
+        (cache_key, resume_hash, job_config_hash)
+    """
+    resume_hash = _hash(resume_content or '')
+    job_config_hash = _hash(job_config or {})
+    cache_key = _hash({
+        'resume': resume_hash,
+        'job_config': job_config_hash,
+        'company_config': _hash(company_config or {}),
+        'candidate_level': candidate_level,
+        'categories': list(categories),
+        'count_per_category': count_per_category,
+    })
+    return cache_key, resume_hash, job_config_hash
+
+
+def _generation_timeout() -> float:
+    return float(getattr(settings, 'QUESTION_POOL_GENERATION_TIMEOUT', DEFAULT_GENERATION_TIMEOUT))
+
+
+def _is_stale(entry) -> bool:
+    return timezone.now() - entry.updated_at > timedelta(seconds=_generation_timeout())
+
+
+def _claim_entry(cache_key, resume_hash, job_config_hash, candidate_level, refresh: bool = False):
+    """
+    认领问题池的生成：创建 generating 状态的缓存记录，由 cache_key 的唯一约束保证只有一个请求创建成功；
+    上一次生成已超时（或 refresh 要求重新生成已就绪的问题池）时，按原状态和更新时间条件更新接管
+
+    Returns:
+        (是否认领成功, 缓存记录)；未认领时记录已就绪或正由其他请求生成
+    """
+    from ..models import QuestionPoolCache
+
+    entry, created = QuestionPoolCache.objects.get_or_create(
+        cache_key=cache_key,
+        defaults={
+            'resume_hash': resume_hash,
+            'job_config_hash': job_config_hash,
+            'candidate_level': candidate_level,
+        }
+    )
+    if created:
+        return True, entry
+    if entry.status == 'ready' and not refresh:
+        return False, entry
+    if entry.status == 'generating' and not _is_stale(entry):
+        return False, entry
+    claimed = QuestionPoolCache.objects.filter(
+        pk=entry.pk, status=entry.status, updated_at=entry.updated_at
+    ).update(status='generating', updated_at=timezone.now())
+    return bool(claimed), entry
+
+
+def _release_entry(cache_key):
+    """
+    释放生成标记，避免等待该问题池的请求一直等到超时：
+    refresh 重新生成已就绪的问题池失败时恢复为已就绪（保留原问题池），首次生成失败时删除记录
+    """
+    from ..models import QuestionPoolCache
+
+    entry = QuestionPoolCache.objects.filter(cache_key=cache_key, status='generating').first()
+    if entry is None:
+        return
+    generating = QuestionPoolCache.objects.filter(pk=entry.pk, status='generating')
+    if entry.question_pool:
+        generating.update(status='ready')
+    else:
+        generating.delete()
+
+
+def _store_entry(cache_key, resume_hash, job_config_hash, candidate_level, pool: Dict) -> bool:
+    """写入生成结果；没有生成出任何问题时（如LLM调用失败）不缓存"""
+    from ..models import QuestionPoolCache
+
+    if not pool.get('questions'):
+        _release_entry(cache_key)
+        return False
+
+    QuestionPoolCache.objects.update_or_create(
+        cache_key=cache_key,
+        defaults={
+            'resume_hash': resume_hash,
+            'job_config_hash': job_config_hash,
+            'candidate_level': candidate_level,
+            'status': 'ready',
+            'question_pool': pool['questions'],
+            'resume_highlights': pool.get('interest_points', []),
+        }
+    )
+    return True
+
+
+def _result(questions, interest_points, cached: bool, generated_at=None) -> Dict[str, Any]:
+    return {
+        'questions': questions,
+        'interest_points': interest_points,
+        'cached': cached,
+        'generated_at': (generated_at or timezone.now()).isoformat(),
+    }
+
+
+async def _await_ready_entry(cache_key: str):
+    """读取缓存；后台正在生成时等待其完成（超时或生成失败时返回 None）"""
+    from ..models import QuestionPoolCache
+
+    deadline = time.monotonic() + _generation_timeout()
+    while True:
+        entry = await QuestionPoolCache.objects.filter(cache_key=cache_key).afirst()
+        if entry is None or entry.status == 'ready':
+            return entry
+        if _is_stale(entry) or time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def aget_question_pool(
+    assistant: InterviewAssistant,
+    resume_content: str,
+    categories: List[str],
+    candidate_level: str = DEFAULT_CANDIDATE_LEVEL,
+    count_per_category: int = DEFAULT_COUNT_PER_CATEGORY,
+    refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    获取候选问题池：优先读取缓存，未命中或 refresh 时认领缓存记录后调用LLM生成并写入缓存；
+    其他请求正在生成同一问题池时等待其结果，不重复生成
+
+    Args:
+        assistant: 面试助手（提供岗位/公司配置和LLM客户端）
+        resume_content: 简历内容，为空时不生成简历相关问题
+        categories: 问题类别
+        candidate_level: 候选人级别
+        count_per_category: 每个类别的问题数量
+        refresh: 忽略缓存重新生成
+
+    Returns:
+        包含 questions、interest_points、cached、generated_at 的字典
+    """
+    from ..models import QuestionPoolCache
+
+    cache_key, resume_hash, job_config_hash = question_pool_cache_key(
+        resume_content, assistant.job_config, assistant.company_config,
+        candidate_level, categories, count_per_category
+    )
+
+    while True:
+        if not refresh:
+            entry = await _await_ready_entry(cache_key)
+            if entry is not None:
+                await QuestionPoolCache.objects.filter(pk=entry.pk).aupdate(hit_count=F('hit_count') + 1)
+                return _result(entry.question_pool, entry.resume_highlights, True, entry.updated_at)
+        claimed, _ = await sync_to_async(_claim_entry)(
+            cache_key, resume_hash, job_config_hash, candidate_level, refresh
+        )
+        if claimed:
+            break
+        # 其他请求正在生成（refresh 时同样等待其生成的新问题池）
+        refresh = False
+
+    try:
+        pool = await assistant.agenerate_question_pool(
+            categories=categories,
+            resume_content=resume_content,
+            candidate_level=candidate_level,
+            count_per_category=count_per_category
+        )
+    except BaseException:
+        await sync_to_async(_release_entry)(cache_key)
+        raise
+    if not await sync_to_async(_store_entry)(cache_key, resume_hash, job_config_hash, candidate_level, pool):
+        # 重新生成没有得到问题时继续使用原问题池
+        entry = await QuestionPoolCache.objects.filter(cache_key=cache_key, status='ready').afirst()
+        if entry is not None:
+            return _result(entry.question_pool, entry.resume_highlights, True, entry.updated_at)
+    return _result(pool['questions'], pool['interest_points'], False)
+
+
+async def _agenerate_for_session(session) -> Dict[str, Any]:
+    assistant = InterviewAssistant(
+        llm_client=get_llm_client(),
+        job_config=session.job_config,
+        company_config=session.company_config,
+        question_bank=get_question_bank()
+    )
+    return await assistant.agenerate_question_pool(
+        categories=DEFAULT_CATEGORIES,
+        resume_content=session.resume_data.resume_content or '',
+        candidate_level=DEFAULT_CANDIDATE_LEVEL,
+        count_per_category=DEFAULT_COUNT_PER_CATEGORY
+    )
+
+
+def warm_question_pool(session_id) -> Optional[bool]:
+    """
+    为会话预生成默认参数的问题池（在后台线程中执行）
+
+    缓存已就绪时直接写入会话；其他请求正在生成同一问题池时不重复生成。
+
+    Returns:
+        True 表示本次生成了新问题池，False 表示复用了缓存，None 表示跳过或失败
+    """
+    from ..models import InterviewAssistSession
+
+    cache_key = None
+    try:
+        session = InterviewAssistSession.objects.select_related('resume_data').get(id=session_id)
+        cache_key, resume_hash, job_config_hash = question_pool_cache_key(
+            session.resume_data.resume_content or '', session.job_config, session.company_config,
+            DEFAULT_CANDIDATE_LEVEL, DEFAULT_CATEGORIES, DEFAULT_COUNT_PER_CATEGORY
+        )
+
+        claimed, entry = _claim_entry(cache_key, resume_hash, job_config_hash, DEFAULT_CANDIDATE_LEVEL)
+        if not claimed:
+            if entry.status == 'ready':
+                _apply_to_session(session_id, entry.question_pool, entry.resume_highlights)
+                return False
+            logger.info(f"问题池正在由其他请求生成，跳过预生成: {session_id}")
+            return None
+
+        started = time.perf_counter()
+        pool = async_to_sync(_agenerate_for_session)(session)
+        if _store_entry(cache_key, resume_hash, job_config_hash, DEFAULT_CANDIDATE_LEVEL, pool):
+            _apply_to_session(session_id, pool['questions'], pool['interest_points'])
+        logger.info(f"会话 {session_id} 问题池预生成完成，共{len(pool['questions'])}个问题，"
+                    f"耗时 {time.perf_counter() - started:.2f}s")
+        return True
+
+    except Exception as e:
+        logger.error(f"预生成问题池失败: {e}")
+        if cache_key:
+            _release_entry(cache_key)
+        return None
+
+
+def _apply_to_session(session_id, questions, interest_points):
+    """会话尚未生成问题时写入预生成的问题池"""
+    from ..models import InterviewAssistSession
+
+    session = InterviewAssistSession.objects.get(id=session_id)
+    if session.question_pool:
+        return
+    session.question_pool = questions
+    session.resume_highlights = interest_points
+    session.save(update_fields=['question_pool', 'resume_highlights', 'updated_at'])
+
+
+def _warm_in_thread(session_id):
+    try:
+        warm_question_pool(session_id)
+    finally:
+        # 后台线程不经过请求周期，需要自行释放数据库连接
+        close_old_connections()
+
+
+def start_question_pool_warmup(session_id):
+    """在后台线程中预生成问题池"""
+    threading.Thread(target=_warm_in_thread, args=(session_id,), daemon=True).start()
@@ -0,0 +1,348 @@
+"""
+最终报告后台生成
+生成报告需要一次较长的LLM调用，放到后台线程执行，接口立即返回任务ID，前端轮询任务状态。
+
+- 生成结果按会话内容哈希（问答记录ID与评估结果、HR备注、是否附带问答记录）缓存，
+  只有记录了新的问答（或修改了生成参数）时才重新生成
+- Markdown 和 JSON 两种格式在生成完成时各渲染一次并写入文件存储，之后直接下载存储中的文件
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .interview_assistant import InterviewAssistant
+from .llm_client import get_llm_client
+from .session_stats import ensure_stats
+
+logger = logging.getLogger(__name__)
+
+# 生成中的任务超过该时间（秒）仍未完成，视为失败，再次提交时重新生成
+DEFAULT_JOB_TIMEOUT = 300
+
+REPORT_FORMATS = {
+    'markdown': ('markdown_file', 'text/markdown; charset=utf-8', 'md'),
+    'json': ('json_file', 'application/json; charset=utf-8', 'json'),
+}
+
+
+class NoQARecordsError(ValueError):
+    """会话没有问答记录，无法生成报告"""
+
+
+def report_options(data: Dict) -> Dict[str, Any]:
+    """从请求参数中提取影响报告内容的生成参数"""
+    return {
+        'include_conversation_log': bool(data.get('include_conversation_log', True)),
+        'hr_notes': data.get('hr_notes', '') or '',
+    }
+
+
+def report_content_hash(records: List[Tuple], options: Dict[str, Any]) -> str:
+    """
+    计算会话内容哈希
+
+    Args:
+        records: 按轮次排序的 (问答记录ID, 评估结果, 是否已追问)
+        options: 生成参数（见 report_options）
+    """
+    payload = {
+        'records': [[str(record_id), evaluation, was_followed_up] for record_id, evaluation, was_followed_up in records],
+        'options': options,
+    }
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+def _content_records(session) -> List[Tuple]:
+    return list(
+        session.qa_records.order_by('round_number').values_list('id', 'evaluation', 'was_followed_up')
+    )
+
+
+def _job_timeout() -> float:
+    return float(getattr(settings, 'INTERVIEW_REPORT_JOB_TIMEOUT', DEFAULT_JOB_TIMEOUT))
+
+
+def _is_stale(job) -> bool:
+    started = job.started_at or job.created_at
+    return job.status in ('pending', 'running') and timezone.now() - started > timedelta(seconds=_job_timeout())
+
+
+def submit_report_job(session_id, options: Dict[str, Any], refresh: bool = False, background: bool = True):
+    """
+    提交报告生成任务；相同内容的报告已生成或正在生成时直接返回已有任务
+
+    Args:
+        session_id: 会话ID
+        options: 生成参数（见 report_options）
+        refresh: 忽略缓存重新生成
+        background: 事务提交后在后台线程中执行（False 时由调用方自行执行 run_report_job）
+
+    Returns:
+        (job, created)
+
+    Raises:
+        NoQARecordsError: 会话没有问答记录
+    """
+    from ..models import InterviewAssistSession, InterviewReportJob
+
+    with transaction.atomic():
+        # 锁定会话行，避免并发提交为同一内容创建多个任务
+        session = InterviewAssistSession.objects.select_for_update().get(id=session_id)
+        records = _content_records(session)
+        if not records:
+            raise NoQARecordsError('没有问答记录，无法生成报告')
+
+        content_hash = report_content_hash(records, options)
+        if not refresh:
+            for job in session.report_jobs.filter(content_hash=content_hash).exclude(status='failed'):
+                if not _is_stale(job):
+                    return job, False
+
+        job = InterviewReportJob.objects.create(session=session, content_hash=content_hash, options=options)
+        if background:
+            transaction.on_commit(lambda: start_report_job(job.id))
+    return job, True
+
+
+def _claim_job(job_id) -> bool:
+    from ..models import InterviewReportJob
+
+    return bool(
+        InterviewReportJob.objects.filter(id=job_id, status='pending').update(
+            status='running', started_at=timezone.now()
+        )
+    )
+
+
+def _load_inputs(job_id):
+    """读取生成报告所需的会话、问答记录和统计"""
+    from ..models import InterviewReportJob
+
+    job = InterviewReportJob.objects.select_related('session__resume_data').get(id=job_id)
+    session = job.session
+    qa_records = list(session.qa_records.order_by('round_number'))
+    qa_data = [
+        {
+            'round_number': record.round_number,
+            'question': record.question,
+            'answer': record.answer,
+            'evaluation': record.evaluation,
+            'was_followed_up': record.was_followed_up
+        }
+        for record in qa_records
+    ]
+    # 提交后可能又记录了新的问答，以实际用于生成的内容为准
+    job.content_hash = report_content_hash(
+        [(record.id, record.evaluation, record.was_followed_up) for record in qa_records], job.options
+    )
+    return job, session, qa_data, ensure_stats(session)
+
+
+def _store_result(job, session, report: Dict[str, Any], qa_data: List[Dict]):
+    """渲染 Markdown / JSON 报告写入存储，并更新任务和会话"""
+    job.completed_at = timezone.now()
+    conversation = qa_data if job.options.get('include_conversation_log', True) else None
+    candidate_name = session.resume_data.candidate_name
+    basename = f"面试辅助报告_{candidate_name}_{session.id}"
+
+    markdown = render_report_markdown(session, report, conversation, job.completed_at)
+    job.markdown_file.save(f"{basename}.md", ContentFile(markdown.encode('utf-8')), save=False)
+
+    document = {
+        'session_id': str(session.id),
+        'candidate_name': candidate_name,
+        'position_title': session.job_config.get('title', ''),
+        'interviewer_name': session.interviewer_name,
+        'generated_at': job.completed_at.isoformat(),
+        'report': report,
+        'qa_records': conversation,
+    }
+    job.json_file.save(
+        f"{basename}.json",
+        ContentFile(json.dumps(document, ensure_ascii=False, indent=2).encode('utf-8')),
+        save=False
+    )
+
+    job.report = report
+    job.status = 'completed'
+    job.save()
+
+    # 会话上保留最新报告（与已存储的 Markdown 文件共用，不重复写入）
+    session.final_report = report
+    session.status = 'completed'
+    session.report_file.name = job.markdown_file.name
+    session.save(update_fields=['final_report', 'status', 'report_file', 'updated_at'])
+
+
+def _mark_failed(job_id, message: str):
+    from ..models import InterviewReportJob
+
+    InterviewReportJob.objects.filter(id=job_id).update(
+        status='failed', error_message=message, completed_at=timezone.now()
+    )
+
+
+async def arun_report_job(job_id) -> bool:
+    """
+    执行报告生成任务（任务已被其他线程领取时直接返回）
+
+    Returns:
+        是否成功生成
+    """
+    if not await sync_to_async(_claim_job)(job_id):
+        return False
+
+    try:
+        job, session, qa_data, stats = await sync_to_async(_load_inputs)(job_id)
+        assistant = InterviewAssistant(
+            llm_client=get_llm_client(),
+            job_config=session.job_config,
+            company_config=session.company_config
+        )
+        # 平均分、追问次数等统计直接读取会话累计值
+        report = await assistant.agenerate_final_report(
+            candidate_name=session.resume_data.candidate_name,
+            interviewer_name=session.interviewer_name,
+            qa_records=qa_data,
+            hr_notes=job.options.get('hr_notes', ''),
+            stats=stats
+        )
+        await sync_to_async(_store_result)(job, session, report, qa_data)
+        logger.info(f"会话 {session.id} 报告生成完成: {job_id}")
+        return True
+    except Exception as e:
+        logger.error(f"报告生成任务 {job_id} 失败: {e}")
+        await sync_to_async(_mark_failed)(job_id, str(e))
+        return False
+
+
+def run_report_job(job_id) -> bool:
+    """arun_report_job 的同步版本"""
+    return async_to_sync(arun_report_job)(job_id)
+
+
+def _run_in_thread(job_id):
+    try:
+        run_report_job(job_id)
+    finally:
+        # 后台线程不经过请求周期，需要自行释放数据库连接
+        close_old_connections()
+
+
+def start_report_job(job_id):
+    """在后台线程中执行报告生成任务"""
+    threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True).start()
+
+
+def serialize_report_job(job, session_id=None) -> Dict[str, Any]:
+    """报告任务的接口返回格式（完成后附带报告内容和下载地址）"""
+    base = f"/interview-assist/sessions/{session_id or job.session_id}/report-jobs/{job.id}"
+    data = {
+        'job_id': str(job.id),
+        'job_status': job.status,
+        'content_hash': job.content_hash,
+        'status_url': f"{base}/",
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'completed_at': job.completed_at.isoformat() if job.completed_at else None,
+    }
+    if job.status == 'failed':
+        data['error_message'] = job.error_message
+    if job.status == 'completed':
+        data.update({
+            'report': job.report,
+            'report_file_url': job.markdown_file.url if job.markdown_file else None,
+            'report_json_url': job.json_file.url if job.json_file else None,
+            'download_urls': {fmt: f"{base}/download/?format={fmt}" for fmt in REPORT_FORMATS},
+        })
+    return data
+
+
+def render_report_markdown(session, report: Dict[str, Any], qa_data: Optional[List[Dict]] = None,
+                           generated_at=None) -> str:
+    """将报告格式化为Markdown"""
+    generated_at = timezone.localtime(generated_at or timezone.now())
+    lines = []
+
+    lines.append("# 面试辅助评估报告\n")
+    lines.append(f"**生成时间**: {generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    lines.append(f"**候选人**: {session.resume_data.candidate_name}\n")
+    lines.append(f"**应聘职位**: {session.job_config.get('title', '')}\n")
+    lines.append(f"**面试官**: {session.interviewer_name}\n")
+    lines.append("\n---\n")
+
+    # 整体评估
+    overall = report.get('overall_assessment', {})
+    lines.append("## 整体评估\n")
+    lines.append(f"- **推荐分数**: {overall.get('recommendation_score', 0)}/100\n")
+    lines.append(f"- **推荐结论**: {overall.get('recommendation', '待定')}\n")
+    lines.append(f"- **评估总结**: {overall.get('summary', '')}\n")
+    lines.append("\n")
+
+    # 维度分析
+    dimensions = report.get('dimension_analysis', {})
+    if dimensions:
+        lines.append("## 维度分析\n")
+        lines.append("| 维度 | 分数 | 评价 |\n")
+        lines.append("|------|------|------|\n")
+        for dim, data in dimensions.items():
+            lines.append(f"| {dim} | {data.get('score', 0)} | {data.get('comment', '')} |\n")
+        lines.append("\n")
+
+    # 技能评估
+    skills = report.get('skill_assessment', [])
+    if skills:
+        lines.append("## 技能评估\n")
+        for skill in skills:
+            lines.append(f"- **{skill.get('skill', '')}**: {skill.get('level', '')} - {skill.get('evidence', '')}\n")
+        lines.append("\n")
+
+    # 亮点和问题
+    highlights = report.get('highlights', [])
+    if highlights:
+        lines.append("## 亮点\n")
+        for h in highlights:
+            lines.append(f"- {h}\n")
+        lines.append("\n")
+
+    red_flags = report.get('red_flags', [])
+    if red_flags:
+        lines.append("## 需关注的问题\n")
+        for r in red_flags:
+            lines.append(f"- ⚠️ {r}\n")
+        lines.append("\n")
+
+    # 建议
+    next_steps = report.get('suggested_next_steps', [])
+    if next_steps:
+        lines.append("## 建议后续步骤\n")
+        for step in next_steps:
+            lines.append(f"1. {step}\n")
+        lines.append("\n")
+
+    # 问答记录
+    if qa_data:
+        lines.append("---\n")
+        lines.append("## 问答记录\n")
+        for qa in qa_data:
+            lines.append(f"\n### 第{qa['round_number']}轮\n")
+            lines.append(f"**问题**: {qa['question']}\n\n")
+            lines.append(f"**回答**: {qa['answer']}\n\n")
+            if qa.get('evaluation'):
+                eval_data = qa['evaluation']
+                lines.append(f"**评分**: {eval_data.get('normalized_score', 0):.1f}/100\n")
+                lines.append(f"**反馈**: {eval_data.get('feedback', '')}\n")
+
+    return "".join(lines)
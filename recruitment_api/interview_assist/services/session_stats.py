@@ -0,0 +1,172 @@
+"""
+面试会话统计
+在 InterviewAssistSession.stats 中维护问答统计的累计值（各维度得分总和与次数、得分趋势等），
+记录问答时在同一事务内增量更新，问答历史和报告接口直接读取，无需遍历全部问答记录。
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# 维度平均分不低于该值视为强项，不高于该值视为弱项
+STRONG_AREA_THRESHOLD = 3
+WEAK_AREA_THRESHOLD = 2
+DEFAULT_SCORE = 50
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {
+        "record_count": 0,
+        "followup_count": 0,
+        "score_sum": 0.0,
+        "score_trend": [],
+        "dimension_totals": {},
+        "dimension_counts": {},
+    }
+
+
+def apply_record(stats: Dict[str, Any], evaluation: Optional[Dict], was_followed_up: bool = False) -> Dict[str, Any]:
+    """
+    把一条问答记录累加到统计中（原地修改并返回）
+
+    Args:
+        stats: 统计累计值
+        evaluation: 问答记录的评估结果
+        was_followed_up: 该问答是否已追问
+    """
+    stats["record_count"] += 1
+    if was_followed_up:
+        stats["followup_count"] += 1
+
+    if evaluation:
+        score = evaluation.get("normalized_score", DEFAULT_SCORE)
+        stats["score_sum"] += score
+        stats["score_trend"].append(score)
+
+        totals, counts = stats["dimension_totals"], stats["dimension_counts"]
+        for dim, dim_score in (evaluation.get("dimension_scores") or {}).items():
+            totals[dim] = totals.get(dim, 0) + dim_score
+            counts[dim] = counts.get(dim, 0) + 1
+    return stats
+
+
+def compute_stats(records: Iterable) -> Dict[str, Any]:
+    """从问答记录（按轮次排序）重新计算统计"""
+    stats = empty_stats()
+    for record in records:
+        apply_record(stats, record.evaluation, record.was_followed_up)
+    return stats
+
+
+def summarize(stats: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    由统计累计值生成概览
+
+    Returns:
+        avg_score、followup_count、strong_areas、weak_areas、dimension_averages
+    """
+    if not stats or not stats.get("record_count"):
+        return {
+            "avg_score": 0,
+            "followup_count": 0,
+            "strong_areas": [],
+            "weak_areas": []
+        }
+
+    scores = stats["score_trend"]
+    avg_score = stats["score_sum"] / len(scores) if scores else 0
+
+    dimension_avgs = {
+        dim: total / stats["dimension_counts"][dim]
+        for dim, total in stats["dimension_totals"].items()
+    }
+
+    return {
+        "avg_score": round(avg_score, 1),
+        "followup_count": stats["followup_count"],
+        "strong_areas": [dim for dim, avg in dimension_avgs.items() if avg >= STRONG_AREA_THRESHOLD],
+        "weak_areas": [dim for dim, avg in dimension_avgs.items() if avg <= WEAK_AREA_THRESHOLD],
+        "dimension_averages": {k: round(v, 2) for k, v in dimension_avgs.items()}
+    }
+
+
+def _stats_equal(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """比较两份统计（浮点累加顺序不同可能产生微小误差）"""
+    if a.get("record_count") != b.get("record_count") or a.get("followup_count") != b.get("followup_count"):
+        return False
+    if a.get("dimension_counts") != b.get("dimension_counts"):
+        return False
+    if len(a.get("score_trend", [])) != len(b.get("score_trend", [])):
+        return False
+    pairs = list(zip(a["score_trend"], b["score_trend"])) + [(a["score_sum"], b["score_sum"])]
+    pairs += [(a["dimension_totals"].get(dim, 0), total) for dim, total in b["dimension_totals"].items()]
+    return all(abs(x - y) < 1e-6 for x, y in pairs)
+
+
+def record_qa(session_id, **record_fields):
+    """
+    在一个事务内创建问答记录并更新会话轮次与统计（锁定会话行，避免并发记录时丢失更新）
+
+    Args:
+        session_id: 会话ID
+        record_fields: InterviewQARecord 的字段（round_number 由本函数分配）
+
+    Returns:
+        (qa_record, session)
+    """
+    from ..models import InterviewAssistSession, InterviewQARecord
+
+    with transaction.atomic():
+        session = InterviewAssistSession.objects.select_for_update().get(id=session_id)
+        stats = ensure_stats(session, save=False)
+
+        session.current_round += 1
+        qa_record = InterviewQARecord.objects.create(
+            session=session, round_number=session.current_round, **record_fields
+        )
+        apply_record(stats, qa_record.evaluation, qa_record.was_followed_up)
+
+        session.stats = stats
+        session.save(update_fields=["current_round", "stats", "updated_at"])
+    return qa_record, session
+
+
+def ensure_stats(session, save: bool = True) -> Dict[str, Any]:
+    """
+    获取会话统计；早于统计功能创建的会话（stats 为空）从问答记录补算
+
+    Returns:
+        统计累计值
+    """
+    if session.stats and "record_count" in session.stats:
+        return session.stats
+
+    stats = compute_stats(session.qa_records.order_by("round_number").only("evaluation", "was_followed_up"))
+    session.stats = stats
+    if save:
+        session.save(update_fields=["stats", "updated_at"])
+    return stats
+
+
+def verify_stats(session, repair: bool = True) -> Tuple[bool, Dict[str, Any]]:
+    """
+    一致性检查：从问答记录重新计算统计并与累计值比较
+
+    Args:
+        session: 面试会话
+        repair: 不一致时是否用重新计算的结果覆盖
+
+    Returns:
+        (是否一致, 重新计算的统计)
+    """
+    recomputed = compute_stats(session.qa_records.order_by("round_number").only("evaluation", "was_followed_up"))
+    consistent = bool(session.stats) and _stats_equal(session.stats, recomputed)
+    if not consistent:
+        logger.warning(f"会话 {session.id} 统计与问答记录不一致{'，已重新计算' if repair else ''}")
+        if repair:
+            session.stats = recomputed
+            session.save(update_fields=["stats", "updated_at"])
+    return consistent, recomputed
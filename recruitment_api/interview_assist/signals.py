@@ -0,0 +1,18 @@
+"""
+面试辅助模块信号处理
+词表配置修改后刷新本进程的检测配置缓存
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ShallowAnswerLexicon
+from .services.lexicon_registry import lexicon_registry
+
+
+@receiver(post_save, sender=ShallowAnswerLexicon)
+@receiver(post_delete, sender=ShallowAnswerLexicon)
+def reload_shallow_answer_lexicons(sender, **kwargs):
+    """事务提交后重新加载词表（编译完成后原子替换，不影响进行中的请求）"""
+    transaction.on_commit(lexicon_registry.reload)
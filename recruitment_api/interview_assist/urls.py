@@ -29,4 +29,16 @@ urlpatterns = [
     # 生成最终报告
     path('sessions/<uuid:session_id>/generate-report/', 
          views.GenerateReportView.as_view(), name='generate_report'),
+    path('sessions/<uuid:session_id>/report-jobs/<uuid:job_id>/', 
+         views.ReportJobView.as_view(), name='report_job'),
+    path('sessions/<uuid:session_id>/report-jobs/<uuid:job_id>/download/', 
+         views.ReportDownloadView.as_view(), name='report_download'),
+    
+    # 浅层回答检测词表配置
+    path('lexicons/', views.ShallowAnswerLexiconView.as_view(), name='lexicon_list'),
+    path('lexicons/resolve/', views.ResolveLexiconView.as_view(), name='lexicon_resolve'),
+    path('lexicons/<int:lexicon_id>/', views.ShallowAnswerLexiconView.as_view(), name='lexicon_detail'),
+    
+    # 题库
+    path('question-bank/', views.QuestionBankView.as_view(), name='question_bank'),
 ]
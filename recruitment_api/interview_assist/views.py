@@ -3,21 +3,45 @@
 人在回路的面试官AI助手
 """
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
-from django.core.files.base import ContentFile
+from asgiref.sync import sync_to_async
 
 import json
 import logging
 import uuid
-from datetime import datetime
 
-from .models import InterviewAssistSession, InterviewQARecord
+from .models import InterviewAssistSession, InterviewReportJob, ShallowAnswerLexicon, QuestionBankEntry
 from .services.interview_assistant import InterviewAssistant
+from .services.lexicon_matcher import LEXICON_CATEGORIES
+from .services.lexicon_registry import lexicon_registry
+from .services.llm_client import get_llm_client
+from .services.prompts import InterviewPrompts
+from .services.question_bank import QuestionBank, get_question_bank
+from .services.report_jobs import (
+    REPORT_FORMATS,
+    NoQARecordsError,
+    arun_report_job,
+    report_options,
+    serialize_report_job,
+    submit_report_job,
+)
+from .services.session_stats import ensure_stats, record_qa, summarize, verify_stats
+from .services.question_pool import (
+    DEFAULT_CANDIDATE_LEVEL,
+    DEFAULT_CATEGORIES,
+    DEFAULT_COUNT_PER_CATEGORY,
+    aget_question_pool,
+    start_question_pool_warmup,
+)
 from resume_screening.models import ResumeData
+from resume_screening.text_blobs import aprefetch_texts
+from recruitment_api.downloads import serve_field_file
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +94,11 @@ class SessionView(View):
                 status='active'
             )
             
+            # 事务提交后在后台预生成问题池
+            prewarm = getattr(settings, 'INTERVIEW_ASSIST_PREWARM_QUESTIONS', True)
+            if prewarm:
+                transaction.on_commit(lambda: start_question_pool_warmup(session.id))
+            
             # 构建简历摘要
             resume_summary = self._extract_resume_summary(resume_data)
             
@@ -82,7 +111,8 @@ class SessionView(View):
                     'position_title': job_config.get('title', resume_data.position_title),
                     'status': session.status,
                     'created_at': session.created_at.isoformat(),
-                    'resume_summary': resume_summary
+                    'resume_summary': resume_summary,
+                    'question_pool_warming': prewarm
                 }
             }, status=201)
             
@@ -196,12 +226,15 @@ class SessionView(View):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class GenerateQuestionsView(View):
-    """生成候选问题视图"""
+    """生成候选问题视图（异步：等待LLM期间不占用工作线程）"""
     
-    def post(self, request, session_id):
+    async def post(self, request, session_id):
         """生成候选问题"""
         try:
-            session = InterviewAssistSession.objects.get(id=session_id)
+            session = await InterviewAssistSession.objects.select_related('resume_data').aget(id=session_id)
+            if session.resume_data is not None:
+                # 简历内容为压缩文本，在异步上下文中访问前先取回
+                await aprefetch_texts([session.resume_data], ['resume_content'])
             
             if session.status != 'active':
                 return JsonResponse({
@@ -211,44 +244,36 @@ class GenerateQuestionsView(View):
             
             data = json.loads(request.body) if request.body else {}
             
-            categories = data.get('categories', ['简历相关', '专业能力', '行为面试'])
-            candidate_level = data.get('candidate_level', 'senior')
-            count_per_category = data.get('count_per_category', 2)
+            categories = data.get('categories', DEFAULT_CATEGORIES)
+            candidate_level = data.get('candidate_level', DEFAULT_CANDIDATE_LEVEL)
+            count_per_category = data.get('count_per_category', DEFAULT_COUNT_PER_CATEGORY)
             focus_on_resume = data.get('focus_on_resume', True)
+            refresh = bool(data.get('refresh', False))
             
-            # 初始化面试助手
+            # 初始化面试助手（技能类问题优先从题库选取）
             assistant = InterviewAssistant(
                 llm_client=self._get_llm_client(),
                 job_config=session.job_config,
-                company_config=session.company_config
+                company_config=session.company_config,
+                question_bank=get_question_bank()
             )
             
-            all_questions = []
-            interest_points = []
-            
-            # 1. 基于简历生成问题
-            if focus_on_resume and session.resume_data.resume_content:
-                resume_result = assistant.generate_resume_based_questions(
-                    resume_content=session.resume_data.resume_content,
-                    count=count_per_category
-                )
-                all_questions.extend(resume_result.get('questions', []))
-                interest_points = resume_result.get('interest_points', [])
-            
-            # 2. 基于技能分类生成问题
-            for category in categories:
-                if category != '简历相关':
-                    skill_questions = assistant.generate_skill_based_questions(
-                        category=category,
-                        candidate_level=candidate_level,
-                        count=count_per_category
-                    )
-                    all_questions.extend(skill_questions)
+            # 读取预生成的问题池（未命中或要求刷新时，基于简历和各技能分类并发生成）
+            pool = await aget_question_pool(
+                assistant,
+                resume_content=(session.resume_data.resume_content or '') if focus_on_resume else '',
+                categories=categories,
+                candidate_level=candidate_level,
+                count_per_category=count_per_category,
+                refresh=refresh
+            )
+            all_questions = pool['questions']
+            interest_points = pool['interest_points']
             
             # 保存到会话
             session.question_pool = all_questions
             session.resume_highlights = interest_points
-            session.save()
+            await session.asave()
             
             return JsonResponse({
                 'status': 'success',
@@ -256,7 +281,9 @@ class GenerateQuestionsView(View):
                 'data': {
                     'session_id': str(session.id),
                     'question_pool': all_questions,
-                    'resume_highlights': interest_points
+                    'resume_highlights': interest_points,
+                    'cached': pool['cached'],
+                    'generated_at': pool['generated_at']
                 }
             })
             
@@ -273,22 +300,20 @@ class GenerateQuestionsView(View):
             }, status=500)
     
     def _get_llm_client(self):
-        """获取LLM客户端（可扩展）"""
-        # TODO: 从配置中获取LLM客户端
-        # 当前返回None，使用mock数据
-        return None
+        """获取LLM客户端（未配置 INTERVIEW_ASSIST_LLM_CONFIG 时返回None，使用mock数据）"""
+        return get_llm_client()
 
 
 # ============ 记录问答并评估 ============
 
 @method_decorator(csrf_exempt, name='dispatch')
 class RecordQAView(View):
-    """记录问答并评估视图"""
+    """记录问答并评估视图（异步）"""
     
-    def post(self, request, session_id):
+    async def post(self, request, session_id):
         """记录问答并获取评估"""
         try:
-            session = InterviewAssistSession.objects.get(id=session_id)
+            session = await InterviewAssistSession.objects.aget(id=session_id)
             
             if session.status != 'active':
                 return JsonResponse({
@@ -307,26 +332,31 @@ class RecordQAView(View):
                     'message': '缺少问题或回答内容'
                 }, status=400)
             
-            # 更新轮次
-            session.current_round += 1
-            round_number = session.current_round
-            
-            # 初始化面试助手
+            # 初始化面试助手（使用该岗位的浅层回答检测词表与权重）
+            detection_profile = await sync_to_async(lexicon_registry.get_profile)(session.job_config)
             assistant = InterviewAssistant(
                 llm_client=self._get_llm_client(),
                 job_config=session.job_config,
-                company_config=session.company_config
+                company_config=session.company_config,
+                lexicon_matcher=detection_profile.matcher,
+                shallow_weights=detection_profile.weights
             )
             
-            # 评估回答
-            evaluation = assistant.evaluate_answer(
+            # 评估回答并生成追问建议（回答可疑时两者并发执行）
+            speculative = data.get(
+                'speculative_followup',
+                getattr(settings, 'INTERVIEW_ASSIST_SPECULATIVE_FOLLOWUP', True)
+            )
+            result = await assistant.aevaluate_answer_with_followup(
                 question=question_data['content'],
                 answer=answer_data['content'],
                 target_skills=question_data.get('expected_skills', []),
-                difficulty=question_data.get('difficulty', 5)
+                difficulty=question_data.get('difficulty', 5),
+                speculative=bool(speculative)
             )
+            evaluation = result['evaluation']
+            followup_result = result['followup']
             
-            # 生成追问建议
             followup_suggestions = []
             followup_recommendation = {
                 'should_followup': evaluation.get('should_followup', False),
@@ -334,27 +364,31 @@ class RecordQAView(View):
                 'suggested_followups': []
             }
             
-            if evaluation.get('should_followup'):
-                followup_result = assistant.generate_followup_suggestions(
-                    original_question=question_data['content'],
-                    answer=answer_data['content'],
-                    evaluation=evaluation,
-                    target_skill=question_data.get('expected_skills', [''])[0] if question_data.get('expected_skills') else None
-                )
+            if followup_result is not None:
                 followup_suggestions = followup_result.get('followup_suggestions', [])
                 followup_recommendation['suggested_followups'] = followup_suggestions
                 followup_recommendation['hr_hint'] = followup_result.get('hr_hint', '')
             
-            # 创建问答记录
-            qa_record = InterviewQARecord.objects.create(
-                session=session,
-                round_number=round_number,
+            # 问题来自题库时累计该题的回答得分
+            try:
+                bank_question_id = int(question_data.get('bank_question_id') or 0) or None
+            except (TypeError, ValueError):
+                bank_question_id = None
+            if bank_question_id and not await QuestionBankEntry.objects.filter(id=bank_question_id).aexists():
+                bank_question_id = None
+            if bank_question_id and evaluation.get('normalized_score') is not None:
+                await sync_to_async(QuestionBank.record_answer)(bank_question_id, evaluation['normalized_score'])
+            
+            # 创建问答记录，同时更新会话轮次与统计
+            qa_record, session = await sync_to_async(record_qa)(
+                session.id,
                 question=question_data['content'],
                 question_source=question_data.get('source', 'hr_custom'),
                 question_category=question_data.get('category', ''),
                 expected_skills=question_data.get('expected_skills', []),
                 question_difficulty=question_data.get('difficulty', 5),
                 related_interest_point=question_data.get('interest_point'),
+                bank_question_id=bank_question_id,
                 answer=answer_data['content'],
                 answer_recorded_at=timezone.now(),
                 answer_duration_seconds=answer_data.get('duration_seconds'),
@@ -362,17 +396,16 @@ class RecordQAView(View):
                 followup_suggestions=followup_suggestions
             )
             
-            session.save()
-            
             return JsonResponse({
                 'status': 'success',
                 'message': '问答已记录，评估完成',
                 'data': {
-                    'round_number': round_number,
+                    'round_number': qa_record.round_number,
                     'qa_record_id': str(qa_record.id),
                     'evaluation': evaluation,
                     'followup_recommendation': followup_recommendation,
-                    'hr_action_hints': self._generate_hr_hints(evaluation)
+                    'hr_action_hints': self._generate_hr_hints(evaluation),
+                    'speculation': result['speculation']
                 }
             })
             
@@ -395,7 +428,7 @@ class RecordQAView(View):
     
     def _get_llm_client(self):
         """获取LLM客户端"""
-        return None
+        return get_llm_client()
     
     def _generate_hr_hints(self, evaluation: dict) -> list:
         """生成HR操作提示"""
@@ -428,12 +461,12 @@ class RecordQAView(View):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class GenerateFollowupView(View):
-    """生成追问建议视图"""
+    """生成追问建议视图（异步）"""
     
-    def post(self, request, session_id):
+    async def post(self, request, session_id):
         """生成追问建议"""
         try:
-            session = InterviewAssistSession.objects.get(id=session_id)
+            session = await InterviewAssistSession.objects.aget(id=session_id)
             
             data = json.loads(request.body)
             
@@ -454,7 +487,7 @@ class GenerateFollowupView(View):
                 company_config=session.company_config
             )
             
-            result = assistant.generate_followup_suggestions(
+            result = await assistant.agenerate_followup_suggestions(
                 original_question=original_question,
                 answer=original_answer,
                 evaluation=evaluation,
@@ -479,7 +512,7 @@ class GenerateFollowupView(View):
             }, status=500)
     
     def _get_llm_client(self):
-        return None
+        return get_llm_client()
 
 
 # ============ 获取问答历史 ============
@@ -489,45 +522,51 @@ class QAHistoryView(View):
     """问答历史视图"""
     
     def get(self, request, session_id):
-        """获取问答历史"""
+        """
+        获取问答历史
+        
+        统计数据直接读取会话上的累计值；include_records=false 时不返回问答明细，
+        verify_stats=true 时从问答记录重新计算并校正累计值。
+        """
         try:
-            session = InterviewAssistSession.objects.get(id=session_id)
+            session = InterviewAssistSession.objects.select_related('resume_data').get(id=session_id)
+            
+            include_records = request.GET.get('include_records', 'true').lower() != 'false'
             
-            qa_records = session.qa_records.all().order_by('round_number')
+            if request.GET.get('verify_stats', '').lower() in ('1', 'true'):
+                stats_consistent, stats = verify_stats(session)
+            else:
+                stats_consistent, stats = None, ensure_stats(session)
             
             records_data = []
-            score_trend = []
-            
-            for record in qa_records:
-                record_data = {
-                    'round': record.round_number,
-                    'question': record.question,
-                    'question_source': record.question_source,
-                    'question_category': record.question_category,
-                    'answer': record.answer,
-                    'evaluation': record.evaluation,
-                    'followup_suggestions': record.followup_suggestions,
-                    'was_followed_up': record.was_followed_up,
-                    'created_at': record.created_at.isoformat()
-                }
-                records_data.append(record_data)
-                
-                if record.evaluation:
-                    score_trend.append(record.evaluation.get('normalized_score', 50))
+            if include_records:
+                for record in session.qa_records.all().order_by('round_number'):
+                    records_data.append({
+                        'round': record.round_number,
+                        'question': record.question,
+                        'question_source': record.question_source,
+                        'question_category': record.question_category,
+                        'answer': record.answer,
+                        'evaluation': record.evaluation,
+                        'followup_suggestions': record.followup_suggestions,
+                        'was_followed_up': record.was_followed_up,
+                        'created_at': record.created_at.isoformat()
+                    })
             
-            # 计算统计数据
-            overall_stats = self._calculate_stats(qa_records)
+            response_data = {
+                'session_id': str(session.id),
+                'candidate_name': session.resume_data.candidate_name,
+                'total_rounds': session.current_round,
+                'qa_records': records_data,
+                'score_trend': stats['score_trend'],
+                'overall_stats': summarize(stats)
+            }
+            if stats_consistent is not None:
+                response_data['stats_consistent'] = stats_consistent
             
             return JsonResponse({
                 'status': 'success',
-                'data': {
-                    'session_id': str(session.id),
-                    'candidate_name': session.resume_data.candidate_name,
-                    'total_rounds': session.current_round,
-                    'qa_records': records_data,
-                    'score_trend': score_trend,
-                    'overall_stats': overall_stats
-                }
+                'data': response_data
             })
             
         except InterviewAssistSession.DoesNotExist:
@@ -541,128 +580,57 @@ class QAHistoryView(View):
                 'status': 'error',
                 'message': f'获取问答历史失败: {str(e)}'
             }, status=500)
-    
-    def _calculate_stats(self, qa_records) -> dict:
-        """计算统计数据"""
-        if not qa_records:
-            return {
-                'avg_score': 0,
-                'followup_count': 0,
-                'strong_areas': [],
-                'weak_areas': []
-            }
-        
-        scores = []
-        dimension_totals = {}
-        dimension_counts = {}
-        followup_count = 0
-        
-        for record in qa_records:
-            if record.was_followed_up:
-                followup_count += 1
-            
-            if record.evaluation:
-                scores.append(record.evaluation.get('normalized_score', 50))
-                
-                dim_scores = record.evaluation.get('dimension_scores', {})
-                for dim, score in dim_scores.items():
-                    if dim not in dimension_totals:
-                        dimension_totals[dim] = 0
-                        dimension_counts[dim] = 0
-                    dimension_totals[dim] += score
-                    dimension_counts[dim] += 1
-        
-        avg_score = sum(scores) / len(scores) if scores else 0
-        
-        # 计算各维度平均分
-        dimension_avgs = {}
-        for dim in dimension_totals:
-            dimension_avgs[dim] = dimension_totals[dim] / dimension_counts[dim]
-        
-        # 找出强项和弱项
-        strong_areas = [dim for dim, avg in dimension_avgs.items() if avg >= 3]
-        weak_areas = [dim for dim, avg in dimension_avgs.items() if avg <= 2]
-        
-        return {
-            'avg_score': round(avg_score, 1),
-            'followup_count': followup_count,
-            'strong_areas': strong_areas,
-            'weak_areas': weak_areas,
-            'dimension_averages': {k: round(v, 2) for k, v in dimension_avgs.items()}
-        }
 
 
 # ============ 生成最终报告 ============
 
 @method_decorator(csrf_exempt, name='dispatch')
 class GenerateReportView(View):
-    """生成最终报告视图"""
+    """生成最终报告视图（异步）"""
     
-    def post(self, request, session_id):
-        """生成最终评估报告"""
+    async def post(self, request, session_id):
+        """
+        提交最终评估报告生成任务
+        
+        报告在后台生成，返回 202 和任务ID，通过 status_url 查询进度；
+        会话内容未变化时直接返回已生成的报告（cached=true）。
+        wait=true 时在本次请求中生成完毕后返回，refresh=true 时忽略缓存重新生成。
+        """
         try:
-            session = InterviewAssistSession.objects.get(id=session_id)
-            
             data = json.loads(request.body) if request.body else {}
+            wait = bool(data.get('wait', False))
             
-            include_conversation_log = data.get('include_conversation_log', True)
-            hr_notes = data.get('hr_notes', '')
+            job, created = await sync_to_async(submit_report_job)(
+                session_id,
+                report_options(data),
+                refresh=bool(data.get('refresh', False)),
+                background=not wait
+            )
+            if created and wait:
+                await arun_report_job(job.id)
+                await job.arefresh_from_db()
             
-            # 获取问答记录
-            qa_records = session.qa_records.all().order_by('round_number')
+            response_data = serialize_report_job(job, session_id)
+            response_data['cached'] = not created and job.status == 'completed'
             
-            if not qa_records.exists():
+            if job.status == 'failed':
                 return JsonResponse({
                     'status': 'error',
-                    'message': '没有问答记录，无法生成报告'
-                }, status=400)
+                    'message': f'生成报告失败: {job.error_message}',
+                    'data': response_data
+                }, status=500)
             
-            # 准备问答数据
-            qa_data = []
-            for record in qa_records:
-                qa_data.append({
-                    'round_number': record.round_number,
-                    'question': record.question,
-                    'answer': record.answer,
-                    'evaluation': record.evaluation,
-                    'was_followed_up': record.was_followed_up
-                })
-            
-            # 初始化面试助手
-            assistant = InterviewAssistant(
-                llm_client=self._get_llm_client(),
-                job_config=session.job_config,
-                company_config=session.company_config
-            )
-            
-            # 生成报告
-            report = assistant.generate_final_report(
-                candidate_name=session.resume_data.candidate_name,
-                interviewer_name=session.interviewer_name,
-                qa_records=qa_data,
-                hr_notes=hr_notes
-            )
-            
-            # 保存报告到会话
-            session.final_report = report
-            session.status = 'completed'
-            
-            # 生成报告文件
-            report_content = self._format_report_as_markdown(
-                session, report, qa_data if include_conversation_log else None
-            )
-            filename = f"面试辅助报告_{session.resume_data.candidate_name}_{session.id}.md"
-            session.report_file.save(filename, ContentFile(report_content.encode('utf-8')))
-            
-            session.save()
+            if job.status != 'completed':
+                return JsonResponse({
+                    'status': 'success',
+                    'message': '报告生成任务已提交，正在后台处理',
+                    'data': response_data
+                }, status=202)
             
             return JsonResponse({
                 'status': 'success',
                 'message': '评估报告生成成功',
-                'data': {
-                    'report': report,
-                    'report_file_url': session.report_file.url if session.report_file else None
-                }
+                'data': response_data
             })
             
         except InterviewAssistSession.DoesNotExist:
@@ -670,87 +638,325 @@ class GenerateReportView(View):
                 'status': 'error',
                 'message': '会话不存在'
             }, status=404)
+        except NoQARecordsError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
         except Exception as e:
             logger.error(f"生成报告时出错: {e}")
             return JsonResponse({
                 'status': 'error',
                 'message': f'生成报告失败: {str(e)}'
             }, status=500)
+
+
+class ReportJobView(View):
+    """报告生成任务状态视图"""
     
-    def _get_llm_client(self):
-        return None
+    def get(self, request, session_id, job_id):
+        """查询报告生成任务状态（完成后附带报告内容和下载地址）"""
+        try:
+            job = InterviewReportJob.objects.get(id=job_id, session_id=session_id)
+        except InterviewReportJob.DoesNotExist:
+            return JsonResponse({
+                'status': 'error',
+                'message': '报告任务不存在'
+            }, status=404)
+        
+        return JsonResponse({
+            'status': 'success',
+            'data': serialize_report_job(job, session_id)
+        })
+
+
+class ReportDownloadView(View):
+    """报告文件下载视图"""
     
-    def _format_report_as_markdown(self, session, report: dict, qa_data: list = None) -> str:
-        """将报告格式化为Markdown"""
-        lines = []
+    def get(self, request, session_id, job_id):
+        """下载已生成的报告文件（format=markdown|json）"""
+        report_format = request.GET.get('format', 'markdown')
+        if report_format not in REPORT_FORMATS:
+            return JsonResponse({
+                'status': 'error',
+                'message': f"format 必须为 {', '.join(REPORT_FORMATS)} 之一"
+            }, status=400)
         
-        lines.append("# 面试辅助评估报告\n")
-        lines.append(f"**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        lines.append(f"**候选人**: {session.resume_data.candidate_name}\n")
-        lines.append(f"**应聘职位**: {session.job_config.get('title', '')}\n")
-        lines.append(f"**面试官**: {session.interviewer_name}\n")
-        lines.append("\n---\n")
+        try:
+            job = InterviewReportJob.objects.get(id=job_id, session_id=session_id, status='completed')
+        except InterviewReportJob.DoesNotExist:
+            return JsonResponse({
+                'status': 'error',
+                'message': '报告不存在或尚未生成完成'
+            }, status=404)
         
-        # 整体评估
-        overall = report.get('overall_assessment', {})
-        lines.append("## 整体评估\n")
-        lines.append(f"- **推荐分数**: {overall.get('recommendation_score', 0)}/100\n")
-        lines.append(f"- **推荐结论**: {overall.get('recommendation', '待定')}\n")
-        lines.append(f"- **评估总结**: {overall.get('summary', '')}\n")
-        lines.append("\n")
+        field_name, content_type, extension = REPORT_FORMATS[report_format]
+        report_file = getattr(job, field_name)
+        if not report_file:
+            return JsonResponse({
+                'status': 'error',
+                'message': '报告文件不存在'
+            }, status=404)
         
-        # 维度分析
-        dimensions = report.get('dimension_analysis', {})
-        if dimensions:
-            lines.append("## 维度分析\n")
-            lines.append("| 维度 | 分数 | 评价 |\n")
-            lines.append("|------|------|------|\n")
-            for dim, data in dimensions.items():
-                lines.append(f"| {dim} | {data.get('score', 0)} | {data.get('comment', '')} |\n")
-            lines.append("\n")
+        try:
+            return serve_field_file(
+                request, report_file,
+                filename=f"面试辅助报告_{session_id}.{extension}",
+                content_type=content_type
+            )
+        except Http404:
+            return JsonResponse({
+                'status': 'error',
+                'message': '报告文件不存在'
+            }, status=404)
+
+
+# ============ 浅层回答检测词表 ============
+
+def _serialize_lexicon(lexicon: ShallowAnswerLexicon) -> dict:
+    return {
+        'id': lexicon.id,
+        'scope_type': lexicon.scope_type,
+        'scope_key': lexicon.scope_key,
+        'lexicons': lexicon.lexicons,
+        'weights': lexicon.weights,
+        'is_active': lexicon.is_active,
+        'version': lexicon.version,
+        'created_at': lexicon.created_at.isoformat(),
+        'updated_at': lexicon.updated_at.isoformat(),
+    }
+
+
+def _validate_lexicon_data(data: dict) -> dict:
+    """校验词表配置，返回字段错误（无错误时为空字典）"""
+    errors = {}
+    
+    scope_type = data.get('scope_type')
+    if scope_type is not None and scope_type not in dict(ShallowAnswerLexicon.SCOPE_CHOICES):
+        errors['scope_type'] = f"必须为 {', '.join(dict(ShallowAnswerLexicon.SCOPE_CHOICES))} 之一"
+    elif scope_type in ('job_family', 'position') and not str(data.get('scope_key') or '').strip():
+        errors['scope_key'] = '岗位族/岗位配置必须提供 scope_key'
+    
+    lexicons = data.get('lexicons')
+    if lexicons is not None:
+        if not isinstance(lexicons, dict):
+            errors['lexicons'] = '必须为对象'
+        else:
+            unknown = [k for k in lexicons if k not in LEXICON_CATEGORIES]
+            invalid = [k for k, v in lexicons.items()
+                       if not isinstance(v, list) or not all(isinstance(t, str) and t.strip() for t in v)]
+            if unknown:
+                errors['lexicons'] = f"未知的词表类别: {', '.join(unknown)}（可选: {', '.join(LEXICON_CATEGORIES)}）"
+            elif invalid:
+                errors['lexicons'] = f"词表必须为非空字符串列表: {', '.join(invalid)}"
+    
+    weights = data.get('weights')
+    if weights is not None:
+        if not isinstance(weights, dict):
+            errors['weights'] = '必须为对象'
+        else:
+            unknown = [k for k in weights if k not in InterviewPrompts.SHALLOW_ANSWER_WEIGHTS]
+            invalid = [k for k, v in weights.items() if isinstance(v, bool) or not isinstance(v, (int, float))]
+            if unknown:
+                errors['weights'] = f"未知的权重项: {', '.join(unknown)}"
+            elif invalid:
+                errors['weights'] = f"权重必须为数值: {', '.join(invalid)}"
+    
+    return errors
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ShallowAnswerLexiconView(View):
+    """浅层回答检测词表配置视图（修改后立即生效，无需重启）"""
+    
+    def get(self, request, lexicon_id=None):
+        """获取词表配置列表或详情"""
+        if lexicon_id is None:
+            lexicons = ShallowAnswerLexicon.objects.all()
+            scope_type = request.GET.get('scope_type')
+            if scope_type:
+                lexicons = lexicons.filter(scope_type=scope_type)
+            return JsonResponse({
+                'status': 'success',
+                'data': {
+                    'lexicons': [_serialize_lexicon(l) for l in lexicons],
+                    'categories': list(LEXICON_CATEGORIES),
+                    'default_weights': InterviewPrompts.SHALLOW_ANSWER_WEIGHTS
+                }
+            })
         
-        # 技能评估
-        skills = report.get('skill_assessment', [])
-        if skills:
-            lines.append("## 技能评估\n")
-            for skill in skills:
-                lines.append(f"- **{skill.get('skill', '')}**: {skill.get('level', '')} - {skill.get('evidence', '')}\n")
-            lines.append("\n")
+        try:
+            lexicon = ShallowAnswerLexicon.objects.get(id=lexicon_id)
+        except ShallowAnswerLexicon.DoesNotExist:
+            return JsonResponse({'status': 'error', 'message': '词表配置不存在'}, status=404)
+        return JsonResponse({'status': 'success', 'data': _serialize_lexicon(lexicon)})
+    
+    def post(self, request, lexicon_id=None):
+        """创建词表配置"""
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'status': 'error', 'message': '请求数据格式错误'}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'status': 'error', 'message': '请求数据必须是JSON对象'}, status=400)
+        
+        data.setdefault('scope_type', 'position')
+        errors = _validate_lexicon_data(data)
+        if errors:
+            return JsonResponse({'status': 'error', 'message': '参数错误', 'errors': errors}, status=400)
+        
+        scope_key = '' if data['scope_type'] == 'default' else str(data.get('scope_key', '')).strip()
+        if ShallowAnswerLexicon.objects.filter(scope_type=data['scope_type'], scope_key=scope_key).exists():
+            return JsonResponse({'status': 'error', 'message': '该范围的词表配置已存在，请使用 PUT 更新'}, status=400)
         
-        # 亮点和问题
-        highlights = report.get('highlights', [])
-        if highlights:
-            lines.append("## 亮点\n")
-            for h in highlights:
-                lines.append(f"- {h}\n")
-            lines.append("\n")
+        lexicon = ShallowAnswerLexicon.objects.create(
+            scope_type=data['scope_type'],
+            scope_key=scope_key,
+            lexicons=data.get('lexicons') or {},
+            weights=data.get('weights') or {},
+            is_active=bool(data.get('is_active', True))
+        )
+        logger.info(f"创建浅层回答检测词表: {lexicon}")
+        
+        return JsonResponse({
+            'status': 'success',
+            'message': '词表配置已创建',
+            'data': _serialize_lexicon(lexicon)
+        }, status=201)
+    
+    def put(self, request, lexicon_id=None):
+        """更新词表配置（lexicons/weights 整体替换）"""
+        try:
+            lexicon = ShallowAnswerLexicon.objects.get(id=lexicon_id)
+            data = json.loads(request.body)
+        except ShallowAnswerLexicon.DoesNotExist:
+            return JsonResponse({'status': 'error', 'message': '词表配置不存在'}, status=404)
+        except json.JSONDecodeError:
+            return JsonResponse({'status': 'error', 'message': '请求数据格式错误'}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'status': 'error', 'message': '请求数据必须是JSON对象'}, status=400)
+        
+        errors = _validate_lexicon_data({k: v for k, v in data.items() if k in ('lexicons', 'weights')})
+        if errors:
+            return JsonResponse({'status': 'error', 'message': '参数错误', 'errors': errors}, status=400)
+        
+        if 'lexicons' in data:
+            lexicon.lexicons = data['lexicons'] or {}
+        if 'weights' in data:
+            lexicon.weights = data['weights'] or {}
+        if 'is_active' in data:
+            lexicon.is_active = bool(data['is_active'])
+        lexicon.save()
+        logger.info(f"更新浅层回答检测词表: {lexicon}")
+        
+        return JsonResponse({
+            'status': 'success',
+            'message': '词表配置已更新',
+            'data': _serialize_lexicon(lexicon)
+        })
+    
+    def delete(self, request, lexicon_id=None):
+        """删除词表配置"""
+        try:
+            lexicon = ShallowAnswerLexicon.objects.get(id=lexicon_id)
+        except ShallowAnswerLexicon.DoesNotExist:
+            return JsonResponse({'status': 'error', 'message': '词表配置不存在'}, status=404)
+        
+        lexicon.delete()
+        return JsonResponse({'status': 'success', 'message': '词表配置已删除'})
+
+
+class ResolveLexiconView(View):
+    """查看某岗位实际生效的词表与权重"""
+    
+    def get(self, request):
+        job_config = {
+            'position': request.GET.get('position', ''),
+            'job_family': request.GET.get('job_family', '')
+        }
+        profile = lexicon_registry.get_profile(job_config)
+        return JsonResponse({
+            'status': 'success',
+            'data': {
+                **profile.describe(),
+                'lexicons': profile.matcher.lexicons
+            }
+        })
+
+
+# ============ 题库 ============
+
+class QuestionBankView(View):
+    """题库问题列表（含使用次数与回答得分统计）"""
+    
+    def get(self, request):
+        """
+        查询参数：
+        - category / candidate_level / difficulty / skill: 筛选条件（skill 不区分大小写）
+        - page: 页码，默认为1
+        - page_size: 每页数量，默认为20，最大100
+        """
+        try:
+            difficulty = int(request.GET['difficulty']) if request.GET.get('difficulty') else None
+            page = int(request.GET.get('page', 1))
+            page_size = min(int(request.GET.get('page_size', 20)), 100)
+        except ValueError:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'difficulty、page、page_size 必须是整数'
+            }, status=400)
+        if page < 1 or page_size < 1:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'page、page_size 必须大于0'
+            }, status=400)
         
-        red_flags = report.get('red_flags', [])
-        if red_flags:
-            lines.append("## 需关注的问题\n")
-            for r in red_flags:
-                lines.append(f"- ⚠️ {r}\n")
-            lines.append("\n")
+        entries = QuestionBankEntry.objects.all()
+        for field in ('category', 'candidate_level'):
+            if request.GET.get(field):
+                entries = entries.filter(**{field: request.GET[field]})
+        if difficulty is not None:
+            entries = entries.filter(difficulty=difficulty)
         
-        # 建议
-        next_steps = report.get('suggested_next_steps', [])
-        if next_steps:
-            lines.append("## 建议后续步骤\n")
-            for step in next_steps:
-                lines.append(f"1. {step}\n")
-            lines.append("\n")
+        start = (page - 1) * page_size
+        skill = request.GET.get('skill', '').strip().lower()
+        if skill:
+            # 技能列表存于 JSON 字段，只取回 id 和技能列匹配，再查询当前页的问题
+            ids = [
+                pk for pk, skills in entries.values_list('id', 'skills').iterator()
+                if skill in {str(s).strip().lower() for s in skills or []}
+            ]
+            total = len(ids)
+            page_ids = ids[start:start + page_size]
+            by_id = {entry.id: entry for entry in QuestionBankEntry.objects.filter(id__in=page_ids)}
+            page_entries = [by_id[pk] for pk in page_ids if pk in by_id]
+        else:
+            total = entries.count()
+            page_entries = entries[start:start + page_size]
         
-        # 问答记录
-        if qa_data:
-            lines.append("---\n")
-            lines.append("## 问答记录\n")
-            for qa in qa_data:
-                lines.append(f"\n### 第{qa['round_number']}轮\n")
-                lines.append(f"**问题**: {qa['question']}\n\n")
-                lines.append(f"**回答**: {qa['answer']}\n\n")
-                if qa.get('evaluation'):
-                    eval_data = qa['evaluation']
-                    lines.append(f"**评分**: {eval_data.get('normalized_score', 0):.1f}/100\n")
-                    lines.append(f"**反馈**: {eval_data.get('feedback', '')}\n")
+        items = []
+        for entry in page_entries:
+            items.append({
+                'id': entry.id,
+                'question': entry.question,
+                'category': entry.category,
+                'candidate_level': entry.candidate_level,
+                'difficulty': entry.difficulty,
+                'skills': entry.skills,
+                'is_active': entry.is_active,
+                'usage_count': entry.usage_count,
+                'answer_count': entry.answer_count,
+                'avg_score': round(entry.avg_score, 1) if entry.avg_score is not None else None,
+                'score_std': round(entry.score_std, 1) if entry.score_std is not None else None,
+                'last_used_at': entry.last_used_at.isoformat() if entry.last_used_at else None
+            })
         
-        return "".join(lines)
+        return JsonResponse({
+            'status': 'success',
+            'data': {
+                'total': total,
+                'page': page,
+                'page_size': page_size,
+                'questions': items
+            }
+        })
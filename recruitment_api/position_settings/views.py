@@ -5,6 +5,23 @@ from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from datetime import datetime, timezone
+from recruitment_api.http_cache import conditional_response, get_response_cache, weak_etag
+
+
+def read_criteria(file_path):
+    """读取文件并返回内容"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return JsonResponse({'code': 200, 'message': '成功', 'data': data})
+    except FileNotFoundError:
+        print("文件不存在")
+        return JsonResponse({'code': 404, 'message': '文件不存在'}, status=404)
+    except json.JSONDecodeError:
+        return JsonResponse({'code': 500, 'message': '文件格式错误，非有效JSON'}, status=500)
+    except Exception as e:
+        return JsonResponse({'code': 500, 'message': f'服务器内部错误: {str(e)}'}, status=500)
 
 
 @csrf_exempt  # 为了方便测试，暂时禁用CSRF保护，生产环境应考虑更安全的方式
@@ -15,18 +32,16 @@ def recruitment_criteria_api(request):
     file_path = os.path.join(os.path.dirname(__file__), 'migrations', 'recruitment_criteria.json')
 
     if request.method == 'GET':
-        # 处理GET请求：读取文件并返回内容
+        # 条件请求：ETag 由文件修改时间和大小计算，未修改时返回 304，不再读取和解析文件
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return JsonResponse({'code': 200, 'message': '成功', 'data': data})
-        except FileNotFoundError:
-            print("文件不存在")
-            return JsonResponse({'code': 404, 'message': '文件不存在'}, status=404)
-        except json.JSONDecodeError:
-            return JsonResponse({'code': 500, 'message': '文件格式错误，非有效JSON'}, status=500)
-        except Exception as e:
-            return JsonResponse({'code': 500, 'message': f'服务器内部错误: {str(e)}'}, status=500)
+            stat_result = os.stat(file_path)
+        except OSError:
+            return read_criteria(file_path)
+        return conditional_response(
+            request, 'recruitment_criteria', file_path,
+            weak_etag(stat_result.st_mtime_ns, stat_result.st_size), lambda: read_criteria(file_path),
+            last_modified=datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+        )
 
     elif request.method == 'POST':
         # 处理POST请求：修改文件内容
@@ -44,6 +59,8 @@ def recruitment_criteria_api(request):
             # 将新数据写入文件
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(new_data, f, indent=4, ensure_ascii=False)  # indent使JSON格式化，便于阅读
+            # 本进程缓存的旧内容立即清除（其他进程按文件修改时间判断）
+            get_response_cache().invalidate('recruitment_criteria')
             return JsonResponse({'code': 200, 'message': '文件更新成功'})
         except Exception as e:
             return JsonResponse({'code': 500, 'message': f'写入文件时发生错误: {str(e)}'}, status=500)
\ No newline at end of file
@@ -0,0 +1,449 @@
+"""
+制品存储
+报告、视频等所有模型文件字段经同一个存储保存（settings.STORAGES 的 default 为 ArtifactStorage）：
+
+- 内容寻址：键由文件内容的 SHA-256 生成（{命名空间}/{哈希前2位}/{哈希其余部分}{扩展名}），
+  相同内容只保存一份，写入后不再修改；同一对象可能被多条记录引用，字段删除文件时不删除对象，
+  不再被引用的对象由 prune_artifacts 命令清理
+- 流式写入：边读边计算哈希，先写入临时文件/对象再落到最终的键，不把整个文件读入内存
+- 后端：本地磁盘（LocalArtifactStore，位于 MEDIA_ROOT）或 S3 兼容的对象存储（S3ArtifactStore，
+  可接入 AWS S3、MinIO 等），由 settings.ARTIFACT_STORE 选择；使用对象存储时各应用节点不再需要共享磁盘
+- 读取：本地后端直接返回文件路径；对象存储后端返回预签名URL，下载接口重定向到该地址
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.deconstruct import deconstructible
+from django.utils.module_loading import import_string
+
+from .downloads import _content_disposition
+
+# 读写文件时的缓冲区大小
+BLOCK_SIZE = 1024 * 1024
+DEFAULT_NAMESPACE = 'artifacts'
+DEFAULT_BACKEND = 'recruitment_api.artifacts.LocalArtifactStore'
+
+_DATE_PART = re.compile(r'^\d+$')
+_CONTENT_KEY = re.compile(r'^(?:[^/]+/)*[0-9a-f]{2}/[0-9a-f]{62}(?:\.[^/.]+)?$')
+
+
+def content_key(namespace: str, digest: str, extension: str = '') -> str:
+    """由内容哈希生成的存储键"""
+    return f"{namespace.strip('/') or DEFAULT_NAMESPACE}/{digest[:2]}/{digest[2:]}{extension.lower()}"
+
+
+def is_content_key(key: str) -> bool:
+    """是否为内容寻址的键（此前按日期目录保存的文件名不是）"""
+    return bool(_CONTENT_KEY.match(key or ''))
+
+
+def namespace_for(name: str) -> str:
+    """
+    由字段生成的文件名得到命名空间：去掉文件名和 upload_to 中的日期目录
+
+    如 'video_analysis/videos/2025/11/20/a.mp4' -> 'video_analysis/videos'
+    """
+    parts = posixpath.dirname(name.replace('\\', '/')).split('/')
+    while parts and (not parts[-1] or _DATE_PART.match(parts[-1])):
+        parts.pop()
+    return '/'.join(parts) or DEFAULT_NAMESPACE
+
+
+def _iter_chunks(content) -> Iterator[bytes]:
+    """按块读取 Django File 或普通文件对象"""
+    if hasattr(content, 'chunks'):
+        yield from content.chunks(BLOCK_SIZE)
+        return
+    while True:
+        block = content.read(BLOCK_SIZE)
+        if not block:
+            return
+        yield block
+
+
+def file_digest(path: str) -> str:
+    sha256_hash = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            sha256_hash.update(block)
+    return sha256_hash.hexdigest()
+
+
+class ArtifactStore:
+    """制品存储后端"""
+
+    def save(self, content, namespace: str, extension: str = '') -> str:
+        """
+        流式保存文件内容
+
+        Args:
+            content: Django File 或二进制文件对象
+            namespace: 命名空间（键的前缀目录）
+            extension: 扩展名（含 "."）
+
+        Returns:
+            存储键（内容已存在时直接返回已有的键）
+        """
+        raise NotImplementedError
+
+    def save_file(self, path: str, namespace: str, extension: str = '', digest: Optional[str] = None) -> str:
+        """保存本地文件（不删除源文件）；digest 为已知的 SHA-256，未知时读取文件计算"""
+        raise NotImplementedError
+
+    def open(self, key: str):
+        """打开存储的文件（二进制只读）"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def iter_keys(self) -> Iterator[Tuple[str, float]]:
+        """存储中全部内容寻址的键及其修改时间（时间戳）"""
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[str]:
+        """文件在本机的路径（对象存储返回 None）"""
+        return None
+
+    def url(self, key: str, filename: Optional[str] = None, as_attachment: bool = False,
+            content_type: Optional[str] = None) -> str:
+        """客户端访问文件的地址"""
+        raise NotImplementedError
+
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    本地磁盘存储
+
+    Args:
+        location: 存储根目录（默认为 MEDIA_ROOT）
+        base_url: 文件访问地址前缀（默认为 MEDIA_URL）
+    """
+
+    def __init__(self, location: Optional[str] = None, base_url: Optional[str] = None):
+        self.location = os.path.abspath(str(location or settings.MEDIA_ROOT))
+        self.base_url = settings.MEDIA_URL if base_url is None else base_url
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.location, key))
+        if not path.startswith(self.location + os.sep):
+            raise ValueError(f"存储键超出存储目录: {key}")
+        return path
+
+    def _temp_file(self):
+        temp_dir = os.path.join(self.location, '.incoming')
+        os.makedirs(temp_dir, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=temp_dir, delete=False)
+
+    def _commit(self, temp_path: str, key: str) -> str:
+        """把写完的临时文件移动到键对应的位置（内容已存在时丢弃临时文件）"""
+        target = self._path(key)
+        if os.path.exists(target):
+            os.remove(temp_path)
+            return key
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(temp_path, target)
+        return key
+
+    def save(self, content, namespace: str, extension: str = '') -> str:
+        sha256_hash = hashlib.sha256()
+        temp = self._temp_file()
+        try:
+            with temp:
+                for block in _iter_chunks(content):
+                    sha256_hash.update(block)
+                    temp.write(block)
+            return self._commit(temp.name, content_key(namespace, sha256_hash.hexdigest(), extension))
+        except BaseException:
+            if os.path.exists(temp.name):
+                os.remove(temp.name)
+            raise
+
+    def save_file(self, path: str, namespace: str, extension: str = '', digest: Optional[str] = None) -> str:
+        key = content_key(namespace, digest or file_digest(path), extension)
+        target = self._path(key)
+        if os.path.exists(target):
+            return key
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            # 同一文件系统内建立硬链接，不复制文件内容
+            os.link(path, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            temp = self._temp_file()
+            with temp, open(path, 'rb') as source:
+                shutil.copyfileobj(source, temp, BLOCK_SIZE)
+            self._commit(temp.name, key)
+        return key
+
+    def open(self, key: str):
+        return open(self._path(key), 'rb')
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def iter_keys(self) -> Iterator[Tuple[str, float]]:
+        for root, dirs, files in os.walk(self.location):
+            # 跳过暂存目录、隐藏目录等不可能保存制品的目录
+            dirs[:] = [name for name in dirs if not name.startswith('.') and name != '__pycache__']
+            for name in files:
+                path = os.path.join(root, name)
+                key = os.path.relpath(path, self.location).replace(os.sep, '/')
+                if is_content_key(key):
+                    yield key, os.path.getmtime(path)
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self._path(key))
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    def url(self, key: str, filename: Optional[str] = None, as_attachment: bool = False,
+            content_type: Optional[str] = None) -> str:
+        return self.base_url + key
+
+
+def _is_not_found(error: Exception) -> bool:
+    """S3 客户端的 404 错误（botocore.exceptions.ClientError）"""
+    code = str(getattr(error, 'response', {}).get('Error', {}).get('Code', ''))
+    return code in ('404', 'NoSuchKey', 'NotFound')
+
+
+class S3ArtifactStore(ArtifactStore):
+    """
+    S3 兼容的对象存储（AWS S3、MinIO 等，需要安装 boto3）
+
+    Args:
+        bucket: 存储桶
+        prefix: 键前缀（多个环境共用存储桶时区分）
+        endpoint_url: 服务地址（MinIO 等非 AWS 服务需要配置）
+        region_name: 区域
+        access_key_id / secret_access_key: 访问密钥（默认使用 boto3 的凭证查找顺序）
+        url_expires: 预签名URL的有效期（秒）
+        spool_size: 上传前内容在内存中缓冲的上限（字节），超过后缓冲到临时文件
+        client: 已创建的 S3 客户端（默认由 boto3 创建）
+    """
+
+    def __init__(self, bucket: str, prefix: str = '', endpoint_url: Optional[str] = None,
+                 region_name: Optional[str] = None, access_key_id: Optional[str] = None,
+                 secret_access_key: Optional[str] = None, url_expires: int = 3600,
+                 spool_size: int = 8 * 1024 * 1024, client=None):
+        if not bucket:
+            raise ImproperlyConfigured("S3 存储需要配置 bucket")
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.url_expires = url_expires
+        self.spool_size = spool_size
+        self.client = client or self._create_client(endpoint_url, region_name, access_key_id, secret_access_key)
+
+    @staticmethod
+    def _create_client(endpoint_url, region_name, access_key_id, secret_access_key):
+        try:
+            import boto3
+        except ImportError:
+            raise ImproperlyConfigured("使用 S3 存储需要安装 boto3（pip install boto3）")
+        return boto3.client(
+            's3', endpoint_url=endpoint_url, region_name=region_name,
+            aws_access_key_id=access_key_id, aws_secret_access_key=secret_access_key,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _head(self, key: str) -> Optional[dict]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+
+    def _upload(self, fileobj, key: str) -> str:
+        # 内容已存在时不再上传
+        if self._head(key) is None:
+            # upload_fileobj 按块分段上传（大文件使用 multipart upload）
+            self.client.upload_fileobj(fileobj, self.bucket, self._object_key(key))
+        return key
+
+    def save(self, content, namespace: str, extension: str = '') -> str:
+        # 键由内容决定，上传前先缓冲并计算哈希（超过 spool_size 时写入临时文件）
+        sha256_hash = hashlib.sha256()
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_size) as buffer:
+            for block in _iter_chunks(content):
+                sha256_hash.update(block)
+                buffer.write(block)
+            buffer.seek(0)
+            return self._upload(buffer, content_key(namespace, sha256_hash.hexdigest(), extension))
+
+    def save_file(self, path: str, namespace: str, extension: str = '', digest: Optional[str] = None) -> str:
+        key = content_key(namespace, digest or file_digest(path), extension)
+        with open(path, 'rb') as f:
+            return self._upload(f, key)
+
+    def open(self, key: str):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))['Body']
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key)
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def iter_keys(self) -> Iterator[Tuple[str, float]]:
+        prefix = f"{self.prefix}/" if self.prefix else ''
+        params = {'Bucket': self.bucket, 'Prefix': prefix}
+        while True:
+            page = self.client.list_objects_v2(**params)
+            for item in page.get('Contents', []):
+                key = item['Key'][len(prefix):]
+                if is_content_key(key):
+                    yield key, item['LastModified'].timestamp()
+            if not page.get('IsTruncated'):
+                return
+            params['ContinuationToken'] = page['NextContinuationToken']
+
+    def size(self, key: str) -> int:
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return int(head['ContentLength'])
+
+    def url(self, key: str, filename: Optional[str] = None, as_attachment: bool = False,
+            content_type: Optional[str] = None) -> str:
+        params = {'Bucket': self.bucket, 'Key': self._object_key(key)}
+        disposition = _content_disposition(filename, as_attachment)
+        if disposition:
+            params['ResponseContentDisposition'] = disposition
+        if content_type:
+            params['ResponseContentType'] = content_type
+        return self.client.generate_presigned_url('get_object', Params=params, ExpiresIn=self.url_expires)
+
+
+@lru_cache(maxsize=None)
+def get_artifact_store() -> ArtifactStore:
+    """按 settings.ARTIFACT_STORE 创建的存储后端（进程内共用）"""
+    config = getattr(settings, 'ARTIFACT_STORE', None) or {}
+    backend = config.get('BACKEND', DEFAULT_BACKEND)
+    return import_string(backend)(**config.get('OPTIONS', {}))
+
+
+@receiver(setting_changed)
+def _reset_artifact_store(setting, **kwargs):
+    if setting in ('ARTIFACT_STORE', 'MEDIA_ROOT', 'MEDIA_URL'):
+        get_artifact_store.cache_clear()
+
+
+@deconstructible
+class ArtifactStorage(Storage):
+    """
+    Django 存储接口适配：模型文件字段经制品存储保存
+
+    upload_to 生成的文件名只用于确定命名空间和扩展名，实际保存的名称为内容寻址的键。
+    """
+
+    @property
+    def store(self) -> ArtifactStore:
+        return get_artifact_store()
+
+    @property
+    def location(self) -> Optional[str]:
+        """本地后端的存储根目录（对象存储为 None）"""
+        return getattr(self.store, 'location', None)
+
+    def get_available_name(self, name, max_length=None):
+        # 键由内容决定，相同的键即相同的内容，无需避让已有文件
+        return name
+
+    def _save(self, name, content):
+        return self.store.save(content, namespace_for(name), os.path.splitext(name)[1])
+
+    def save_file(self, path: str, name: str, digest: Optional[str] = None) -> str:
+        """以 name 的命名空间和扩展名保存本地文件，返回存储键"""
+        return self.store.save_file(path, namespace_for(name), os.path.splitext(name)[1], digest)
+
+    def _open(self, name, mode='rb'):
+        return File(self.store.open(name), name=name)
+
+    def exists(self, name):
+        return self.store.exists(name)
+
+    def delete(self, name):
+        # 内容寻址的对象可能被其他记录引用，只由 prune_artifacts 清理
+        if name and not is_content_key(name):
+            self.store.delete(name)
+
+    def size(self, name):
+        return self.store.size(name)
+
+    def path(self, name):
+        path = self.store.local_path(name)
+        if path is None:
+            raise NotImplementedError("对象存储中的文件没有本地路径")
+        return path
+
+    def url(self, name):
+        return self.store.url(name)
+
+    def presigned_url(self, name, filename: Optional[str] = None, as_attachment: bool = False,
+                      content_type: Optional[str] = None) -> str:
+        """带下载文件名和内容类型的访问地址（对象存储为预签名URL）"""
+        return self.store.url(name, filename=filename, as_attachment=as_attachment, content_type=content_type)
+
+
+@contextmanager
+def local_copy(field_file, suffix: Optional[str] = None) -> Iterator[str]:
+    """
+    获取文件字段在本机的路径：本地存储直接返回，对象存储下载到临时文件，退出时删除
+
+    视频分析等需要按路径读取文件的处理使用。
+    """
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        path = None
+    if path is not None:
+        yield path
+        return
+
+    suffix = os.path.splitext(field_file.name)[1] if suffix is None else suffix
+    temp_path = os.path.join(tempfile.gettempdir(), f"artifact-{uuid.uuid4().hex}{suffix}")
+    try:
+        with field_file.storage.open(field_file.name, 'rb') as source, open(temp_path, 'wb') as target:
+            shutil.copyfileobj(source, target, BLOCK_SIZE)
+        yield temp_path
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
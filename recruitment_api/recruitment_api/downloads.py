@@ -0,0 +1,237 @@
+"""
+文件下载
+视频播放和报告下载共用的响应构造：
+
+- Range 请求：返回 206 和请求的字节区间，浏览器播放视频时可以拖动进度
+- 条件请求：ETag（文件大小 + 修改时间）和 Last-Modified，未变化时返回 304
+- 零拷贝：文件以 FileResponse 返回，WSGI 服务器（如 gunicorn）支持时用 sendfile 直接从文件发送，
+  Range 响应同样适用
+- 反向代理转发：settings.DOWNLOAD_OFFLOAD 为 'x-accel'（nginx）或 'x-sendfile'（Apache/lighttpd）时，
+  只返回响应头，由反向代理读取并发送文件，不占用 Python 工作进程
+- 对象存储：文件不在本机（制品存储使用 S3 兼容后端）时重定向到预签名URL，由对象存储直接发送
+"""
+
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+_RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeFile:
+    """只读出文件中 [start, start + length) 区间的文件对象（保留 fileno 以便 WSGI 服务器使用 sendfile）"""
+
+    def __init__(self, file, start: int, length: int):
+        self._file = file
+        self._remaining = length
+        file.seek(start)
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """由文件大小和修改时间生成的 ETag（不读取文件内容）"""
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    解析单区间的 Range 请求头
+
+    Returns:
+        (起始字节, 结束字节)（含两端）；请求头无法识别或包含多个区间时返回 None（返回完整文件）
+
+    Raises:
+        ValueError: 区间超出文件范围（应返回 416）
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # 后缀区间：最后 N 个字节
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _if_range_matches(request, etag: str, last_modified: float) -> bool:
+    """If-Range 与当前文件一致时才按 Range 返回部分内容"""
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return etag in parse_etags(value)
+    since = parse_http_date_safe(value)
+    return since is not None and int(last_modified) <= since
+
+
+def _content_disposition(filename: Optional[str], as_attachment: bool) -> Optional[str]:
+    if not filename:
+        return 'attachment' if as_attachment else None
+    disposition = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return f'{disposition}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=utf-8''{quote(filename)}"
+
+
+def _offload_response(path: str) -> Optional[HttpResponse]:
+    """由反向代理发送文件的空响应（未配置或文件不在转发目录内时返回 None）"""
+    mode = getattr(settings, 'DOWNLOAD_OFFLOAD', None)
+    if mode == 'x-sendfile':
+        # 路径URL编码后放入响应头（mod_xsendfile 默认会解码）
+        response = HttpResponse()
+        response['X-Sendfile'] = quote(path)
+        return response
+    if mode == 'x-accel':
+        # {文件系统目录: nginx internal location}
+        for root, location in getattr(settings, 'DOWNLOAD_ACCEL_LOCATIONS', {}).items():
+            root = os.path.realpath(str(root))
+            if path.startswith(root + os.sep):
+                relative = os.path.relpath(path, root).replace(os.sep, '/')
+                response = HttpResponse()
+                response['X-Accel-Redirect'] = location.rstrip('/') + '/' + quote(relative)
+                return response
+    return None
+
+
+def serve_file(request, path: str, *, content_type: Optional[str] = None, filename: Optional[str] = None,
+               as_attachment: bool = True, root: Optional[str] = None) -> HttpResponse:
+    """
+    返回文件下载响应（支持 Range、条件请求和反向代理转发）
+
+    Args:
+        request: 请求
+        path: 文件路径
+        content_type: 内容类型（默认按文件名推断）
+        filename: 下载文件名（默认为文件名）
+        as_attachment: 是否作为附件下载（视频播放传 False）
+        root: 文件必须位于该目录内（防止路径穿越）
+
+    Raises:
+        Http404: 文件不存在或不在 root 目录内
+    """
+    path = os.path.realpath(path)
+    if root is not None and not path.startswith(os.path.realpath(str(root)) + os.sep):
+        raise Http404("文件不存在")
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        raise Http404("文件不存在")
+    if not os.path.isfile(path):
+        raise Http404("文件不存在")
+
+    filename = filename or os.path.basename(path)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    etag = file_etag(stat_result)
+    last_modified = stat_result.st_mtime
+
+    def with_headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    # If-None-Match / If-Modified-Since 等条件满足时返回 304 / 412
+    conditional = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+    if conditional is not None:
+        return with_headers(conditional)
+
+    disposition = _content_disposition(filename, as_attachment)
+    offloaded = _offload_response(path)
+    if offloaded is not None:
+        # Range 和内容长度由反向代理处理
+        offloaded['Content-Type'] = content_type
+        if disposition:
+            offloaded['Content-Disposition'] = disposition
+        return with_headers(offloaded)
+
+    size = stat_result.st_size
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and request.method in ('GET', 'HEAD') and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return with_headers(response)
+
+    file = open(path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = str(size)
+    else:
+        start, end = byte_range
+        response = FileResponse(_RangeFile(file, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if disposition:
+        response['Content-Disposition'] = disposition
+    return with_headers(response)
+
+
+def serve_stored_file(request, storage, name: str, *, content_type: Optional[str] = None,
+                      filename: Optional[str] = None, as_attachment: bool = True) -> HttpResponse:
+    """
+    返回存储中文件的下载响应：本地文件直接返回（文件必须位于存储目录内），
+    对象存储中的文件重定向到预签名URL
+
+    Raises:
+        Http404: 文件不存在
+    """
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        if not storage.exists(name):
+            raise Http404("文件不存在")
+        presigned_url = getattr(storage, 'presigned_url', None)
+        if presigned_url is None:
+            return HttpResponseRedirect(storage.url(name))
+        filename = filename or os.path.basename(name)
+        content_type = content_type or mimetypes.guess_type(filename)[0]
+        return HttpResponseRedirect(presigned_url(
+            name, filename=filename, as_attachment=as_attachment, content_type=content_type
+        ))
+    except ValueError:
+        # 存储键超出存储目录
+        raise Http404("文件不存在")
+    return serve_file(request, path, content_type=content_type, filename=filename,
+                      as_attachment=as_attachment, root=storage.location)
+
+
+def serve_field_file(request, field_file, **kwargs) -> HttpResponse:
+    """返回模型文件字段的下载响应"""
+    if not field_file:
+        raise Http404("文件不存在")
+    return serve_stored_file(request, field_file.storage, field_file.name, **kwargs)
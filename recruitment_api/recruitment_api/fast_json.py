@@ -0,0 +1,153 @@
+"""
+快速 JSON 序列化
+列表接口（任务历史、简历组等）返回大量嵌套数据，JsonResponse 使用标准库编码器逐层编码：
+
+- 安装 orjson 时用 orjson 编码（未安装时回退到标准库 json，输出相同的数据）
+- datetime、UUID 直接交给编码器处理，视图中无需逐条调用 isoformat() / str()
+- 已经是 JSON 文本的字段（如JSON报告）用 raw_json() 包装后原样嵌入响应，不再作为字符串二次转义；
+  嵌入前校验一次是否为合法 JSON，压缩文本字段的值带有内容哈希，校验结果按哈希缓存
+"""
+
+import datetime
+import decimal
+import json
+import re
+import secrets
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, List, Optional, Union
+
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 已校验的 JSON 文本 {内容哈希: 是否合法}（内容哈希相同的文本相同，结果不会变化）
+VALIDATED_CACHE_SIZE = 10000
+_validated: 'OrderedDict[str, bool]' = OrderedDict()
+_validated_lock = threading.Lock()
+
+
+class RawJSON:
+    """已序列化的 JSON 片段，编码时原样嵌入"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: Union[str, bytes]):
+        self.data = data.encode('utf-8') if isinstance(data, str) else bytes(data)
+
+    def __repr__(self):
+        return f"<RawJSON {len(self.data)} bytes>"
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is None:
+        return json.loads(data)
+    # orjson 不接受 str 的子类（如压缩文本字段返回的 BlobText）
+    return orjson.loads(str(data) if isinstance(data, str) else data)
+
+
+def raw_json(text: Optional[str]) -> Union[RawJSON, str, None]:
+    """
+    把 JSON 文本包装为原样嵌入的片段
+
+    Args:
+        text: JSON 文本（带 sha256 属性的压缩文本按哈希缓存校验结果）
+
+    Returns:
+        合法的 JSON 文本返回 RawJSON；空值原样返回；不是合法 JSON 时仍作为字符串返回
+    """
+    if not text:
+        return text
+    digest = getattr(text, 'sha256', None)
+    with _validated_lock:
+        valid = _validated.get(digest) if digest else None
+    if valid is None:
+        try:
+            loads(text)
+            valid = True
+        except ValueError:
+            valid = False
+        if digest:
+            with _validated_lock:
+                _validated[digest] = valid
+                if len(_validated) > VALIDATED_CACHE_SIZE:
+                    _validated.popitem(last=False)
+    return RawJSON(text) if valid else text
+
+
+def _default(obj: Any) -> Any:
+    """两种编码器共用的类型转换（与视图中原来的 isoformat() / str() 结果相同）"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (uuid.UUID, decimal.Decimal, Promise)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _Fragments:
+    """
+    编码时把 RawJSON 替换为占位字符串，编码完成后再换回片段内容
+
+    占位字符串包含控制字符和随机串，两种编码器都会把控制字符转义为 \\u0000，
+    业务数据中的字符串不会与占位字符串的编码结果相同。
+    """
+
+    def __init__(self):
+        self.token = secrets.token_hex(8)
+        self.items: List[bytes] = []
+        self._pattern = re.compile(rb'"\\u0000' + self.token.encode() + rb':(\d+)\\u0000"')
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, RawJSON):
+            self.items.append(obj.data)
+            return f"\x00{self.token}:{len(self.items) - 1}\x00"
+        return _default(obj)
+
+    def restore(self, content: bytes) -> bytes:
+        if not self.items:
+            return content
+        return self._pattern.sub(lambda match: self.items[int(match.group(1))], content)
+
+
+def dumps(data: Any, use_orjson: Optional[bool] = None) -> bytes:
+    """
+    编码为 JSON（UTF-8 字节）
+
+    Args:
+        data: 数据
+        use_orjson: 是否使用 orjson（默认在已安装时使用）
+
+    Returns:
+        JSON 字节串
+    """
+    if use_orjson is None:
+        use_orjson = orjson is not None
+    fragments = _Fragments()
+    if use_orjson:
+        content = orjson.dumps(data, default=fragments.default)
+    else:
+        content = json.dumps(
+            data, default=fragments.default, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+    return fragments.restore(content)
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    与 JsonResponse 用法相同的 JSON 响应，使用 dumps 编码
+
+    Args:
+        data: 响应数据
+        safe: 为 True 时只允许 dict（与 JsonResponse 相同）
+    """
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,187 @@
+"""
+HTTP 缓存
+读多写少的接口（初筛报告详情、视频分析结果、简历组详情、招聘标准）支持条件请求：
+
+- 弱 ETag：由记录的版本计算（updated_at，或记录各列的取值——压缩文本列保存的就是内容哈希），
+  只需查询少数几列，不需要取回完整记录和构造响应
+- 条件请求：If-None-Match 与当前 ETag 相同时直接返回 304
+- Cache-Control：按资源配置（settings.HTTP_CACHE_CONTROL）
+- 进程内响应缓存：热点资源的响应体按 ETag 缓存，ETag 变化（记录被修改，包括 QuerySet.update）后不再使用；
+  记录保存或删除时（post_save / post_delete）立即清除对应的缓存
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# 未配置的资源：每次使用前向服务端验证
+DEFAULT_CACHE_CONTROL = {'private': True, 'no_cache': True}
+
+
+def _version_part(value: Any) -> str:
+    # 压缩文本列（StoredText / BlobText）按内容哈希参与计算
+    digest = getattr(value, 'sha256', None)
+    if digest is not None:
+        return digest
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def weak_etag(*parts: Any) -> str:
+    """由记录版本（updated_at、各列取值等）计算弱 ETag"""
+    digest = hashlib.sha1('\x1f'.join(_version_part(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    content: bytes
+    content_type: str
+
+
+class ResponseCache:
+    """
+    进程内的响应缓存（按最近使用淘汰）
+
+    Args:
+        max_entries: 最多缓存的响应数
+        max_bytes: 响应体总大小上限
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[tuple[str, Hashable], CachedResponse]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: Hashable, etag: str) -> Optional[CachedResponse]:
+        """ETag 相同时返回缓存的响应"""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or entry.etag != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.hits += 1
+            return entry
+
+    def set(self, namespace: str, key: Hashable, entry: CachedResponse):
+        if len(entry.content) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop((namespace, key))
+            self._entries[(namespace, key)] = entry
+            self._size += len(entry.content)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None):
+        """清除一个资源的缓存（key 为 None 时清除整个命名空间）"""
+        with self._lock:
+            if key is not None:
+                self._pop((namespace, key))
+                return
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == namespace]:
+                self._pop(entry_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _pop(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """按 settings.HTTP_RESPONSE_CACHE 创建的进程内响应缓存"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            options = getattr(settings, 'HTTP_RESPONSE_CACHE', {})
+            _response_cache = ResponseCache(
+                max_entries=options.get('MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+                max_bytes=options.get('MAX_BYTES', DEFAULT_MAX_BYTES),
+            )
+        return _response_cache
+
+
+@receiver(setting_changed)
+def _reset_response_cache(*, setting, **kwargs):
+    global _response_cache
+    if setting == 'HTTP_RESPONSE_CACHE':
+        with _response_cache_lock:
+            _response_cache = None
+
+
+def cache_control_for(namespace: str) -> Dict[str, Any]:
+    return getattr(settings, 'HTTP_CACHE_CONTROL', {}).get(namespace, DEFAULT_CACHE_CONTROL)
+
+
+def conditional_response(request, namespace: str, key: Hashable, etag: Optional[str],
+                         build: Callable[[], HttpResponse], last_modified=None,
+                         cache_control: Optional[Dict[str, Any]] = None) -> HttpResponse:
+    """
+    支持条件请求和进程内缓存的响应
+
+    Args:
+        request: 请求
+        namespace: 资源类型（缓存命名空间，也是 HTTP_CACHE_CONTROL 的键）
+        key: 资源标识（同一资源的不同查询参数应使用不同的 key）
+        etag: 资源当前版本的 ETag；为 None 时资源不可缓存（如排队位置随时变化），每次构造并要求重新验证
+        build: 构造完整响应（只在 ETag 不匹配且缓存未命中时调用）
+        last_modified: 最后修改时间（可选）
+        cache_control: Cache-Control 指令（默认按 namespace 读取配置）
+
+    Returns:
+        304、缓存的响应或新构造的响应
+    """
+    if etag is None:
+        response = build()
+        patch_cache_control(response, **DEFAULT_CACHE_CONTROL)
+        return response
+
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        cache = get_response_cache()
+        entry = cache.get(namespace, key, etag)
+        if entry is not None:
+            response = HttpResponse(entry.content, content_type=entry.content_type)
+        else:
+            response = build()
+            # 只缓存已渲染的成功响应（DRF Response 等延迟渲染的响应不缓存）
+            if response.status_code != 200 or response.streaming or not getattr(response, 'is_rendered', True):
+                return response
+            cache.set(namespace, key, CachedResponse(etag, response.content, response['Content-Type']))
+
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    patch_cache_control(response, **(cache_control if cache_control is not None else cache_control_for(namespace)))
+    return response
@@ -0,0 +1,114 @@
+"""
+响应裁剪
+列表和详情接口按查询参数裁剪返回的字段，避免每条记录都带上简历全文和JSON报告（含完整群聊记录）：
+
+- fields=：稀疏字段集，只返回列出的字段，嵌套字段用点号表示（如 fields=id,resumes.candidate_name）
+- expand=：展开大字段（简历内容、JSON报告等），默认不返回，只返回按需获取的子资源链接
+- deferred()：未返回的字段对应的数据库列，查询时用 QuerySet.defer() 跳过；render() 只对返回的字段取值
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+
+class ShapeError(ValueError):
+    """fields / expand 参数不合法"""
+
+
+def parse_names(value: Optional[str]) -> Optional[FrozenSet[str]]:
+    """解析逗号分隔的字段名（参数未提供时返回 None）"""
+    if value is None:
+        return None
+    return frozenset(name.strip() for name in value.split(',') if name.strip())
+
+
+def _children(names: Iterable[str], prefix: str) -> FrozenSet[str]:
+    return frozenset(name[len(prefix) + 1:] for name in names if name.startswith(prefix + '.'))
+
+
+def _mentions(names: Iterable[str], name: str) -> bool:
+    """name 本身或其子字段（name.xxx）是否在列表中"""
+    return any(item == name or item.startswith(name + '.') for item in names)
+
+
+class ResponseShape:
+    """
+    一个资源（或嵌套资源）的返回字段
+
+    Args:
+        fields: 要返回的字段（None 表示全部默认字段）
+        expand: 要展开的大字段
+        heavy: 该资源的大字段，只有出现在 expand 或 fields 中时才返回
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None, expand: Iterable[str] = (),
+                 heavy: Iterable[str] = ()):
+        self.fields = frozenset(fields) if fields is not None else None
+        self.expand = frozenset(expand)
+        self.heavy = frozenset(heavy)
+
+    @classmethod
+    def from_request(cls, request, heavy: Iterable[str] = (), expandable: Iterable[str] = (),
+                     expand: Iterable[str] = ()) -> 'ResponseShape':
+        """
+        从查询参数 fields / expand 构造
+
+        Args:
+            request: 请求
+            heavy: 顶层资源的大字段
+            expandable: 允许展开的字段（含嵌套字段，如 resumes.resume_content），默认为 heavy
+            expand: 固定展开的字段（兼容 include_resumes 等原有的开关参数）
+
+        Raises:
+            ShapeError: expand 中有不支持展开的字段
+        """
+        heavy = frozenset(heavy)
+        expandable = frozenset(expandable) | heavy
+        expand = (parse_names(request.GET.get('expand')) or frozenset()) | frozenset(expand)
+        unknown = sorted(expand - expandable)
+        if unknown:
+            raise ShapeError(
+                f"expand 不支持: {', '.join(unknown)}，可选: {', '.join(sorted(expandable)) or '无'}"
+            )
+        return cls(parse_names(request.GET.get('fields')), expand, heavy)
+
+    def includes(self, name: str) -> bool:
+        """是否返回该字段"""
+        if name in self.heavy:
+            # 大字段：展开（或展开其子字段）、或在 fields 中列出时返回
+            return _mentions(self.expand, name) or _mentions(self.fields or (), name)
+        return self.fields is None or _mentions(self.fields, name)
+
+    def nested(self, name: str, heavy: Iterable[str] = ()) -> 'ResponseShape':
+        """
+        嵌套资源的返回字段
+
+        fields 中没有该资源的子字段（如只写了 resumes）时返回嵌套资源的全部默认字段；
+        展开嵌套资源的大字段（如 resumes.resume_content）同时展开嵌套资源本身。
+        """
+        fields = None
+        if self.fields is not None:
+            fields = _children(self.fields, name) or None
+        return ResponseShape(fields, _children(self.expand, name), heavy)
+
+    def select(self, data: Dict) -> Dict:
+        """去掉不返回的字段"""
+        return {key: value for key, value in data.items() if self.includes(key)}
+
+    def render(self, obj, getters: Dict[str, Callable[[Any], Any]]) -> Dict:
+        """按返回字段取值（不返回的字段不求值，不会触发已 defer 的列的查询）"""
+        return {key: getter(obj) for key, getter in getters.items() if self.includes(key)}
+
+    def deferred(self, columns: Dict[str, Sequence[str]]) -> List[str]:
+        """
+        不需要查询的数据库列
+
+        Args:
+            columns: {返回字段: 生成该字段用到的数据库列}
+
+        Returns:
+            只被不返回的字段使用的列（用于 QuerySet.defer）
+        """
+        needed, unused = set(), set()
+        for name, names in columns.items():
+            (needed if self.includes(name) else unused).update(names)
+        return sorted(unused - needed)
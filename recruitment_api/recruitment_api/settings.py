@@ -73,6 +73,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "recruitment_api.wsgi.application"
+# 面试辅助的LLM接口为异步视图，生产环境建议以 ASGI 方式部署（如 uvicorn recruitment_api.asgi:application）
+ASGI_APPLICATION = "recruitment_api.asgi.application"
 
 
 # Database
@@ -140,3 +142,103 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# 简历文档解析配置（PDF/DOCX）
+RESUME_EXTRACTION_WORKERS = 2  # 解析进程池大小
+RESUME_EXTRACTION_STREAM_THRESHOLD = 10 * 1024 * 1024  # 超过该大小的文件落盘后按页流式解析
+
+# 简历规则预筛选配置（LLM 评审前的快速过滤）
+RESUME_PREFILTER_ENABLED = True
+RESUME_PREFILTER_THRESHOLD = 35  # 预筛选得分低于该值的候选人直接判定为“不匹配”，岗位信息中的 prefilter_threshold 可覆盖
+
+# 浅层回答检测词表：其他进程修改词表后，本进程最长在该间隔内感知并重新加载
+SHALLOW_LEXICON_REFRESH_SECONDS = 5
+
+# 面试辅助LLM配置（OpenAI 兼容接口）；为 None 时面试辅助使用模拟数据
+# 示例: {"model": "deepseek-ai/DeepSeek-V3.2-Exp", "api_key": "sk-...", "base_url": "https://api.siliconflow.cn/v1", "timeout": 120}
+INTERVIEW_ASSIST_LLM_CONFIG = None
+# 记录问答时，本地检测到回答可疑即与LLM评估并发生成追问建议（评估认为无需追问时丢弃）
+INTERVIEW_ASSIST_SPECULATIVE_FOLLOWUP = True
+# 创建面试辅助会话后在后台预生成候选问题池（按简历/岗位缓存，重复会话直接复用）
+INTERVIEW_ASSIST_PREWARM_QUESTIONS = True
+QUESTION_POOL_GENERATION_TIMEOUT = 120  # 问题池生成超过该时间（秒）仍未完成视为失败
+# 题库：技能类问题优先从题库选取，不足时才调用LLM生成；相似度不低于阈值的问题视为重复
+INTERVIEW_ASSIST_QUESTION_BANK_ENABLED = True
+QUESTION_BANK_DUPLICATE_THRESHOLD = 0.7
+# 最终报告在后台线程中生成，超过该时间（秒）仍未完成的任务视为失败
+INTERVIEW_REPORT_JOB_TIMEOUT = 300
+
+# 面试后评估：auto 模式下候选人数超过阈值时使用 map-reduce（逐人精简评估 + 分桶锦标赛排序），否则使用多智能体群聊
+FINAL_RECOMMEND_EVALUATION_MODE = 'auto'
+FINAL_RECOMMEND_MAP_REDUCE_THRESHOLD = 12
+FINAL_RECOMMEND_MAP_CONCURRENCY = 8  # 精简评估并发数
+FINAL_RECOMMEND_BUCKET_SIZE = 8  # 每组比较的候选人数
+FINAL_RECOMMEND_ADVANCE_PER_BUCKET = 3  # 每组晋级人数
+
+# 多智能体群聊（简历初筛、面试后评估）每轮发言写入检查点，任务失败重试时从最后一轮成功的发言继续
+GROUPCHAT_CHECKPOINT_ENABLED = True
+
+# 简历初筛调度：所有提交共用同一组群聊执行槽位，交互式提交优先于批量提交，同一优先级内按提交人（或岗位）公平排队
+SCREENING_MAX_CONCURRENT_CHATS = 2  # 同时进行的多专家评审群聊数上限
+SCREENING_INTERACTIVE_MAX_RESUMES = 5  # 未指定 priority 时，简历数不超过该值的提交视为交互式
+SCREENING_ESTIMATED_CHAT_SECONDS = 90  # 尚无完成记录时估算排队时间使用的单次群聊耗时（秒）
+SCREENING_FLOW_WEIGHTS = {}  # 公平排队权重，如 {"submitter:hr_zhang": 2}，默认均为 1
+
+# 面试视频分片上传：分片写入暂存文件，中断后从已接收的偏移量继续，完成后保存到制品存储
+VIDEO_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 建议客户端使用的分片大小（字节）
+VIDEO_UPLOAD_MAX_CHUNK_SIZE = 64 * 1024 * 1024  # 单个分片的最大字节数
+VIDEO_UPLOAD_STAGING_DIR = None  # 分片暂存目录，默认为 MEDIA_ROOT/video_analysis/uploads（多节点部署时需共享或按上传ID固定路由）
+
+# 视频分析引擎：分析器在进程池中运行，替换 VIDEO_ANALYZER 即可接入真实的分析模型
+VIDEO_ANALYZER = 'video_analysis.analyzers.SimulatedVideoAnalyzer'  # 分析器类路径（继承 video_analysis.analyzers.VideoAnalyzer）
+VIDEO_ANALYZER_OPTIONS = {}  # 分析器参数，如模拟分析器的 {"delay": 0}
+VIDEO_ANALYSIS_WORKERS = 2  # 分析进程数（同时进行的分析数上限）
+VIDEO_ANALYSIS_QUEUE_SIZE = 100  # 等待队列容量，队列已满时拒绝新的分析
+VIDEO_ANALYSIS_TIMEOUT = 600  # 单个视频的分析超时时间（秒）
+VIDEO_ANALYSIS_START_METHOD = 'spawn'  # 分析进程的启动方式（spawn / forkserver / fork）
+
+# 视频抽帧（分析器 uses_frames 为 True 时使用）：按频率采样并缩放到模型输入尺寸，按批次经共享内存传给分析进程
+VIDEO_DECODE_SAMPLE_FPS = 1.0  # 每秒采样帧数
+VIDEO_DECODE_FRAME_SIZE = (224, 224)  # 模型输入尺寸（宽, 高）
+VIDEO_DECODE_BATCH_SIZE = 32  # 每批帧数
+VIDEO_DECODE_SEEK_THRESHOLD = 2.0  # 相邻采样点间隔超过该秒数时跳转到关键帧，而非顺序解码
+VIDEO_FRAME_CACHE_DIR = None  # 采样帧缓存目录（按视频内容哈希缓存），默认为 MEDIA_ROOT/video_analysis/frames
+
+# 文件下载（视频播放、报告下载）：配置反向代理后由代理直接发送文件，不占用 Python 工作进程
+DOWNLOAD_OFFLOAD = None  # None / 'x-accel'（nginx X-Accel-Redirect）/ 'x-sendfile'（Apache、lighttpd）
+DOWNLOAD_ACCEL_LOCATIONS = {}  # x-accel 模式下 {文件系统目录: nginx internal location}，如 {MEDIA_ROOT: "/protected/"}
+
+# 文件存储：所有模型文件字段经制品存储保存，键由内容 SHA-256 生成（相同内容只存一份）
+MEDIA_ROOT = BASE_DIR  # 本地存储根目录（与此前未配置时的默认位置一致）
+STORAGES = {
+    "default": {"BACKEND": "recruitment_api.artifacts.ArtifactStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+# 存储后端：本地磁盘 LocalArtifactStore，或 S3 兼容的对象存储 S3ArtifactStore（需要安装 boto3），如
+# {"BACKEND": "recruitment_api.artifacts.S3ArtifactStore",
+#  "OPTIONS": {"bucket": "recruitment", "endpoint_url": "http://minio:9000", "access_key_id": "...", "secret_access_key": "..."}}
+ARTIFACT_STORE = {
+    "BACKEND": "recruitment_api.artifacts.LocalArtifactStore",
+    "OPTIONS": {},
+}
+
+# 压缩文本（简历内容、JSON报告、筛选总结）：按内容哈希存入 TextBlob 表，相同文本只存一份
+TEXT_BLOB_CODEC = 'zlib'  # 'zlib' / 'zstd'（需要安装 zstandard）
+TEXT_BLOB_LEVEL = 6  # 压缩级别
+
+# HTTP 缓存：读多写少的接口返回弱 ETag（由记录版本计算），未修改时返回 304
+# 各资源的 Cache-Control（patch_cache_control 参数），未配置的资源每次使用前向服务端验证
+HTTP_CACHE_CONTROL = {
+    "screening_report": {"private": True, "max_age": 60},  # 初筛报告详情
+    "video_analysis": {"private": True, "max_age": 60},  # 已完成/失败的视频分析（分析中的记录每次验证）
+    "resume_group": {"private": True, "no_cache": True},  # 简历组详情（随视频分析进度变化）
+    "recruitment_criteria": {"no_cache": True},  # 招聘标准
+}
+# 进程内响应缓存：热点资源的响应体按 ETag 缓存，记录修改后自动失效
+HTTP_RESPONSE_CACHE = {
+    "MAX_ENTRIES": 512,
+    "MAX_BYTES": 32 * 1024 * 1024,
+}
+
+# 初筛调度队列只在进程内存中：进程收到第一个请求时，把启动前创建、仍在等待中或进行中的任务重新入队
+SCREENING_RECOVER_ON_STARTUP = True
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ResumeScreeningConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "resume_screening"
+
+    def ready(self):
+        from . import signals  # noqa: F401
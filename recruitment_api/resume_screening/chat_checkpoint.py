@@ -0,0 +1,196 @@
+"""
+多智能体群聊检查点
+群聊（简历初筛、面试后评估）的每轮发言完成后写入 ChatTurnCheckpoint。
+任务中途失败（如某次LLM调用超时）后重试或服务重启后再次执行时，
+从最后一轮成功的发言继续：已完成的发言直接回放到群聊中，不再调用LLM。
+
+- 检查点按 (对话类型, 任务标识, 候选人, 输入哈希) 区分，输入（岗位信息、简历内容等）变化后旧检查点作废
+- 对话完成后最后一轮标记为 is_final，再次执行时直接回放全部发言
+- 任务整体成功并保存结果后由调用方清理检查点
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from autogen import GroupChat
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_fingerprint(*parts: Any) -> str:
+    """计算对话输入哈希"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _checkpoint_enabled() -> bool:
+    try:
+        from django.conf import settings
+        return getattr(settings, "GROUPCHAT_CHECKPOINT_ENABLED", True)
+    except Exception:
+        return False
+
+
+class ChatCheckpointer:
+    """
+    单个群聊的检查点读写
+
+    Args:
+        scope: 对话类型（screening / final_evaluation）
+        task_key: 任务标识
+        candidate: 候选人（面试后评估为整组对话，留空）
+        fingerprint: 对话输入哈希
+    """
+
+    def __init__(self, scope: str, task_key: str, fingerprint: str, candidate: str = ''):
+        self.scope = scope
+        self.task_key = str(task_key)
+        self.candidate = candidate or ''
+        self.fingerprint = fingerprint
+        # 已保存的发言数，回放时重新加入群聊的消息不再写入
+        self.saved_count = 0
+
+    def _queryset(self):
+        from .models import ChatTurnCheckpoint
+
+        return ChatTurnCheckpoint.objects.filter(
+            scope=self.scope, task_key=self.task_key, candidate=self.candidate
+        )
+
+    def load(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        读取已保存的发言（同时删除输入已变化的旧检查点）
+
+        Returns:
+            (按轮次排序的消息列表, 对话是否已结束)
+        """
+        self._queryset().exclude(fingerprint=self.fingerprint).delete()
+        turns = list(self._queryset().filter(fingerprint=self.fingerprint).order_by('turn_index'))
+
+        # 只取从0开始连续的发言
+        messages = []
+        for expected, turn in enumerate(turns):
+            if turn.turn_index != expected:
+                break
+            messages.append(turn.message)
+        self.saved_count = len(messages)
+        completed = bool(messages) and turns[len(messages) - 1].is_final
+        return messages, completed
+
+    def save(self, turn_index: int, message: Dict[str, Any]):
+        """保存一轮发言（已保存的轮次跳过）"""
+        from .models import ChatTurnCheckpoint
+
+        if turn_index < self.saved_count:
+            return
+        try:
+            ChatTurnCheckpoint.objects.update_or_create(
+                scope=self.scope,
+                task_key=self.task_key,
+                candidate=self.candidate,
+                fingerprint=self.fingerprint,
+                turn_index=turn_index,
+                defaults={
+                    'speaker': str(message.get('name', ''))[:100],
+                    'message': message,
+                }
+            )
+            self.saved_count = turn_index + 1
+        except Exception as e:
+            # 检查点写入失败不影响对话本身
+            logger.error(f"保存群聊检查点失败: {e}")
+
+    def mark_complete(self):
+        """标记对话已结束"""
+        self._queryset().filter(fingerprint=self.fingerprint, turn_index=self.saved_count - 1).update(is_final=True)
+
+
+class CheckpointedGroupChat(GroupChat):
+    """每追加一条发言即写入检查点的群聊（未设置 checkpointer 时与 GroupChat 相同）"""
+
+    def __post_init__(self):
+        super().__post_init__()
+        # GroupChatManager 注册回复函数时会浅拷贝群聊对象，检查点写入器放在共享的容器中
+        self._checkpoint_state = {"checkpointer": None}
+
+    @property
+    def checkpointer(self) -> Optional[ChatCheckpointer]:
+        return self._checkpoint_state["checkpointer"]
+
+    @checkpointer.setter
+    def checkpointer(self, value: Optional[ChatCheckpointer]):
+        self._checkpoint_state["checkpointer"] = value
+
+    def append(self, message: Dict, speaker):
+        super().append(message, speaker)
+        if self.checkpointer is not None:
+            self.checkpointer.save(len(self.messages) - 1, dict(self.messages[-1]))
+
+
+def run_checkpointed_chat(
+    initiator,
+    manager,
+    group_chat: CheckpointedGroupChat,
+    message: str,
+    *,
+    scope: str,
+    task_key: str,
+    candidate: str = '',
+    fingerprint: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    运行群聊；存在检查点时从最后一轮成功的发言继续
+
+    Args:
+        initiator: 发起对话的智能体
+        manager: 群聊管理器
+        group_chat: 群聊
+        message: 初始消息
+        scope: 对话类型
+        task_key: 任务标识
+        candidate: 候选人
+        fingerprint: 对话输入哈希（默认按初始消息计算）
+
+    Returns:
+        群聊的全部消息
+    """
+    if not _checkpoint_enabled():
+        initiator.initiate_chat(manager, message=message)
+        return group_chat.messages
+
+    checkpointer = ChatCheckpointer(scope, task_key, fingerprint or checkpoint_fingerprint(message), candidate)
+    saved, completed = checkpointer.load()
+
+    if completed:
+        # 对话已完整结束：直接回放，不调用LLM
+        logger.info(f"群聊检查点已完成，直接回放 {len(saved)} 轮发言: {scope}/{task_key}/{candidate}")
+        group_chat.messages.extend(saved)
+        return group_chat.messages
+
+    group_chat.checkpointer = checkpointer
+    if saved:
+        logger.info(f"从检查点恢复群聊，已完成 {len(saved)} 轮发言: {scope}/{task_key}/{candidate}")
+        last_agent, last_message = manager.resume(messages=saved, silent=True)
+        last_agent.initiate_chat(recipient=manager, message=last_message, clear_history=False)
+    else:
+        initiator.initiate_chat(manager, message=message)
+
+    checkpointer.mark_complete()
+    return group_chat.messages
+
+
+def clear_checkpoints(scope: str, task_key: str, candidates: Optional[Iterable[str]] = None) -> int:
+    """
+    清理任务的检查点（任务成功并保存结果后调用）
+
+    Returns:
+        删除的检查点数
+    """
+    from .models import ChatTurnCheckpoint
+
+    queryset = ChatTurnCheckpoint.objects.filter(scope=scope, task_key=str(task_key))
+    if candidates is not None:
+        queryset = queryset.filter(candidate__in=list(candidates))
+    return queryset.delete()[0]
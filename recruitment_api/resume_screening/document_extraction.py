@@ -0,0 +1,438 @@
+"""
+简历文档解析模块
+将 PDF / DOCX 格式的简历在进程池中解析为纯文本，并按文件 SHA-256 缓存解析结果。
+
+- DOCX：使用标准库 zipfile + ElementTree 逐段流式解析，无额外依赖
+- PDF：使用纯 Python 的 pypdf 逐页解析（可选依赖，未安装时给出明确错误）
+- 超过阈值的大文件先落盘为临时文件，解析进程按页读取，不整体加载到内存
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+# 文档类型识别
+DOCUMENT_MIME_TYPES = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+DOCUMENT_EXTENSIONS = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+}
+
+# 默认配置（可在 settings 中覆盖）
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_STREAM_THRESHOLD = 10 * 1024 * 1024  # 超过 10MB 的文件落盘后按页流式解析
+HASH_CHUNK_SIZE = 1024 * 1024
+BASE64_CHUNK_SIZE = 4 * 1024 * 1024  # 必须是 4 的倍数
+
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class DocumentExtractionError(ValueError):
+    """简历文档解析失败"""
+
+
+def detect_document_type(name: str = "", mime_type: str = "") -> Optional[str]:
+    """
+    根据 MIME 类型或文件扩展名识别需要解析的文档类型
+
+    Args:
+        name: 文件名
+        mime_type: MIME 类型
+
+    Returns:
+        'pdf' / 'docx'，纯文本或无法识别时返回 None
+    """
+    if mime_type in DOCUMENT_MIME_TYPES:
+        return DOCUMENT_MIME_TYPES[mime_type]
+    extension = os.path.splitext(name or "")[1].lower()
+    return DOCUMENT_EXTENSIONS.get(extension)
+
+
+def calculate_file_sha256(path: str) -> str:
+    """分块计算文件的 SHA-256，避免大文件整体读入内存"""
+    sha256_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+# ============ 解析进程内执行的函数（不依赖 Django） ============
+
+def _iter_pdf_pages(source) -> Iterator[str]:
+    """逐页读取 PDF 文本"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise DocumentExtractionError("解析 PDF 需要安装 pypdf: pip install pypdf")
+
+    try:
+        reader = PdfReader(source)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    except DocumentExtractionError:
+        raise
+    except Exception as e:
+        raise DocumentExtractionError(f"PDF 文件解析失败: {e}")
+
+
+def _iter_docx_paragraphs(source) -> Iterator[str]:
+    """流式读取 DOCX 正文段落（不构建完整 DOM）"""
+    try:
+        with zipfile.ZipFile(source) as archive:
+            with archive.open("word/document.xml") as document:
+                for event, element in ElementTree.iterparse(document, events=("end",)):
+                    if element.tag != f"{_WORD_NAMESPACE}p":
+                        continue
+                    texts = []
+                    for node in element.iter():
+                        if node.tag == f"{_WORD_NAMESPACE}t" and node.text:
+                            texts.append(node.text)
+                        elif node.tag == f"{_WORD_NAMESPACE}tab":
+                            texts.append("\t")
+                    element.clear()
+                    yield "".join(texts)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise DocumentExtractionError(f"DOCX 文件解析失败: {e}")
+
+
+_EXTRACTORS = {
+    "pdf": _iter_pdf_pages,
+    "docx": _iter_docx_paragraphs,
+}
+
+
+def extract_document(source: Any, document_type: str) -> Dict[str, Any]:
+    """
+    解析单个文档（在解析进程中运行）
+
+    Args:
+        source: 文件路径或文件字节内容
+        document_type: 'pdf' / 'docx'
+
+    Returns:
+        dict: text（解析文本）、pages（页数/段落数）、extraction_ms（解析耗时）
+    """
+    extractor = _EXTRACTORS.get(document_type)
+    if extractor is None:
+        raise DocumentExtractionError(f"不支持的文档类型: {document_type}")
+
+    start = time.perf_counter()
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+
+    parts = []
+    pages = 0
+    for part in extractor(source):
+        parts.append(part)
+        pages += 1
+
+    separator = "\n\n" if document_type == "pdf" else "\n"
+    return {
+        "text": separator.join(parts).strip(),
+        "pages": pages,
+        "extraction_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+# ============ 进程池 ============
+
+def _get_setting(name: str, default):
+    try:
+        from django.conf import settings
+        return getattr(settings, name, default)
+    except Exception:
+        return default
+
+
+def get_extraction_executor() -> ProcessPoolExecutor:
+    """获取（懒创建）共享的解析进程池"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = _get_setting("RESUME_EXTRACTION_WORKERS", DEFAULT_MAX_WORKERS)
+            # 使用 spawn 启动子进程，避免在多线程的 Web 进程中 fork
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """解析进程异常退出后进程池不可再用，丢弃后下次提交时重新创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _extraction_result(executor: ProcessPoolExecutor, future, name: str) -> Dict[str, Any]:
+    """取回解析结果，解析进程的异常统一转换为 DocumentExtractionError"""
+    try:
+        return future.result()
+    except DocumentExtractionError:
+        raise
+    except BrokenProcessPool as e:
+        _discard_executor(executor)
+        raise DocumentExtractionError(f"简历 {name} 解析时解析进程异常退出: {e}")
+    except Exception as e:
+        raise DocumentExtractionError(f"简历 {name} 解析失败: {e}")
+
+
+# ============ 流水线入口 ============
+
+class _PendingDocument:
+    """待解析文档：持有字节内容或（大文件）临时文件路径"""
+
+    def __init__(self, index: int, name: str, document_type: str):
+        self.index = index
+        self.name = name
+        self.document_type = document_type
+        self.data: Optional[bytes] = None
+        self.path: Optional[str] = None
+        self.is_temp = False
+        self.size = 0
+        self.sha256 = ""
+
+    @property
+    def source(self):
+        return self.path if self.path else self.data
+
+    def cleanup(self):
+        if self.is_temp and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _decode_base64_content(content: str, pending: _PendingDocument, stream_threshold: int):
+    """解码 base64 简历内容，大文件分块写入临时文件"""
+    if "," in content[:100] and content.startswith("data:"):
+        content = content.split(",", 1)[1]
+    content = "".join(content.split())
+
+    # base64 长度 * 3/4 即原始大小的估计值
+    if len(content) * 3 // 4 <= stream_threshold:
+        try:
+            pending.data = base64.b64decode(content, validate=True)
+        except (binascii.Error, ValueError):
+            raise DocumentExtractionError(f"简历 {pending.name} 的内容不是有效的 base64 编码")
+        pending.size = len(pending.data)
+        pending.sha256 = hashlib.sha256(pending.data).hexdigest()
+        return
+
+    sha256_hash = hashlib.sha256()
+    fd, path = tempfile.mkstemp(suffix=f".{pending.document_type}")
+    pending.path, pending.is_temp = path, True
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for offset in range(0, len(content), BASE64_CHUNK_SIZE):
+                chunk = base64.b64decode(content[offset:offset + BASE64_CHUNK_SIZE], validate=True)
+                sha256_hash.update(chunk)
+                f.write(chunk)
+                pending.size += len(chunk)
+    except (binascii.Error, ValueError):
+        pending.cleanup()
+        raise DocumentExtractionError(f"简历 {pending.name} 的内容不是有效的 base64 编码")
+    pending.sha256 = sha256_hash.hexdigest()
+
+
+def _load_file(path: str, pending: _PendingDocument, stream_threshold: int):
+    """读取本地简历文件，大文件只传路径给解析进程"""
+    pending.size = os.path.getsize(path)
+    if pending.size > stream_threshold:
+        pending.path = path
+        pending.sha256 = calculate_file_sha256(path)
+    else:
+        with open(path, "rb") as f:
+            pending.data = f.read()
+        pending.sha256 = hashlib.sha256(pending.data).hexdigest()
+
+
+def _run_extraction(pending_documents: List[_PendingDocument]) -> Dict[int, Dict[str, Any]]:
+    """
+    先查缓存，未命中的文档提交到进程池解析，并写回缓存
+
+    Returns:
+        dict: 文档序号 -> 解析结果（text, pages, extraction_ms, sha256, cached）
+    """
+    from django.db.models import F
+    from .models import ParsedResumeCache
+
+    results: Dict[int, Dict[str, Any]] = {}
+    if not pending_documents:
+        return results
+
+    hashes = {doc.sha256 for doc in pending_documents}
+    cached = {entry.sha256: entry for entry in ParsedResumeCache.objects.filter(sha256__in=hashes)}
+
+    executor = None
+    futures = {}
+    names = {}
+    try:
+        for doc in pending_documents:
+            entry = cached.get(doc.sha256)
+            if entry is not None:
+                results[doc.index] = {
+                    "text": entry.text,
+                    "pages": entry.page_count,
+                    "extraction_ms": 0.0,
+                    "sha256": doc.sha256,
+                    "cached": True,
+                }
+            elif doc.sha256 not in futures:
+                executor = executor or get_extraction_executor()
+                names[doc.sha256] = doc.name
+                try:
+                    futures[doc.sha256] = executor.submit(extract_document, doc.source, doc.document_type)
+                except BrokenProcessPool as e:
+                    _discard_executor(executor)
+                    raise DocumentExtractionError(f"简历 {doc.name} 解析时解析进程异常退出: {e}")
+
+        for sha256, future in futures.items():
+            extracted = _extraction_result(executor, future, names[sha256])
+            ParsedResumeCache.objects.update_or_create(
+                sha256=sha256,
+                defaults={
+                    "document_type": next(d.document_type for d in pending_documents if d.sha256 == sha256),
+                    "text": extracted["text"],
+                    "page_count": extracted["pages"],
+                    "extraction_ms": extracted["extraction_ms"],
+                },
+            )
+            for doc in pending_documents:
+                if doc.sha256 == sha256 and doc.index not in results:
+                    results[doc.index] = dict(extracted, sha256=sha256, cached=False)
+    finally:
+        # 某个文档解析失败时，取消尚未开始的解析并等待已开始的解析结束，再删除它们读取的临时文件
+        for future in futures.values():
+            future.cancel()
+        wait(list(futures.values()))
+        for doc in pending_documents:
+            doc.cleanup()
+
+    if cached:
+        ParsedResumeCache.objects.filter(sha256__in=list(cached)).update(
+            hit_count=F("hit_count") + 1
+        )
+    return results
+
+
+def _summarize(results: Dict[int, Dict[str, Any]], started: float) -> Dict[str, Any]:
+    return {
+        "documents": len(results),
+        "cache_hits": sum(1 for r in results.values() if r["cached"]),
+        "extraction_ms": round(sum(r["extraction_ms"] for r in results.values()), 2),
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def extract_resume_payloads(resumes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    解析前端提交的简历列表中的 PDF/DOCX 简历（base64 编码的 content），就地替换为纯文本
+
+    每份被解析的简历 metadata 中会增加：
+    - type: 'text/plain'
+    - source_type: 原始 MIME 类型
+    - extraction: {sha256, pages, extraction_ms, cached}
+
+    Args:
+        resumes: parse_position_resumes_json 返回的简历列表
+
+    Returns:
+        dict: 本次解析的统计信息（documents, cache_hits, extraction_ms, total_ms）
+
+    Raises:
+        DocumentExtractionError: 内容无法解码或解析（包括解析进程异常退出）
+    """
+    started = time.perf_counter()
+    stream_threshold = _get_setting("RESUME_EXTRACTION_STREAM_THRESHOLD", DEFAULT_STREAM_THRESHOLD)
+
+    pending_documents = []
+    for idx, resume in enumerate(resumes):
+        metadata = resume.get("metadata", {})
+        document_type = detect_document_type(resume.get("name", ""), metadata.get("type", ""))
+        if document_type is None:
+            continue
+        content = resume.get("content")
+        if not isinstance(content, str):
+            raise DocumentExtractionError(f"简历 {resume.get('name')} 的内容必须为 base64 字符串")
+
+        pending = _PendingDocument(idx, resume.get("name", ""), document_type)
+        try:
+            _decode_base64_content(content, pending, stream_threshold)
+        except DocumentExtractionError:
+            for doc in pending_documents:
+                doc.cleanup()
+            raise
+        pending_documents.append(pending)
+
+    results = _run_extraction(pending_documents)
+
+    for doc in pending_documents:
+        result = results[doc.index]
+        resume = resumes[doc.index]
+        metadata = resume.setdefault("metadata", {})
+        metadata["source_type"] = metadata.get("type") or doc.document_type
+        metadata["type"] = "text/plain"
+        metadata["size"] = doc.size
+        metadata["extraction"] = {
+            "sha256": result["sha256"],
+            "pages": result["pages"],
+            "extraction_ms": result["extraction_ms"],
+            "cached": result["cached"],
+        }
+        resume["content"] = result["text"]
+
+    summary = _summarize(results, started)
+    if pending_documents:
+        logger.info(
+            f"简历文档解析完成: {summary['documents']} 份, 缓存命中 {summary['cache_hits']} 份, "
+            f"耗时 {summary['total_ms']}ms"
+        )
+    return summary
+
+
+def extract_resume_files(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    解析本地 PDF/DOCX 简历文件
+
+    Args:
+        paths: 文件路径列表（不支持的类型会被忽略）
+
+    Returns:
+        dict: 文件路径 -> 解析结果（text, pages, extraction_ms, sha256, cached）
+    """
+    stream_threshold = _get_setting("RESUME_EXTRACTION_STREAM_THRESHOLD", DEFAULT_STREAM_THRESHOLD)
+
+    pending_documents = []
+    for idx, path in enumerate(paths):
+        document_type = detect_document_type(path)
+        if document_type is None:
+            continue
+        pending = _PendingDocument(idx, os.path.basename(path), document_type)
+        _load_file(path, pending, stream_threshold)
+        pending_documents.append(pending)
+
+    results = _run_extraction(pending_documents)
+    return {paths[index]: result for index, result in results.items()}
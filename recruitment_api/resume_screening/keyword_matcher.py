@@ -0,0 +1,228 @@
+"""
+多关键词匹配模块
+把全部关键词构建为前缀树（trie），再编译为一个等价的正则表达式自动机，
+由 C 实现的 re 引擎从左到右扫描文本，一次扫描即可找出所有关键词（含相互重叠的关键词）的位置。
+
+- 每个位置上正则按最长匹配返回关键词 T，T 的所有前缀关键词同时命中（构建时预先计算）
+- 下一次搜索从上一次匹配的起点 +1 开始，保证重叠关键词不会漏掉
+- Python 层的开销只与命中次数相关
+- 关键词首字符种类很多时（如按岗位扩充的大词表），正则根节点的分支会被逐个尝试；
+  此时改为先用首字符集合定位候选位置，再用该首字符对应的子树正则做锚定匹配
+
+适合在简历预筛选、浅层回答检测等高吞吐场景中反复复用同一个编译好的匹配器。
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+# 首字符种类超过该值时使用“首字符定位 + 子树匹配”的扫描方式
+FIRST_CHAR_DISPATCH_THRESHOLD = 256
+
+# ASCII 字母数字视为单词字符（中文词无需边界判断）
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+
+def _trie_to_pattern(node: Dict[str, dict]) -> str:
+    """把前缀树转换为正则：同一层的分支按首字符区分，可选的后缀保证最长匹配优先"""
+    branches = [re.escape(ch) + _trie_to_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # 空字符串键表示此处是某个关键词的结尾，后续部分可选
+    return f"(?:{body})?" if "" in node else body
+
+
+class KeywordMatcher:
+    """
+    多关键词匹配器
+
+    Args:
+        keywords: 关键词到附加值的映射，或 (关键词, 附加值) 序列；
+                  同一关键词可对应多个附加值（例如同时属于多个词表）
+        case_sensitive: 是否区分大小写（默认不区分）
+        word_boundary: 对以英文字母/数字开头或结尾的关键词要求单词边界，
+                       避免 "AI" 命中 "maintain" 这类误匹配
+    """
+
+    def __init__(
+        self,
+        keywords: Union[Dict[str, Any], Iterable[Tuple[str, Any]]] = (),
+        *,
+        case_sensitive: bool = False,
+        word_boundary: bool = True,
+    ):
+        self.case_sensitive = case_sensitive
+        self.word_boundary = word_boundary
+        self._payloads: Dict[str, List[Any]] = {}
+        self._terms: List[str] = []
+        self._pattern = None
+        self._first_char_pattern = None
+        self._subtree_patterns: Dict[str, Any] = {}
+        self._prefix_terms: Dict[str, Tuple[int, ...]] = {}
+        self._term_info: List[Tuple[int, bool, bool, List[Any]]] = []
+        self._built = False
+
+        items = keywords.items() if isinstance(keywords, dict) else keywords
+        for term, value in items:
+            self.add(term, value)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _normalize(self, text: str) -> str:
+        if self.case_sensitive:
+            return text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # 极少数字符小写后长度会变化，逐字符处理以保证位置与原文一致
+            lowered = "".join(ch.lower()[0] for ch in text)
+        return lowered
+
+    def add(self, term: str, value: Any = None):
+        """添加关键词（构建后再添加会触发重新构建）"""
+        term = (term or "").strip()
+        if not term:
+            return
+        key = self._normalize(term)
+        if key not in self._payloads:
+            self._payloads[key] = []
+            self._terms.append(term)
+        self._payloads[key].append(term if value is None else value)
+        self._built = False
+
+    def build(self) -> "KeywordMatcher":
+        """构建前缀树并编译为正则自动机"""
+        keys = [self._normalize(term) for term in self._terms]
+
+        trie: Dict[str, dict] = {}
+        for key in keys:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        # 某位置的最长匹配为 key 时，key 的所有前缀关键词也在该位置命中
+        index_by_key = {key: index for index, key in enumerate(keys)}
+        self._prefix_terms = {
+            key: tuple(index_by_key[key[:size]] for size in range(1, len(key) + 1) if key[:size] in index_by_key)
+            for key in keys
+        }
+        if len(trie) > FIRST_CHAR_DISPATCH_THRESHOLD:
+            self._pattern = None
+            self._first_char_pattern = re.compile("[" + "".join(re.escape(ch) for ch in sorted(trie)) + "]")
+            self._subtree_patterns = {
+                ch: re.compile(re.escape(ch) + _trie_to_pattern(child)) for ch, child in trie.items()
+            }
+        else:
+            self._pattern = re.compile(_trie_to_pattern(trie)) if keys else None
+            self._first_char_pattern = None
+            self._subtree_patterns = {}
+
+        # 预先计算每个关键词的长度、边界要求和附加值，扫描时无需重复处理
+        self._term_info = [
+            (
+                len(key),
+                self.word_boundary and term[0] in _WORD_CHARS,
+                self.word_boundary and term[-1] in _WORD_CHARS,
+                self._payloads[key],
+            )
+            for term, key in zip(self._terms, keys)
+        ]
+        self._built = True
+        return self
+
+    @staticmethod
+    def _check_boundary(original: str, start: int, end: int, check_left: bool, check_right: bool) -> bool:
+        if check_left and start > 0 and original[start - 1] in _WORD_CHARS:
+            return False
+        if check_right and end < len(original) and original[end] in _WORD_CHARS:
+            return False
+        return True
+
+    def _iter_longest(self, normalized: str) -> Iterator[Any]:
+        """逐个产出每个起始位置上的最长匹配（re.Match），按起始位置顺序"""
+        if self._first_char_pattern is not None:
+            candidate_search = self._first_char_pattern.search
+            subtree_patterns = self._subtree_patterns
+            position = 0
+            while True:
+                candidate = candidate_search(normalized, position)
+                if candidate is None:
+                    return
+                start = candidate.start()
+                match = subtree_patterns[normalized[start]].match(normalized, start)
+                if match is not None:
+                    yield match
+                position = start + 1
+        elif self._pattern is not None:
+            search = self._pattern.search
+            position = 0
+            while True:
+                match = search(normalized, position)
+                if match is None:
+                    return
+                yield match
+                position = match.start() + 1
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str, Any]]:
+        """
+        扫描文本，按 (起始位置, 结束位置) 顺序产出所有匹配
+
+        Yields:
+            (start, end, term, value)：start/end 为原文中的切片位置，term 为注册时的关键词
+        """
+        if not self._built:
+            self.build()
+        if not text:
+            return
+
+        prefix_terms = self._prefix_terms
+        term_info = self._term_info
+        terms = self._terms
+        check_boundary = self._check_boundary
+        for match in self._iter_longest(self._normalize(text)):
+            start = match.start()
+            # 前缀关键词按长度递增排列，产出顺序即 (start, end) 顺序
+            for index in prefix_terms[match.group()]:
+                length, check_left, check_right, values = term_info[index]
+                end = start + length
+                if (check_left or check_right) and not check_boundary(text, start, end, check_left, check_right):
+                    continue
+                for value in values:
+                    yield start, end, terms[index], value
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str, Any]]:
+        """返回所有匹配的列表"""
+        return list(self.iter_matches(text))
+
+    def matched_values(self, text: str) -> set:
+        """
+        返回文本中命中的附加值集合（不关心位置和次数，附加值需可哈希）
+
+        已命中的关键词不再重复做边界检查，全部关键词命中后提前结束扫描。
+        """
+        if not self._built:
+            self.build()
+        values = set()
+        if not text:
+            return values
+
+        prefix_terms = self._prefix_terms
+        term_info = self._term_info
+        check_boundary = self._check_boundary
+        remaining = len(self._terms)
+        found = [False] * remaining
+        for match in self._iter_longest(self._normalize(text)):
+            start = match.start()
+            for index in prefix_terms[match.group()]:
+                if found[index]:
+                    continue
+                length, check_left, check_right, payloads = term_info[index]
+                if (check_left or check_right) and not check_boundary(text, start, start + length, check_left, check_right):
+                    continue
+                found[index] = True
+                values.update(payloads)
+                remaining -= 1
+            if not remaining:
+                break
+        return values
@@ -0,0 +1,135 @@
+import json
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import JsonResponse
+from django.utils import timezone
+
+from recruitment_api.fast_json import FastJsonResponse, dumps, loads, orjson
+from recruitment_api.response_shaping import ResponseShape
+from resume_screening.models import ResumeData, ResumeGroup
+from resume_screening.text_blobs import BlobText, text_sha256
+from resume_screening.views import RESUME_DATA_HEAVY, serialize_resume_data
+
+# 简历组列表中每条简历返回的字段
+RESUME_KEYS = (
+    'id', 'candidate_name', 'position_title', 'screening_score', 'screening_summary', 'json_content',
+    'created_at', 'report_md_url', 'report_json_url',
+)
+
+
+def make_report(name: str, messages: int) -> str:
+    """与初筛JSON报告结构相同的报告（含群聊记录）"""
+    return json.dumps({
+        "candidate_name": name,
+        "scores": {"hr_score": 80, "technical_score": 75, "manager_score": 78, "comprehensive_score": 77},
+        "final_recommendation": {"decision": "推荐面试", "reasons": "技术能力与岗位要求匹配"},
+        "conversation_history": [
+            {"name": speaker, "role": "user", "content": f"{name}：“{speaker}”评审意见，熟悉 Python/Django，\n项目经验丰富。" * 8}
+            for index in range(messages) for speaker in [("HR", "技术专家", "项目经理")[index % 3]]
+        ],
+    }, ensure_ascii=False, indent=2)
+
+
+class Command(BaseCommand):
+    help = '对比简历组列表的 JSON 序列化耗时（JsonResponse 与 FastJsonResponse）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups', type=int, default=50, help='每页简历组数')
+        parser.add_argument('--resumes', type=int, default=10, help='每个简历组的简历数')
+        parser.add_argument('--messages', type=int, default=20, help='每份JSON报告的群聊发言数')
+        parser.add_argument('--repeat', type=int, default=20, help='重复次数（取中位数）')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        page = []
+        for group_index in range(options['groups']):
+            group = ResumeGroup(
+                position_title='Python开发', position_details={}, position_hash=uuid.uuid4().hex,
+                group_name=f'Python开发_{group_index}', description='批量导入', created_at=now,
+            )
+            resumes = []
+            for index in range(options['resumes']):
+                # 与从数据库读取的压缩文本字段相同，JSON报告带有内容哈希
+                report = make_report(f'候选人{group_index}_{index}', options['messages'])
+                resumes.append(ResumeData(
+                    position_title='Python开发', position_details={}, candidate_name=f'候选人{group_index}_{index}',
+                    resume_content='', json_report_content=BlobText(report, text_sha256(report)),
+                    screening_score={'comprehensive_score': 77}, screening_summary='综合评分 77，建议进入面试',
+                    resume_file_hash=uuid.uuid4().hex, created_at=now,
+                    report_md_file=f'screening_reports/2025/11/20/候选人{index}.md',
+                ))
+            page.append((group, resumes))
+
+        def legacy():
+            # 原实现：逐条 str() / isoformat()，JSON报告作为字符串再次转义
+            groups = [{
+                "id": str(group.id),
+                "group_name": group.group_name,
+                "position_title": group.position_title,
+                "description": group.description,
+                "resume_count": len(resumes),
+                "status": group.status,
+                "created_at": group.created_at.isoformat(),
+                "resumes": [{
+                    "id": str(resume.id),
+                    "candidate_name": resume.candidate_name,
+                    "position_title": resume.position_title,
+                    "screening_score": resume.screening_score,
+                    "screening_summary": resume.screening_summary,
+                    "json_content": resume.json_report_content,
+                    "created_at": resume.created_at.isoformat(),
+                    "report_md_url": resume.report_md_file.url if resume.report_md_file else None,
+                    "report_json_url": resume.report_json_file.url if resume.report_json_file else None,
+                } for resume in resumes],
+            } for group, resumes in page]
+            return JsonResponse({"groups": groups, "total": len(groups)}).content
+
+        shape = ResponseShape(expand=['json_content'], heavy=RESUME_DATA_HEAVY)
+
+        def fast_payload():
+            groups = [{
+                "id": group.id,
+                "group_name": group.group_name,
+                "position_title": group.position_title,
+                "description": group.description,
+                "resume_count": len(resumes),
+                "status": group.status,
+                "created_at": group.created_at,
+                "resumes": [serialize_resume_data(resume, shape, RESUME_KEYS) for resume in resumes],
+            } for group, resumes in page]
+            return {"groups": groups, "total": len(groups)}
+
+        paths = [('JsonResponse（原实现）', legacy)]
+        paths.append(('FastJsonResponse（标准库 json）', lambda: dumps(fast_payload(), use_orjson=False)))
+        if orjson is not None:
+            paths.append(('FastJsonResponse（orjson）', lambda: FastJsonResponse(fast_payload()).content))
+        else:
+            self.stdout.write(self.style.WARNING('未安装 orjson，只对比标准库编码'))
+
+        # 除JSON报告由字符串变为对象外，各实现的输出应一致
+        expected = json.loads(legacy())
+        for group in expected['groups']:
+            for resume in group['resumes']:
+                resume['json_content'] = json.loads(resume['json_content'])
+        for name, func in paths[1:]:
+            if loads(func()) != expected:
+                raise CommandError(f'{name} 的输出与原实现不一致')
+
+        self.stdout.write(
+            f"{options['groups']} 个简历组 × {options['resumes']} 份简历，重复 {options['repeat']} 次（中位数）："
+        )
+        baseline = None
+        for name, func in paths:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                content = func()
+                timings.append(time.perf_counter() - started)
+            elapsed = statistics.median(timings)
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f"  {name}: {elapsed * 1000:.1f} ms，{len(content) / 1024:.0f} KB，{baseline / elapsed:.1f}x"
+            )
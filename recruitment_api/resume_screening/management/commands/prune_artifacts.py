@@ -0,0 +1,45 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models
+
+from recruitment_api.artifacts import ArtifactStorage, get_artifact_store
+
+
+def artifact_file_fields(model):
+    """模型中经制品存储保存的文件字段"""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ArtifactStorage)
+    ]
+
+
+class Command(BaseCommand):
+    help = '删除不再被任何记录引用的制品（报告、视频等内容寻址的文件）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=24,
+                            help='只删除修改时间早于该小时数的文件（避免删除刚写入、记录尚未保存的文件）')
+        parser.add_argument('--dry-run', action='store_true', help='只列出将要删除的文件')
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for model in apps.get_models():
+            for field in artifact_file_fields(model):
+                referenced.update(
+                    model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True).iterator()
+                )
+
+        store = get_artifact_store()
+        cutoff = time.time() - options['older_than_hours'] * 3600
+        orphaned = [key for key, modified in store.iter_keys() if modified < cutoff and key not in referenced]
+        for key in orphaned:
+            if options['dry_run']:
+                self.stdout.write(key)
+            else:
+                store.delete(key)
+
+        action = '将删除' if options['dry_run'] else '已删除'
+        self.stdout.write(self.style.SUCCESS(f'{action} {len(orphaned)} 个未引用的文件'))
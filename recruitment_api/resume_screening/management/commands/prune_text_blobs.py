@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from resume_screening.models import TextBlob
+from resume_screening.text_blobs import compressed_text_fields
+
+
+class Command(BaseCommand):
+    help = '删除不再被任何记录引用的压缩文本'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=24,
+                            help='只删除创建时间早于该小时数的文本（避免删除刚写入、记录尚未保存的文本）')
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for model in apps.get_models():
+            for field in compressed_text_fields(model):
+                for ref in model.objects.exclude(**{f'{field.name}__isnull': True}).values_list(field.name, flat=True):
+                    referenced.add(ref.sha256)
+
+        cutoff = timezone.now() - timedelta(hours=options['older_than_hours'])
+        candidates = TextBlob.objects.filter(created_at__lt=cutoff).values_list('sha256', flat=True)
+        orphaned = [digest for digest in candidates.iterator() if digest not in referenced]
+        for start in range(0, len(orphaned), 500):
+            TextBlob.objects.filter(sha256__in=orphaned[start:start + 500]).delete()
+
+        self.stdout.write(self.style.SUCCESS(f'已删除 {len(orphaned)} 条未引用的压缩文本'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from resume_screening.models import CompressionDictionary, TextBlob
+from resume_screening.text_blobs import (
+    CODEC_ZSTD, ZLIB_DICTIONARY_SIZE, compress, configured_codec, load_texts, train_dictionary
+)
+
+
+class Command(BaseCommand):
+    help = '从最近的压缩文本训练共享字典（之后写入的文本使用新字典压缩，已有文本不受影响）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=500, help='训练使用的文本数量')
+        parser.add_argument('--size', type=int, default=None,
+                            help='字典大小（字节），默认 zlib 为 32KB、zstd 为 110KB')
+
+    def handle(self, *args, **options):
+        codec = configured_codec()
+        size = options['size'] or (110 * 1024 if codec == CODEC_ZSTD else ZLIB_DICTIONARY_SIZE)
+        digests = TextBlob.objects.order_by('-created_at').values_list('sha256', flat=True)[:options['samples']]
+        samples = [text for text in load_texts(digests).values() if text]
+        if len(samples) < 2:
+            self.stdout.write(self.style.WARNING('样本不足，至少需要 2 条文本'))
+            return
+
+        data = train_dictionary(samples, codec, size)
+        if not data:
+            self.stdout.write(self.style.WARNING('样本之间没有共同内容，未生成字典'))
+            return
+        dictionary = CompressionDictionary.objects.create(codec=codec, data=data, sample_count=len(samples))
+
+        raw = sum(len(sample.encode('utf-8')) for sample in samples)
+        plain = sum(len(compress(codec, sample.encode('utf-8'))) for sample in samples)
+        with_dictionary = sum(len(compress(codec, sample.encode('utf-8'), data)) for sample in samples)
+        self.stdout.write(self.style.SUCCESS(
+            f'已生成 {codec} 字典 #{dictionary.id}（{len(data)} 字节，{len(samples)} 个样本）；'
+            f'样本压缩率 {raw / max(plain, 1):.1f}x → {raw / max(with_dictionary, 1):.1f}x'
+        ))
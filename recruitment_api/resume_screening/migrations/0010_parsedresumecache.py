@@ -0,0 +1,31 @@
+# Generated by Django 5.0.14 on 2026-10-19 11:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0009_alter_resumegroup_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedResumeCache',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='文件SHA-256')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('document_type', models.CharField(max_length=10, verbose_name='文档类型')),
+                ('text', models.TextField(verbose_name='解析文本')),
+                ('page_count', models.IntegerField(default=0, verbose_name='页数')),
+                ('extraction_ms', models.FloatField(default=0, verbose_name='解析耗时(毫秒)')),
+                ('hit_count', models.IntegerField(default=0, verbose_name='缓存命中次数')),
+            ],
+            options={
+                'verbose_name': '简历解析缓存',
+                'verbose_name_plural': '简历解析缓存',
+                'db_table': 'parsed_resume_cache',
+            },
+        ),
+    ]
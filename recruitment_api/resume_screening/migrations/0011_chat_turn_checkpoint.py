@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0010_parsedresumecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatTurnCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('screening', '简历初筛'), ('final_evaluation', '面试后评估')], max_length=30, verbose_name='对话类型')),
+                ('task_key', models.CharField(max_length=64, verbose_name='任务标识')),
+                ('candidate', models.CharField(blank=True, default='', max_length=100, verbose_name='候选人')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='对话输入哈希')),
+                ('turn_index', models.IntegerField(verbose_name='发言轮次')),
+                ('speaker', models.CharField(max_length=100, verbose_name='发言者')),
+                ('message', models.JSONField(verbose_name='消息')),
+                ('is_final', models.BooleanField(default=False, verbose_name='对话已结束')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': '群聊检查点',
+                'verbose_name_plural': '群聊检查点',
+                'db_table': 'chat_turn_checkpoints',
+                'ordering': ['scope', 'task_key', 'candidate', 'turn_index'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='chatturncheckpoint',
+            constraint=models.UniqueConstraint(fields=('scope', 'task_key', 'candidate', 'fingerprint', 'turn_index'), name='unique_chat_turn_checkpoint'),
+        ),
+    ]
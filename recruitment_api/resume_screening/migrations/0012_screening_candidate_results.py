@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:22
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0011_chat_turn_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScreeningCandidateResult',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('position', models.IntegerField(default=0, verbose_name='简历顺序')),
+                ('candidate_name', models.CharField(max_length=100, verbose_name='候选人姓名')),
+                ('resume_payload', models.JSONField(verbose_name='简历')),
+                ('status', models.CharField(choices=[('pending', '等待中'), ('running', '进行中'), ('completed', '已完成'), ('failed', '失败')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0, verbose_name='执行次数')),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('report', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidate_results', to='resume_screening.screeningreport')),
+                ('resume_data', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidate_results', to='resume_screening.resumedata')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_results', to='resume_screening.resumescreeningtask')),
+            ],
+            options={
+                'verbose_name': '初筛候选人结果',
+                'verbose_name_plural': '初筛候选人结果',
+                'db_table': 'screening_candidate_results',
+                'ordering': ['task', 'position'],
+                'indexes': [models.Index(fields=['task', 'status'], name='screening_c_task_id_2fbaac_idx')],
+            },
+        ),
+    ]
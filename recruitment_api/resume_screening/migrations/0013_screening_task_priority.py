@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0012_screening_candidate_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumescreeningtask',
+            name='priority',
+            field=models.CharField(choices=[('interactive', '交互式'), ('bulk', '批量')], default='interactive', max_length=20, verbose_name='优先级'),
+        ),
+        migrations.AddField(
+            model_name='resumescreeningtask',
+            name='submitter',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='提交人'),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+import resume_screening.text_blobs
+
+# (模型, 字段) —— 原来的文本列迁移为压缩文本
+COMPRESSED_FIELDS = [
+    ('ResumeData', 'resume_content'),
+    ('ResumeData', 'screening_summary'),
+    ('ResumeData', 'json_report_content'),
+    ('ScreeningReport', 'resume_content'),
+    ('ScreeningReport', 'json_report_content'),
+]
+
+
+def compress_texts(apps, schema_editor):
+    from resume_screening.text_blobs import StoredText, store_text
+
+    TextBlob = apps.get_model('resume_screening', 'TextBlob')
+    for model_name, field_name in COMPRESSED_FIELDS:
+        model = apps.get_model('resume_screening', model_name)
+        rows = model.objects.exclude(**{f'{field_name}__isnull': True}).values_list('pk', field_name)
+        for pk, text in rows.iterator():
+            digest = store_text(text, blob_model=TextBlob, use_dictionary=False)
+            model.objects.filter(pk=pk).update(**{f'{field_name}_sha256': StoredText(digest)})
+
+
+def decompress_texts(apps, schema_editor):
+    from resume_screening.text_blobs import load_texts
+
+    TextBlob = apps.get_model('resume_screening', 'TextBlob')
+    CompressionDictionary = apps.get_model('resume_screening', 'CompressionDictionary')
+    for model_name, field_name in COMPRESSED_FIELDS:
+        model = apps.get_model('resume_screening', model_name)
+        stored = f'{field_name}_sha256'
+        for pk, ref in model.objects.exclude(**{f'{stored}__isnull': True}).values_list('pk', stored).iterator():
+            text = load_texts([ref.sha256], blob_model=TextBlob, dictionary_model=CompressionDictionary)[ref.sha256]
+            model.objects.filter(pk=pk).update(**{field_name: text})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0013_screening_task_priority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompressionDictionary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('codec', models.CharField(max_length=10, verbose_name='压缩编码')),
+                ('data', models.BinaryField(verbose_name='字典内容')),
+                ('sample_count', models.IntegerField(default=0, verbose_name='训练样本数')),
+            ],
+            options={
+                'verbose_name': '压缩字典',
+                'verbose_name_plural': '压缩字典',
+                'db_table': 'compression_dictionaries',
+            },
+        ),
+        migrations.CreateModel(
+            name='TextBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='文本SHA-256')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('codec', models.CharField(max_length=10, verbose_name='压缩编码')),
+                ('data', models.BinaryField(verbose_name='压缩内容')),
+                ('size', models.IntegerField(default=0, verbose_name='原文字节数')),
+                ('stored_size', models.IntegerField(default=0, verbose_name='压缩后字节数')),
+                ('dictionary', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='blobs', to='resume_screening.compressiondictionary')),
+            ],
+            options={
+                'verbose_name': '压缩文本',
+                'verbose_name_plural': '压缩文本',
+                'db_table': 'text_blobs',
+            },
+        ),
+        *[
+            migrations.AddField(
+                model_name=model_name.lower(),
+                name=f'{field_name}_sha256',
+                field=resume_screening.text_blobs.CompressedTextField(blank=True, null=True),
+            )
+            for model_name, field_name in COMPRESSED_FIELDS
+        ],
+        # 回滚时重新添加的原文本列先允许为空，回填后再恢复非空约束
+        migrations.AlterField(
+            model_name='resumedata',
+            name='resume_content',
+            field=models.TextField(null=True, verbose_name='简历内容'),
+        ),
+        migrations.RunPython(compress_texts, decompress_texts),
+        *[
+            migrations.RemoveField(model_name=model_name.lower(), name=field_name)
+            for model_name, field_name in COMPRESSED_FIELDS
+        ],
+        *[
+            migrations.RenameField(model_name=model_name.lower(), old_name=f'{field_name}_sha256', new_name=field_name)
+            for model_name, field_name in COMPRESSED_FIELDS
+        ],
+        migrations.AlterField(
+            model_name='resumedata',
+            name='resume_content',
+            field=resume_screening.text_blobs.CompressedTextField(verbose_name='简历内容'),
+        ),
+        migrations.AlterField(
+            model_name='resumedata',
+            name='screening_summary',
+            field=resume_screening.text_blobs.CompressedTextField(blank=True, null=True, verbose_name='筛选总结'),
+        ),
+        migrations.AlterField(
+            model_name='resumedata',
+            name='json_report_content',
+            field=resume_screening.text_blobs.CompressedTextField(blank=True, null=True, verbose_name='JSON报告内容'),
+        ),
+        migrations.AlterField(
+            model_name='screeningreport',
+            name='resume_content',
+            field=resume_screening.text_blobs.CompressedTextField(blank=True, null=True, verbose_name='简历内容'),
+        ),
+        migrations.AlterField(
+            model_name='screeningreport',
+            name='json_report_content',
+            field=resume_screening.text_blobs.CompressedTextField(blank=True, null=True, verbose_name='JSON报告内容'),
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.utils import timezone
 import uuid
 import hashlib
 
+from .text_blobs import CompressedTextField
+
 
 class ResumeScreeningTask(models.Model):
     """简历初筛任务模型"""
@@ -12,6 +14,10 @@ class ResumeScreeningTask(models.Model):
         ('completed', '已完成'),
         ('failed', '失败')
     ]
+    PRIORITY_CHOICES = [
+        ('interactive', '交互式'),
+        ('bulk', '批量')
+    ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
@@ -23,6 +29,9 @@ class ResumeScreeningTask(models.Model):
     current_speaker = models.CharField(max_length=100, blank=True, null=True)  # 当前发言者
     # 添加岗位信息字段
     position_data = models.JSONField(null=True, blank=True, verbose_name="岗位信息")
+    # 调度：优先级（交互式优先于批量）和提交人（同一优先级内按提交人公平排队）
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='interactive', verbose_name="优先级")
+    submitter = models.CharField(max_length=100, blank=True, default='', verbose_name="提交人")
 
     class Meta:
         db_table = 'resume_screening_tasks'
@@ -37,15 +46,48 @@ class ScreeningReport(models.Model):
     md_file = models.FileField(upload_to='screening_reports/%Y/%m/%d/')
     original_filename = models.CharField(max_length=255)
     # 添加简历内容字段
-    resume_content = models.TextField(null=True, blank=True, verbose_name="简历内容")
+    resume_content = CompressedTextField(null=True, blank=True, verbose_name="简历内容")
     # 添加JSON报告内容字段
-    json_report_content = models.TextField(null=True, blank=True, verbose_name="JSON报告内容")
+    json_report_content = CompressedTextField(null=True, blank=True, verbose_name="JSON报告内容")
 
     class Meta:
         db_table = 'screening_reports'
         ordering = ['-created_at']
 
 
+class ScreeningCandidateResult(models.Model):
+    """初筛任务中单个候选人的子任务 - 每位候选人评审完成即保存结果，失败互不影响，可单独重试"""
+    STATUS_CHOICES = [
+        ('pending', '等待中'),
+        ('running', '进行中'),
+        ('completed', '已完成'),
+        ('failed', '失败')
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.ForeignKey(ResumeScreeningTask, on_delete=models.CASCADE, related_name='candidate_results')
+    position = models.IntegerField(default=0, verbose_name="简历顺序")
+    candidate_name = models.CharField(max_length=100, verbose_name="候选人姓名")
+    # 已解析为纯文本的简历（name/content/metadata），重试时无需前端重新提交
+    resume_payload = models.JSONField(verbose_name="简历")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0, verbose_name="执行次数")
+    error_message = models.TextField(blank=True, null=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    report = models.ForeignKey(ScreeningReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='candidate_results')
+    resume_data = models.ForeignKey('ResumeData', on_delete=models.SET_NULL, null=True, blank=True, related_name='candidate_results')
+
+    class Meta:
+        db_table = 'screening_candidate_results'
+        ordering = ['task', 'position']
+        verbose_name = "初筛候选人结果"
+        verbose_name_plural = "初筛候选人结果"
+        indexes = [
+            models.Index(fields=['task', 'status']),
+        ]
+
+
 class ResumeGroup(models.Model):
     """简历组模型 - 用于组织具有相同岗位信息的简历"""
     # 状态选项
@@ -101,18 +143,18 @@ class ResumeData(models.Model):
     
     # 候选人信息
     candidate_name = models.CharField(max_length=100, verbose_name="候选人姓名")
-    resume_content = models.TextField(verbose_name="简历内容")
+    resume_content = CompressedTextField(verbose_name="简历内容")
     
     # 筛选结果
     screening_score = models.JSONField(null=True, blank=True, verbose_name="筛选评分")
-    screening_summary = models.TextField(null=True, blank=True, verbose_name="筛选总结")
+    screening_summary = CompressedTextField(null=True, blank=True, verbose_name="筛选总结")
     
     # 文件存储
     resume_file_hash = models.CharField(max_length=64, unique=True, verbose_name="简历文件哈希值")
     report_md_file = models.FileField(upload_to='screening_reports/%Y/%m/%d/', null=True, blank=True, verbose_name="报告MD文件")
     report_json_file = models.FileField(upload_to='screening_reports/%Y/%m/%d/', null=True, blank=True, verbose_name="报告JSON文件")
     # 添加JSON报告内容字段
-    json_report_content = models.TextField(null=True, blank=True, verbose_name="JSON报告内容")
+    json_report_content = CompressedTextField(null=True, blank=True, verbose_name="JSON报告内容")
     
     # 关联任务
     task = models.ForeignKey(ResumeScreeningTask, on_delete=models.SET_NULL, null=True, blank=True, related_name='resume_data')
@@ -134,4 +176,78 @@ class ResumeData(models.Model):
             models.Index(fields=['position_title']),
             models.Index(fields=['resume_file_hash']),
             models.Index(fields=['created_at']),
-        ]
\ No newline at end of file
+        ]
+
+class CompressionDictionary(models.Model):
+    """压缩文本的共享字典 - 由已有报告训练，新写入的文本使用最新的字典压缩"""
+    created_at = models.DateTimeField(default=timezone.now)
+    codec = models.CharField(max_length=10, verbose_name="压缩编码")
+    data = models.BinaryField(verbose_name="字典内容")
+    sample_count = models.IntegerField(default=0, verbose_name="训练样本数")
+
+    class Meta:
+        db_table = 'compression_dictionaries'
+        verbose_name = "压缩字典"
+        verbose_name_plural = "压缩字典"
+
+
+class TextBlob(models.Model):
+    """压缩文本 - 以文本SHA-256为键，简历内容、JSON报告等相同文本只存一份（见 text_blobs.py）"""
+    sha256 = models.CharField(max_length=64, primary_key=True, verbose_name="文本SHA-256")
+    created_at = models.DateTimeField(default=timezone.now)
+    codec = models.CharField(max_length=10, verbose_name="压缩编码")
+    dictionary = models.ForeignKey(CompressionDictionary, on_delete=models.PROTECT, null=True, blank=True, related_name='blobs')
+    data = models.BinaryField(verbose_name="压缩内容")
+    size = models.IntegerField(default=0, verbose_name="原文字节数")
+    stored_size = models.IntegerField(default=0, verbose_name="压缩后字节数")
+
+    class Meta:
+        db_table = 'text_blobs'
+        verbose_name = "压缩文本"
+        verbose_name_plural = "压缩文本"
+
+
+class ParsedResumeCache(models.Model):
+    """简历文档解析缓存 - 以文件SHA-256为键，重复上传的PDF/DOCX无需再次解析"""
+    sha256 = models.CharField(max_length=64, primary_key=True, verbose_name="文件SHA-256")
+    created_at = models.DateTimeField(default=timezone.now)
+    document_type = models.CharField(max_length=10, verbose_name="文档类型")
+    text = models.TextField(verbose_name="解析文本")
+    page_count = models.IntegerField(default=0, verbose_name="页数")
+    extraction_ms = models.FloatField(default=0, verbose_name="解析耗时(毫秒)")
+    hit_count = models.IntegerField(default=0, verbose_name="缓存命中次数")
+
+    class Meta:
+        db_table = 'parsed_resume_cache'
+        verbose_name = "简历解析缓存"
+        verbose_name_plural = "简历解析缓存"
+
+
+class ChatTurnCheckpoint(models.Model):
+    """多智能体群聊发言检查点 - 每轮发言完成后保存，任务失败重试时从最后一轮继续，已完成的发言不再调用LLM"""
+    SCOPE_CHOICES = [
+        ('screening', '简历初筛'),
+        ('final_evaluation', '面试后评估'),
+    ]
+
+    scope = models.CharField(max_length=30, choices=SCOPE_CHOICES, verbose_name="对话类型")
+    task_key = models.CharField(max_length=64, verbose_name="任务标识")  # 初筛为岗位信息哈希，面试后评估为简历组ID
+    candidate = models.CharField(max_length=100, blank=True, default='', verbose_name="候选人")
+    fingerprint = models.CharField(max_length=64, verbose_name="对话输入哈希")  # 输入变化后旧检查点作废
+    turn_index = models.IntegerField(verbose_name="发言轮次")
+    speaker = models.CharField(max_length=100, verbose_name="发言者")
+    message = models.JSONField(verbose_name="消息")
+    is_final = models.BooleanField(default=False, verbose_name="对话已结束")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'chat_turn_checkpoints'
+        ordering = ['scope', 'task_key', 'candidate', 'turn_index']
+        verbose_name = "群聊检查点"
+        verbose_name_plural = "群聊检查点"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'task_key', 'candidate', 'fingerprint', 'turn_index'],
+                name='unique_chat_turn_checkpoint'
+            ),
+        ]
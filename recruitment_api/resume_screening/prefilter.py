@@ -0,0 +1,384 @@
+"""
+简历快速预筛选模块
+在调用多 Agent LLM 评审之前，按岗位标准对简历做确定性的低成本打分：
+
+- 技能匹配：对 required_skills / optional_skills（含同义词）做多关键词匹配（前缀树编译成的正则，一次扫描）
+- 工作年限：正则提取简历中声明的工作年限，与 min_experience 比较
+- 学历匹配：识别简历中的最高学历，与岗位 education 要求比较
+
+得分低于阈值或未命中任何必备技能的候选人直接判定为“不匹配”，不再进入 LLM 评审。
+简历中无法识别的年限/学历按“未知”处理，得该维度一半的分数；岗位未设置加分技能时，
+加分技能维度按必备技能的匹配比例计分。
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .keyword_matcher import KeywordMatcher
+
+# 默认配置（可在 settings 或岗位信息中覆盖）
+DEFAULT_THRESHOLD = 35.0
+MATCHER_CACHE_SIZE = 32
+
+# 年限/学历无法识别时该维度的得分比例
+UNKNOWN_CREDIT = 0.5
+
+# 岗位技能项中的可替代写法分隔符（如 PyTorch/TensorFlow、Vue、React）
+_SKILL_ALTERNATIVE_SEPARATORS = re.compile(r"[/、|｜]")
+_SKILL_QUOTES = "\"'“”‘’「」『』"
+
+# 各维度权重（满分 100）
+SCORE_WEIGHTS = {
+    "required_skills": 60,
+    "optional_skills": 15,
+    "experience": 15,
+    "education": 10,
+}
+
+# 常见技能同义词（统一小写匹配），岗位信息中的 skill_synonyms 会与之合并
+SKILL_SYNONYMS = {
+    "javascript": ["js", "es6", "ecmascript"],
+    "typescript": ["ts"],
+    "html": ["html5"],
+    "css": ["css3", "scss", "sass", "less"],
+    "vue.js": ["vue", "vue2", "vue3", "vuejs"],
+    "vue3": ["vue 3", "vue.js 3"],
+    "react": ["react.js", "reactjs"],
+    "node.js": ["node", "nodejs"],
+    "python": ["python3"],
+    "golang": ["go语言"],
+    "c++": ["cpp"],
+    "postgresql": ["postgres", "pgsql"],
+    "mysql": ["mariadb"],
+    "kubernetes": ["k8s"],
+    "ai": ["人工智能", "机器学习", "深度学习", "大模型", "llm"],
+    "机器学习": ["machine learning"],
+    "深度学习": ["deep learning"],
+}
+
+# 学历等级（数值越大学历越高）
+EDUCATION_LEVELS = {
+    "博士": 5, "phd": 5, "ph.d": 5,
+    "硕士": 4, "研究生": 4, "master's": 4, "master of": 4, "mba": 4,
+    "本科": 3, "学士": 3, "bachelor": 3,
+    "大专": 2, "专科": 2, "高职": 2, "associate": 2,
+    "高中": 1, "中专": 1, "中技": 1,
+}
+
+_CHINESE_NUMERALS = {
+    "一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5,
+    "六": 6, "七": 7, "八": 8, "九": 9, "十": 10,
+}
+
+_YEARS_PATTERNS = [
+    # 5年工作经验 / 3年以上开发经验 / 两年前端经验
+    re.compile(r"([0-9]+(?:\.[0-9]+)?|[一二两三四五六七八九十]+)\s*\+?\s*年(?:以上|多)?(?:的)?[一-龥A-Za-z]{0,8}?(?:经验|经历)"),
+    # 工作年限：5年 / 从业年限: 3
+    re.compile(r"(?:工作|从业|开发)年限\s*[：:]?\s*([0-9]+(?:\.[0-9]+)?|[一二两三四五六七八九十]+)"),
+    # 工作经验: 3年 / 经验：两年
+    re.compile(r"(?:工作|开发)?经验\s*[：:]\s*([0-9]+(?:\.[0-9]+)?|[一二两三四五六七八九十]+)\s*年"),
+    # 5 years of experience / 3+ yrs experience
+    re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*\+?\s*(?:years?|yrs?)\b(?:\s+of)?(?:\s+\w+){0,3}?\s+experience", re.IGNORECASE),
+]
+
+_matcher_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_matcher_cache_lock = threading.Lock()
+_education_matcher = KeywordMatcher(EDUCATION_LEVELS)
+
+
+def _parse_number(token: str) -> Optional[float]:
+    """解析阿拉伯数字或简单中文数字（如 三、十二）"""
+    try:
+        return float(token)
+    except ValueError:
+        pass
+    if token == "十":
+        return 10.0
+    if token.startswith("十"):
+        return 10.0 + _CHINESE_NUMERALS.get(token[1:], 0)
+    if "十" in token:
+        tens, _, units = token.partition("十")
+        return _CHINESE_NUMERALS.get(tens, 0) * 10.0 + _CHINESE_NUMERALS.get(units, 0)
+    return float(_CHINESE_NUMERALS[token]) if token in _CHINESE_NUMERALS else None
+
+
+def extract_years_of_experience(text: str) -> Optional[float]:
+    """
+    从简历文本中提取声明的工作年限
+
+    Args:
+        text: 简历文本
+
+    Returns:
+        float: 声明的最大工作年限；未找到时返回 None
+    """
+    years = []
+    for pattern in _YEARS_PATTERNS:
+        for match in pattern.finditer(text or ""):
+            value = _parse_number(match.group(1))
+            # 过滤明显不合理的数值（如把年份误识别为年限）
+            if value is not None and 0 < value <= 50:
+                years.append(value)
+    return max(years) if years else None
+
+
+def extract_education_level(text: str) -> Optional[int]:
+    """
+    识别简历中出现的最高学历等级
+
+    Returns:
+        int: 学历等级（见 EDUCATION_LEVELS），未识别时返回 None
+    """
+    levels = _education_matcher.matched_values(text or "")
+    return max(levels) if levels else None
+
+
+def skill_alternatives(skill: str) -> List[str]:
+    """
+    拆分岗位技能项中的可替代写法（如 "PyTorch/TensorFlow" 命中其一即可），并去掉多余的引号
+
+    Args:
+        skill: 岗位标准中的技能项
+
+    Returns:
+        list: 可替代的技能关键词
+    """
+    return [
+        part.strip().strip(_SKILL_QUOTES).strip()
+        for part in _SKILL_ALTERNATIVE_SEPARATORS.split(skill)
+        if part.strip().strip(_SKILL_QUOTES).strip()
+    ]
+
+
+def _criteria_cache_key(position: Dict[str, Any]) -> str:
+    keys = ("required_skills", "optional_skills", "skill_synonyms")
+    return json.dumps({k: position.get(k) for k in keys}, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _build_skill_matcher(position: Dict[str, Any]) -> Dict[str, Any]:
+    """根据岗位技能要求（含同义词）编译匹配器"""
+    synonyms = {k.lower(): list(v) for k, v in SKILL_SYNONYMS.items()}
+    for skill, aliases in (position.get("skill_synonyms") or {}).items():
+        synonyms.setdefault(str(skill).lower(), []).extend(aliases or [])
+
+    def clean(skills):
+        return [str(s).strip().strip(_SKILL_QUOTES).strip() for s in skills or [] if skill_alternatives(str(s))]
+
+    required = clean(position.get("required_skills"))
+    optional = clean(position.get("optional_skills"))
+
+    matcher = KeywordMatcher()
+    for group, skills in (("required", required), ("optional", optional)):
+        for skill in skills:
+            value = (group, skill)
+            for alternative in skill_alternatives(skill):
+                matcher.add(alternative, value)
+                for alias in synonyms.get(alternative.lower(), []):
+                    matcher.add(alias, value)
+    # 学历关键词并入同一个匹配器，一次扫描同时完成技能与学历识别
+    for term, level in EDUCATION_LEVELS.items():
+        matcher.add(term, ("education", level))
+    matcher.build()
+
+    return {"matcher": matcher, "required": required, "optional": optional}
+
+
+def get_skill_matcher(position: Dict[str, Any]) -> Dict[str, Any]:
+    """获取岗位对应的已编译技能匹配器（按技能配置缓存，LRU 淘汰）"""
+    key = _criteria_cache_key(position)
+    with _matcher_cache_lock:
+        compiled = _matcher_cache.get(key)
+        if compiled is not None:
+            _matcher_cache.move_to_end(key)
+            return compiled
+
+    compiled = _build_skill_matcher(position)
+    with _matcher_cache_lock:
+        _matcher_cache[key] = compiled
+        while len(_matcher_cache) > MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return compiled
+
+
+def _required_education_level(position: Dict[str, Any]) -> Optional[int]:
+    """岗位可接受的最低学历等级"""
+    levels = []
+    for item in position.get("education") or []:
+        level = EDUCATION_LEVELS.get(str(item).strip().lower())
+        if level is None:
+            matched = _education_matcher.matched_values(str(item))
+            level = min(matched) if matched else None
+        if level is not None:
+            levels.append(level)
+    return min(levels) if levels else None
+
+
+def resolve_threshold(position: Dict[str, Any], threshold: Optional[float] = None) -> float:
+    """
+    确定预筛选阈值：显式传入 > 岗位信息中的 prefilter_threshold > settings.RESUME_PREFILTER_THRESHOLD
+    """
+    if threshold is not None:
+        return float(threshold)
+    if isinstance(position, dict) and position.get("prefilter_threshold") is not None:
+        return float(position["prefilter_threshold"])
+    try:
+        from django.conf import settings
+        return float(getattr(settings, "RESUME_PREFILTER_THRESHOLD", DEFAULT_THRESHOLD))
+    except Exception:
+        return DEFAULT_THRESHOLD
+
+
+def prefilter_resume(position: Dict[str, Any], resume_text: str, threshold: Optional[float] = None) -> Dict[str, Any]:
+    """
+    对单份简历进行快速预筛选打分
+
+    Args:
+        position: 岗位信息（required_skills, optional_skills, min_experience, education 等）
+        resume_text: 简历纯文本
+        threshold: 可选，预筛选阈值（默认见 resolve_threshold）
+
+    Returns:
+        dict: score（0-100）、passed、threshold、各维度明细以及不通过时的 reasons
+    """
+    threshold = resolve_threshold(position, threshold)
+    compiled = get_skill_matcher(position)
+    matched = compiled["matcher"].matched_values(resume_text or "")
+
+    required, optional = compiled["required"], compiled["optional"]
+    matched_required = [s for s in required if ("required", s) in matched]
+    matched_optional = [s for s in optional if ("optional", s) in matched]
+    missing_required = [s for s in required if ("required", s) not in matched]
+
+    required_ratio = len(matched_required) / len(required) if required else 1.0
+    score = 0.0
+    score += SCORE_WEIGHTS["required_skills"] * required_ratio
+    score += SCORE_WEIGHTS["optional_skills"] * (len(matched_optional) / len(optional) if optional else required_ratio)
+
+    reasons = []
+    if missing_required:
+        reasons.append(f"缺少必备技能: {', '.join(missing_required)}")
+
+    min_experience = position.get("min_experience") or 0
+    years = extract_years_of_experience(resume_text)
+    if not min_experience:
+        score += SCORE_WEIGHTS["experience"]
+    elif years is None:
+        score += SCORE_WEIGHTS["experience"] * UNKNOWN_CREDIT
+    else:
+        score += SCORE_WEIGHTS["experience"] * min(years / float(min_experience), 1.0)
+        if years < float(min_experience):
+            reasons.append(f"工作年限 {years:g} 年，低于要求的 {min_experience} 年")
+
+    required_level = _required_education_level(position)
+    education_levels = [value[1] for value in matched if value[0] == "education"]
+    education_level = max(education_levels) if education_levels else None
+    if required_level is None:
+        score += SCORE_WEIGHTS["education"]
+    elif education_level is None:
+        score += SCORE_WEIGHTS["education"] * UNKNOWN_CREDIT
+    elif education_level < required_level:
+        reasons.append(f"学历不满足要求（要求: {'/'.join(map(str, position.get('education') or []))}）")
+    else:
+        score += SCORE_WEIGHTS["education"]
+
+    score = round(score, 2)
+    # 必备技能一项都未命中时，其他维度得分再高也不通过
+    passed = score >= threshold and (not required or bool(matched_required))
+    if passed:
+        reasons = []
+    elif score < threshold:
+        reasons.insert(0, f"预筛选得分 {score} 低于阈值 {threshold:g}")
+    else:
+        reasons.insert(0, "未命中任何必备技能")
+
+    return {
+        "score": score,
+        "passed": passed,
+        "threshold": threshold,
+        "matched_required_skills": matched_required,
+        "missing_required_skills": missing_required,
+        "matched_optional_skills": matched_optional,
+        "years_of_experience": years,
+        "education_level": education_level,
+        "reasons": reasons,
+    }
+
+
+def prefilter_resumes(position: Dict[str, Any], resumes: List[Dict[str, Any]], threshold: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    批量预筛选简历
+
+    Args:
+        position: 岗位信息
+        resumes: 简历列表，每项包含 `name`, `content`
+        threshold: 可选，预筛选阈值
+
+    Returns:
+        dict: 简历名称 -> prefilter_resume 的结果
+    """
+    threshold = resolve_threshold(position, threshold)
+    return {
+        item.get("name") or f"resume_{idx}": prefilter_resume(position, item.get("content", ""), threshold)
+        for idx, item in enumerate(resumes)
+    }
+
+
+def build_rejection_report(candidate_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    为未通过预筛选的候选人生成与 LLM 评审结果相同结构的报告
+
+    Returns:
+        dict: 可直接写入 resumes/<候选人>.json 的报告数据
+    """
+    reasons = "；".join(result["reasons"])
+    return {
+        "file_name": "招聘评审结果.md",
+        "name": candidate_name,
+        "scores": {
+            "hr_score": 0.0,
+            "technical_score": 0.0,
+            "manager_score": 0.0,
+            "comprehensive_score": result["score"],
+        },
+        "salary_suggestions": {
+            "hr_suggestion": "",
+            "technical_suggestion": "",
+            "manager_suggestion": "",
+            "final_suggestion": "",
+        },
+        "review_comments": {
+            "hr_comments": "",
+            "technical_comments": "",
+            "manager_comments": "",
+        },
+        "final_recommendation": {
+            "decision": "不匹配",
+            "reasons": reasons,
+        },
+        "prefilter": result,
+        "conversation_history": [],
+    }
+
+
+def render_rejection_markdown(candidate_name: str, result: Dict[str, Any]) -> str:
+    """生成未通过预筛选的候选人 Markdown 报告"""
+    lines = [
+        "# 企业招聘简历评审报告",
+        "",
+        "## 预筛选结果",
+        "",
+        f"- 候选人：{candidate_name}",
+        f"- 综合评分：{result['score']}分（阈值 {result['threshold']:g}）",
+        "- 最终建议：不匹配",
+        f"- 已匹配必备技能：{', '.join(result['matched_required_skills']) or '无'}",
+        f"- 缺少必备技能：{', '.join(result['missing_required_skills']) or '无'}",
+    ]
+    if result["years_of_experience"] is not None:
+        lines.append(f"- 声明工作年限：{result['years_of_experience']:g}年")
+    lines += ["", "### 不匹配原因", ""]
+    lines += [f"- {reason}" for reason in result["reasons"]]
+    lines += ["", "该候选人未通过规则预筛选，未进入多专家评审流程。", ""]
+    return "\n".join(lines)
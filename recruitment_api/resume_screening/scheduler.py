@@ -0,0 +1,226 @@
+"""
+初筛任务调度器
+每位候选人的多专家评审（一次群聊）是一个调度单元，所有提交共用同一组执行槽位：
+
+- 优先级：交互式（少量简历、招聘人员等待结果）优先于批量（大批量导入）
+- 公平排队：同一优先级内按提交人（未提供时按岗位）分流，做加权公平排队，
+  大批量提交不会让其他提交人的简历一直排在后面
+- 并发上限：同时进行的群聊数不超过 settings.SCREENING_MAX_CONCURRENT_CHATS
+
+队列在进程内存中维护，接口可查询任务的排队位置和预计开始时间。服务重启后队列为空，
+重启前排队或执行中的子任务由 screening_tasks.recover_interrupted_tasks 重新入队。
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import timedelta
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_CLASSES = ('interactive', 'bulk')
+
+DEFAULT_MAX_CONCURRENT_CHATS = 2
+DEFAULT_INTERACTIVE_MAX_RESUMES = 5
+# 尚无完成记录时假定的单次群聊耗时（秒）
+DEFAULT_ESTIMATED_CHAT_SECONDS = 90.0
+# 单次群聊耗时滑动平均的平滑系数
+DURATION_SMOOTHING = 0.2
+
+
+@dataclass(order=True)
+class ScheduledUnit:
+    """调度单元（一位候选人的评审）"""
+    finish_tag: float
+    sequence: int
+    start_tag: float = field(compare=False)
+    task_id: Any = field(compare=False)
+    result_id: Any = field(compare=False)
+    priority: str = field(compare=False)
+    flow: str = field(compare=False)
+
+
+def default_priority(resume_count: int) -> str:
+    """未指定优先级时：简历数不超过 settings.SCREENING_INTERACTIVE_MAX_RESUMES 为交互式，否则为批量"""
+    limit = getattr(settings, 'SCREENING_INTERACTIVE_MAX_RESUMES', DEFAULT_INTERACTIVE_MAX_RESUMES)
+    return 'interactive' if resume_count <= limit else 'bulk'
+
+
+def _start_thread(target: Callable[[], None]):
+    threading.Thread(target=target, daemon=True).start()
+
+
+class ScreeningScheduler:
+    """
+    初筛调度器
+
+    Args:
+        runner: 执行调度单元的函数 runner(task_id, result_id)
+        max_concurrent: 并发群聊上限（默认读取 settings.SCREENING_MAX_CONCURRENT_CHATS）
+        spawn: 启动工作线程的函数（测试中可替换为同步执行）
+    """
+
+    def __init__(self, runner: Callable[[Any, Any], Any], max_concurrent: Optional[int] = None,
+                 spawn: Callable[[Callable[[], None]], None] = _start_thread):
+        self._runner = runner
+        self._max_concurrent = max_concurrent
+        self._spawn = spawn
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._queues: Dict[str, List[ScheduledUnit]] = {priority: [] for priority in PRIORITY_CLASSES}
+        # 各优先级的虚拟时间，以及各分流最后一个单元的结束标签
+        self._virtual_time = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self._last_finish: Dict[tuple, float] = {}
+        self._running: Dict[Any, ScheduledUnit] = {}
+        self._average_seconds: Optional[float] = None
+
+    @property
+    def max_concurrent(self) -> int:
+        if self._max_concurrent is not None:
+            return self._max_concurrent
+        return max(1, int(getattr(settings, 'SCREENING_MAX_CONCURRENT_CHATS', DEFAULT_MAX_CONCURRENT_CHATS)))
+
+    @staticmethod
+    def flow_weight(flow: str) -> float:
+        """分流权重（settings.SCREENING_FLOW_WEIGHTS 可为指定提交人或岗位配置更高的份额）"""
+        return float(getattr(settings, 'SCREENING_FLOW_WEIGHTS', {}).get(flow, 1.0))
+
+    def submit(self, task_id, result_ids: Iterable, priority: str = 'interactive', flow: str = '') -> int:
+        """
+        提交任务的候选人子任务
+
+        Args:
+            task_id: 初筛任务ID
+            result_ids: 候选人子任务ID（按评审顺序）
+            priority: 优先级（interactive / bulk）
+            flow: 公平排队的分流标识（提交人或岗位）
+
+        Returns:
+            入队的单元数
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"未知的优先级: {priority}")
+
+        weight = self.flow_weight(flow)
+        count = 0
+        with self._lock:
+            queued = {unit.result_id for queue in self._queues.values() for unit in queue} | set(self._running)
+            for result_id in result_ids:
+                if result_id in queued:
+                    continue
+                # 加权公平排队：起始标签取虚拟时间与该分流上一单元结束标签的较大者，按结束标签先后出队
+                start = max(self._virtual_time[priority], self._last_finish.get((priority, flow), 0.0))
+                finish = start + 1.0 / weight
+                self._last_finish[(priority, flow)] = finish
+                heapq.heappush(self._queues[priority], ScheduledUnit(
+                    finish_tag=finish, sequence=next(self._sequence), start_tag=start,
+                    task_id=task_id, result_id=result_id, priority=priority, flow=flow
+                ))
+                count += 1
+            dispatched = self._dispatch_locked()
+
+        for unit in dispatched:
+            self._spawn(lambda unit=unit: self._execute(unit))
+        return count
+
+    def _dispatch_locked(self) -> List[ScheduledUnit]:
+        """在空闲槽位上按优先级和公平排队顺序取出单元（调用方持有锁）"""
+        dispatched = []
+        while len(self._running) < self.max_concurrent:
+            unit = self._pop_next_locked()
+            if unit is None:
+                break
+            self._running[unit.result_id] = unit
+            dispatched.append(unit)
+        return dispatched
+
+    def _pop_next_locked(self) -> Optional[ScheduledUnit]:
+        for priority in PRIORITY_CLASSES:
+            queue = self._queues[priority]
+            if queue:
+                unit = heapq.heappop(queue)
+                self._virtual_time[priority] = max(self._virtual_time[priority], unit.start_tag)
+                return unit
+        return None
+
+    def _execute(self, unit: ScheduledUnit):
+        started = time.monotonic()
+        try:
+            self._runner(unit.task_id, unit.result_id)
+        except Exception as e:
+            logger.error(f"初筛调度单元执行失败 {unit.task_id}/{unit.result_id}: {e}")
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._running.pop(unit.result_id, None)
+                self._average_seconds = elapsed if self._average_seconds is None else (
+                    DURATION_SMOOTHING * elapsed + (1 - DURATION_SMOOTHING) * self._average_seconds
+                )
+                dispatched = self._dispatch_locked()
+            for next_unit in dispatched:
+                self._spawn(lambda next_unit=next_unit: self._execute(next_unit))
+
+    def tracked_result_ids(self) -> set:
+        """本调度器中排队或执行中的子任务ID"""
+        with self._lock:
+            return {unit.result_id for queue in self._queues.values() for unit in queue} | set(self._running)
+
+    def average_chat_seconds(self) -> float:
+        """单次群聊的平均耗时（尚无记录时使用 settings.SCREENING_ESTIMATED_CHAT_SECONDS）"""
+        if self._average_seconds is not None:
+            return self._average_seconds
+        return float(getattr(settings, 'SCREENING_ESTIMATED_CHAT_SECONDS', DEFAULT_ESTIMATED_CHAT_SECONDS))
+
+    def queue_status(self, task_id) -> Optional[Dict[str, Any]]:
+        """
+        任务的排队信息（任务没有排队或执行中的单元时返回 None）
+
+        Returns:
+            queue_position（第一个排队单元之前的单元数）、queued_candidates、running_candidates、
+            estimated_wait_seconds、estimated_start_at
+        """
+        with self._lock:
+            order = [unit for priority in PRIORITY_CLASSES for unit in sorted(self._queues[priority])]
+            running = len(self._running)
+            task_running = sum(1 for unit in self._running.values() if unit.task_id == task_id)
+            average = self.average_chat_seconds()
+            slots = self.max_concurrent
+
+        positions = [index for index, unit in enumerate(order) if unit.task_id == task_id]
+        if not positions and not task_running:
+            return None
+
+        status = {
+            'queued_candidates': len(positions),
+            'running_candidates': task_running,
+            'queue_position': positions[0] if positions else None,
+            'estimated_wait_seconds': None,
+            'estimated_start_at': None,
+        }
+        if positions:
+            # 执行中和排在前面的单元按槽位数分批完成
+            wait = ((positions[0] + running) // slots) * average
+            status['estimated_wait_seconds'] = round(wait, 1)
+            status['estimated_start_at'] = (timezone.now() + timedelta(seconds=wait)).isoformat()
+        return status
+
+
+_scheduler: Optional[ScreeningScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> ScreeningScheduler:
+    """获取进程内共享的初筛调度器"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from .screening_tasks import run_scheduled_unit
+            _scheduler = ScreeningScheduler(runner=run_scheduled_unit)
+        return _scheduler
@@ -4,10 +4,14 @@ import json
 import re
 import json as json_module
 import hashlib
+import threading
 from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
 from typing import Dict, List, Any, Tuple, Optional
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
 import datetime
+from .document_extraction import detect_document_type, extract_resume_files
+from .prefilter import prefilter_resume, build_rejection_report, render_rejection_markdown
+from .chat_checkpoint import CheckpointedGroupChat, checkpoint_fingerprint, run_checkpointed_chat
 
 os.environ["PYTHONIOENCODING"] = "utf-8"
 
@@ -36,7 +40,7 @@ def read_resumes_from_folder(folder_path):
     读取文件夹中所有简历文件，从文件名提取姓名并返回文件内容
 
     参数:
-        folder_path (str): 包含简历文件的文件夹路径
+        folder_path (str): 包含简历文件的文件夹路径（支持 txt/md 等文本文件以及 PDF/DOCX 文档）
 
     返回:
         dict: 键为姓名，值为文件内容的字典
@@ -48,12 +52,19 @@ def read_resumes_from_folder(folder_path):
         if not os.path.exists(folder_path):
             raise FileNotFoundError(f"文件夹不存在: {folder_path}")
 
+        document_paths = []
+
         # 遍历文件夹中的所有文件
         for filename in os.listdir(folder_path):
             file_path = os.path.join(folder_path, filename)
 
             # 只处理文件，忽略子文件夹
             if os.path.isfile(file_path):
+                # PDF/DOCX 简历统一交给解析进程池处理
+                if detect_document_type(filename):
+                    document_paths.append(file_path)
+                    continue
+
                 # 从文件名提取姓名（去除扩展名）
                 name = os.path.splitext(filename)[0]
 
@@ -63,6 +74,10 @@ def read_resumes_from_folder(folder_path):
 
                 resumes[name] = content
 
+        for file_path, extracted in extract_resume_files(document_paths).items():
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            resumes[name] = extracted["text"]
+
     except Exception as e:
         print(f"读取文件时出错: {e}")
         return {}
@@ -79,10 +94,13 @@ def parse_position_resumes_json(data: Dict[str, Any]) -> Tuple[Dict[str, Any], L
       "position": { ... },
       "resumes": [
          {"name": "ABD.txt", "content": "简历详细文本...", "metadata": {"size": 3375, "type": "text/plain"}},
+         {"name": "李四.pdf", "content": "<base64编码的文件内容>", "metadata": {"size": 102400, "type": "application/pdf"}},
          ...
       ]
     }
 
+    PDF/DOCX 简历的 content 为 base64 编码的文件内容，由 document_extraction.extract_resume_payloads 解析为纯文本。
+
     返回：(position_dict, parsed_resumes_list)
     - position_dict: 原始的岗位对象（不会修改字段），调用方可进一步校验
     - parsed_resumes_list: 标准化后的简历列表，每项包含 `name`, `content`, `metadata`（至少含 `size` 和 `type`）
@@ -580,13 +598,15 @@ termination_condition = TextMentionTermination("APPROVE") | TextMentionTerminati
     20)
 
 
-# 全局变量用于存储当前任务对象
-current_task = None
+# 当前线程正在执行的任务对象（调度器并发执行多个任务时各线程互不影响）
+_current = threading.local()
+
+# 岗位量化标准是模块级共享状态，切换岗位和创建 Agents 时加锁
+_criteria_lock = threading.RLock()
 
 def set_current_task(task):
-    """设置当前任务对象"""
-    global current_task
-    current_task = task
+    """设置当前线程的任务对象"""
+    _current.task = task
 
 # 自定义发言选择函数
 def enhanced_speaker_selector(last_speaker: autogen.Agent, groupchat: GroupChat):
@@ -626,13 +646,14 @@ def enhanced_speaker_selector(last_speaker: autogen.Agent, groupchat: GroupChat)
     current_sequence = ["User_Proxy", "Assistant", "HR_Expert", "Technical_Expert", "Project_Manager_Expert", "Critic"]
     print(f"发言进度: {current_sequence}")
     
-    # 更新当前任务的发言者信息
+    # 更新当前任务的发言者信息（只写该字段，避免覆盖其他线程更新的进度）
+    current_task = getattr(_current, 'task', None)
     if current_task:
         if last_speaker:
             current_task.current_speaker = last_speaker.name
         else:
             current_task.current_speaker = "开始"
-        current_task.save()
+        current_task.save(update_fields=['current_speaker'])
     
     if last_speaker and next_speaker:
         print(f"当前: {last_speaker.name} -> 下一个: {next_speaker.name}")
@@ -851,8 +872,11 @@ def run_resume_screening(input_path: str = "origin_resumes", *, candidate_name:
     elif os.path.isfile(input_path):
         # 从单个文件读取
         name = os.path.splitext(os.path.basename(input_path))[0]
-        with open(input_path, 'r', encoding='utf-8') as f:
-            resumes_data = {name: f.read()}
+        if detect_document_type(input_path):
+            resumes_data = {name: extract_resume_files([input_path])[input_path]["text"]}
+        else:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                resumes_data = {name: f.read()}
     else:
         raise FileNotFoundError(f"输入路径不存在: {input_path}")
 
@@ -979,20 +1003,49 @@ def run_resume_screening(input_path: str = "origin_resumes", *, candidate_name:
         return f"报告已保存到 {final_md_path}（文件无法读取）。"
 
 
-def run_resume_screening_from_payload(position: Dict[str, Any], resumes: List[Dict[str, Any]], *, run_chat: bool = True) -> Dict[str, str]:
+def save_prefilter_rejection(candidate_name: str, prefilter_result: Dict[str, Any]):
+    """将未通过预筛选的候选人结果保存为与 LLM 评审相同格式的 MD/JSON 文件"""
+    current_script_dir = os.path.dirname(os.path.abspath(__file__))
+    resumes_dir = os.path.join(current_script_dir, 'resumes')
+
+    md_path = os.path.join(resumes_dir, f"{candidate_name}简历初筛结果.md")
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(render_rejection_markdown(candidate_name, prefilter_result))
+
+    json_path = os.path.join(resumes_dir, f"{candidate_name}.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json_module.dump(build_rejection_report(candidate_name, prefilter_result), f, ensure_ascii=False, indent=2)
+
+    print(f"候选人 {candidate_name} 未通过预筛选（得分 {prefilter_result['score']}），跳过多专家评审")
+
+
+def _prefilter_enabled(prefilter: Optional[bool]) -> bool:
+    if prefilter is not None:
+        return prefilter
+    try:
+        from django.conf import settings
+        return getattr(settings, "RESUME_PREFILTER_ENABLED", True)
+    except Exception:
+        return True
+
+
+def screening_checkpoint_key(position: Dict[str, Any]) -> str:
+    """初筛群聊检查点的任务标识（岗位信息哈希）"""
+    return checkpoint_fingerprint(position)
+
+
+def payload_candidate_names(resumes: List[Dict[str, Any]]) -> List[str]:
+    """候选人名称列表（与 run_resume_screening_from_payload 的命名方式一致）"""
+    return [os.path.splitext(item.get('name') or 'candidate')[0] for item in resumes]
+
+
+def prepare_screening_position(position: Dict[str, Any]):
     """
-    使用前端传来的岗位信息和已解析的简历列表生成初筛报告。
+    按传入的岗位信息更新内存中的量化标准（批量评审前调用一次）
 
     参数:
       - position: 岗位信息字典（同前端格式）
-      - resumes: 简历列表，每项包含 `name`, `content`, `metadata`
-      - run_chat: 是否执行 Agent 聊天流程（默认 True）。如果环境无 LLM，可设为 False，仅生成/保存文件框架。
-
-    返回:
-      - 一个字典，key 为候选人名称（文件名不含扩展），value 为生成的 MD 文件路径或 MD 内容字符串（如果可读取）。
     """
-    results = {}
-
     # 校验传入的岗位信息与本地量化标准文件的一致性
     md_file_path = "本岗位招聘量化标准.md"
     criteria_file_path = os.path.join("..", "position_settings", "migrations", "recruitment_criteria.json")
@@ -1027,17 +1080,49 @@ def run_resume_screening_from_payload(position: Dict[str, Any], resumes: List[Di
     resumes_dir = os.path.join(current_script_dir, 'resumes')
     os.makedirs(resumes_dir, exist_ok=True)
 
-    for item in resumes:
-        name = item.get('name') or 'candidate'
-        # 去掉扩展名作为候选人名称
-        candidate_name = os.path.splitext(name)[0]
-        resume_text = item.get('content', '')
+
+def screen_payload_resume(position: Dict[str, Any], item: Dict[str, Any], *, run_chat: bool = True,
+                          prefilter: Optional[bool] = None, prefilter_threshold: Optional[float] = None) -> Tuple[str, str]:
+    """
+    评审单份简历（需先调用 prepare_screening_position）
+
+    参数:
+      - position: 岗位信息字典
+      - item: 简历，包含 `name`, `content`, `metadata`
+      - run_chat / prefilter / prefilter_threshold: 同 run_resume_screening_from_payload
+
+    返回:
+      - (候选人名称, MD 报告内容)
+    """
+    current_script_dir = os.path.dirname(os.path.abspath(__file__))
+    resumes_dir = os.path.join(current_script_dir, 'resumes')
+
+    name = item.get('name') or 'candidate'
+    # 去掉扩展名作为候选人名称
+    candidate_name = os.path.splitext(name)[0]
+    resume_text = item.get('content', '')
+    md_filename = f"{candidate_name}简历初筛结果.md"
+    final_md_path = os.path.join(resumes_dir, md_filename)
+
+    # 规则预筛选：明显不匹配的候选人不进入多专家评审
+    if _prefilter_enabled(prefilter) and isinstance(position, dict):
+        prefilter_result = prefilter_resume(position, resume_text, prefilter_threshold)
+        item.setdefault('metadata', {})['prefilter'] = prefilter_result
+        if not prefilter_result['passed']:
+            save_prefilter_rejection(candidate_name, prefilter_result)
+            with open(final_md_path, 'r', encoding='utf-8') as f:
+                return candidate_name, f.read()
+
+    with _criteria_lock:
+        # 并发评审不同岗位时，在锁内切换量化标准并生成本次对话的 Agents 和消息
+        if isinstance(position, dict) and recruitment_system.quantification_table.get('criteria') != position:
+            prepare_screening_position(position)
 
         # 动态创建Agents以使用最新的量化标准
         user_proxy, assistant, hr_agent, technical_agent, manager_agent, critic = create_agents_with_current_criteria()
 
-        # 创建群聊对象（与 run_resume_screening 保持一致）
-        group_chat = GroupChat(
+        # 创建群聊对象（与 run_resume_screening 保持一致；每轮发言写入检查点，失败重试时从断点继续）
+        group_chat = CheckpointedGroupChat(
             agents=[user_proxy, assistant, hr_agent, technical_agent, manager_agent, critic],
             messages=[],
             max_round=12,
@@ -1057,10 +1142,7 @@ def run_resume_screening_from_payload(position: Dict[str, Any], resumes: List[Di
     参考月薪资：{recruitment_system.quantification_table['criteria'].get('salary_range', [8000, 20000])[0]}~{recruitment_system.quantification_table['criteria'].get('salary_range', [8000, 20000])[1]}元"""
         )
 
-        if run_chat:
-            user_proxy.initiate_chat(
-                manager,
-                message=f"""我们需要对一份求职简历进行综合评审。
+        chat_message = f"""我们需要对一份求职简历进行综合评审。
 
 招聘标准概述：
 - 职位：{recruitment_system.quantification_table['position']}
@@ -1074,20 +1156,52 @@ def run_resume_screening_from_payload(position: Dict[str, Any], resumes: List[Di
 {resume_text}
 
 请开始评审流程。"""
-            )
+        fingerprint = checkpoint_fingerprint(chat_message, recruitment_system.quantification_table)
 
-        # 存储输出
-        md_filename = f"{candidate_name}简历初筛结果.md"
-        save_conversation_to_md(group_chat.messages if hasattr(group_chat, 'messages') else [], md_filename)
-        save_resume_to_json(group_chat.messages if hasattr(group_chat, 'messages') else [], candidate_name, f"{candidate_name}.json")
+    if run_chat:
+        run_checkpointed_chat(
+            user_proxy, manager, group_chat, chat_message,
+            scope='screening',
+            task_key=screening_checkpoint_key(position),
+            candidate=candidate_name,
+            fingerprint=fingerprint
+        )
 
-        final_md_path = os.path.join(resumes_dir, md_filename)
-        try:
-            with open(final_md_path, 'r', encoding='utf-8') as f:
-                md_content = f.read()
-            results[candidate_name] = md_content
-        except Exception:
-            results[candidate_name] = f"报告已保存到 {final_md_path}（文件无法读取）。"
+    # 存储输出
+    save_conversation_to_md(group_chat.messages if hasattr(group_chat, 'messages') else [], md_filename)
+    save_resume_to_json(group_chat.messages if hasattr(group_chat, 'messages') else [], candidate_name, f"{candidate_name}.json")
+
+    try:
+        with open(final_md_path, 'r', encoding='utf-8') as f:
+            return candidate_name, f.read()
+    except Exception:
+        return candidate_name, f"报告已保存到 {final_md_path}（文件无法读取）。"
+
+
+def run_resume_screening_from_payload(position: Dict[str, Any], resumes: List[Dict[str, Any]], *, run_chat: bool = True,
+                                      prefilter: Optional[bool] = None, prefilter_threshold: Optional[float] = None) -> Dict[str, str]:
+    """
+    使用前端传来的岗位信息和已解析的简历列表生成初筛报告。
+
+    参数:
+      - position: 岗位信息字典（同前端格式）
+      - resumes: 简历列表，每项包含 `name`, `content`, `metadata`
+      - run_chat: 是否执行 Agent 聊天流程（默认 True）。如果环境无 LLM，可设为 False，仅生成/保存文件框架。
+      - prefilter: 是否在 LLM 评审前执行规则预筛选（默认读取 settings.RESUME_PREFILTER_ENABLED）
+      - prefilter_threshold: 预筛选阈值，低于该分数的候选人直接判定为“不匹配”，不调用 LLM
+
+    返回:
+      - 一个字典，key 为候选人名称（文件名不含扩展），value 为生成的 MD 文件路径或 MD 内容字符串（如果可读取）。
+    """
+    results = {}
+
+    prepare_screening_position(position)
+
+    for item in resumes:
+        candidate_name, md_content = screen_payload_resume(
+            position, item, run_chat=run_chat, prefilter=prefilter, prefilter_threshold=prefilter_threshold
+        )
+        results[candidate_name] = md_content
 
     return results
 
@@ -0,0 +1,310 @@
+"""
+初筛任务的按候选人执行
+每位候选人是一个子任务（ScreeningCandidateResult）：评审完成即保存报告和简历数据，
+某位候选人失败只记录该子任务的错误，不影响其他候选人；失败的候选人可单独重试。
+"""
+
+import logging
+import os
+import traceback
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .chat_checkpoint import clear_checkpoints
+from .data_manager import save_resume_screening_data, get_or_create_screening_report
+from .screening_manage import (
+    screen_payload_resume, set_current_task, screening_checkpoint_key, payload_candidate_names
+)
+
+logger = logging.getLogger(__name__)
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resumes')
+
+
+def create_candidate_results(task, resumes_data: List[Dict[str, Any]]) -> List[Any]:
+    """为任务中的每份简历创建子任务"""
+    from .models import ScreeningCandidateResult
+
+    return ScreeningCandidateResult.objects.bulk_create([
+        ScreeningCandidateResult(
+            task=task,
+            position=index,
+            candidate_name=candidate_name,
+            resume_payload=item,
+        )
+        for index, (candidate_name, item) in enumerate(zip(payload_candidate_names(resumes_data), resumes_data))
+    ])
+
+
+def _read_file(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def persist_candidate_result(task, position_data: Dict[str, Any], candidate_name: str, resume_content: str):
+    """
+    保存单个候选人的初筛报告和简历数据
+
+    Returns:
+        (report, resume_data)
+    """
+    md_file_path = os.path.join(RESUMES_DIR, f"{candidate_name}简历初筛结果.md")
+    md_report_content = _read_file(md_file_path)
+    json_report_content = _read_file(os.path.join(RESUMES_DIR, f"{candidate_name}.json"))
+
+    # 获取或创建报告记录，并保存简历内容和JSON报告内容
+    report = get_or_create_screening_report(task, candidate_name, md_file_path, json_report_content)
+    if report:
+        report.resume_content = resume_content
+        report.save()
+
+    # 保存到统一数据管理表
+    resume_data = save_resume_screening_data(
+        task=task,
+        position_data=position_data,
+        candidate_name=candidate_name,
+        resume_content=resume_content,
+        md_report_content=md_report_content,
+        json_report_content=json_report_content
+    )
+    return report, resume_data
+
+
+def _update_progress(task):
+    """按已结束（完成或失败）的子任务数更新任务进度"""
+    finished = task.candidate_results.filter(status__in=['completed', 'failed']).count()
+    task.current_step = finished
+    task.progress = int(finished / task.total_steps * 100) if task.total_steps else 100
+    task.save(update_fields=['current_step', 'progress'])
+
+
+def _run_candidate(task, position_data: Dict[str, Any], result) -> bool:
+    """执行单个候选人的评审并立即保存结果，返回是否成功"""
+    result.status = 'running'
+    result.attempts += 1
+    result.started_at = timezone.now()
+    result.completed_at = None
+    result.error_message = None
+    result.save(update_fields=['status', 'attempts', 'started_at', 'completed_at', 'error_message'])
+
+    try:
+        item = result.resume_payload
+        candidate_name, _ = screen_payload_resume(position_data, item)
+        with transaction.atomic():
+            report, resume_data = persist_candidate_result(
+                task, position_data, candidate_name, item.get('content', '')
+            )
+            result.report = report
+            result.resume_data = resume_data
+            result.resume_payload = item  # 保留预筛选结果等元数据
+            result.status = 'completed'
+            result.completed_at = timezone.now()
+            result.save()
+    except Exception as e:
+        logger.error(f"候选人 {result.candidate_name} 初筛失败: {e}")
+        result.status = 'failed'
+        result.error_message = f"{str(e)}\n{traceback.format_exc()}"
+        result.completed_at = timezone.now()
+        result.save(update_fields=['status', 'error_message', 'completed_at'])
+        return False
+
+    # 该候选人的结果已保存，清理其群聊检查点（失败时保留，重试时从断点继续）
+    clear_checkpoints('screening', screening_checkpoint_key(position_data), [result.candidate_name])
+    return True
+
+
+def run_screening_unit(task_id, result_id) -> bool:
+    """
+    执行一个候选人子任务（调度器的执行单元）；任务的子任务全部结束后更新任务状态
+
+    Returns:
+        是否成功（子任务已被执行或不存在时返回 False）
+    """
+    from .models import ResumeScreeningTask, ScreeningCandidateResult
+
+    # 领取子任务，避免同一子任务被重复执行
+    if not ScreeningCandidateResult.objects.filter(id=result_id, task_id=task_id, status='pending').update(status='running'):
+        return False
+    ResumeScreeningTask.objects.filter(id=task_id, status='pending').update(status='running')
+
+    task = ResumeScreeningTask.objects.get(id=task_id)
+    result = ScreeningCandidateResult.objects.get(id=result_id)
+    # 设置当前线程的任务对象，以便在筛选过程中更新发言者信息
+    set_current_task(task)
+    try:
+        succeeded = _run_candidate(task, task.position_data or {}, result)
+    finally:
+        set_current_task(None)
+
+    _update_progress(task)
+    if not task.candidate_results.filter(status__in=['pending', 'running']).exists():
+        finalize_task(task)
+    return succeeded
+
+
+def run_scheduled_unit(task_id, result_id):
+    """调度器工作线程中执行子任务"""
+    try:
+        run_screening_unit(task_id, result_id)
+    finally:
+        # 后台线程不经过请求周期，需要自行释放数据库连接
+        close_old_connections()
+
+
+def run_screening_task(task_id, candidate_ids: Optional[Iterable] = None):
+    """
+    在当前线程中逐个执行任务中等待中的候选人子任务（不经过调度器）
+
+    Args:
+        task_id: 初筛任务ID
+        candidate_ids: 只执行这些子任务（默认执行全部等待中的子任务）
+    """
+    from .models import ScreeningCandidateResult
+
+    pending = ScreeningCandidateResult.objects.filter(task_id=task_id, status='pending')
+    if candidate_ids is not None:
+        pending = pending.filter(id__in=list(candidate_ids))
+    for result_id in pending.order_by('position').values_list('id', flat=True):
+        run_screening_unit(task_id, result_id)
+
+
+def finalize_task(task):
+    """所有子任务结束后更新任务状态：全部失败为失败，否则为完成（失败的候选人记录在错误信息中）"""
+    results = list(task.candidate_results.values_list('candidate_name', 'status'))
+    failed = [name for name, status in results if status == 'failed']
+
+    task.status = 'failed' if results and len(failed) == len(results) else 'completed'
+    task.error_message = f"以下候选人初筛失败，可单独重试: {', '.join(failed)}" if failed else None
+    task.current_speaker = None  # 清除当前发言者信息
+    task.current_step = task.total_steps
+    task.progress = 100
+    task.save(update_fields=['status', 'error_message', 'current_speaker', 'current_step', 'progress'])
+
+
+def interrupted_candidate_ids(task) -> List[Any]:
+    """
+    中断的子任务：状态为等待中或进行中，但没有在本进程调度器中排队或执行
+    （调度队列只在进程内存中，服务重启后重启前的子任务会停留在这两个状态）
+    """
+    from .scheduler import get_scheduler
+
+    tracked = get_scheduler().tracked_result_ids()
+    return [
+        result_id for result_id in task.candidate_results.filter(
+            status__in=['pending', 'running']
+        ).values_list('id', flat=True)
+        if result_id not in tracked
+    ]
+
+
+def retry_failed_candidates(task, candidate_names: Optional[Iterable[str]] = None) -> List[Any]:
+    """
+    将失败和中断的子任务重置为等待中（调用方随后执行 start_screening_task）
+
+    Args:
+        task: 初筛任务
+        candidate_names: 只重试这些候选人（默认重试全部失败和中断的候选人）
+
+    Returns:
+        重置的子任务列表
+    """
+    retryable = task.candidate_results.filter(Q(status='failed') | Q(id__in=interrupted_candidate_ids(task)))
+    if candidate_names is not None:
+        retryable = retryable.filter(candidate_name__in=list(candidate_names))
+    results = list(retryable)
+    if results:
+        task.candidate_results.filter(id__in=[result.id for result in results]).update(
+            status='pending', error_message=None
+        )
+        task.status = 'pending'
+        task.error_message = None
+        task.save(update_fields=['status', 'error_message'])
+    return results
+
+
+def recover_interrupted_tasks(created_before=None) -> int:
+    """
+    恢复服务重启前未执行完的任务：中断的子任务重置为等待中并重新提交给调度器，
+    子任务已全部结束（重启前尚未更新任务状态）的任务直接更新状态
+
+    Args:
+        created_before: 只恢复在此之前创建的任务（默认当前时间）
+
+    Returns:
+        重新提交的子任务数
+    """
+    from .models import ResumeScreeningTask
+
+    created_before = created_before or timezone.now()
+    task_ids = ResumeScreeningTask.objects.filter(
+        status__in=['pending', 'running'], created_at__lt=created_before
+    ).values_list('id', flat=True)
+
+    count = 0
+    for task_id in list(task_ids):
+        with transaction.atomic():
+            task = ResumeScreeningTask.objects.select_for_update().get(id=task_id)
+            if task.status not in ('pending', 'running'):
+                continue
+            interrupted = interrupted_candidate_ids(task)
+            if interrupted:
+                task.candidate_results.filter(id__in=interrupted).update(status='pending', error_message=None)
+                start_screening_task(task.id, interrupted)
+                count += len(interrupted)
+            elif not task.candidate_results.filter(status__in=['pending', 'running']).exists():
+                finalize_task(task)
+    if count:
+        logger.info(f"已重新提交 {count} 个中断的初筛子任务")
+    return count
+
+
+def task_flow_key(task) -> str:
+    """公平排队的分流标识：提交人，未提供时为岗位"""
+    if task.submitter:
+        return f"submitter:{task.submitter}"
+    return f"position:{screening_checkpoint_key(task.position_data or {})}"
+
+
+def enqueue_screening_task(task_id, candidate_ids: Optional[Iterable] = None) -> int:
+    """把任务中等待中的子任务提交给调度器，返回入队数"""
+    from .models import ResumeScreeningTask
+    from .scheduler import get_scheduler
+
+    task = ResumeScreeningTask.objects.get(id=task_id)
+    pending = task.candidate_results.filter(status='pending')
+    if candidate_ids is not None:
+        pending = pending.filter(id__in=list(candidate_ids))
+    return get_scheduler().submit(
+        task.id, pending.order_by('position').values_list('id', flat=True),
+        priority=task.priority, flow=task_flow_key(task)
+    )
+
+
+def start_screening_task(task_id, candidate_ids: Optional[Iterable] = None):
+    """事务提交后把任务提交给调度器，由调度器在后台线程中执行"""
+    candidate_ids = list(candidate_ids) if candidate_ids is not None else None
+    transaction.on_commit(lambda: enqueue_screening_task(task_id, candidate_ids))
+
+
+def serialize_candidate_result(result) -> Dict[str, Any]:
+    """子任务的接口返回格式"""
+    duration = None
+    if result.started_at and result.completed_at:
+        duration = round((result.completed_at - result.started_at).total_seconds(), 3)
+    return {
+        "candidate_id": str(result.id),
+        "candidate_name": result.candidate_name,
+        "status": result.status,
+        "attempts": result.attempts,
+        "started_at": result.started_at.isoformat() if result.started_at else None,
+        "completed_at": result.completed_at.isoformat() if result.completed_at else None,
+        "duration_seconds": duration,
+        "error_message": result.error_message if result.status == 'failed' else None,
+        "report_id": str(result.report_id) if result.report_id else None,
+        "resume_data_id": str(result.resume_data_id) if result.resume_data_id else None,
+    }
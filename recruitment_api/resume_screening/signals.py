@@ -0,0 +1,59 @@
+"""
+简历初筛模块信号处理
+简历数据、简历组保存或删除后清除本进程缓存的报告详情和简历组详情响应；
+进程收到第一个请求时恢复服务重启前中断的初筛任务
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from recruitment_api.http_cache import get_response_cache
+from .models import ResumeData, ResumeGroup
+
+logger = logging.getLogger(__name__)
+
+# 本模块在 AppConfig.ready() 中导入，即进程启动时间
+PROCESS_STARTED_AT = timezone.now()
+_recovery_lock = threading.Lock()
+_recovered = False
+
+
+@receiver(post_save, sender=ResumeData)
+@receiver(post_delete, sender=ResumeData)
+def invalidate_resume_data_responses(sender, instance, **kwargs):
+    cache = get_response_cache()
+    cache.invalidate('screening_report', instance.pk)
+    cache.invalidate('resume_group')
+
+
+@receiver(post_save, sender=ResumeGroup)
+@receiver(post_delete, sender=ResumeGroup)
+def invalidate_resume_group_responses(sender, **kwargs):
+    get_response_cache().invalidate('resume_group')
+
+
+@receiver(request_started)
+def recover_screening_tasks_on_first_request(sender, **kwargs):
+    """
+    调度队列只在进程内存中：进程处理第一个请求前，把启动前创建、仍在等待中或进行中的任务重新提交给调度器
+    （在请求线程中执行，不在 ready() 中访问数据库；settings.SCREENING_RECOVER_ON_STARTUP 为 False 时跳过）
+    """
+    global _recovered
+    if _recovered or not getattr(settings, 'SCREENING_RECOVER_ON_STARTUP', True):
+        return
+    with _recovery_lock:
+        if _recovered:
+            return
+        _recovered = True
+
+    from .screening_tasks import recover_interrupted_tasks
+    try:
+        recover_interrupted_tasks(created_before=PROCESS_STARTED_AT)
+    except Exception as e:
+        logger.error(f"恢复中断的初筛任务失败: {e}")
@@ -0,0 +1,325 @@
+"""
+压缩文本存储
+简历内容、JSON报告（含完整的群聊记录）、筛选总结等大文本不再直接保存在业务表中：
+
+- 文本按内容 SHA-256 存入 TextBlob 表，相同文本只存一份（ScreeningReport 与 ResumeData 的简历内容、
+  JSON报告相同，只保存一次），业务表的列只保存哈希
+- 压缩：默认 zlib；安装 zstandard 后可设置 settings.TEXT_BLOB_CODEC = 'zstd'；压缩后不比原文小时原样保存
+- 共享字典：train_text_blob_dictionary 命令从已有文本训练字典，之后写入的文本用最新的字典压缩
+  （报告的结构和用语高度相似，单条文本也能获得较高的压缩率）；TextBlob 记录所用的字典，解压时使用同一字典
+- 延迟解压：查询记录时只取回哈希，首次访问字段时才查询并解压；列表接口用 prefetch_texts 一次取回整页的文本
+"""
+
+import hashlib
+import logging
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+from django import forms
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_RAW = 'raw'
+CODEC_ZLIB = 'zlib'
+CODEC_ZSTD = 'zstd'
+DEFAULT_CODEC = CODEC_ZLIB
+DEFAULT_LEVEL = 6
+# zlib 预置字典的上限（压缩窗口大小）
+ZLIB_DICTIONARY_SIZE = 32 * 1024
+
+# 字典内容不会修改，按ID缓存在进程内
+_dictionaries: Dict[int, bytes] = {}
+_dictionaries_lock = threading.Lock()
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def configured_codec() -> str:
+    codec = getattr(settings, 'TEXT_BLOB_CODEC', DEFAULT_CODEC)
+    if codec == CODEC_ZSTD and zstandard is None:
+        logger.warning("未安装 zstandard，压缩文本改用 zlib")
+        return CODEC_ZLIB
+    return codec
+
+
+def compress(codec: str, data: bytes, dictionary: Optional[bytes] = None, level: Optional[int] = None) -> bytes:
+    """按编码压缩数据（dictionary 为共享字典）"""
+    level = int(level if level is not None else getattr(settings, 'TEXT_BLOB_LEVEL', DEFAULT_LEVEL))
+    if codec == CODEC_RAW:
+        return data
+    if codec == CODEC_ZLIB:
+        if dictionary:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, zdict=dictionary)
+        else:
+            compressor = zlib.compressobj(level)
+        return compressor.compress(data) + compressor.flush()
+    if codec == CODEC_ZSTD:
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdCompressor(level=level, dict_data=dict_data).compress(data)
+    raise ValueError(f"不支持的压缩编码: {codec}")
+
+
+def decompress(codec: str, data: bytes, dictionary: Optional[bytes] = None) -> bytes:
+    if codec == CODEC_RAW:
+        return bytes(data)
+    if codec == CODEC_ZLIB:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("解压 zstd 文本需要安装 zstandard")
+        dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+    raise ValueError(f"不支持的压缩编码: {codec}")
+
+
+def _models():
+    from .models import CompressionDictionary, TextBlob
+    return TextBlob, CompressionDictionary
+
+
+def _dictionary_data(dictionary_id: Optional[int], dictionary_model=None) -> Optional[bytes]:
+    if dictionary_id is None:
+        return None
+    with _dictionaries_lock:
+        data = _dictionaries.get(dictionary_id)
+    if data is None:
+        dictionary_model = dictionary_model or _models()[1]
+        data = bytes(dictionary_model.objects.values_list('data', flat=True).get(id=dictionary_id))
+        with _dictionaries_lock:
+            _dictionaries[dictionary_id] = data
+    return data
+
+
+def _active_dictionary(codec: str) -> Tuple[Optional[int], Optional[bytes]]:
+    """该编码最新训练的字典"""
+    dictionary_id = _models()[1].objects.filter(codec=codec).order_by('-id').values_list('id', flat=True).first()
+    return dictionary_id, _dictionary_data(dictionary_id)
+
+
+def store_text(text: str, blob_model=None, use_dictionary: bool = True) -> str:
+    """
+    保存文本（已存在相同内容时直接返回）
+
+    Args:
+        text: 文本
+        blob_model: TextBlob 模型（数据迁移中传入历史模型）
+        use_dictionary: 是否使用共享字典压缩
+
+    Returns:
+        文本的 SHA-256
+    """
+    blob_model = blob_model or _models()[0]
+    digest = text_sha256(text)
+    if blob_model.objects.filter(sha256=digest).exists():
+        return digest
+
+    raw = text.encode('utf-8')
+    codec = configured_codec()
+    dictionary_id, dictionary = _active_dictionary(codec) if use_dictionary else (None, None)
+    data = compress(codec, raw, dictionary)
+    if len(data) >= len(raw):
+        codec, dictionary_id, data = CODEC_RAW, None, raw
+    blob_model.objects.get_or_create(sha256=digest, defaults={
+        'codec': codec, 'dictionary_id': dictionary_id, 'data': data,
+        'size': len(raw), 'stored_size': len(data),
+    })
+    return digest
+
+
+def load_texts(digests: Iterable[str], blob_model=None, dictionary_model=None) -> Dict[str, str]:
+    """一次查询取回并解压多个文本 {哈希: 文本}"""
+    blob_model = blob_model or _models()[0]
+    digests = {digest for digest in digests if digest}
+    texts = {}
+    if not digests:
+        return texts
+    rows = blob_model.objects.filter(sha256__in=digests).values_list('sha256', 'codec', 'dictionary_id', 'data')
+    for digest, codec, dictionary_id, data in rows:
+        dictionary = _dictionary_data(dictionary_id, dictionary_model)
+        texts[digest] = decompress(codec, data, dictionary).decode('utf-8')
+    return texts
+
+
+class StoredText:
+    """数据库中已保存、尚未解压的文本（只有哈希）"""
+
+    __slots__ = ('sha256',)
+
+    def __init__(self, sha256: str):
+        self.sha256 = sha256
+
+    def load(self) -> 'BlobText':
+        text = load_texts([self.sha256]).get(self.sha256)
+        if text is None:
+            raise LookupError(f"压缩文本不存在: {self.sha256}")
+        return BlobText(text, self.sha256)
+
+    def __repr__(self):
+        return f"<StoredText {self.sha256[:12]}>"
+
+
+class BlobText(str):
+    """已解压的文本（记住哈希，再次保存时无需重新计算和查询）"""
+
+    def __new__(cls, text: str, sha256: str):
+        value = super().__new__(cls, text)
+        value.sha256 = sha256
+        return value
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    """访问字段时才解压文本（定义 __set__ 成为数据描述符，实例 __dict__ 中的值不会绕过解压）"""
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, StoredText):
+            value = value.load()
+            instance.__dict__[self.field.attname] = value
+        return value
+
+
+class CompressedTextField(models.Field):
+    """
+    压缩文本字段：列中保存文本的 SHA-256，文本压缩后存入 TextBlob 表
+
+    读写方式与 TextField 相同（赋值为 str，读取得到 str）；QuerySet.update 和等值查询同样可以直接使用文本。
+    values()/values_list() 返回 StoredText，需要时调用 load() 解压。
+    """
+
+    descriptor_class = CompressedTextDescriptor
+    description = "压缩文本（按内容哈希引用）"
+
+    def __init__(self, *args, **kwargs):
+        kwargs['max_length'] = 64
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('max_length', None)
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'CharField'
+
+    def from_db_value(self, value, expression, connection):
+        return StoredText(value) if value else None
+
+    def get_prep_value(self, value):
+        # 查询条件：按文本内容的哈希匹配
+        if value is None:
+            return None
+        if isinstance(value, (StoredText, BlobText)):
+            return value.sha256
+        return text_sha256(str(value))
+
+    def pre_save(self, model_instance, add):
+        # 未访问过的文本不解压，直接保存原来的哈希
+        return model_instance.__dict__.get(self.attname)
+
+    def get_db_prep_save(self, value, connection):
+        # 保存：新文本先写入 TextBlob
+        if value is None:
+            return None
+        if isinstance(value, (StoredText, BlobText)):
+            return value.sha256
+        return store_text(str(value))
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, StoredText):
+            return value.load()
+        return str(value)
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return '' if value is None else str(value)
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{'form_class': forms.CharField, 'widget': forms.Textarea, **kwargs})
+
+
+def compressed_text_fields(model) -> List[CompressedTextField]:
+    return [field for field in model._meta.concrete_fields if isinstance(field, CompressedTextField)]
+
+
+def prefetch_texts(instances: Sequence[models.Model], fields: Optional[Iterable[str]] = None) -> List[models.Model]:
+    """
+    一次查询取回并解压一组记录的压缩文本字段，避免列表中逐条查询
+
+    Args:
+        instances: 同一模型的记录
+        fields: 字段名（默认为全部压缩文本字段）
+
+    Returns:
+        记录列表
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+    attnames = [
+        field.attname for field in compressed_text_fields(type(instances[0]))
+        if fields is None or field.name in fields
+    ]
+    pending = [
+        (instance, attname) for instance in instances for attname in attnames
+        if isinstance(instance.__dict__.get(attname), StoredText)
+    ]
+    texts = load_texts(instance.__dict__[attname].sha256 for instance, attname in pending)
+    for instance, attname in pending:
+        digest = instance.__dict__[attname].sha256
+        if digest in texts:
+            instance.__dict__[attname] = BlobText(texts[digest], digest)
+    return instances
+
+
+async def aprefetch_texts(instances: Sequence[models.Model], fields: Optional[Iterable[str]] = None) -> List[models.Model]:
+    """prefetch_texts 的异步版本（异步视图中访问压缩文本前调用，访问字段时不再查询数据库）"""
+    return await sync_to_async(prefetch_texts)(instances, fields)
+
+
+def train_zlib_dictionary(samples: Sequence[str], size: int = ZLIB_DICTIONARY_SIZE) -> bytes:
+    """
+    由样本生成 zlib 预置字典：多个样本中共同出现的行（标题、JSON键、评审用语等）
+
+    zlib 对字典末尾的内容引用距离最短，出现次数最多的行放在末尾。
+    """
+    counts = Counter()
+    for sample in samples:
+        counts.update({line.strip() for line in sample.splitlines() if len(line.strip()) >= 4})
+    common = [line for line, count in counts.most_common() if count >= 2]
+
+    selected, total = [], 0
+    for line in common:
+        encoded = (line + '\n').encode('utf-8')
+        if total + len(encoded) > size:
+            break
+        selected.append(encoded)
+        total += len(encoded)
+    return b''.join(reversed(selected))
+
+
+def train_dictionary(samples: Sequence[str], codec: str, size: int) -> bytes:
+    """训练共享字典（zstd 使用 zstandard 的字典训练，zlib 使用共同行）"""
+    if codec == CODEC_ZSTD:
+        return zstandard.train_dictionary(size, [sample.encode('utf-8') for sample in samples]).as_bytes()
+    return train_zlib_dictionary(samples, min(size, ZLIB_DICTIONARY_SIZE))
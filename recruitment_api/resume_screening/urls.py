@@ -4,10 +4,13 @@ from . import views
 urlpatterns = [
     path('screening/', views.ResumeScreeningAPIView.as_view(), name='resume-screening'),
     path('tasks/<uuid:task_id>/status/', views.ScreeningTaskStatusAPIView.as_view(), name='screening-task-status'),
+    path('tasks/<uuid:task_id>/retry/', views.ScreeningTaskRetryAPIView.as_view(), name='screening-task-retry'),
     path('tasks-history/', views.ScreeningTaskHistoryAPIView.as_view(), name='screening-task-history'),
     path('reports/<uuid:report_id>/download/', views.ScreeningReportDownloadAPIView.as_view(), name='screening-report-download'),
     path('reports/<uuid:report_id>/detail/', views.ScreeningReportDetailAPIView.as_view(), name='screening-report-detail'),
     path('data/', views.ResumeDataAPIView.as_view(), name='resume-data'),
+    path('data/<uuid:resume_id>/resume/', views.ResumeDataResumeAPIView.as_view(), name='resume-data-resume'),
+    path('data/<uuid:resume_id>/transcript/', views.ResumeDataTranscriptAPIView.as_view(), name='resume-data-transcript'),
     path('groups/create/', views.CreateResumeGroupAPIView.as_view(), name='create-resume-group'),
     path('groups/add-resume/', views.AddResumeToGroupAPIView.as_view(), name='add-resume-to-group'),
     path('groups/remove-resume/', views.RemoveResumeFromGroupAPIView.as_view(), name='remove-resume-from-group'),
@@ -2,17 +2,191 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import FileResponse, JsonResponse
+from django.http import Http404, JsonResponse
+from django.db import transaction
 from .models import ResumeScreeningTask, ScreeningReport, ResumeData, ResumeGroup
 from .serializers import ResumeScreeningSerializer
-from .screening_manage import parse_position_resumes_json, run_resume_screening_from_payload, set_current_task
-from .data_manager import save_resume_screening_data, get_or_create_screening_report
+from .screening_manage import parse_position_resumes_json
+from .scheduler import PRIORITY_CLASSES, default_priority, get_scheduler
+from .screening_tasks import (
+    create_candidate_results, start_screening_task, retry_failed_candidates, serialize_candidate_result,
+    interrupted_candidate_ids
+)
 from .group_status_manager import update_group_status_based_on_video_analysis
+from .document_extraction import extract_resume_payloads, DocumentExtractionError
+from .text_blobs import prefetch_texts
+from recruitment_api.downloads import serve_field_file
+from recruitment_api.fast_json import FastJsonResponse, loads, raw_json
+from recruitment_api.http_cache import conditional_response, weak_etag
+from recruitment_api.response_shaping import ResponseShape, ShapeError
+from typing import Sequence
+from django.urls import reverse
 import uuid
 import os
 import json
 from django.conf import settings
-import threading
+
+
+# 简历数据条目中的大字段：默认只返回子资源链接（resume_url / transcript_url），expand 后返回全文
+RESUME_DATA_HEAVY = ('json_content', 'resume_content')
+# 简历数据条目各返回字段用到的数据库列（不返回的字段对应的列不查询）
+RESUME_DATA_COLUMNS = {
+    'candidate_name': ['candidate_name'],
+    'position_title': ['position_title'],
+    'scores': ['screening_score'],
+    'screening_score': ['screening_score'],
+    'summary': ['screening_summary'],
+    'screening_summary': ['screening_summary'],
+    'json_content': ['json_report_content'],
+    'resume_content': ['resume_content'],
+    'created_at': ['created_at'],
+    'report_md_url': ['report_md_file'],
+    'report_json_url': ['report_json_file'],
+    'video_analysis': ['video_analysis'],
+}
+
+
+def _video_analysis_info(resume_data):
+    """关联的视频分析记录摘要"""
+    video = resume_data.video_analysis
+    if not video:
+        return None
+    return {
+        "video_id": video.id,
+        "video_name": video.video_name,
+        "status": video.status,
+        "analysis_result": video.analysis_result,
+        "summary": video.summary,
+        "confidence_score": video.confidence_score,
+    }
+
+
+def _normalized_scores(resume_data):
+    """解析评分数据（四项评分，缺失时为0）"""
+    if not resume_data.screening_score:
+        return {}
+    return {
+        key: resume_data.screening_score.get(key, 0)
+        for key in ("hr_score", "technical_score", "manager_score", "comprehensive_score")
+    }
+
+
+# 简历数据条目各返回字段的取值
+RESUME_DATA_GETTERS = {
+    "id": lambda data: data.id,
+    "candidate_name": lambda data: data.candidate_name,
+    "position_title": lambda data: data.position_title,
+    "scores": lambda data: data.screening_score,
+    "screening_score": lambda data: data.screening_score,
+    "summary": lambda data: data.screening_summary,
+    "screening_summary": lambda data: data.screening_summary,
+    # JSON报告内容（含完整群聊记录）原样嵌入响应，不再作为字符串二次转义
+    "json_content": lambda data: raw_json(data.json_report_content),
+    "resume_content": lambda data: data.resume_content,
+    "created_at": lambda data: data.created_at,
+    "report_md_url": lambda data: data.report_md_file.url if data.report_md_file else None,
+    "report_json_url": lambda data: data.report_json_file.url if data.report_json_file else None,
+    # 简历全文和群聊记录的子资源
+    "resume_url": lambda data: reverse('resume-data-resume', args=[data.id]),
+    "transcript_url": lambda data: reverse('resume-data-transcript', args=[data.id]),
+    # 如果有关联的视频分析记录，添加视频分析信息
+    "video_analysis": _video_analysis_info,
+}
+
+
+def serialize_resume_data(resume_data, shape: ResponseShape, keys: Sequence[str], **getters) -> dict:
+    """
+    按返回字段序列化简历数据
+
+    Args:
+        resume_data: 简历数据
+        shape: 简历数据条目的返回字段
+        keys: 接口返回的字段（按顺序）
+        getters: 与 RESUME_DATA_GETTERS 取值方式不同的字段
+
+    Returns:
+        字段字典
+    """
+    getters = {key: getters.get(key) or RESUME_DATA_GETTERS[key] for key in keys}
+    data = shape.render(resume_data, getters)
+    # 没有关联的视频分析记录时不返回该字段
+    if 'video_analysis' in data and data['video_analysis'] is None:
+        del data['video_analysis']
+    return data
+
+
+# 任务状态/历史接口中简历数据条目的字段
+TASK_RESUME_DATA_KEYS = (
+    'id', 'candidate_name', 'position_title', 'scores', 'summary', 'json_content', 'resume_content',
+    'report_md_url', 'report_json_url', 'resume_url', 'transcript_url', 'video_analysis',
+)
+# 任务结果中可展开的字段
+TASK_RESULT_EXPANDABLE = ('reports.resume_content', 'resume_data.json_content', 'resume_data.resume_content')
+
+
+def shape_resume_data(queryset, shape: ResponseShape):
+    """
+    按返回字段裁剪简历数据查询：不返回的列不查询，大字段一次取回整页
+
+    Args:
+        queryset: ResumeData 查询
+        shape: 简历数据条目的返回字段
+
+    Returns:
+        简历数据列表
+    """
+    queryset = queryset.defer('position_details', *shape.deferred(RESUME_DATA_COLUMNS))
+    if shape.includes('video_analysis'):
+        queryset = queryset.select_related('video_analysis')
+    text_fields = [
+        column for name in ('summary', 'screening_summary', *RESUME_DATA_HEAVY) if shape.includes(name)
+        for column in RESUME_DATA_COLUMNS[name]
+    ]
+    return prefetch_texts(queryset, text_fields)
+
+
+def serialize_task_results(tasks, shape: ResponseShape) -> dict:
+    """
+    一次查询取回多个任务的报告和简历数据
+
+    Args:
+        tasks: 任务列表
+        shape: 任务的返回字段（嵌套的 reports / resume_data）
+
+    Returns:
+        {任务ID: {"reports": [...], "resume_data": [...]}}
+    """
+    results = {task.id: {"reports": [], "resume_data": []} for task in tasks}
+    position_data = {task.id: task.position_data for task in tasks}
+    if not results:
+        return results
+
+    if shape.includes('reports'):
+        report_shape = shape.nested('reports', heavy=['resume_content'])
+        columns = ['id', 'task', 'original_filename']
+        if report_shape.includes('resume_content'):
+            columns.append('resume_content')
+        reports = ScreeningReport.objects.filter(task_id__in=results).only(*columns)
+        for report in prefetch_texts(reports, ['resume_content']):
+            report_data = {
+                "report_id": report.id,
+                "report_filename": report.original_filename,
+                "download_url": f"/api/screening/reports/{report.id}/download/",
+            }
+            if report_shape.includes('resume_content'):
+                report_data["resume_content"] = report.resume_content if report.resume_content else ""
+            # 如果任务中有岗位信息，添加到报告数据中
+            if position_data[report.task_id]:
+                report_data["position_info"] = position_data[report.task_id]
+            results[report.task_id]["reports"].append(report_shape.select(report_data))
+
+    if shape.includes('resume_data'):
+        data_shape = shape.nested('resume_data', heavy=RESUME_DATA_HEAVY)
+        queryset = ResumeData.objects.filter(task_id__in=results)
+        for resume_data in shape_resume_data(queryset, data_shape):
+            resume_data_info = serialize_resume_data(resume_data, data_shape, TASK_RESUME_DATA_KEYS)
+            results[resume_data.task_id]["resume_data"].append(resume_data_info)
+    return results
 
 
 class ResumeScreeningAPIView(APIView):
@@ -27,188 +201,98 @@ class ResumeScreeningAPIView(APIView):
         except ValueError as e:
             return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        # 将 PDF/DOCX 简历解析为纯文本（按文件哈希缓存，重复上传无需再次解析）
+        try:
+            extraction_summary = extract_resume_payloads(resumes_data)
+        except DocumentExtractionError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 调度优先级：未指定时按简历数量区分交互式/批量
+        priority = request.data.get('priority') or default_priority(len(resumes_data))
+        if priority not in PRIORITY_CLASSES:
+            return Response(
+                {"status": "error", "message": f"priority 必须是 {' / '.join(PRIORITY_CLASSES)} 之一"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if request.user and request.user.is_authenticated:
+            submitter = request.user.get_username()
+        else:
+            submitter = str(request.data.get('submitter') or '')[:100]
+
         # 创建筛选任务，同时保存岗位信息
         task = ResumeScreeningTask.objects.create(
             status='pending',
             progress=0,
             total_steps=len(resumes_data),
             current_step=0,
-            position_data=position_data  # 保存岗位信息
+            position_data=position_data,  # 保存岗位信息
+            priority=priority,
+            submitter=submitter
         )
 
-        # 异步处理简历筛选任务
-        threading.Thread(
-            target=self._run_screening_task,
-            args=(task, position_data, resumes_data)
-        ).start()
+        # 每份简历一个子任务，由调度器按优先级和公平排队执行，完成一位即保存一位
+        create_candidate_results(task, resumes_data)
+        start_screening_task(task.id)
 
         # 立即返回响应给前端
         return Response({
             "status": "submitted",
             "message": "简历筛选任务已提交，正在后台处理",
-            "task_id": str(task.id)
+            "task_id": str(task.id),
+            "priority": priority,
+            "extraction": extraction_summary
         }, status=status.HTTP_202_ACCEPTED)
 
-    def _run_screening_task(self, task, position_data, resumes_data):
-        """在后台线程中运行简历筛选任务"""
-        try:
-            # 设置当前任务对象，以便在筛选过程中更新发言者信息
-            set_current_task(task)
-            
-            # 更新任务状态为运行中
-            task.status = 'running'
-            task.save()
-            
-            results = run_resume_screening_from_payload(
-                position=position_data,
-                resumes=resumes_data,
-                run_chat=True  # False没有开启对话
-            )
-            
-            # 保存报告文件到数据库
-            reports = []
-            resume_screening_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resumes')
-            
-            for i, (candidate_name, result_content) in enumerate(results.items()):
-                # 更新进度
-                task.progress = int((i + 1) / len(results) * 100)
-                task.current_step = i + 1
-                task.save()
-                
-                # 查找生成的MD文件
-                md_filename = f"{candidate_name}简历初筛结果.md"
-                md_file_path = os.path.join(resume_screening_dir, md_filename)
-                
-                # 查找生成的JSON文件
-                json_filename = f"{candidate_name}.json"
-                json_file_path = os.path.join(resume_screening_dir, json_filename)
-                
-                # 获取简历内容
-                resume_content = ""
-                for resume in resumes_data:
-                    if os.path.splitext(resume['name'])[0] == candidate_name:
-                        resume_content = resume['content']
-                        break
-                
-                # 读取报告文件内容
-                md_report_content = ""
-                json_report_content = ""
-                
-                if os.path.exists(md_file_path):
-                    with open(md_file_path, 'r', encoding='utf-8') as f:
-                        md_report_content = f.read()
-                
-                if os.path.exists(json_file_path):
-                    with open(json_file_path, 'r', encoding='utf-8') as f:
-                        json_report_content = f.read()
-                
-                # 获取或创建报告记录，并保存简历内容和JSON报告内容
-                report = get_or_create_screening_report(task, candidate_name, md_file_path, json_report_content)
-                if report:
-                    # 保存简历内容到报告中
-                    report.resume_content = resume_content
-                    report.save()
-                    reports.append(report)
-                
-                # 保存到统一数据管理表
-                save_resume_screening_data(
-                    task=task,
-                    position_data=position_data,
-                    candidate_name=candidate_name,
-                    resume_content=resume_content,
-                    md_report_content=md_report_content,
-                    json_report_content=json_report_content
-                )
-                        
-            # 更新任务状态为完成
-            task.status = 'completed'
-            task.progress = 100
-            task.current_step = task.total_steps
-            task.current_speaker = None  # 清除当前发言者信息
-            task.save()
-            
-        except Exception as e:
-            import traceback
-            # 更新任务状态为失败
-            task.status = 'failed'
-            task.error_message = f"{str(e)}\n{traceback.format_exc()}"
-            task.current_speaker = None  # 清除当前发言者信息
-            task.save()
-            # 打印详细错误信息到控制台
-            print(f"任务执行失败: {str(e)}")
-            print(traceback.format_exc())
-
 
 class ScreeningTaskStatusAPIView(APIView):
     """查询任务状态API（手动刷新方案）"""
 
     def get(self, request, task_id, format=None):
+        try:
+            shape = ResponseShape.from_request(request, expandable=TASK_RESULT_EXPANDABLE)
+        except ShapeError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             task = ResumeScreeningTask.objects.get(id=task_id)
             response_data = {
-                "task_id": str(task.id),
+                "task_id": task.id,
                 "status": task.status,
                 "progress": task.progress,
                 "current_step": task.current_step,
                 "total_steps": task.total_steps,
-                "created_at": task.created_at.isoformat()
+                "created_at": task.created_at
             }
 
             # 如果任务正在运行，包含当前发言者信息
             if task.status == 'running' and task.current_speaker:
                 response_data['current_speaker'] = task.current_speaker
 
-            # 如果任务完成，包含报告下载链接以及岗位信息和简历内容
-            if task.status == 'completed':
-                reports = ScreeningReport.objects.filter(task=task)
-                if reports.exists():
-                    response_data['reports'] = []
-                    for report in reports:
-                        report_data = {
-                            "report_id": str(report.id),
-                            "report_filename": report.original_filename,
-                            "download_url": f"/api/screening/reports/{report.id}/download/",
-                            "resume_content": report.resume_content if report.resume_content else ""
-                        }
-                        
-                        # 如果任务中有岗位信息，添加到报告数据中
-                        if task.position_data:
-                            report_data["position_info"] = task.position_data
-                        
-                        response_data['reports'].append(report_data)
-               
-                # 添加简历数据（包括JSON内容）
-                resume_data_list = ResumeData.objects.filter(task=task)
-                if resume_data_list.exists():
-                    response_data['resume_data'] = []
-                    for resume_data in resume_data_list:
-                        # 构建基本简历信息
-                        resume_data_info = {
-                            "id": str(resume_data.id),  # 添加ID字段
-                            "candidate_name": resume_data.candidate_name,
-                            "position_title": resume_data.position_title,
-                            "scores": resume_data.screening_score,
-                            "summary": resume_data.screening_summary,
-                            "json_content": resume_data.json_report_content,  # JSON报告内容
-                            "resume_content": resume_data.resume_content,
-                            "report_md_url": resume_data.report_md_file.url if resume_data.report_md_file else None,
-                            "report_json_url": resume_data.report_json_file.url if resume_data.report_json_file else None,
-                        }
-                        
-                        # 如果有关联的视频分析记录，添加视频分析信息
-                        if resume_data.video_analysis:
-                            resume_data_info["video_analysis"] = {
-                                "video_id": str(resume_data.video_analysis.id),
-                                "video_name": resume_data.video_analysis.video_name,
-                                "status": resume_data.video_analysis.status,
-                                "analysis_result": resume_data.video_analysis.analysis_result,
-                                "summary": resume_data.video_analysis.summary,
-                                "confidence_score": resume_data.video_analysis.confidence_score,
-                            }
-                        
-                        response_data['resume_data'].append(resume_data_info)
-
-            return JsonResponse(response_data)
+            # 排队中的任务：排队位置和预计开始时间
+            response_data['priority'] = task.priority
+            queue_status = get_scheduler().queue_status(task.id)
+            if queue_status:
+                response_data['queue'] = queue_status
+
+            # 各候选人子任务的状态、耗时和错误信息
+            candidate_results = list(task.candidate_results.all())
+            if candidate_results:
+                response_data['candidates'] = [serialize_candidate_result(result) for result in candidate_results]
+                response_data['completed_candidates'] = sum(1 for result in candidate_results if result.status == 'completed')
+                response_data['failed_candidates'] = sum(1 for result in candidate_results if result.status == 'failed')
+            if task.error_message:
+                response_data['error_message'] = task.error_message
+
+            # 已完成的候选人（任务仍在运行时也返回）包含报告下载链接以及岗位信息和简历摘要，
+            # 简历全文和JSON报告需 expand 或通过子资源获取
+            if task.status == 'completed' or candidate_results:
+                results = serialize_task_results([task], shape)[task.id]
+                for key in ('reports', 'resume_data'):
+                    if results[key]:
+                        response_data[key] = results[key]
+
+            response_data = shape.select(response_data)
+            return FastJsonResponse(response_data)
 
         except ResumeScreeningTask.DoesNotExist:
             return Response(
@@ -217,6 +301,47 @@ class ScreeningTaskStatusAPIView(APIView):
             )
 
 
+class ScreeningTaskRetryAPIView(APIView):
+    """重试初筛任务中失败或中断的候选人（已完成的候选人不会重新评审）"""
+
+    def post(self, request, task_id, format=None):
+        candidates = request.data.get('candidates')
+        if candidates is not None and not isinstance(candidates, list):
+            return Response(
+                {"status": "error", "message": "candidates 必须是候选人姓名列表"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            # 锁定任务行，避免重复提交重试
+            try:
+                task = ResumeScreeningTask.objects.select_for_update().get(id=task_id)
+            except ResumeScreeningTask.DoesNotExist:
+                return Response({"error": "任务不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+            # 执行中的任务只允许重试中断的候选人（服务重启后不在调度队列中的子任务）
+            if task.status in ('pending', 'running') and not interrupted_candidate_ids(task):
+                return Response(
+                    {"status": "error", "message": "任务正在执行，请结束后再重试"},
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            results = retry_failed_candidates(task, candidates)
+            if not results:
+                return Response(
+                    {"status": "error", "message": "没有可重试的失败或中断候选人"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            start_screening_task(task.id, [result.id for result in results])
+
+        return Response({
+            "status": "submitted",
+            "message": f"已重新提交 {len(results)} 位候选人",
+            "task_id": str(task.id),
+            "candidates": [result.candidate_name for result in results]
+        }, status=status.HTTP_202_ACCEPTED)
+
+
 class ScreeningReportDownloadAPIView(APIView):
     """报告文件下载API"""
 
@@ -224,23 +349,30 @@ class ScreeningReportDownloadAPIView(APIView):
         try:
             report = ScreeningReport.objects.get(id=report_id)
 
-            # 返回文件下载响应
-            response = FileResponse(
-                report.md_file.open('rb'),
-                content_type='text/markdown'
+            # 返回文件下载响应（支持断点续传、条件请求和反向代理转发）
+            return serve_field_file(
+                request, report.md_file,
+                content_type='text/markdown',
+                filename=report.original_filename
             )
-            response['Content-Disposition'] = \
-                f'attachment; filename="{report.original_filename}"'
-
-            return response
 
-        except ScreeningReport.DoesNotExist:
+        except (ScreeningReport.DoesNotExist, Http404):
             return Response(
                 {"error": "报告不存在"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
 
+# 初筛报告详情用到的列（ETag 由这些列计算）
+REPORT_VERSION_COLUMNS = (
+    'created_at', 'candidate_name', 'position_title', 'screening_score', 'screening_summary',
+    'resume_content', 'json_report_content', 'report_json_file', 'video_analysis',
+)
+
+# 简历组详情用到的列（status 须为最后一列）
+GROUP_VERSION_COLUMNS = ('created_at', 'group_name', 'position_title', 'description', 'status')
+
+
 class ScreeningReportDetailAPIView(APIView):
     """
     报告详情API - 根据报告ID查询报告详细信息
@@ -249,7 +381,20 @@ class ScreeningReportDetailAPIView(APIView):
     def get(self, request, report_id, format=None):
         """
         根据报告ID获取报告详情，包括候选人姓名、评分、总结、简历内容、报告内容、时间等信息
+        支持条件请求：ETag 由记录各列计算（压缩文本列即内容哈希），未修改时返回 304
         """
+        version = ResumeData.objects.filter(id=report_id).values_list(*REPORT_VERSION_COLUMNS).first()
+        if version is None:
+            return Response(
+                {"error": "未找到与该报告关联的简历数据"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return conditional_response(
+            request, 'screening_report', report_id, weak_etag(*version),
+            lambda: self._build_response(report_id)
+        )
+
+    def _build_response(self, report_id):
         try:
             # 获取关联的简历数据
             try:
@@ -354,8 +499,8 @@ class ResumeDataAPIView(APIView):
         for data in data_list:
             # 构建基本简历数据
             resume_info = {
-                "id": str(data.id),
-                "created_at": data.created_at.isoformat(),
+                "id": data.id,
+                "created_at": data.created_at,
                 "position_title": data.position_title,
                 "candidate_name": data.candidate_name,
                 "screening_score": data.screening_score,
@@ -367,7 +512,7 @@ class ResumeDataAPIView(APIView):
             # 如果有关联的视频分析记录，添加视频分析信息
             if data.video_analysis:
                 resume_info["video_analysis"] = {
-                    "video_id": str(data.video_analysis.id),
+                    "video_id": data.video_analysis.id,
                     "video_name": data.video_analysis.video_name,
                     "status": data.video_analysis.status,
                     "fraud_score": data.video_analysis.fraud_score,
@@ -381,7 +526,7 @@ class ResumeDataAPIView(APIView):
             
             result.append(resume_info)
             
-        return JsonResponse({
+        return FastJsonResponse({
             "results": result,
             "total": queryset.count(),
             "page": page,
@@ -424,6 +569,64 @@ class ResumeDataAPIView(APIView):
             )
 
 
+class ResumeDataResumeAPIView(APIView):
+    """简历全文（列表接口默认不返回简历内容，需要时按ID获取）"""
+
+    def get(self, request, resume_id, format=None):
+        try:
+            resume_data = ResumeData.objects.only('id', 'candidate_name', 'resume_content').get(id=resume_id)
+        except ResumeData.DoesNotExist:
+            return Response({"error": "简历数据不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+        return JsonResponse({
+            "id": str(resume_data.id),
+            "candidate_name": resume_data.candidate_name,
+            "resume_content": resume_data.resume_content,
+        })
+
+
+class ResumeDataTranscriptAPIView(APIView):
+    """
+    初筛群聊记录 - JSON报告中的 conversation_history（列表接口默认不返回JSON报告）
+    查询参数：
+    - offset: 起始发言序号，默认为0
+    - limit: 返回的发言数，默认返回全部
+    """
+
+    def get(self, request, resume_id, format=None):
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+            limit = request.GET.get('limit')
+            limit = max(int(limit), 0) if limit is not None else None
+        except ValueError:
+            return Response(
+                {"status": "error", "message": "offset 和 limit 必须是整数"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            resume_data = ResumeData.objects.only('id', 'candidate_name', 'json_report_content').get(id=resume_id)
+        except ResumeData.DoesNotExist:
+            return Response({"error": "简历数据不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+        messages = []
+        if resume_data.json_report_content:
+            try:
+                messages = loads(resume_data.json_report_content).get('conversation_history') or []
+            except (ValueError, AttributeError):
+                messages = []
+        end = offset + limit if limit is not None else None
+
+        return FastJsonResponse({
+            "id": str(resume_data.id),
+            "candidate_name": resume_data.candidate_name,
+            "total": len(messages),
+            "offset": offset,
+            "limit": limit,
+            "messages": messages[offset:end],
+        })
+
+
 class CreateResumeGroupAPIView(APIView):
     """
     创建简历组API
@@ -573,15 +776,25 @@ class ResumeGroupListAPIView(APIView):
         - page_size: 每页数量，默认为10，最大50
         - position_title: 岗位名称（可选，用于筛选）
         - status: 状态（可选，用于筛选）
-        - include_resumes: 是否包含简历信息，默认为false
+        - include_resumes: 是否包含简历信息，默认为false（等同于 expand=resumes）
+        - fields: 只返回列出的字段，如 fields=id,group_name,resumes.candidate_name
+        - expand: 展开的字段：resumes（简历信息）、resumes.resume_content（简历全文）
         """
+        try:
+            include_resumes = request.GET.get('include_resumes', 'false').lower() == 'true'
+            shape = ResponseShape.from_request(
+                request, heavy=['resumes'], expandable=['resumes.resume_content'],
+                expand=['resumes'] if include_resumes else ()
+            )
+        except ShapeError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             # 获取查询参数
             page = int(request.GET.get('page', 1))
             page_size = min(int(request.GET.get('page_size', 10)), 50)
             position_title = request.GET.get('position_title', None)
-            status = request.GET.get('status', None)
-            include_resumes = request.GET.get('include_resumes', 'false').lower() == 'true'
+            group_status = request.GET.get('status', None)
             
             # 构建查询
             groups = ResumeGroup.objects.all().order_by('-created_at')
@@ -591,13 +804,25 @@ class ResumeGroupListAPIView(APIView):
                 groups = groups.filter(position_title__icontains=position_title)
                 
             # 根据状态筛选
-            if status:
-                groups = groups.filter(status=status)
+            if group_status:
+                groups = groups.filter(status=group_status)
             
             # 分页
             start = (page - 1) * page_size
             end = start + page_size
-            paginated_groups = groups[start:end]
+            paginated_groups = list(groups[start:end])
+
+            # 如果需要包含简历信息：整页的简历一次查询，简历全文需 expand 或通过子资源获取
+            group_resumes = {group.id: [] for group in paginated_groups}
+            if shape.includes('resumes'):
+                resume_shape = shape.nested('resumes', heavy=RESUME_DATA_HEAVY)
+                queryset = ResumeData.objects.filter(group_id__in=group_resumes)
+                for resume in shape_resume_data(queryset, resume_shape):
+                    resume_info = serialize_resume_data(resume, resume_shape, (
+                        'id', 'candidate_name', 'position_title', 'screening_score', 'screening_summary',
+                        'resume_content', 'created_at', 'report_md_url', 'report_json_url', 'resume_url', 'transcript_url',
+                    ))
+                    group_resumes[resume.group_id].append(resume_info)
             
             # 构建响应数据
             groups_data = []
@@ -614,36 +839,21 @@ class ResumeGroupListAPIView(APIView):
                 resume_count = group.resumes.count()
                 
                 group_data = {
-                    "id": str(group.id),
+                    "id": group.id,
                     "group_name": group.group_name,
                     "position_title": group.position_title,
                     "description": group.description,
                     "resume_count": resume_count,
                     "status": group.status,  # 添加状态信息
-                    "created_at": group.created_at.isoformat()
+                    "created_at": group.created_at
                 }
                 
-                # 如果需要包含简历信息
-                if include_resumes:
-                    resumes = group.resumes.all()
-                    resume_data = []
-                    for resume in resumes:
-                        resume_data.append({
-                            "id": str(resume.id),
-                            "candidate_name": resume.candidate_name,
-                            "position_title": resume.position_title,
-                            "screening_score": resume.screening_score,
-                            "screening_summary": resume.screening_summary,
-                            "resume_content": resume.resume_content,
-                            "created_at": resume.created_at.isoformat(),
-                            "report_md_url": resume.report_md_file.url if resume.report_md_file else None,
-                            "report_json_url": resume.report_json_file.url if resume.report_json_file else None,
-                        })
-                    group_data["resumes"] = resume_data
+                if shape.includes('resumes'):
+                    group_data["resumes"] = group_resumes[group.id]
                 
-                groups_data.append(group_data)
+                groups_data.append(shape.select(group_data))
             
-            return JsonResponse({
+            return FastJsonResponse({
                 "groups": groups_data,
                 "total": groups.count(),
                 "page": page,
@@ -665,7 +875,40 @@ class ResumeGroupDetailAPIView(APIView):
     def get(self, request, group_id, format=None):
         """
         根据简历组ID获取简历组详情
+        查询参数：
+        - include_resumes: 是否包含简历信息，默认为true
+        - fields: 只返回列出的字段，如 fields=id,status,resumes.scores
+        - expand: 展开的字段：resumes.json_content（JSON报告）、resumes.resume_content（简历全文）
         """
+        try:
+            shape = ResponseShape.from_request(
+                request, expandable=['resumes.json_content', 'resumes.resume_content']
+            )
+        except ShapeError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 条件请求：ETag 由简历组、组内简历和关联视频分析的版本计算，未修改时不再查询和序列化
+        group_version = ResumeGroup.objects.filter(id=group_id).values_list(*GROUP_VERSION_COLUMNS).first()
+        if group_version is None:
+            return Response(
+                {"error": "简历组不存在"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        resume_versions = ResumeData.objects.filter(group_id=group_id).order_by('id').values_list(
+            'id', *REPORT_VERSION_COLUMNS, 'video_analysis__status', 'video_analysis__updated_at'
+        )
+        resume_versions = list(resume_versions)
+        if resume_versions:
+            # 组内有简历时，组状态在构造响应时由视频分析状态重新计算（已计入 ETag），存储的状态不参与计算
+            group_version = group_version[:-1]
+        query = request.GET.urlencode()
+        etag = weak_etag(query, *group_version, *(part for row in resume_versions for part in row))
+        return conditional_response(
+            request, 'resume_group', (group_id, query), etag,
+            lambda: self._build_response(request, group_id, shape)
+        )
+
+    def _build_response(self, request, group_id, shape):
         try:
             # 获取简历组
             try:
@@ -686,63 +929,34 @@ class ResumeGroupDetailAPIView(APIView):
             
             # 构建响应数据
             group_data = {
-                "id": str(group.id),
+                "id": group.id,
                 "group_name": group.group_name,
                 "position_title": group.position_title,
                 "description": group.description,
                 "resume_count": resume_count,
                 "status": group.status,
-                "created_at": group.created_at.isoformat()
+                "created_at": group.created_at
             }
             
             # 如果需要包含简历信息
             include_resumes = request.GET.get('include_resumes', 'true').lower() == 'true'
-            if include_resumes:
-                resumes = group.resumes.all()
+            if include_resumes and shape.includes('resumes'):
+                resume_shape = shape.nested('resumes', heavy=RESUME_DATA_HEAVY)
                 resume_data = []
-                for resume in resumes:
-                    # 解析评分数据
-                    scores = {}
-                    if resume.screening_score:
-                        scores = {
-                            "hr_score": resume.screening_score.get("hr_score", 0),
-                            "technical_score": resume.screening_score.get("technical_score", 0),
-                            "manager_score": resume.screening_score.get("manager_score", 0),
-                            "comprehensive_score": resume.screening_score.get("comprehensive_score", 0)
-                        }
-                    
-                    # 构建基本简历信息
-                    resume_info = {
-                        "id": str(resume.id),
-                        "candidate_name": resume.candidate_name,
-                        "position_title": resume.position_title,
-                        "scores": scores,
-                        "summary": resume.screening_summary,
-                        "json_content": resume.json_report_content,
-                        "report_md_url": resume.report_md_file.url if resume.report_md_file else None,
-                        "report_json_url": resume.report_json_file.url if resume.report_json_file else None,
-                    }
-                    
-                    # 如果有关联的视频分析记录，添加视频分析信息
-                    if resume.video_analysis:
-                        resume_info["video_analysis"] = {
-                            "video_id": str(resume.video_analysis.id),
-                            "video_name": resume.video_analysis.video_name,
-                            "status": resume.video_analysis.status,
-                            "analysis_result": resume.video_analysis.analysis_result,
-                            "summary": resume.video_analysis.summary,
-                            "confidence_score": resume.video_analysis.confidence_score,
-                        }
-                    
-                    resume_data.append(resume_info)
+                for resume in shape_resume_data(group.resumes.all(), resume_shape):
+                    # JSON报告（含完整群聊记录）和简历全文需 expand 或通过子资源获取
+                    resume_data.append(serialize_resume_data(resume, resume_shape, (
+                        'id', 'candidate_name', 'position_title', 'scores', 'summary', 'json_content', 'resume_content',
+                        'report_md_url', 'report_json_url', 'resume_url', 'transcript_url', 'video_analysis',
+                    ), scores=_normalized_scores))
                 group_data["resumes"] = resume_data
             
-            return JsonResponse({
-                "group": group_data,
+            return FastJsonResponse({
+                "group": shape.select(group_data),
                 "summary": {
                     "total_resumes": resume_count,
                     "status": group.status,
-                    "created_at": group.created_at.isoformat()
+                    "created_at": group.created_at
                 }
             })
             
@@ -992,8 +1206,13 @@ class ScreeningTaskHistoryAPIView(APIView):
     """查询历史任务信息API"""
 
     def get(self, request, format=None):
+        try:
+            shape = ResponseShape.from_request(request, expandable=TASK_RESULT_EXPANDABLE)
+        except ShapeError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         # 获取查询参数
-        status = request.GET.get('status', None)
+        task_status = request.GET.get('status', None)
         page = int(request.GET.get('page', 1))
         page_size = min(int(request.GET.get('page_size', 10)), 50)
         
@@ -1001,83 +1220,43 @@ class ScreeningTaskHistoryAPIView(APIView):
         tasks = ResumeScreeningTask.objects.all().order_by('-created_at')
         
         # 根据状态过滤
-        if status:
-            tasks = tasks.filter(status=status)
+        if task_status:
+            tasks = tasks.filter(status=task_status)
             
         # 分页
         start = (page - 1) * page_size
         end = start + page_size
-        paginated_tasks = tasks[start:end]
+        paginated_tasks = list(tasks[start:end])
+
+        # 已完成任务的报告和简历数据（整页一次查询，简历全文和JSON报告需 expand 或通过子资源获取）
+        task_results = serialize_task_results(
+            [task for task in paginated_tasks if task.status == 'completed'], shape
+        )
         
         # 构建响应数据
         history_data = []
         for task in paginated_tasks:
             task_data = {
-                "task_id": str(task.id),
+                "task_id": task.id,
                 "status": task.status,
                 "progress": task.progress,
                 "current_step": task.current_step,
                 "total_steps": task.total_steps,
-                "created_at": task.created_at.isoformat()
+                "created_at": task.created_at
             }
             
             # 如果任务正在运行，包含当前发言者信息
             if task.status == 'running' and task.current_speaker:
                 task_data['current_speaker'] = task.current_speaker
 
-            # 如果任务完成，包含报告下载链接以及岗位信息和简历内容
-            if task.status == 'completed':
-                reports = ScreeningReport.objects.filter(task=task)
-                if reports.exists():
-                    task_data['reports'] = []
-                    for report in reports:
-                        report_data = {
-                            "report_id": str(report.id),
-                            "report_filename": report.original_filename,
-                            "download_url": f"/api/screening/reports/{report.id}/download/",
-                            "resume_content": report.resume_content if report.resume_content else ""
-                        }
-                        
-                        # 如果任务中有岗位信息，添加到报告数据中
-                        if task.position_data:
-                            report_data["position_info"] = task.position_data
-                        
-                        task_data['reports'].append(report_data)
-                
-                # 添加简历数据（包括JSON内容）
-                resume_data_list = ResumeData.objects.filter(task=task)
-                if resume_data_list.exists():
-                    task_data['resume_data'] = []
-                    for resume_data in resume_data_list:
-                        # 构建基本简历信息
-                        resume_data_info = {
-                            "id": str(resume_data.id),  # 添加ID字段
-                            "candidate_name": resume_data.candidate_name,
-                            "position_title": resume_data.position_title,
-                            "scores": resume_data.screening_score,
-                            "summary": resume_data.screening_summary,
-                            "json_content": resume_data.json_report_content,  # JSON报告内容
-                            "resume_content": resume_data.resume_content,
-                            "report_md_url": resume_data.report_md_file.url if resume_data.report_md_file else None,
-                            "report_json_url": resume_data.report_json_file.url if resume_data.report_json_file else None,
-                        }
-                        
-                        # 如果有关联的视频分析记录，添加视频分析信息
-                        if resume_data.video_analysis:
-                            resume_data_info["video_analysis"] = {
-                                "video_id": str(resume_data.video_analysis.id),
-                                "video_name": resume_data.video_analysis.video_name,
-                                "status": resume_data.video_analysis.status,
-                                "analysis_result": resume_data.video_analysis.analysis_result,
-                                "summary": resume_data.video_analysis.summary,
-                                "confidence_score": resume_data.video_analysis.confidence_score,
-                            }
-                        
-                        task_data['resume_data'].append(resume_data_info)
-            
-            history_data.append(task_data)
+            # 如果任务完成，包含报告下载链接以及岗位信息和简历数据
+            for key, items in task_results.get(task.id, {}).items():
+                if items:
+                    task_data[key] = items
+            
+            history_data.append(shape.select(task_data))
         
-        return JsonResponse({
+        return FastJsonResponse({
             "tasks": history_data,
             "total": tasks.count(),
             "page": page,
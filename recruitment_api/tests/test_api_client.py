@@ -179,7 +179,8 @@ class InterviewAssistAPITests:
         
         result = self.client._request('POST', f'{self.base_path}/sessions/{session_id}/generate-report/', {
             'include_conversation_log': True,
-            'hr_notes': hr_notes
+            'hr_notes': hr_notes,
+            'wait': True
         })
         
         if result.get('status_code') == 200:
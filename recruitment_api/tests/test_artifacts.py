@@ -0,0 +1,223 @@
+"""
+制品存储测试（内容寻址、本地磁盘后端、S3 兼容后端、预签名下载）
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+
+from recruitment_api.artifacts import LocalArtifactStore, content_key, namespace_for
+from video_analysis import engine as engine_module, views
+from video_analysis.models import VideoAnalysis
+
+CONTENT = b'interview video content' * 1000
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+class FakeClientError(Exception):
+    """与 botocore ClientError 相同的 response 结构"""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeS3Client:
+    """内存中的 S3 兼容服务（代替 MinIO）"""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = 0
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError('404')
+        return {'ContentLength': len(self.objects[(Bucket, Key)])}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None):
+        self.objects[(Bucket, Key)] = Fileobj.read()
+        self.uploads += 1
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError('NoSuchKey')
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn):
+        query = '&'.join(
+            f'{name}={value}' for name, value in sorted(Params.items()) if name not in ('Bucket', 'Key')
+        )
+        return f"http://minio.local/{Params['Bucket']}/{Params['Key']}?X-Amz-Expires={ExpiresIn}&{query}"
+
+
+class LocalArtifactStoreTestCase(TestCase):
+    """本地磁盘后端"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.store = LocalArtifactStore(self.tmpdir, base_url='/media/')
+
+    def test_content_addressed_keys(self):
+        self.assertEqual(namespace_for('video_analysis/videos/2025/11/20/张三.mp4'), 'video_analysis/videos')
+        self.assertEqual(namespace_for('report.md'), 'artifacts')
+
+        key = self.store.save(ContentFile(CONTENT), 'video_analysis/videos', '.MP4')
+        self.assertEqual(key, content_key('video_analysis/videos', DIGEST, '.mp4'))
+        self.assertEqual(key, f'video_analysis/videos/{DIGEST[:2]}/{DIGEST[2:]}.mp4')
+        # 相同内容只保存一份
+        self.assertEqual(self.store.save(io.BytesIO(CONTENT), 'video_analysis/videos', '.mp4'), key)
+        self.assertEqual(os.listdir(os.path.join(self.tmpdir, '.incoming')), [])
+        with self.store.open(key) as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertEqual(self.store.size(key), len(CONTENT))
+        self.assertEqual(self.store.url(key), '/media/' + key)
+
+        with self.assertRaises(ValueError):
+            self.store.open('../outside.txt')
+
+    def test_save_file_links_without_copy(self):
+        source = os.path.join(self.tmpdir, 'staged.part')
+        with open(source, 'wb') as f:
+            f.write(CONTENT)
+        key = self.store.save_file(source, 'video_analysis/videos', '.mp4', digest=DIGEST)
+        os.remove(source)
+        self.assertTrue(self.store.exists(key))
+        with self.store.open(key) as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_model_file_field_uses_store(self):
+        with override_settings(MEDIA_ROOT=self.tmpdir):
+            video = VideoAnalysis(video_name='张三.mp4', candidate_name='张三', position_applied='Python开发')
+            video.video_file.save('张三.mp4', ContentFile(CONTENT))
+            self.assertEqual(video.video_file.name, content_key('video_analysis/videos', DIGEST, '.mp4'))
+            self.assertTrue(os.path.isfile(video.video_file.path))
+            self.assertEqual(default_storage.location, self.tmpdir)
+
+
+    def test_shared_object_survives_delete_until_pruned(self):
+        with override_settings(MEDIA_ROOT=self.tmpdir):
+            first, second = [
+                VideoAnalysis(video_name=f'{name}.mp4', candidate_name=name, position_applied='Python开发')
+                for name in ('张三', '李四')
+            ]
+            for video in (first, second):
+                video.video_file.save(f'{video.candidate_name}.mp4', ContentFile(CONTENT))
+            key = first.video_file.name
+            self.assertEqual(second.video_file.name, key)
+
+            # 相同内容的文件被另一条记录引用，删除字段文件时不删除对象
+            first.video_file.delete(save=False)
+            first.delete()
+            self.assertTrue(default_storage.exists(key))
+
+            call_command('prune_artifacts', older_than_hours=0, stdout=io.StringIO())
+            self.assertTrue(default_storage.exists(key))
+
+            second.delete()
+            out = io.StringIO()
+            call_command('prune_artifacts', older_than_hours=0, dry_run=True, stdout=out)
+            self.assertIn(key, out.getvalue())
+            self.assertTrue(default_storage.exists(key))
+            call_command('prune_artifacts', older_than_hours=0, stdout=io.StringIO())
+            self.assertFalse(default_storage.exists(key))
+
+
+class S3ArtifactStoreTestCase(TestCase):
+    """S3 兼容后端：上传、预签名下载和需要本地文件的视频分析"""
+
+    def setUp(self):
+        self.client = Client()
+        self.s3 = FakeS3Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=self.tmpdir,
+            VIDEO_ANALYZER_OPTIONS={'delay': 0},
+            ARTIFACT_STORE={
+                'BACKEND': 'recruitment_api.artifacts.S3ArtifactStore',
+                'OPTIONS': {'bucket': 'recruitment', 'prefix': 'test', 'url_expires': 600, 'client': self.s3},
+            },
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.spawned = []
+        self.engine = engine_module.VideoAnalysisEngine(
+            executor_factory=ThreadPoolExecutor, spawn=self.spawned.append
+        )
+        self.addCleanup(self.engine.shutdown)
+        patcher = mock.patch.object(views, 'get_engine', lambda: self.engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _upload(self, name, content=CONTENT):
+        response = self.client.post('/video-analysis/', {
+            'video_file': SimpleUploadedFile(f'{name}.mp4', content, content_type='video/mp4'),
+            'candidate_name': name,
+            'position_applied': 'Python开发',
+        })
+        self.assertEqual(response.status_code, 201)
+        return VideoAnalysis.objects.get(id=response.json()['video_id'])
+
+    def test_upload_stream_and_analyze(self):
+        video = self._upload('张三')
+        key = content_key('video_analysis/videos', DIGEST, '.mp4')
+        self.assertEqual(video.video_file.name, key)
+        self.assertEqual(self.s3.objects[('recruitment', f'test/{key}')], CONTENT)
+        # 本机不保存视频文件
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'video_analysis', 'videos')))
+
+        # 分析前下载到临时文件
+        while self.spawned:
+            self.spawned.pop(0)()
+        self.assertEqual(VideoAnalysis.objects.get(id=video.id).status, 'completed')
+
+        # 下载重定向到预签名URL
+        response = self.client.get(f'/video-analysis/{video.id}/video/?download=1')
+        self.assertEqual(response.status_code, 302)
+        location = urlsplit(response['Location'])
+        self.assertEqual(location.path, f'/recruitment/test/{key}')
+        query = parse_qs(location.query)
+        self.assertEqual(query['X-Amz-Expires'], ['600'])
+        self.assertEqual(query['ResponseContentType'], ['video/mp4'])
+        self.assertTrue(query['ResponseContentDisposition'][0].startswith('attachment'))
+
+        self.s3.objects.clear()
+        self.assertEqual(self.client.get(f'/video-analysis/{video.id}/video/').status_code, 404)
+
+    def test_chunked_upload_and_dedup(self):
+        response = self.client.post('/video-analysis/uploads/', data=json.dumps({
+            'video_name': '张三_分片.mp4', 'candidate_name': '张三', 'position_applied': 'Python开发',
+            'total_size': len(CONTENT),
+        }), content_type='application/json')
+        upload_id = response.json()['upload_id']
+        self.client.generic(
+            'PATCH', f'/video-analysis/uploads/{upload_id}/', CONTENT,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='0'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/video-analysis/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, 201)
+        video = VideoAnalysis.objects.get(id=response.json()['video_id'])
+        self.assertEqual(video.video_file.name, content_key('video_analysis/videos', DIGEST, '.mp4'))
+        self.assertEqual(os.listdir(os.path.join(self.tmpdir, 'video_analysis', 'uploads')), [])
+
+        # 相同内容不再上传
+        self._upload('张三_重复')
+        self.assertEqual(self.s3.uploads, 1)
@@ -0,0 +1,89 @@
+"""
+多智能体群聊检查点测试（使用本地回复函数代替LLM）
+"""
+
+from autogen import Agent, ConversableAgent, GroupChatManager
+from django.test import TestCase
+
+from resume_screening.chat_checkpoint import CheckpointedGroupChat, clear_checkpoints, run_checkpointed_chat
+from resume_screening.models import ChatTurnCheckpoint
+
+
+class ChatCheckpointTestCase(TestCase):
+    """群聊检查点测试"""
+
+    sequence = ['User', 'HR', 'Tech', 'Critic']
+
+    def setUp(self):
+        self.calls = []
+        self.fail_on = set()
+
+    def _build_chat(self):
+        def make_reply(name):
+            def reply(recipient, messages=None, sender=None, config=None):
+                self.calls.append(name)
+                if name in self.fail_on:
+                    self.fail_on.discard(name)
+                    raise TimeoutError(f'{name} 调用超时')
+                return True, f"{name}的评审意见" + (' APPROVE' if name == 'Critic' else '')
+            return reply
+
+        agents = []
+        for name in self.sequence:
+            agent = ConversableAgent(name=name, llm_config=False, human_input_mode='NEVER', code_execution_config=False)
+            agent.register_reply([Agent, None], make_reply(name), position=0)
+            agents.append(agent)
+
+        def select(last_speaker, groupchat):
+            index = self.sequence.index(last_speaker.name) + 1
+            return groupchat.agents[index] if index < len(self.sequence) else None
+
+        group_chat = CheckpointedGroupChat(agents=agents, messages=[], max_round=10, speaker_selection_method=select)
+        manager = GroupChatManager(
+            groupchat=group_chat, llm_config=False,
+            is_termination_msg=lambda message: 'APPROVE' in str(message.get('content', ''))
+        )
+        return agents[0], manager, group_chat
+
+    def _run(self, message='请评审候选人张三'):
+        user, manager, group_chat = self._build_chat()
+        return run_checkpointed_chat(
+            user, manager, group_chat, message, scope='screening', task_key='position', candidate='张三'
+        )
+
+    def test_resume_after_failure(self):
+        self.fail_on = {'Tech'}
+        with self.assertRaises(TimeoutError):
+            self._run()
+        self.assertEqual(self.calls, ['HR', 'Tech'])
+        self.assertEqual(
+            list(ChatTurnCheckpoint.objects.order_by('turn_index').values_list('speaker', flat=True)),
+            ['User', 'HR']
+        )
+
+        # 重试：已完成的 HR 发言直接回放，只调用后续发言
+        self.calls = []
+        messages = self._run()
+        self.assertEqual(self.calls, ['Tech', 'Critic'])
+        self.assertEqual([m['name'] for m in messages], self.sequence)
+        self.assertEqual(messages[1]['content'], 'HR的评审意见')
+        self.assertTrue(ChatTurnCheckpoint.objects.get(turn_index=3).is_final)
+
+        # 对话已结束：再次执行不调用任何智能体
+        self.calls = []
+        self.assertEqual(self._run(), messages)
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(clear_checkpoints('screening', 'position', ['张三']), 4)
+
+    def test_changed_input_discards_checkpoints(self):
+        self.fail_on = {'Critic'}
+        with self.assertRaises(TimeoutError):
+            self._run()
+        self.assertEqual(ChatTurnCheckpoint.objects.count(), 3)
+
+        self.calls = []
+        messages = self._run('请评审候选人张三（简历已更新）')
+        self.assertEqual(self.calls, ['HR', 'Tech', 'Critic'])
+        self.assertEqual(len(messages), 4)
+        self.assertEqual(ChatTurnCheckpoint.objects.count(), 4)
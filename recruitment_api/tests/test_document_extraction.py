@@ -0,0 +1,212 @@
+"""
+简历文档解析（PDF/DOCX）测试
+"""
+
+import base64
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from resume_screening import document_extraction
+from resume_screening.document_extraction import (
+    DocumentExtractionError,
+    detect_document_type,
+    extract_document,
+    extract_resume_payloads,
+)
+from resume_screening.models import ParsedResumeCache
+
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def build_docx(paragraphs):
+    """构造只包含正文段落的最小 DOCX 文件"""
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    document_xml = (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>'
+    )
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document_xml)
+    return buffer.getvalue()
+
+
+def build_pdf(lines):
+    """构造每行一段文字的单页 PDF 文件（Helvetica 字体，只支持 ASCII）"""
+    stream = "BT /F1 12 Tf 72 720 Td " + " ".join(f"({line}) Tj 0 -16 Td" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    output = BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n{body}\nendobj\n".encode())
+    xref = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return output.getvalue()
+
+
+class DocumentTypeDetectionTestCase(TestCase):
+    """文档类型识别测试"""
+
+    def test_detect_by_mime_type(self):
+        self.assertEqual(detect_document_type("resume", "application/pdf"), "pdf")
+        self.assertEqual(detect_document_type("resume", DOCX_MIME), "docx")
+
+    def test_detect_by_extension(self):
+        self.assertEqual(detect_document_type("张三.PDF"), "pdf")
+        self.assertEqual(detect_document_type("张三.docx"), "docx")
+        self.assertIsNone(detect_document_type("张三.txt", "text/plain"))
+
+
+class DocumentExtractionTestCase(TestCase):
+    """文档解析与缓存测试"""
+
+    def test_extract_docx(self):
+        """测试 DOCX 段落解析"""
+        result = extract_document(build_docx(["张三", "Python 开发 5 年"]), "docx")
+
+        self.assertEqual(result["text"], "张三\nPython 开发 5 年")
+        self.assertEqual(result["pages"], 2)
+
+    def test_extract_invalid_docx(self):
+        """测试损坏的 DOCX 文件"""
+        with self.assertRaises(DocumentExtractionError):
+            extract_document(b"not a zip file", "docx")
+
+    def test_extract_resume_payloads_uses_cache(self):
+        """测试简历解析结果写入缓存并在重复提交时命中"""
+        content = base64.b64encode(build_docx(["李四", "熟悉 Django"])).decode()
+
+        resumes = [{"name": "李四.docx", "content": content, "metadata": {"type": DOCX_MIME}}]
+        summary = extract_resume_payloads(resumes)
+
+        self.assertEqual(summary["documents"], 1)
+        self.assertEqual(summary["cache_hits"], 0)
+        self.assertEqual(resumes[0]["content"], "李四\n熟悉 Django")
+        self.assertEqual(resumes[0]["metadata"]["type"], "text/plain")
+        self.assertEqual(resumes[0]["metadata"]["source_type"], DOCX_MIME)
+        self.assertEqual(ParsedResumeCache.objects.count(), 1)
+
+        resumes = [{"name": "李四.docx", "content": content, "metadata": {"type": DOCX_MIME}}]
+        summary = extract_resume_payloads(resumes)
+
+        self.assertEqual(summary["cache_hits"], 1)
+        self.assertTrue(resumes[0]["metadata"]["extraction"]["cached"])
+        self.assertEqual(ParsedResumeCache.objects.get().hit_count, 1)
+
+    def test_plain_text_resumes_untouched(self):
+        """测试纯文本简历不经过解析"""
+        resumes = [{"name": "王五.txt", "content": "王五的简历", "metadata": {"type": "text/plain"}}]
+        summary = extract_resume_payloads(resumes)
+
+        self.assertEqual(summary["documents"], 0)
+        self.assertEqual(resumes[0]["content"], "王五的简历")
+
+    def test_invalid_base64_content(self):
+        """测试无效的 base64 内容"""
+        resumes = [{"name": "赵六.pdf", "content": "@@@not-base64@@@", "metadata": {}}]
+        with self.assertRaises(DocumentExtractionError):
+            extract_resume_payloads(resumes)
+
+    def test_extract_pdf_payload(self):
+        """测试 PDF 简历经解析进程逐页解析"""
+        content = base64.b64encode(build_pdf(["Zhang San", "Python Django 5 years"])).decode()
+        resumes = [{"name": "张三.pdf", "content": content, "metadata": {"type": "application/pdf"}}]
+        summary = extract_resume_payloads(resumes)
+
+        self.assertEqual(summary["documents"], 1)
+        self.assertIn("Zhang San", resumes[0]["content"])
+        self.assertIn("Python Django 5 years", resumes[0]["content"])
+        self.assertEqual(resumes[0]["metadata"]["extraction"]["pages"], 1)
+        self.assertEqual(resumes[0]["metadata"]["source_type"], "application/pdf")
+
+    @override_settings(RESUME_EXTRACTION_STREAM_THRESHOLD=64)
+    def test_large_documents_streamed_through_temp_files(self):
+        """测试超过阈值的文档分块写入临时文件，由解析进程按路径读取，解析后删除"""
+        temp_paths = []
+        real_mkstemp = tempfile.mkstemp
+
+        def recording_mkstemp(*args, **kwargs):
+            fd, path = real_mkstemp(*args, **kwargs)
+            temp_paths.append(path)
+            return fd, path
+
+        pdf = build_pdf(["Li Si", "Kubernetes"])
+        docx = build_docx(["李四", "熟悉 Kubernetes"])
+        self.assertGreater(len(pdf), 64)
+        resumes = [
+            {"name": "李四.pdf", "content": base64.b64encode(pdf).decode(), "metadata": {}},
+            {"name": "李四.docx", "content": base64.b64encode(docx).decode(), "metadata": {}},
+        ]
+        with mock.patch.object(document_extraction.tempfile, "mkstemp", recording_mkstemp):
+            summary = extract_resume_payloads(resumes)
+
+        self.assertEqual(summary["documents"], 2)
+        self.assertEqual(len(temp_paths), 2)
+        self.assertFalse(any(os.path.exists(path) for path in temp_paths))
+        self.assertIn("Kubernetes", resumes[0]["content"])
+        self.assertEqual(resumes[1]["content"], "李四\n熟悉 Kubernetes")
+        self.assertEqual(resumes[0]["metadata"]["size"], len(pdf))
+        self.assertEqual(ParsedResumeCache.objects.count(), 2)
+
+    @override_settings(RESUME_EXTRACTION_STREAM_THRESHOLD=64)
+    def test_worker_failure_waits_for_other_documents(self):
+        """测试解析进程异常退出时转换为 DocumentExtractionError，且等其他文档解析结束后才删除临时文件"""
+        broken = Future()
+        broken.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        slow = Future()
+        slow.set_running_or_notify_cancel()
+        file_seen = []
+
+        class FakeExecutor:
+            def __init__(self):
+                self.submitted = []
+
+            def submit(self, fn, source, document_type):
+                self.submitted.append(source)
+                if len(self.submitted) == 1:
+                    return broken
+
+                def finish():
+                    # 解析进程仍在读取临时文件
+                    file_seen.append(os.path.exists(source))
+                    slow.set_result({"text": "", "pages": 0, "extraction_ms": 0.0})
+
+                threading.Timer(0.2, finish).start()
+                return slow
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                pass
+
+        executor = FakeExecutor()
+        resumes = [
+            {"name": "王五.docx", "content": base64.b64encode(build_docx(["王五"] * 20)).decode(), "metadata": {}},
+            {"name": "赵六.docx", "content": base64.b64encode(build_docx(["赵六"] * 20)).decode(), "metadata": {}},
+        ]
+        with mock.patch.object(document_extraction, "get_extraction_executor", return_value=executor):
+            with self.assertRaisesMessage(DocumentExtractionError, "解析进程异常退出"):
+                extract_resume_payloads(resumes)
+
+        self.assertEqual(file_seen, [True])
+        self.assertFalse(any(os.path.exists(path) for path in executor.submitted))
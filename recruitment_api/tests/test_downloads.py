@@ -0,0 +1,107 @@
+"""
+文件下载测试（Range 请求、条件请求、反向代理转发、路径穿越）
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+from urllib.parse import unquote
+
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, override_settings
+
+from video_analysis.models import VideoAnalysis
+
+CONTENT = bytes(range(256)) * 40
+
+
+class DownloadTestCase(TestCase):
+    """视频播放与报告下载"""
+
+    def setUp(self):
+        self.client = Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.video = VideoAnalysis(video_name='张三_面试视频.mp4', candidate_name='张三', position_applied='Python开发')
+        self.video.video_file.save('张三.mp4', ContentFile(CONTENT), save=False)
+        self.video.save()
+        self.url = f'/video-analysis/{self.video.id}/video/'
+
+    def _get(self, url=None, **headers):
+        response = self.client.get(url or self.url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_and_range_requests(self):
+        response, body = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+
+        response, body = self._get(HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '100')
+
+        # 后缀区间与开放区间
+        self.assertEqual(self._get(HTTP_RANGE='bytes=-10')[1], CONTENT[-10:])
+        self.assertEqual(self._get(HTTP_RANGE=f'bytes={len(CONTENT) - 5}-')[1], CONTENT[-5:])
+
+        response, _ = self._get(HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_conditional_requests(self):
+        response, _ = self._get()
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag)[0].status_code, 304)
+        self.assertEqual(self._get(HTTP_IF_MODIFIED_SINCE=last_modified)[0].status_code, 304)
+
+        # If-Range 与文件不一致时返回完整文件
+        response, body = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual((response.status_code, body), (200, CONTENT))
+        response, body = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual((response.status_code, body), (206, CONTENT[:10]))
+
+    def test_reverse_proxy_offload(self):
+        with override_settings(DOWNLOAD_OFFLOAD='x-accel', DOWNLOAD_ACCEL_LOCATIONS={self.tmpdir: '/protected/'}):
+            response, body = self._get(HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, b'')
+        self.assertTrue(response['X-Accel-Redirect'].startswith('/protected/video_analysis/videos/'))
+        self.assertIn('ETag', response)
+
+        with override_settings(DOWNLOAD_OFFLOAD='x-sendfile'):
+            response, _ = self._get()
+        self.assertEqual(unquote(response['X-Sendfile']), os.path.realpath(self.video.video_file.path))
+
+    def test_report_download_confined_to_reports_dir(self):
+        report_dir = os.path.join(self.tmpdir, 'interview_evaluation_reports', '2025', '11', '20')
+        os.makedirs(report_dir)
+        with open(os.path.join(report_dir, '评估报告.md'), 'w', encoding='utf-8') as f:
+            f.write('# 评估报告')
+
+        response, body = self._get(
+            '/final-recommend/download-report/interview_evaluation_reports/2025/11/20/%E8%AF%84%E4%BC%B0%E6%8A%A5%E5%91%8A.md'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body.decode('utf-8'), '# 评估报告')
+        self.assertIn("attachment; filename*=utf-8''", response['Content-Disposition'])
+
+        # 评估报告目录之外的文件（如视频）不能下载
+        response, _ = self._get(
+            f'/final-recommend/download-report/interview_evaluation_reports/..%2F{self.video.video_file.name}'
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(self._get(f'/video-analysis/{uuid.uuid4()}/video/')[0].status_code, 404)
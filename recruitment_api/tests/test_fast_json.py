@@ -0,0 +1,71 @@
+"""
+快速 JSON 序列化测试（orjson 与标准库输出一致、JSON片段原样嵌入）
+"""
+
+import json
+import uuid
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from recruitment_api import fast_json
+from recruitment_api.fast_json import FastJsonResponse, RawJSON, dumps, raw_json
+from resume_screening.text_blobs import BlobText, text_sha256
+
+
+class FastJsonTestCase(SimpleTestCase):
+    """dumps / raw_json / FastJsonResponse"""
+
+    def test_backends_produce_same_output(self):
+        now = timezone.now()
+        report = json.dumps({"candidate_name": "张三", "conversation_history": [{"name": "HR", "content": "良好"}]},
+                            ensure_ascii=False, indent=2)
+        data = {
+            "id": uuid.UUID(int=1),
+            "created_at": now,
+            "json_content": raw_json(report),
+            "items": [raw_json('[1, 2]'), raw_json('{"a": "\\u0000"}')],
+            "invalid": raw_json('{"a": '),
+            "text": '\x00ffff:0\x00 "引号"',
+        }
+        outputs = [dumps(data, use_orjson=False)]
+        if fast_json.orjson is not None:
+            outputs.append(dumps(data, use_orjson=True))
+
+        for content in outputs:
+            self.assertEqual(json.loads(content), {
+                "id": str(uuid.UUID(int=1)),
+                "created_at": now.isoformat(),
+                "json_content": json.loads(report),
+                "items": [[1, 2], {"a": "\x00"}],
+                "invalid": '{"a": ',
+                "text": '\x00ffff:0\x00 "引号"',
+            })
+            # 片段原样嵌入，不再转义
+            self.assertIn(report.encode('utf-8'), content)
+        self.assertEqual(len(set(outputs)), 1)
+
+    def test_validation_cached_by_content_hash(self):
+        text = '{"a": 1}'
+        blob = BlobText(text, text_sha256(text))
+        self.assertIsInstance(raw_json(blob), RawJSON)
+        with mock.patch.object(fast_json, 'loads', side_effect=AssertionError):
+            self.assertEqual(raw_json(blob).data, b'{"a": 1}')
+        self.assertIsNone(raw_json(None))
+
+    def test_response(self):
+        response = FastJsonResponse({"id": uuid.UUID(int=2)})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), {"id": str(uuid.UUID(int=2))})
+        with self.assertRaises(TypeError):
+            FastJsonResponse([1])
+        self.assertEqual(FastJsonResponse([1], safe=False).content, b'[1]')
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_json_serialization', groups=2, resumes=2, messages=3, repeat=1, stdout=out)
+        self.assertIn('JsonResponse（原实现）', out.getvalue())
+        self.assertIn('FastJsonResponse（标准库 json）', out.getvalue())
@@ -0,0 +1,90 @@
+"""
+面试后评估数据加载测试
+"""
+
+import json
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase
+
+from final_recommend import data_preparation
+from final_recommend.data_preparation import (
+    clear_report_cache,
+    load_candidates_data_by_group,
+    load_group_candidates,
+    load_personality_and_fraud_data,
+    split_candidate_records,
+)
+from resume_screening.models import ResumeData, ResumeGroup
+from video_analysis.models import VideoAnalysis
+
+
+class CandidateLoaderTestCase(TestCase):
+    """候选人数据加载测试"""
+
+    def setUp(self):
+        clear_report_cache()
+        self.group = ResumeGroup.objects.create(
+            position_title='后端开发工程师', position_details={}, position_hash=uuid.uuid4().hex, group_name='后端组'
+        )
+        video = VideoAnalysis.objects.create(
+            video_name='面试.mp4', candidate_name='张三', position_applied='后端开发工程师',
+            fraud_score=0.2, openness_score=0.8, conscientiousness_score=0.7,
+            extraversion_score=0.6, agreeableness_score=None, neuroticism_score=0.3
+        )
+        self._create_resume('张三', {'final_recommendation': {'reasons': '经验丰富'}}, video)
+        self._create_resume('李四', {'final_recommendation': {'reasons': '基础扎实'}})
+        self._create_resume('王五', None, raw_report='not json')
+
+    def _create_resume(self, name, report, video=None, raw_report=None):
+        return ResumeData.objects.create(
+            group=self.group, candidate_name=name, position_title='后端开发工程师', position_details={},
+            resume_content=f'{name}的简历', screening_score={'comprehensive_score': 80}, screening_summary='通过',
+            resume_file_hash=uuid.uuid4().hex,
+            json_report_content=raw_report if raw_report is not None else json.dumps(report, ensure_ascii=False),
+            video_analysis=video
+        )
+
+    def test_single_query(self):
+        # 简历记录一次查询，整组的压缩文本一次查询（与候选人数无关）
+        with self.assertNumQueries(2):
+            candidates = load_group_candidates(self.group.id)
+            split_candidate_records(candidates)
+
+        by_name = {candidate.name: candidate for candidate in candidates}
+        self.assertEqual(by_name['张三'].final_recommendation, {'reasons': '经验丰富'})
+        self.assertEqual(by_name['张三'].big_five['agreeableness'], 0.0)
+        self.assertEqual(by_name['张三'].fraud_score, 0.2)
+        self.assertIsNone(by_name['李四'].big_five)
+        self.assertEqual(by_name['王五'].final_recommendation, {})
+
+    def test_legacy_loaders(self):
+        candidates_data = load_candidates_data_by_group(self.group.id)
+        self.assertEqual(set(candidates_data), {'张三', '李四', '王五'})
+        self.assertEqual(candidates_data['李四']['final_recommendation'], {'reasons': '基础扎实'})
+        self.assertEqual(candidates_data['李四']['screening_summary'], '通过')
+
+        big_five, fraud = load_personality_and_fraud_data(self.group.id)
+        self.assertEqual(set(big_five), {'张三'})
+        self.assertEqual(big_five['张三']['openness'], 0.8)
+        self.assertEqual(fraud, {'张三': 0.2})
+
+        self.assertEqual(load_candidates_data_by_group(uuid.uuid4()), {})
+
+    def test_report_json_cached(self):
+        load_group_candidates(self.group.id)
+        loads = mock.Mock(wraps=json.loads)
+        fake_json = SimpleNamespace(loads=loads, JSONDecodeError=json.JSONDecodeError)
+        with mock.patch.object(data_preparation, 'json', fake_json):
+            load_group_candidates(self.group.id)
+            self.assertEqual(loads.call_count, 0)
+
+            # 报告内容变化后重新解码
+            ResumeData.objects.filter(candidate_name='李四').update(
+                json_report_content=json.dumps({'final_recommendation': {'reasons': '复评通过'}}, ensure_ascii=False)
+            )
+            candidates = {c.name: c for c in load_group_candidates(self.group.id)}
+            self.assertEqual(loads.call_count, 1)
+        self.assertEqual(candidates['李四'].final_recommendation, {'reasons': '复评通过'})
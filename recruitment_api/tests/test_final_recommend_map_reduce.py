@@ -0,0 +1,123 @@
+"""
+面试后评估 map-reduce 模式测试（使用模拟LLM，不调用真实模型）
+"""
+
+import json
+import re
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from final_recommend.after_interview import generate_candidate_info, resolve_evaluation_mode
+from final_recommend.map_reduce import CRITIC, CandidateAssessment, MapReduceEvaluator
+
+
+class FakeLLM:
+    """按候选人编号给分的模拟LLM：编号越小分数越高，比较时按综合得分排序"""
+
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def __call__(self, messages):
+        prompt = messages[-1]['content']
+        with self.lock:
+            self.calls.append(prompt)
+        if prompt.startswith('请评估以下候选人'):
+            name = re.search(r'候选人：(\S+)', prompt).group(1)
+            if name in self.fail_for:
+                raise RuntimeError('模拟调用失败')
+            score = 100 - int(name[2:])
+            return json.dumps({
+                'hr_score': score, 'technical_score': score, 'management_score': score,
+                'overall_score': score, 'risk_flags': [], 'summary': f'{name}综合表现'
+            }, ensure_ascii=False)
+        if prompt.startswith('候选人精简评估'):
+            scored = re.findall(r'^- (\S+)：综合(\d+)分', prompt, re.MULTILINE)
+            ranking = [name for name, _ in sorted(scored, key=lambda item: -int(item[1]))]
+            return json.dumps({'ranking': ranking}, ensure_ascii=False)
+        return '## 终评报告\n\n| 候选人 | 结论 |'
+
+
+def make_candidates(count):
+    return {
+        f'候选{i:02d}': {
+            'screening_score': 60,
+            'screening_summary': '初筛摘要',
+            'final_recommendation': {'reasons': f'候选{i:02d}的简历亮点'}
+        }
+        for i in range(1, count + 1)
+    }
+
+
+class MapReduceEvaluationTests(SimpleTestCase):
+    """map-reduce 评估测试"""
+
+    def _evaluate(self, count, llm=None):
+        llm = llm or FakeLLM()
+        progress = []
+        evaluator = MapReduceEvaluator(
+            llm=llm,
+            format_candidate=generate_candidate_info,
+            criteria={'position': '后端开发工程师', 'required_skills': ['Python']},
+            progress_callback=lambda stage, calls: progress.append((stage, calls))
+        )
+        messages, speakers = evaluator.run(make_candidates(count), {}, {})
+        return evaluator, messages, speakers, progress
+
+    def _ranking(self, messages):
+        return re.search(r'招聘顺位推荐：(.+)', messages[-1]['content']).group(1).split(' > ')
+
+    def test_large_group_ranking(self):
+        evaluator, messages, speakers, progress = self._evaluate(30)
+
+        self.assertEqual(messages[-1]['name'], CRITIC)
+        self.assertEqual(speakers[-1], CRITIC)
+        self.assertTrue(messages[-1]['content'].rstrip().endswith('APPROVE'))
+
+        ranking = self._ranking(messages)
+        self.assertEqual(ranking, [f'候选{i:02d}' for i in range(1, 31)])
+
+        # 30人：30次精简评估 + 两轮分组比较（4组、2组）+ 终评排序和报告
+        self.assertEqual(evaluator.llm_calls, 30 + 4 + 2 + 2)
+        self.assertEqual(progress[-1][1], evaluator.llm_calls)
+
+        # 每次调用的输入不随组规模增长
+        self.assertLess(max(len(prompt) for prompt in evaluator.llm.calls), 1500)
+
+    def test_calls_scale_linearly(self):
+        small, *_ = self._evaluate(20)
+        large, *_ = self._evaluate(80)
+        self.assertLess(large.llm_calls, 4 * small.llm_calls + 4)
+
+    def test_failed_assessment_falls_back(self):
+        evaluator, messages, _, _ = self._evaluate(10, FakeLLM(fail_for={'候选01'}))
+        ranking = self._ranking(messages)
+        self.assertEqual(len(ranking), 10)
+        self.assertIn('精简评估失败', messages[-1]['content'])
+        # 退化评估按初筛得分（60分）参与排序，低于其他候选人的模拟评分
+        self.assertEqual(ranking[0], '候选02')
+        self.assertEqual(ranking[-1], '候选01')
+
+    def test_small_buckets_still_shrink(self):
+        assessments = [CandidateAssessment(name=f'候选{i:02d}', overall_score=100 - i) for i in range(1, 6)]
+        for bucket_size, advance in ((4, 3), (5, 3), (2, 1)):
+            evaluator = MapReduceEvaluator(
+                llm=FakeLLM(), format_candidate=generate_candidate_info, criteria={},
+                bucket_size=bucket_size, advance_per_bucket=advance
+            )
+            finalists, eliminated, rounds = evaluator.reduce_candidates(assessments)
+
+            self.assertLessEqual(len(finalists), bucket_size)
+            self.assertEqual(len(finalists) + len(eliminated), 5)
+            self.assertEqual(finalists[0].name, '候选01')
+            self.assertEqual(evaluator.llm_calls, sum(r.count('组排序') for r in rounds))
+
+    @override_settings(FINAL_RECOMMEND_MAP_REDUCE_THRESHOLD=12)
+    def test_resolve_mode(self):
+        self.assertEqual(resolve_evaluation_mode('auto', 12), 'group_chat')
+        self.assertEqual(resolve_evaluation_mode('auto', 13), 'map_reduce')
+        self.assertEqual(resolve_evaluation_mode('group_chat', 50), 'group_chat')
+        with self.assertRaises(ValueError):
+            resolve_evaluation_mode('unknown', 1)
@@ -0,0 +1,130 @@
+"""
+HTTP 缓存测试（弱 ETag、304、Cache-Control、进程内响应缓存及失效）
+"""
+
+import json
+
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from recruitment_api.http_cache import CachedResponse, ResponseCache, get_response_cache
+from resume_screening.models import ResumeData, ResumeGroup
+from video_analysis.models import VideoAnalysis
+
+
+class ResponseCacheTestCase(TestCase):
+    """进程内响应缓存"""
+
+    def test_lru_bounds_and_invalidation(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        cache.set('video_analysis', 1, CachedResponse('W/"1"', b'aaaa', 'application/json'))
+        cache.set('video_analysis', 2, CachedResponse('W/"2"', b'bbbb', 'application/json'))
+        self.assertIsNotNone(cache.get('video_analysis', 1, 'W/"1"'))
+        # ETag 不同（记录已修改）时不使用缓存
+        self.assertIsNone(cache.get('video_analysis', 1, 'W/"1b"'))
+
+        # 超过条数或总大小时淘汰最久未使用的响应
+        cache.set('resume_group', 3, CachedResponse('W/"3"', b'cccc', 'application/json'))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('video_analysis', 2, 'W/"2"'))
+        cache.set('resume_group', 4, CachedResponse('W/"4"', b'd' * 11, 'application/json'))
+        self.assertIsNone(cache.get('resume_group', 4, 'W/"4"'))
+
+        cache.invalidate('resume_group')
+        self.assertEqual(len(cache), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+class ConditionalRequestTestCase(TestCase):
+    """读多写少接口的条件请求"""
+
+    def setUp(self):
+        self.client = Client()
+        get_response_cache().clear()
+        self.group = ResumeGroup.objects.create(
+            position_title='Python开发', position_details={}, position_hash='0' * 64, group_name='Python开发_1人'
+        )
+        self.video = VideoAnalysis.objects.create(
+            video_name='张三.mp4', video_file='video_analysis/videos/zhangsan.mp4',
+            candidate_name='张三', position_applied='Python开发', status='completed', summary='表现良好',
+        )
+        self.data = ResumeData.objects.create(
+            position_title='Python开发', position_details={}, candidate_name='张三', resume_content='张三的简历',
+            json_report_content=json.dumps({"candidate_name": "张三"}), screening_summary='综合评分 77',
+            resume_file_hash='1' * 64, group=self.group, video_analysis=self.video,
+        )
+
+    def test_report_detail_not_modified_and_cached(self):
+        url = f'/resume-screening/reports/{self.data.id}/detail/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+        # 未修改：只查询版本列
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        with self.assertNumQueries(1):
+            cached = self.client.get(url)
+        self.assertEqual(cached.json()['report']['summary'], '综合评分 77')
+
+        # QuerySet.update 不触发信号，ETag 随列的取值变化
+        ResumeData.objects.filter(id=self.data.id).update(screening_summary='综合评分 80')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['report']['summary'], '综合评分 80')
+
+        # 保存记录时清除本进程的缓存
+        self.assertEqual(len(get_response_cache()), 1)
+        self.data.refresh_from_db()
+        self.data.save()
+        self.assertEqual(len(get_response_cache()), 0)
+
+    def test_video_status_by_state(self):
+        url = f'/video-analysis/{self.video.id}/status/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # 重新分析（QuerySet.update 同时更新 updated_at）后 ETag 变化；排队中的记录返回排队位置，不缓存
+        VideoAnalysis.objects.filter(id=self.video.id).update(status='pending', updated_at=timezone.now())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        VideoAnalysis.objects.filter(id=self.video.id).update(status='processing', updated_at=timezone.now())
+        response = self.client.get(url)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_group_detail_tracks_resumes_and_videos(self):
+        url = f'/resume-screening/groups/{self.group.id}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # 不同查询参数的响应不同
+        self.assertNotEqual(self.client.get(url, {'fields': 'id'})['ETag'], etag)
+
+        VideoAnalysis.objects.filter(id=self.video.id).update(summary='需复核', updated_at=timezone.now())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['group']['resumes'][0]['video_analysis']['summary'], '需复核')
+
+        self.assertEqual(self.client.get('/resume-screening/groups/00000000-0000-0000-0000-000000000000/').status_code, 404)
+
+    def test_criteria_not_modified(self):
+        response = self.client.get('/position-settings/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(self.client.get('/position-settings/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    @override_settings(HTTP_CACHE_CONTROL={'screening_report': {'public': True, 'max_age': 600}})
+    def test_cache_control_configurable(self):
+        response = self.client.get(f'/resume-screening/reports/{self.data.id}/detail/')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=600')
@@ -3,8 +3,10 @@
 """
 
 import json
+import shutil
+import tempfile
 import uuid
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 
 from interview_assist.models import InterviewAssistSession, InterviewQARecord
@@ -18,6 +20,13 @@ class InterviewAssistTestCase(TestCase):
         """测试前准备"""
         self.client = Client()
         
+        # 生成的报告文件写入临时目录
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir)
+        media.enable()
+        self.addCleanup(media.disable)
+        
         # 创建测试用简历数据
         self.resume_data = ResumeData.objects.create(
             candidate_name='张三',
@@ -424,7 +433,8 @@ class GenerateReportViewTests(InterviewAssistTestCase):
             f'{self.base_url}/sessions/{self.session.id}/generate-report/',
             data=json.dumps({
                 'include_conversation_log': True,
-                'hr_notes': '候选人表现积极'
+                'hr_notes': '候选人表现积极',
+                'wait': True
             }),
             content_type='application/json'
         )
@@ -503,7 +513,7 @@ class IntegrationTests(InterviewAssistTestCase):
         # 5. 生成报告
         response = self.client.post(
             f'{self.base_url}/sessions/{session_id}/generate-report/',
-            data=json.dumps({'hr_notes': '面试表现良好'}),
+            data=json.dumps({'hr_notes': '面试表现良好', 'wait': True}),
             content_type='application/json'
         )
         self.assertEqual(response.status_code, 200)
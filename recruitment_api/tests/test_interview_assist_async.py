@@ -0,0 +1,137 @@
+"""
+面试辅助异步LLM调用测试
+"""
+
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from interview_assist.services.interview_assistant import InterviewAssistant
+from interview_assist.services.llm_client import parse_json_response
+
+
+class SlowAsyncClient:
+    """每次调用耗时 delay 秒的异步客户端"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+
+    async def chat_with_json_response(self, messages, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        user_message = messages[-1]["content"]
+        if "兴趣点" in user_message:
+            return {"interest_points": [{"content": "项目经历"}], "questions": [{"question": "简历问题"}]}
+        return {"questions": [{"question": f"问题{self.calls}"}], "normalized_score": 70}
+
+
+class SyncClient:
+    """同步客户端"""
+
+    def chat_with_json_response(self, messages, temperature=0.7):
+        return {"followup_suggestions": [{"question": "具体怎么做的？"}], "hr_hint": "追问细节"}
+
+
+class AsyncAssistantTestCase(SimpleTestCase):
+    """异步面试助手测试"""
+
+    def test_question_pool_is_generated_concurrently(self):
+        client = SlowAsyncClient(delay=0.2)
+        assistant = InterviewAssistant(llm_client=client, job_config={"title": "后端工程师"})
+
+        started = time.monotonic()
+        pool = async_to_sync(assistant.agenerate_question_pool)(
+            categories=["简历相关", "专业能力", "行为面试", "系统设计"],
+            resume_content="五年Python开发经验",
+        )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(client.calls, 4)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(pool["questions"][0]["question"], "简历问题")
+        self.assertEqual(len(pool["questions"]), 4)
+        self.assertEqual(pool["interest_points"], [{"content": "项目经历"}])
+
+    def test_sync_client_in_async_path(self):
+        assistant = InterviewAssistant(llm_client=SyncClient())
+        result = async_to_sync(assistant.agenerate_followup_suggestions)(
+            original_question="介绍一下缓存设计", answer="用了Redis", evaluation={}
+        )
+        self.assertEqual(result["hr_hint"], "追问细节")
+
+    def test_async_client_in_sync_path(self):
+        assistant = InterviewAssistant(llm_client=SlowAsyncClient(delay=0))
+        questions = assistant.generate_skill_based_questions("专业能力", count=1)
+        self.assertEqual(questions, [{"question": "问题1"}])
+
+    def test_parse_json_response(self):
+        self.assertEqual(parse_json_response('```json\n{"a": 1}\n```'), {"a": 1})
+        self.assertEqual(parse_json_response('结果如下：{"a": 2} 以上'), {"a": 2})
+        with self.assertRaises(ValueError):
+            parse_json_response("无法评估")
+
+
+class EvaluationClient:
+    """评估与追问各耗时 delay 秒，评估结果的 should_followup 可配置"""
+
+    def __init__(self, should_followup, delay=0.2):
+        self.should_followup = should_followup
+        self.delay = delay
+        self.calls = []
+
+    async def chat_with_json_response(self, messages, temperature=0.7):
+        user_message = messages[-1]["content"]
+        kind = "followup" if "生成追问建议" in user_message else "evaluation"
+        self.calls.append(kind)
+        await asyncio.sleep(self.delay)
+        if kind == "followup":
+            return {"followup_suggestions": [{"question": "请给出具体指标"}], "hr_hint": "追问指标"}
+        return {"normalized_score": 40.0, "should_followup": self.should_followup}
+
+
+class SpeculativeFollowupTestCase(SimpleTestCase):
+    """推测执行追问建议测试"""
+
+    shallow_answer = "我们用了微服务和分布式"
+
+    def _run(self, client, answer, speculative=True):
+        assistant = InterviewAssistant(llm_client=client)
+        return async_to_sync(assistant.aevaluate_answer_with_followup)(
+            question="介绍一下系统架构", answer=answer, target_skills=["架构设计"], speculative=speculative
+        )
+
+    def test_accepted_speculation_runs_concurrently(self):
+        client = EvaluationClient(should_followup=True)
+
+        started = time.monotonic()
+        result = self._run(client, self.shallow_answer)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(result["followup"]["hr_hint"], "追问指标")
+        self.assertTrue(result["speculation"]["accepted"])
+        self.assertGreater(result["speculation"]["latency_saved_ms"], 100)
+
+    def test_speculation_discarded_when_evaluation_disagrees(self):
+        result = self._run(EvaluationClient(should_followup=False), self.shallow_answer)
+
+        self.assertIsNone(result["followup"])
+        self.assertTrue(result["speculation"]["started"])
+        self.assertFalse(result["speculation"]["accepted"])
+        self.assertEqual(result["speculation"]["latency_saved_ms"], 0.0)
+
+    def test_serial_when_disabled_or_not_suspicious(self):
+        client = EvaluationClient(should_followup=True, delay=0)
+        result = self._run(client, self.shallow_answer, speculative=False)
+        self.assertFalse(result["speculation"]["started"])
+        self.assertEqual(client.calls, ["evaluation", "followup"])
+        self.assertIsNotNone(result["followup"])
+
+        client = EvaluationClient(should_followup=False, delay=0)
+        detailed = "比如在订单系统中，我们把QPS从3000提升到12000，具体做法是拆分热点库表并引入本地缓存，上线后P99延迟下降了40%。"
+        result = self._run(client, detailed)
+        self.assertFalse(result["speculation"]["started"])
+        self.assertEqual(client.calls, ["evaluation"])
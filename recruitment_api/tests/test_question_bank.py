@@ -0,0 +1,201 @@
+"""
+题库（跨会话复用、近似去重、选题统计）测试
+"""
+
+import json
+import uuid
+
+from asgiref.sync import async_to_sync
+from django.test import Client, TestCase
+
+from interview_assist.models import InterviewAssistSession, QuestionBankEntry
+from interview_assist.services.interview_assistant import InterviewAssistant
+from interview_assist.services.question_bank import NO_SKILLS_KEY, QuestionBank, skill_key
+from resume_screening.models import ResumeData
+
+
+class CountingClient:
+    """记录调用次数的LLM客户端，每次返回固定的技能问题"""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.calls = 0
+
+    def chat_with_json_response(self, messages, temperature=0.7):
+        self.calls += 1
+        return {"questions": self.questions}
+
+
+class QuestionBankTestCase(TestCase):
+    """题库服务测试"""
+
+    def setUp(self):
+        self.bank = QuestionBank()
+
+    def _questions(self, *texts, skills=("Python",)):
+        return [{"question": text, "difficulty": 6, "expected_skills": list(skills)} for text in texts]
+
+    def test_near_duplicates_are_merged(self):
+        first = self.bank.add_questions(
+            self._questions("如何设计一个高并发的秒杀系统？", "Python的GIL对多线程有什么影响？"),
+            "专业能力", "senior"
+        )
+        second = self.bank.add_questions(
+            self._questions("如何设计一个支持高并发的秒杀系统", "如何设计一个高并发秒杀系统？", "MySQL索引失效的常见场景有哪些？"),
+            "专业能力", "senior"
+        )
+
+        self.assertEqual(QuestionBankEntry.objects.count(), 3)
+        self.assertEqual(second[0].pk, first[0].pk)
+        self.assertEqual(len(second), 2)
+
+        # 不同级别分别建库
+        self.bank.add_questions(self._questions("如何设计一个高并发的秒杀系统？"), "专业能力", "junior")
+        self.assertEqual(QuestionBankEntry.objects.count(), 4)
+
+    def test_bank_serves_before_llm(self):
+        client = CountingClient(self._questions("Python的GIL对多线程有什么影响？", "如何排查Django慢查询？"))
+        assistant = InterviewAssistant(llm_client=client, question_bank=self.bank)
+
+        first = async_to_sync(self.bank.afill_questions)(assistant, "专业能力", "senior", 2)
+        second = async_to_sync(self.bank.afill_questions)(assistant, "专业能力", "senior", 2)
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual({q["bank_question_id"] for q in first}, {q["bank_question_id"] for q in second})
+        self.assertEqual(set(QuestionBankEntry.objects.values_list("usage_count", flat=True)), {2})
+
+        # 题库不足时只调用LLM补充
+        async_to_sync(self.bank.afill_questions)(assistant, "专业能力", "senior", 3)
+        self.assertEqual(client.calls, 2)
+
+    def test_bank_is_keyed_by_required_skills(self):
+        backend = CountingClient(self._questions("Python的GIL对多线程有什么影响？", "如何排查Django慢查询？"))
+        frontend = CountingClient(
+            self._questions("React的虚拟DOM如何提升渲染性能？", "如何优化首屏加载时间？", skills=("React",))
+        )
+        python_job = {"requirements": {"required_skills": ["Python", "Django"]}}
+        react_job = {"requirements": {"required_skills": ["React", "TypeScript"]}}
+
+        async_to_sync(self.bank.afill_questions)(
+            InterviewAssistant(llm_client=backend, job_config=python_job, question_bank=self.bank), "专业能力", "senior", 2
+        )
+        # 技能集合不同的岗位不使用其他岗位的问题
+        questions = async_to_sync(self.bank.afill_questions)(
+            InterviewAssistant(llm_client=frontend, job_config=react_job, question_bank=self.bank), "专业能力", "senior", 2
+        )
+        self.assertEqual(frontend.calls, 1)
+        self.assertEqual([q["question"] for q in questions], ["React的虚拟DOM如何提升渲染性能？", "如何优化首屏加载时间？"])
+
+        # 技能集合相同（忽略大小写和顺序）时复用题库
+        same_job = {"requirements": {"required_skills": ["django", "Python"]}}
+        questions = async_to_sync(self.bank.afill_questions)(
+            InterviewAssistant(llm_client=backend, job_config=same_job, question_bank=self.bank), "专业能力", "senior", 2
+        )
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual({q["question"] for q in questions}, {"Python的GIL对多线程有什么影响？", "如何排查Django慢查询？"})
+
+    def test_jobs_without_skills_do_not_reuse_legacy_questions(self):
+        # 分库前入库的问题（skill_key 为空）不参与选题
+        QuestionBankEntry.objects.create(question="请介绍一个你最有成就感的项目", category="专业能力", candidate_level="senior")
+        QuestionBankEntry.objects.create(
+            question="说说你对微服务拆分的理解", category="专业能力", candidate_level="senior", skill_key=""
+        )
+        self.assertEqual(self.bank.select("专业能力", "senior", 2), [])
+
+        entry, = self.bank.add_questions(self._questions("如何保证接口的幂等性？"), "专业能力", "senior")
+        self.assertEqual(entry.skill_key, NO_SKILLS_KEY)
+        self.assertEqual(skill_key([" ", ""]), NO_SKILLS_KEY)
+        self.assertEqual([e.pk for e in self.bank.select("专业能力", "senior", 2)], [entry.pk])
+
+    def test_selection_prefers_discriminating_questions(self):
+        flat, spread = self.bank.add_questions(
+            self._questions("请介绍Python装饰器的原理", "如何定位线上内存泄漏？"), "专业能力", "senior"
+        )
+        for score in (60, 61, 60, 59):
+            QuestionBank.record_answer(flat.pk, score)
+        for score in (20, 90, 35, 85):
+            QuestionBank.record_answer(spread.pk, score)
+        QuestionBankEntry.objects.update(usage_count=4)
+
+        selected = self.bank.select("专业能力", "senior", 1)
+        self.assertEqual(selected[0].pk, spread.pk)
+
+        spread.refresh_from_db()
+        self.assertEqual(spread.answer_count, 4)
+        self.assertAlmostEqual(spread.avg_score, 57.5)
+
+
+class QuestionBankAPITestCase(TestCase):
+    """题库接入问题生成与问答记录的测试"""
+
+    def setUp(self):
+        self.client = Client()
+        resume_data = ResumeData.objects.create(
+            candidate_name='赵六',
+            position_title='测试开发工程师',
+            position_details={},
+            resume_content='赵六，3年自动化测试经验。',
+            resume_file_hash=f'test_hash_{uuid.uuid4().hex[:16]}'
+        )
+        self.session = InterviewAssistSession.objects.create(
+            resume_data=resume_data, interviewer_name='面试官', job_config={'title': '测试开发工程师'}
+        )
+
+    def test_record_answer_updates_bank_stats(self):
+        response = self.client.post(
+            f'/interview-assist/sessions/{self.session.id}/generate-questions/',
+            data=json.dumps({'categories': ['专业能力'], 'focus_on_resume': False}),
+            content_type='application/json'
+        )
+        question = response.json()['data']['question_pool'][0]
+        self.assertIn('bank_question_id', question)
+
+        response = self.client.post(
+            f'/interview-assist/sessions/{self.session.id}/record-qa/',
+            data=json.dumps({
+                'question': {'content': question['question'], 'bank_question_id': question['bank_question_id']},
+                'answer': {'content': '我负责搭建了接口自动化测试平台，比如用pytest把回归时间从2天缩短到3小时。'}
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        entry = QuestionBankEntry.objects.get(pk=question['bank_question_id'])
+        self.assertEqual(entry.answer_count, 1)
+        self.assertEqual(entry.qa_records.count(), 1)
+
+        response = self.client.get('/interview-assist/question-bank/', {'category': '专业能力'})
+        self.assertEqual(response.json()['data']['total'], QuestionBankEntry.objects.count())
+
+    def test_list_validates_and_paginates(self):
+        bank = QuestionBank()
+        bank.add_questions(
+            [{"question": f"第{i}个Python问题：{'异步' if i % 2 else '元类'}{i}", "difficulty": 6,
+              "expected_skills": ["Python"]} for i in range(5)],
+            "专业能力", "senior"
+        )
+        bank.add_questions([{"question": "React Hooks 的闭包陷阱是什么？", "expected_skills": ["React"]}], "专业能力", "senior")
+
+        response = self.client.get('/interview-assist/question-bank/', {'difficulty': 'hard'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/interview-assist/question-bank/', {'page': '0'}).status_code, 400)
+
+        data = self.client.get('/interview-assist/question-bank/', {'skill': 'python', 'page_size': 2, 'page': 3}).json()['data']
+        self.assertEqual((data['total'], data['page'], data['page_size']), (5, 3, 2))
+        self.assertEqual(len(data['questions']), 1)
+        self.assertEqual(data['questions'][0]['skills'], ['Python'])
+
+        data = self.client.get('/interview-assist/question-bank/', {'difficulty': 6, 'page_size': 10}).json()['data']
+        self.assertEqual(data['total'], 5)
+
+    def test_invalid_bank_question_id_ignored(self):
+        response = self.client.post(
+            f'/interview-assist/sessions/{self.session.id}/record-qa/',
+            data=json.dumps({
+                'question': {'content': '介绍一下你的项目', 'bank_question_id': 'abc'},
+                'answer': {'content': '我负责接口自动化测试平台。'}
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(self.session.qa_records.get().bank_question_id)
@@ -0,0 +1,167 @@
+"""
+候选问题池预生成与缓存测试
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from interview_assist.models import InterviewAssistSession, QuestionPoolCache
+from interview_assist.services.interview_assistant import InterviewAssistant
+from interview_assist.services.question_pool import (
+    DEFAULT_CANDIDATE_LEVEL,
+    DEFAULT_CATEGORIES,
+    DEFAULT_COUNT_PER_CATEGORY,
+    aget_question_pool,
+    question_pool_cache_key,
+    warm_question_pool,
+)
+from resume_screening.models import ResumeData
+
+
+class SlowClient:
+    """耗时的异步LLM客户端，记录调用次数"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat_with_json_response(self, messages, temperature=0.7):
+        self.calls += 1
+        await asyncio.sleep(0.2)
+        return {"questions": [{"question": "如何设计支付系统的幂等？", "difficulty": 6, "expected_skills": ["Go"]}]}
+
+
+class EmptyClient:
+    """LLM调用失败（没有生成任何问题）的异步客户端"""
+
+    async def chat_with_json_response(self, messages, temperature=0.7):
+        return {"questions": []}
+
+
+class QuestionPoolTestCase(TestCase):
+    """问题池缓存测试"""
+
+    def setUp(self):
+        self.client = Client()
+        self.resume_data = ResumeData.objects.create(
+            candidate_name='王五',
+            position_title='后端开发工程师',
+            position_details={'skills': ['Go', 'Python']},
+            resume_content='王五，4年Go和Python开发经验，负责过支付系统重构。',
+            resume_file_hash=f'test_hash_{uuid.uuid4().hex[:16]}'
+        )
+        self.job_config = {'title': '后端开发工程师', 'requirements': {'required_skills': ['Python']}}
+
+    def _create_session(self):
+        return InterviewAssistSession.objects.create(
+            resume_data=self.resume_data,
+            interviewer_name='面试官',
+            job_config=self.job_config
+        )
+
+    def _generate(self, session, **data):
+        return self.client.post(
+            f'/interview-assist/sessions/{session.id}/generate-questions/',
+            data=json.dumps(data),
+            content_type='application/json'
+        )
+
+    def test_session_creation_schedules_warmup(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                '/interview-assist/sessions/',
+                data=json.dumps({'resume_data_id': str(self.resume_data.id), 'job_config': self.job_config}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.json()['data']['question_pool_warming'])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_warmup_fills_session_and_cache(self):
+        session = self._create_session()
+        self.assertTrue(warm_question_pool(session.id))
+
+        session.refresh_from_db()
+        self.assertTrue(session.question_pool)
+        entry = QuestionPoolCache.objects.get()
+        self.assertEqual(entry.status, 'ready')
+        self.assertEqual(entry.question_pool, session.question_pool)
+
+        # 同一候选人/岗位的新会话直接复用缓存
+        second = self._create_session()
+        self.assertFalse(warm_question_pool(second.id))
+        second.refresh_from_db()
+        self.assertEqual(second.question_pool, session.question_pool)
+        self.assertEqual(QuestionPoolCache.objects.count(), 1)
+
+    def test_generate_reads_cache_and_refreshes(self):
+        session = self._create_session()
+        warm_question_pool(session.id)
+
+        response = self._generate(session)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['data']['cached'])
+        self.assertEqual(QuestionPoolCache.objects.get().hit_count, 1)
+
+        response = self._generate(session, refresh=True)
+        self.assertFalse(response.json()['data']['cached'])
+
+        # 不同生成参数对应不同缓存
+        response = self._generate(session, candidate_level='junior')
+        self.assertFalse(response.json()['data']['cached'])
+        self.assertEqual(QuestionPoolCache.objects.count(), 2)
+
+    def test_stale_generating_entry_is_taken_over(self):
+        session = self._create_session()
+        cache_key, resume_hash, job_config_hash = question_pool_cache_key(
+            self.resume_data.resume_content, self.job_config, {},
+            DEFAULT_CANDIDATE_LEVEL, DEFAULT_CATEGORIES, DEFAULT_COUNT_PER_CATEGORY
+        )
+        entry = QuestionPoolCache.objects.create(
+            cache_key=cache_key, resume_hash=resume_hash,
+            job_config_hash=job_config_hash, candidate_level=DEFAULT_CANDIDATE_LEVEL
+        )
+        QuestionPoolCache.objects.filter(pk=entry.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        response = self._generate(session)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()['data']['cached'])
+        self.assertEqual(QuestionPoolCache.objects.get().status, 'ready')
+
+    def test_concurrent_misses_generate_once(self):
+        client = SlowClient()
+        assistant = InterviewAssistant(llm_client=client, job_config=self.job_config)
+
+        async def generate_twice():
+            return await asyncio.gather(*[
+                aget_question_pool(assistant, '', ['专业能力'], count_per_category=1) for _ in range(2)
+            ])
+
+        results = async_to_sync(generate_twice)()
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(sorted(result['cached'] for result in results), [False, True])
+        self.assertEqual(results[0]['questions'], results[1]['questions'])
+        entry = QuestionPoolCache.objects.get()
+        self.assertEqual((entry.status, entry.hit_count), ('ready', 1))
+
+    def test_failed_refresh_keeps_ready_pool(self):
+        assistant = InterviewAssistant(llm_client=SlowClient(), job_config=self.job_config)
+        first = async_to_sync(aget_question_pool)(assistant, '', ['专业能力'], count_per_category=1)
+        self.assertTrue(first['questions'])
+
+        assistant = InterviewAssistant(llm_client=EmptyClient(), job_config=self.job_config)
+        refreshed = async_to_sync(aget_question_pool)(assistant, '', ['专业能力'], count_per_category=1, refresh=True)
+        self.assertTrue(refreshed['cached'])
+        self.assertEqual(refreshed['questions'], first['questions'])
+        entry = QuestionPoolCache.objects.get()
+        self.assertEqual((entry.status, entry.question_pool), ('ready', first['questions']))
+
+        # 首次生成失败时不缓存
+        missed = async_to_sync(aget_question_pool)(assistant, '', ['专业能力'], count_per_category=2)
+        self.assertEqual(missed['questions'], [])
+        self.assertEqual(QuestionPoolCache.objects.count(), 1)
@@ -0,0 +1,109 @@
+"""
+最终报告后台生成测试
+"""
+
+import json
+import shutil
+import tempfile
+import uuid
+
+from django.test import Client, TestCase, override_settings
+
+from interview_assist.models import InterviewAssistSession, InterviewQARecord, InterviewReportJob
+from interview_assist.services.report_jobs import run_report_job
+from resume_screening.models import ResumeData
+
+
+class ReportJobTestCase(TestCase):
+    """报告生成任务测试"""
+
+    def setUp(self):
+        self.client = Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir)
+        media.enable()
+        self.addCleanup(media.disable)
+        resume_data = ResumeData.objects.create(
+            candidate_name='周八',
+            position_title='后端开发工程师',
+            position_details={},
+            resume_content='周八，4年Go开发经验。',
+            resume_file_hash=f'test_hash_{uuid.uuid4().hex[:16]}'
+        )
+        self.session = InterviewAssistSession.objects.create(
+            resume_data=resume_data, interviewer_name='面试官', job_config={'title': '后端开发工程师'}
+        )
+        self.url = f'/interview-assist/sessions/{self.session.id}'
+        self._add_record(1, 70)
+
+    def _add_record(self, round_number, score):
+        InterviewQARecord.objects.create(
+            session=self.session, round_number=round_number, question='介绍一下项目', answer='负责订单服务',
+            evaluation={'normalized_score': score, 'dimension_scores': {'technical_depth': 3}}
+        )
+        self.session.stats = {}
+        self.session.save(update_fields=['stats'])
+
+    def _submit(self, **data):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                f'{self.url}/generate-report/', data=json.dumps(data), content_type='application/json'
+            )
+        return response, callbacks
+
+    def test_background_job_and_cache(self):
+        response, callbacks = self._submit(hr_notes='表现积极')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+        job_id = response.json()['data']['job_id']
+
+        status = self.client.get(f'{self.url}/report-jobs/{job_id}/').json()['data']
+        self.assertEqual(status['job_status'], 'pending')
+
+        # 测试中不启动线程，直接执行任务
+        self.assertTrue(run_report_job(job_id))
+        self.assertFalse(run_report_job(job_id))
+
+        status = self.client.get(f'{self.url}/report-jobs/{job_id}/').json()['data']
+        self.assertEqual(status['job_status'], 'completed')
+        self.assertIn('overall_assessment', status['report'])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, 'completed')
+        self.assertEqual(self.session.report_file.name, InterviewReportJob.objects.get().markdown_file.name)
+
+        # 内容未变化：直接返回已生成的报告，不创建新任务
+        response, callbacks = self._submit(hr_notes='表现积极')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['data']['cached'])
+        self.assertEqual(response.json()['data']['job_id'], job_id)
+        self.assertEqual(len(callbacks), 0)
+
+        # 记录新问答后重新生成
+        self._add_record(2, 40)
+        response, callbacks = self._submit(hr_notes='表现积极')
+        self.assertEqual(response.status_code, 202)
+        self.assertNotEqual(response.json()['data']['job_id'], job_id)
+        self.assertEqual(InterviewReportJob.objects.count(), 2)
+
+    def test_wait_and_download(self):
+        response, _ = self._submit(wait=True, include_conversation_log=True)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertFalse(data['cached'])
+
+        response = self.client.get(data['download_urls']['markdown'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# 面试辅助评估报告', b''.join(response.streaming_content).decode('utf-8'))
+
+        response = self.client.get(data['download_urls']['json'])
+        document = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(document['report'], data['report'])
+        self.assertEqual(len(document['qa_records']), 1)
+
+        response = self.client.get(f"{self.url}/report-jobs/{data['job_id']}/download/", {'format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_job(self):
+        response = self.client.get(f'{self.url}/report-jobs/{uuid.uuid4()}/')
+        self.assertEqual(response.status_code, 404)
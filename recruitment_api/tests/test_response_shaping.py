@@ -0,0 +1,115 @@
+"""
+响应裁剪测试（稀疏字段集、展开大字段、按需获取的子资源）
+"""
+
+import json
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from resume_screening.models import ResumeData, ResumeGroup, ResumeScreeningTask, ScreeningReport
+
+
+def make_report(name: str) -> str:
+    return json.dumps({
+        "candidate_name": name,
+        "scores": {"hr_score": 80, "technical_score": 75, "manager_score": 78, "comprehensive_score": 77},
+        "conversation_history": [
+            {"name": "HR", "content": f"{name} 的沟通能力良好。"},
+            {"name": "技术专家", "content": f"{name} 熟悉 Python 和 Django。"},
+            {"name": "项目经理", "content": f"{name} 的项目经验符合要求。"},
+        ],
+    }, ensure_ascii=False)
+
+
+class ResponseShapingTestCase(TestCase):
+    """列表接口默认不返回简历全文和JSON报告"""
+
+    def setUp(self):
+        self.client = Client()
+        self.task = ResumeScreeningTask.objects.create(status='completed', position_data={'position': 'Python开发'})
+        self.group = ResumeGroup.objects.create(
+            position_title='Python开发', position_details={}, position_hash='0' * 64, group_name='Python开发_1人'
+        )
+        self.resume = '张三\n5年Python开发经验\n' * 200
+        ScreeningReport.objects.create(task=self.task, original_filename='张三.md', resume_content=self.resume)
+        self.data = ResumeData.objects.create(
+            position_title='Python开发', position_details={}, candidate_name='张三',
+            resume_content=self.resume, json_report_content=make_report('张三'),
+            screening_score={'comprehensive_score': 77}, screening_summary='综合评分 77',
+            resume_file_hash='1' * 64, task=self.task, group=self.group,
+        )
+
+    def test_heavy_fields_omitted_by_default(self):
+        response = self.client.get('/resume-screening/tasks-history/')
+        self.assertEqual(response.status_code, 200)
+        task = response.json()['tasks'][0]
+        item = task['resume_data'][0]
+        self.assertNotIn('resume_content', item)
+        self.assertNotIn('json_content', item)
+        self.assertNotIn('resume_content', task['reports'][0])
+        self.assertEqual(item['summary'], '综合评分 77')
+        self.assertEqual(item['resume_url'], f'/resume-screening/data/{self.data.id}/resume/')
+        self.assertLess(len(response.content), len(self.resume))
+
+        response = self.client.get(f'/resume-screening/groups/{self.group.id}/')
+        item = response.json()['group']['resumes'][0]
+        self.assertNotIn('json_content', item)
+        self.assertEqual(item['scores']['comprehensive_score'], 77)
+
+        # 未包含简历信息时不查询简历
+        response = self.client.get('/resume-screening/groups/')
+        self.assertNotIn('resumes', response.json()['groups'][0])
+
+    def test_expand_and_sparse_fields(self):
+        response = self.client.get('/resume-screening/tasks-history/', {
+            'expand': 'resume_data.json_content,reports.resume_content',
+            'fields': 'task_id,resume_data.id,resume_data.json_content,reports',
+        })
+        task = response.json()['tasks'][0]
+        self.assertEqual(set(task), {'task_id', 'resume_data', 'reports'})
+        # JSON报告原样嵌入响应（对象，而不是转义后的字符串）
+        self.assertEqual(task['resume_data'], [{'id': str(self.data.id), 'json_content': json.loads(make_report('张三'))}])
+        self.assertEqual(task['reports'][0]['resume_content'], self.resume)
+
+        response = self.client.get(f'/resume-screening/tasks/{self.task.id}/status/', {
+            'fields': 'status,resume_data.candidate_name',
+        })
+        self.assertEqual(response.json(), {'status': 'completed', 'resume_data': [{'candidate_name': '张三'}]})
+
+        # include_resumes 与 expand=resumes 等价，展开简历全文同时包含简历信息
+        for params in ({'include_resumes': 'true'}, {'expand': 'resumes.resume_content'}):
+            group = self.client.get('/resume-screening/groups/', params).json()['groups'][0]
+            self.assertEqual(group['resumes'][0]['candidate_name'], '张三')
+            self.assertEqual('resume_content' in group['resumes'][0], 'expand' in params)
+
+        response = self.client.get('/resume-screening/groups/', {'expand': 'resume_content'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('resumes.resume_content', response.json()['message'])
+
+    def test_unused_columns_not_loaded(self):
+        # 只选择少数字段时，不返回的列不查询，也不取回压缩文本
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/resume-screening/groups/{self.group.id}/', {
+                'fields': 'id,resumes.candidate_name',
+            })
+        self.assertEqual(response.json()['group'], {'id': str(self.group.id), 'resumes': [{'candidate_name': '张三'}]})
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"resume_data"."candidate_name"', sql)
+        self.assertNotIn('"resume_data"."json_report_content"', sql)
+        self.assertNotIn('"resume_data"."position_details"', sql)
+        self.assertFalse(any('text_blobs' in query['sql'] for query in queries.captured_queries))
+
+    def test_sub_resources(self):
+        response = self.client.get(f'/resume-screening/data/{self.data.id}/resume/')
+        self.assertEqual(response.json()['resume_content'], self.resume)
+
+        response = self.client.get(f'/resume-screening/data/{self.data.id}/transcript/', {'offset': 1, 'limit': 1})
+        body = response.json()
+        self.assertEqual(body['total'], 3)
+        self.assertEqual([message['name'] for message in body['messages']], ['技术专家'])
+
+        self.assertEqual(self.client.get(f'/resume-screening/data/{self.data.id}/transcript/?limit=x').status_code, 400)
+        ResumeData.objects.filter(id=self.data.id).delete()
+        self.assertEqual(self.client.get(f'/resume-screening/data/{self.data.id}/resume/').status_code, 404)
@@ -0,0 +1,117 @@
+"""
+简历规则预筛选测试
+"""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from resume_screening.data_manager import extract_scores_from_json_report
+from resume_screening.keyword_matcher import KeywordMatcher
+from resume_screening.prefilter import (
+    build_rejection_report,
+    extract_years_of_experience,
+    prefilter_resume,
+)
+
+
+POSITION = {
+    "position": "前端开发工程师",
+    "required_skills": ["HTML", "JavaScript", "css"],
+    "optional_skills": ["vue3", "react"],
+    "min_experience": 3,
+    "education": ["本科", "大专"],
+}
+
+
+class KeywordMatcherTestCase(TestCase):
+    """多关键词匹配（前缀树正则）测试"""
+
+    def test_find_overlapping_keywords(self):
+        matcher = KeywordMatcher({"前端": 1, "前端开发": 2, "开发": 3})
+        hits = [(start, end, term) for start, end, term, _ in matcher.find_all("资深前端开发")]
+
+        self.assertEqual(hits, [(2, 4, "前端"), (2, 6, "前端开发"), (4, 6, "开发")])
+
+    def test_case_insensitive_with_word_boundary(self):
+        matcher = KeywordMatcher({"AI": "ai", "Vue.js": "vue"})
+
+        self.assertEqual(matcher.matched_values("熟悉 vue.js，了解 ai 应用"), {"ai", "vue"})
+        self.assertEqual(matcher.matched_values("maintain legacy code"), set())
+
+
+class ResumePrefilterTestCase(TestCase):
+    """预筛选打分测试"""
+
+    def test_extract_years_of_experience(self):
+        self.assertEqual(extract_years_of_experience("拥有5年前端开发经验"), 5)
+        self.assertEqual(extract_years_of_experience("三年以上工作经验"), 3)
+        self.assertEqual(extract_years_of_experience("工作年限：4"), 4)
+        self.assertEqual(extract_years_of_experience("6+ years of frontend experience"), 6)
+        self.assertIsNone(extract_years_of_experience("2020年毕业于某大学"))
+
+        # 示例简历的格式
+        sample = (Path(settings.BASE_DIR) / 'resume_screening' / 'resumes' / '张三.txt').read_text(encoding='utf-8')
+        self.assertIn("工作经验: 3年", sample)
+        self.assertEqual(extract_years_of_experience(sample), 3)
+        self.assertEqual(extract_years_of_experience("开发经验：两年"), 2)
+
+    def test_matching_resume_passes(self):
+        resume = "本科学历，5年前端开发经验，熟悉 HTML5、CSS3、JS 以及 Vue3 框架。"
+        result = prefilter_resume(POSITION, resume)
+
+        self.assertTrue(result["passed"])
+        self.assertEqual(result["matched_required_skills"], ["HTML", "JavaScript", "css"])
+        self.assertEqual(result["matched_optional_skills"], ["vue3"])
+        self.assertEqual(result["reasons"], [])
+
+    def test_unrelated_resume_rejected_with_reasons(self):
+        resume = "高中学历，1年仓库管理经验，熟悉 Excel。"
+        result = prefilter_resume(POSITION, resume)
+
+        self.assertFalse(result["passed"])
+        self.assertEqual(result["missing_required_skills"], ["HTML", "JavaScript", "css"])
+        self.assertTrue(any("缺少必备技能" in reason for reason in result["reasons"]))
+        self.assertTrue(any("工作年限" in reason for reason in result["reasons"]))
+
+    def test_composite_skill_criteria(self):
+        criteria_file = Path(settings.BASE_DIR) / 'position_settings' / 'migrations' / 'recruitment_criteria.json'
+        position = json.loads(criteria_file.read_text(encoding='utf-8'))
+        resume = "硕士，5年工作经验，熟悉 Python、PyTorch 和深度学习，了解 Transformer模型架构，做过 Triton GPU编程。"
+        result = prefilter_resume(position, resume)
+
+        self.assertTrue(result["passed"])
+        self.assertIn("PyTorch/TensorFlow", result["matched_required_skills"])
+        self.assertEqual(result["missing_required_skills"], [])
+        self.assertIn("CUDA/Triton GPU编程", result["matched_optional_skills"])
+
+    def test_unknowns_do_not_pass_without_required_skills(self):
+        position = dict(POSITION, optional_skills=[])
+        # 年限、学历都无法识别且没有加分技能要求时，不再得满分
+        result = prefilter_resume(position, "熟悉 Excel 和 Word")
+        self.assertEqual(result["score"], 12.5)
+        self.assertFalse(result["passed"])
+
+        # 必备技能一项都未命中时，即使阈值很低也不通过
+        result = prefilter_resume(position, "本科，5年工作经验，熟悉 Excel", threshold=10)
+        self.assertGreaterEqual(result["score"], 10)
+        self.assertFalse(result["passed"])
+        self.assertEqual(result["reasons"][0], "未命中任何必备技能")
+
+    def test_threshold_override(self):
+        resume = "熟悉 HTML"
+        self.assertFalse(prefilter_resume(POSITION, resume, threshold=90)["passed"])
+        self.assertTrue(prefilter_resume(dict(POSITION, prefilter_threshold=10), resume)["passed"])
+
+        with override_settings(RESUME_PREFILTER_THRESHOLD=95):
+            self.assertFalse(prefilter_resume(POSITION, resume)["passed"])
+
+    def test_rejection_report_format(self):
+        result = prefilter_resume(POSITION, "熟悉 Excel")
+        report = build_rejection_report("王五", result)
+
+        self.assertEqual(report["final_recommendation"]["decision"], "不匹配")
+        scores = extract_scores_from_json_report(json.dumps(report, ensure_ascii=False))
+        self.assertEqual(scores["comprehensive_score"], result["score"])
@@ -0,0 +1,191 @@
+"""
+初筛任务按候选人执行测试（使用本地函数代替多专家评审）
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from resume_screening import scheduler as scheduler_module
+from resume_screening import screening_tasks
+from resume_screening.models import ResumeData, ResumeScreeningTask, ScreeningCandidateResult
+from resume_screening.scheduler import ScreeningScheduler
+
+
+class ScreeningCandidateTestCase(TestCase):
+    """候选人子任务测试"""
+
+    def setUp(self):
+        self.client = Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.media = override_settings(MEDIA_ROOT=os.path.join(self.tmpdir, 'media'))
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        self.fail_on = set()
+        self.screened = []
+        self.saved_before = []
+        for target, value in [
+            ('RESUMES_DIR', self.tmpdir),
+            ('screen_payload_resume', self._fake_screen),
+        ]:
+            patcher = mock.patch.object(screening_tasks, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _fake_screen(self, position, item):
+        candidate_name = os.path.splitext(item['name'])[0]
+        self.screened.append(candidate_name)
+        if candidate_name in self.fail_on:
+            raise TimeoutError('LLM 调用超时')
+        # 评审开始时已保存的候选人数（先完成的候选人不等整批结束即已入库）
+        self.saved_before.append(ResumeData.objects.count())
+
+        md = f"# {candidate_name}简历初筛结果\n综合评分：80分"
+        with open(os.path.join(self.tmpdir, f"{candidate_name}简历初筛结果.md"), 'w', encoding='utf-8') as f:
+            f.write(md)
+        with open(os.path.join(self.tmpdir, f"{candidate_name}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'scores': {'comprehensive_score': 80}}, f, ensure_ascii=False)
+        return candidate_name, md
+
+    def _create_task(self, names):
+        resumes = [{'name': f'{name}.txt', 'content': f'{name}的简历', 'metadata': {}} for name in names]
+        task = ResumeScreeningTask.objects.create(
+            total_steps=len(resumes), position_data={'position': 'Python开发', 'required_skills': ['Python']}
+        )
+        screening_tasks.create_candidate_results(task, resumes)
+        return task
+
+    def test_failure_isolated_and_retry(self):
+        task = self._create_task(['张三', '李四', '王五'])
+        self.fail_on = {'李四'}
+        screening_tasks.run_screening_task(task.id)
+
+        self.assertEqual(self.saved_before, [0, 1])
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'completed')
+        self.assertEqual(task.progress, 100)
+        self.assertIn('李四', task.error_message)
+        statuses = dict(task.candidate_results.values_list('candidate_name', 'status'))
+        self.assertEqual(statuses, {'张三': 'completed', '李四': 'failed', '王五': 'completed'})
+
+        data = self.client.get(f'/resume-screening/tasks/{task.id}/status/').json()
+        self.assertEqual((data['completed_candidates'], data['failed_candidates']), (2, 1))
+        self.assertEqual(len(data['resume_data']), 2)
+        failed = next(item for item in data['candidates'] if item['candidate_name'] == '李四')
+        self.assertIn('超时', failed['error_message'])
+
+        # 只重试失败的候选人
+        self.fail_on = set()
+        self.screened = []
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                f'/resume-screening/tasks/{task.id}/retry/', data=json.dumps({}), content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['candidates'], ['李四'])
+        self.assertEqual(len(callbacks), 1)
+
+        screening_tasks.run_screening_task(task.id)
+        self.assertEqual(self.screened, ['李四'])
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'completed')
+        self.assertIsNone(task.error_message)
+        retried = task.candidate_results.get(candidate_name='李四')
+        self.assertEqual((retried.status, retried.attempts), ('completed', 2))
+        self.assertIsNotNone(retried.resume_data)
+
+        # 没有失败的候选人时不能重试
+        response = self.client.post(
+            f'/resume-screening/tasks/{task.id}/retry/', data=json.dumps({}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_running_task_streams_completed_candidates(self):
+        task = self._create_task(['赵六', '钱七'])
+        result = task.candidate_results.get(candidate_name='赵六')
+        screening_tasks._run_candidate(task, task.position_data, result)
+        task.status = 'running'
+        task.save()
+
+        data = self.client.get(f'/resume-screening/tasks/{task.id}/status/').json()
+        self.assertEqual(data['status'], 'running')
+        self.assertEqual([item['candidate_name'] for item in data['resume_data']], ['赵六'])
+        self.assertEqual(
+            [(item['candidate_name'], item['status']) for item in data['candidates']],
+            [('赵六', 'completed'), ('钱七', 'pending')]
+        )
+
+        # 等待中的子任务在调度器中排队时不能重试
+        self._replace_scheduler()
+        screening_tasks.enqueue_screening_task(task.id)
+        response = self.client.post(
+            f'/resume-screening/tasks/{task.id}/retry/', data=json.dumps({}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(ScreeningCandidateResult.objects.filter(task=task, status='pending').count(), 1)
+
+    def _replace_scheduler(self):
+        """模拟进程重启：换成空的调度器，工作线程改为手动执行"""
+        threads = []
+        original = scheduler_module._scheduler
+        scheduler_module._scheduler = ScreeningScheduler(
+            runner=screening_tasks.run_screening_unit, max_concurrent=1, spawn=threads.append
+        )
+        self.addCleanup(setattr, scheduler_module, '_scheduler', original)
+        return threads
+
+    def _interrupt(self, names):
+        """服务在评审中途重启：一位候选人已完成，一位进行中，其余等待中，队列丢失"""
+        task = self._create_task(names)
+        screening_tasks._run_candidate(task, task.position_data, task.candidate_results.get(candidate_name=names[0]))
+        task.candidate_results.filter(candidate_name=names[1]).update(status='running', started_at=timezone.now())
+        task.status = 'running'
+        task.save()
+        return task
+
+    def test_interrupted_task_recovered_after_restart(self):
+        task = self._interrupt(['张三', '李四', '王五'])
+        threads = self._replace_scheduler()
+
+        # 重启后才创建的任务不在恢复范围内
+        self.assertEqual(screening_tasks.recover_interrupted_tasks(created_before=task.created_at), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            count = screening_tasks.recover_interrupted_tasks(created_before=timezone.now())
+        self.assertEqual(count, 2)
+        self.assertEqual(task.candidate_results.filter(status='pending').count(), 2)
+
+        # 子任务已重新入队，不能再重试
+        response = self.client.post(
+            f'/resume-screening/tasks/{task.id}/retry/', data=json.dumps({}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 409)
+
+        self.screened = []
+        while threads:
+            threads.pop(0)()
+        self.assertEqual(self.screened, ['李四', '王五'])
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'completed')
+        self.assertEqual(task.candidate_results.filter(status='completed').count(), 3)
+
+    def test_retry_accepts_interrupted_running_task(self):
+        task = self._interrupt(['赵六', '钱七', '孙八'])
+        threads = self._replace_scheduler()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/resume-screening/tasks/{task.id}/retry/', data=json.dumps({'candidates': ['钱七']}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['candidates'], ['钱七'])
+        self.assertEqual(len(threads), 1)
+        self.assertEqual(task.candidate_results.get(candidate_name='钱七').status, 'pending')
@@ -0,0 +1,114 @@
+"""
+初筛调度器测试（工作线程替换为手动执行）
+"""
+
+from django.test import Client, TestCase, override_settings
+
+from resume_screening import scheduler as scheduler_module
+from resume_screening.models import ResumeScreeningTask
+from resume_screening.scheduler import ScreeningScheduler
+from resume_screening.screening_tasks import create_candidate_results
+
+
+class ScreeningSchedulerTestCase(TestCase):
+    """优先级、公平排队和并发上限测试"""
+
+    def setUp(self):
+        self.executed = []
+        self.pending_threads = []
+        self.scheduler = ScreeningScheduler(
+            runner=lambda task_id, result_id: self.executed.append(result_id),
+            max_concurrent=2,
+            spawn=self.pending_threads.append
+        )
+
+    def _finish_one(self):
+        self.pending_threads.pop(0)()
+
+    def _drain(self):
+        while self.pending_threads:
+            self._finish_one()
+
+    def test_concurrency_cap_and_priority(self):
+        self.scheduler.submit('bulk-task', [f'b{i}' for i in range(6)], priority='bulk', flow='position:a')
+        # 只有两个执行槽位
+        self.assertEqual(len(self.pending_threads), 2)
+
+        self.scheduler.submit('urgent-task', ['u0', 'u1'], priority='interactive', flow='submitter:hr')
+        self.assertEqual(len(self.pending_threads), 2)
+        status = self.scheduler.queue_status('urgent-task')
+        self.assertEqual((status['queue_position'], status['queued_candidates']), (0, 2))
+
+        self._drain()
+        # 交互式提交在批量提交剩余的简历之前执行
+        self.assertEqual(self.executed, ['b0', 'b1', 'u0', 'u1', 'b2', 'b3', 'b4', 'b5'])
+        self.assertIsNone(self.scheduler.queue_status('bulk-task'))
+
+    def test_fair_queueing_between_flows(self):
+        self.scheduler = ScreeningScheduler(
+            runner=lambda task_id, result_id: self.executed.append(result_id),
+            max_concurrent=1,
+            spawn=self.pending_threads.append
+        )
+        self.scheduler.submit('big', [f'a{i}' for i in range(5)], priority='bulk', flow='submitter:a')
+        self.scheduler.submit('small', ['c0', 'c1'], priority='bulk', flow='submitter:c')
+
+        status = self.scheduler.queue_status('small')
+        # a0 执行中，后提交的 c0 不用排在 a 剩余的简历之后
+        self.assertEqual(status['queue_position'], 0)
+        self.assertGreater(status['estimated_wait_seconds'], 0)
+
+        self._drain()
+        self.assertEqual(self.executed, ['a0', 'c0', 'a1', 'c1', 'a2', 'a3', 'a4'])
+
+    @override_settings(SCREENING_FLOW_WEIGHTS={'submitter:vip': 2})
+    def test_flow_weight(self):
+        self.scheduler = ScreeningScheduler(
+            runner=lambda task_id, result_id: self.executed.append(result_id),
+            max_concurrent=1,
+            spawn=self.pending_threads.append
+        )
+        self.scheduler.submit('normal', ['n0', 'n1', 'n2'], priority='bulk', flow='submitter:normal')
+        self.scheduler.submit('vip', ['v0', 'v1', 'v2', 'v3'], priority='bulk', flow='submitter:vip')
+        self._drain()
+        # 权重为 2 的分流每轮执行两份简历
+        self.assertEqual(self.executed, ['n0', 'v0', 'v1', 'v2', 'n1', 'v3', 'n2'])
+
+
+class ScreeningQueueStatusTestCase(TestCase):
+    """任务状态接口中的排队信息"""
+
+    def setUp(self):
+        self.client = Client()
+        self.pending_threads = []
+        self.original = scheduler_module._scheduler
+        scheduler_module._scheduler = ScreeningScheduler(
+            runner=lambda task_id, result_id: None, max_concurrent=1, spawn=self.pending_threads.append
+        )
+
+    def tearDown(self):
+        scheduler_module._scheduler = self.original
+
+    def test_status_shows_queue_position(self):
+        position = {'position': 'Python开发', 'required_skills': ['Python']}
+        tasks = []
+        for submitter, count in [('bulk_user', 3), ('hr', 1)]:
+            task = ResumeScreeningTask.objects.create(
+                total_steps=count, position_data=position, priority='bulk' if count > 1 else 'interactive',
+                submitter=submitter
+            )
+            create_candidate_results(task, [{'name': f'{submitter}{i}.txt', 'content': '简历'} for i in range(count)])
+            tasks.append(task)
+
+        from resume_screening.screening_tasks import enqueue_screening_task
+        for task in tasks:
+            enqueue_screening_task(task.id)
+
+        bulk = self.client.get(f'/resume-screening/tasks/{tasks[0].id}/status/').json()
+        self.assertEqual(bulk['priority'], 'bulk')
+        self.assertEqual(bulk['queue']['running_candidates'], 1)
+        self.assertEqual(bulk['queue']['queue_position'], 1)
+
+        urgent = self.client.get(f'/resume-screening/tasks/{tasks[1].id}/status/').json()
+        self.assertEqual(urgent['queue']['queue_position'], 0)
+        self.assertIsNotNone(urgent['queue']['estimated_start_at'])
@@ -0,0 +1,98 @@
+"""
+面试会话增量统计测试
+"""
+
+import json
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+
+from interview_assist.models import InterviewAssistSession, InterviewQARecord
+from interview_assist.services.session_stats import compute_stats, summarize
+from resume_screening.models import ResumeData
+
+
+class SessionStatsTestCase(TestCase):
+    """会话统计测试"""
+
+    answers = [
+        "我们用了微服务",
+        "比如在订单系统中，我们把QPS从3000提升到12000，具体做法是拆分热点库表并引入本地缓存。",
+        "大概是用了缓存吧，可能还有消息队列",
+    ]
+
+    def setUp(self):
+        self.client = Client()
+        resume_data = ResumeData.objects.create(
+            candidate_name='孙七',
+            position_title='后端开发工程师',
+            position_details={},
+            resume_content='孙七，5年Java开发经验。',
+            resume_file_hash=f'test_hash_{uuid.uuid4().hex[:16]}'
+        )
+        self.session = InterviewAssistSession.objects.create(
+            resume_data=resume_data, interviewer_name='面试官', job_config={'title': '后端开发工程师'}
+        )
+        self.url = f'/interview-assist/sessions/{self.session.id}'
+
+    def _record_all(self):
+        for answer in self.answers:
+            response = self.client.post(
+                f'{self.url}/record-qa/',
+                data=json.dumps({'question': {'content': '介绍一下项目'}, 'answer': {'content': answer}}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 200)
+
+    def test_stats_updated_on_record(self):
+        self._record_all()
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.current_round, 3)
+        self.assertEqual(self.session.stats['record_count'], 3)
+
+        records = InterviewQARecord.objects.filter(session=self.session).order_by('round_number')
+        self.assertEqual([r.round_number for r in records], [1, 2, 3])
+        expected = compute_stats(records)
+
+        data = self.client.get(f'{self.url}/history/').json()['data']
+        self.assertEqual(data['score_trend'], expected['score_trend'])
+        self.assertEqual(data['overall_stats'], summarize(expected))
+        self.assertEqual(len(data['qa_records']), 3)
+
+        data = self.client.get(f'{self.url}/history/', {'include_records': 'false', 'verify_stats': 'true'}).json()['data']
+        self.assertEqual(data['qa_records'], [])
+        self.assertTrue(data['stats_consistent'])
+
+    def test_verify_repairs_inconsistent_stats(self):
+        self._record_all()
+        record = InterviewQARecord.objects.get(session=self.session, round_number=1)
+        InterviewQARecord.objects.filter(pk=record.pk).update(
+            evaluation={**record.evaluation, 'normalized_score': 99.0}, was_followed_up=True
+        )
+
+        data = self.client.get(f'{self.url}/history/', {'verify_stats': 'true'}).json()['data']
+        self.assertFalse(data['stats_consistent'])
+        self.assertEqual(data['score_trend'][0], 99.0)
+        self.assertEqual(data['overall_stats']['followup_count'], 1)
+
+        out = StringIO()
+        call_command('check_interview_stats', stdout=out)
+        self.assertIn('0 个不一致', out.getvalue())
+
+    def test_legacy_session_is_backfilled(self):
+        for round_number, score in ((1, 80.0), (2, 40.0)):
+            InterviewQARecord.objects.create(
+                session=self.session, round_number=round_number, question='问题', answer='回答',
+                evaluation={'normalized_score': score, 'dimension_scores': {'technical_depth': round_number + 1}}
+            )
+
+        data = self.client.get(f'{self.url}/history/').json()['data']
+        self.assertEqual(data['score_trend'], [80.0, 40.0])
+        self.assertEqual(data['overall_stats']['avg_score'], 60.0)
+        self.assertEqual(data['overall_stats']['dimension_averages'], {'technical_depth': 2.5})
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.stats['record_count'], 2)
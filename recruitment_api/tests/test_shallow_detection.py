@@ -0,0 +1,105 @@
+"""
+浅层回答检测（词表自动机）测试
+"""
+
+import random
+
+from django.test import TestCase
+
+from interview_assist.management.commands.benchmark_shallow_detection import (
+    automaton_lexicon_signals,
+    legacy_lexicon_hits,
+    legacy_lexicon_signals,
+)
+from interview_assist.services.interview_assistant import InterviewAssistant
+from interview_assist.services.lexicon_matcher import (
+    LEXICON_CATEGORIES,
+    LexiconMatcher,
+    get_default_lexicon_matcher,
+)
+from interview_assist.services.prompts import InterviewPrompts
+
+
+class LexiconMatcherTestCase(TestCase):
+    """词表匹配器测试"""
+
+    def test_scan_returns_categories_and_positions(self):
+        answer = "我们用了微服务和K8S，高并发场景下大概能扛住"
+        scan = get_default_lexicon_matcher().scan(answer)
+
+        hits = {(hit["category"], hit["term"]) for hit in scan.hits}
+        self.assertIn(("high_level", "微服务"), hits)
+        self.assertIn(("high_level", "k8s"), hits)
+        self.assertIn(("high_level", "高并发"), hits)
+        self.assertIn(("metrics", "并发"), hits)
+        self.assertIn(("vague", "大概"), hits)
+
+        for hit in scan.hits:
+            self.assertEqual(answer[hit["start"]:hit["end"]].lower(), hit["term"].lower())
+        self.assertEqual(scan.count("high_level"), 3)
+
+    def test_custom_lexicons(self):
+        matcher = LexiconMatcher({"vague": ["差不多", "应该"], "concrete": ["比如"]})
+        scan = matcher.scan("应该差不多吧，比如说")
+
+        self.assertEqual(scan.terms("vague"), ["差不多", "应该"])
+        self.assertTrue(scan.has("concrete"))
+        self.assertFalse(scan.has("weakness"))
+
+    def test_case_sensitivity_per_category(self):
+        """高级术语和技术指标不区分大小写，其余词表区分大小写（与原逐词扫描一致）"""
+        matcher = LexiconMatcher({
+            "vague": ["Maybe"], "concrete": ["For example"], "high_level": ["Kubernetes"], "metrics": ["QPS"],
+        })
+        answer = "maybe we used KUBERNETES, for example qps 3000. Maybe"
+        scan = matcher.scan(answer)
+
+        self.assertEqual([hit["start"] for hit in scan.hits if hit["category"] == "vague"], [answer.rindex("Maybe")])
+        self.assertFalse(scan.has("concrete"))
+        self.assertEqual(scan.terms("high_level"), ["Kubernetes"])
+        self.assertEqual(scan.terms("metrics"), ["QPS"])
+
+    def test_equivalent_to_per_term_scan(self):
+        """单次扫描结果与逐词扫描一致"""
+        lexicons = {
+            category: list(getattr(InterviewPrompts, attr))
+            for category, attr in LEXICON_CATEGORIES.items()
+        }
+        terms = [term for values in lexicons.values() for term in values]
+        filler = ["我们", "系统", "负责", "QPS", "缓存", "，", "。", "3000", "Docker"]
+        rng = random.Random(7)
+        matcher = get_default_lexicon_matcher()
+
+        for _ in range(200):
+            answer = "".join(rng.choice(terms if rng.random() < 0.3 else filler) for _ in range(rng.randint(1, 40)))
+            self.assertEqual(
+                legacy_lexicon_signals(answer, lexicons),
+                automaton_lexicon_signals(answer, matcher),
+                answer,
+            )
+            self.assertEqual(
+                legacy_lexicon_hits(answer, lexicons),
+                sorted((hit["start"], hit["end"], hit["category"]) for hit in matcher.scan(answer).hits),
+                answer,
+            )
+
+
+class DetectShallowAnswerTestCase(TestCase):
+    """浅层回答检测测试"""
+
+    def setUp(self):
+        self.assistant = InterviewAssistant()
+
+    def test_shallow_answer_detected_with_hits(self):
+        result = self.assistant.detect_shallow_answer("用过微服务，应该差不多，大概就是那样", ["微服务"])
+
+        self.assertTrue(result["is_suspicious"])
+        self.assertEqual(result["followup_skill"], "微服务")
+        categories = {hit["category"] for hit in result["lexicon_hits"]}
+        self.assertEqual(categories, {"high_level", "vague"})
+
+    def test_evaluation_contains_lexicon_hits(self):
+        evaluation = self.assistant.evaluate_answer("介绍一下缓存设计", "比如我们在项目中用Redis做缓存，QPS提升到3000")
+
+        self.assertIn("lexicon_hits", evaluation)
+        self.assertTrue(any(hit["category"] == "concrete" for hit in evaluation["lexicon_hits"]))
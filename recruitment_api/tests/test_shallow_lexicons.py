@@ -0,0 +1,153 @@
+"""
+浅层回答检测词表配置（按岗位覆盖、热更新）测试
+"""
+
+import json
+
+from django.test import Client, TestCase
+
+from interview_assist.models import ShallowAnswerLexicon
+from interview_assist.services.interview_assistant import InterviewAssistant
+from interview_assist.services.lexicon_registry import lexicon_registry
+
+
+def _detect(job_config, answer):
+    profile = lexicon_registry.get_profile(job_config)
+    assistant = InterviewAssistant(
+        job_config=job_config,
+        lexicon_matcher=profile.matcher,
+        shallow_weights=profile.weights,
+    )
+    return assistant.detect_shallow_answer(answer, [])
+
+
+class LexiconRegistryTestCase(TestCase):
+    """词表注册表测试"""
+
+    def setUp(self):
+        lexicon_registry.clear()
+
+    def tearDown(self):
+        lexicon_registry.clear()
+
+    def test_defaults_without_config(self):
+        profile = lexicon_registry.get_profile({"position": "后端工程师"})
+        self.assertEqual(profile.sources, ())
+        self.assertIn("微服务", profile.matcher.lexicons["high_level"])
+
+    def test_position_overrides_job_family_and_default(self):
+        ShallowAnswerLexicon.objects.create(scope_type="default", lexicons={"vague": ["大概"]})
+        ShallowAnswerLexicon.objects.create(
+            scope_type="job_family", scope_key="数据", lexicons={"high_level": ["数据湖"]}
+        )
+        ShallowAnswerLexicon.objects.create(
+            scope_type="position", scope_key="数据工程师", lexicons={"high_level": ["Flink"]}
+        )
+        lexicon_registry.reload()
+
+        profile = lexicon_registry.get_profile({"position": "数据工程师", "job_family": "数据"})
+        self.assertEqual(profile.matcher.lexicons["high_level"], ["Flink"])
+        self.assertEqual(profile.matcher.lexicons["vague"], ["大概"])
+        self.assertEqual([source[0] for source in profile.sources], ["default", "job_family", "position"])
+
+        other = lexicon_registry.get_profile({"position": "数据分析师", "job_family": "数据"})
+        self.assertEqual(other.matcher.lexicons["high_level"], ["数据湖"])
+
+    def test_weights_change_detection(self):
+        answer = "用了微服务"
+        self.assertTrue(_detect({"position": "前端工程师"}, answer)["is_suspicious"])
+
+        ShallowAnswerLexicon.objects.create(
+            scope_type="position", scope_key="前端工程师",
+            weights={"suspicion_threshold": 100},
+        )
+        lexicon_registry.reload()
+        self.assertFalse(_detect({"position": "前端工程师"}, answer)["is_suspicious"])
+        self.assertTrue(_detect({"position": "后端工程师"}, answer)["is_suspicious"])
+
+    def test_edit_reloads_without_restart(self):
+        job_config = {"title": "算法工程师"}
+        with self.captureOnCommitCallbacks(execute=True):
+            lexicon = ShallowAnswerLexicon.objects.create(
+                scope_type="position", scope_key="算法工程师", lexicons={"high_level": ["Transformer"]}
+            )
+        self.assertIn("transformer", {h["term"].lower() for h in _detect(job_config, "用了Transformer")["lexicon_hits"]})
+
+        lexicon.lexicons = {"high_level": ["扩散模型"]}
+        with self.captureOnCommitCallbacks(execute=True):
+            lexicon.save()
+        self.assertEqual(lexicon.version, 2)
+
+        profile = lexicon_registry.get_profile(job_config)
+        self.assertEqual(profile.matcher.lexicons["high_level"], ["扩散模型"])
+        self.assertEqual(profile.sources[-1][2], 2)
+
+    def test_same_sources_share_compiled_matcher(self):
+        first = lexicon_registry.get_profile({"position": "岗位A"})
+        second = lexicon_registry.get_profile({"position": "岗位B"})
+        self.assertIs(first.matcher, second.matcher)
+
+
+class LexiconAPITestCase(TestCase):
+    """词表配置接口测试"""
+
+    def setUp(self):
+        self.client = Client()
+        self.base_url = '/interview-assist/lexicons/'
+        lexicon_registry.clear()
+
+    def tearDown(self):
+        lexicon_registry.clear()
+
+    def _post(self, data):
+        return self.client.post(self.base_url, data=json.dumps(data), content_type='application/json')
+
+    def test_create_update_delete(self):
+        response = self._post({
+            "scope_type": "position",
+            "scope_key": "测试工程师",
+            "lexicons": {"vague": ["可能吧"]},
+            "weights": {"suspicion_threshold": 4},
+        })
+        self.assertEqual(response.status_code, 201)
+        lexicon_id = response.json()['data']['id']
+
+        response = self.client.put(
+            f'{self.base_url}{lexicon_id}/',
+            data=json.dumps({"lexicons": {"vague": ["或许"]}}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['version'], 2)
+
+        response = self.client.get(f'{self.base_url}resolve/', {'position': '测试工程师'})
+        data = response.json()['data']
+        self.assertEqual(data['lexicons']['vague'], ["或许"])
+        self.assertEqual(data['weights']['suspicion_threshold'], 4)
+
+        response = self.client.delete(f'{self.base_url}{lexicon_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(f'{self.base_url}{lexicon_id}/').status_code, 404)
+
+    def test_validation(self):
+        response = self._post({"scope_type": "position", "scope_key": "x", "lexicons": {"unknown": ["a"]}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('lexicons', response.json()['errors'])
+
+        response = self._post({"scope_type": "position", "scope_key": "x", "weights": {"very_short_answer": "3"}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('weights', response.json()['errors'])
+
+        response = self._post({"scope_type": "position"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('scope_key', response.json()['errors'])
+
+        self.assertEqual(self._post({"scope_type": "default"}).status_code, 201)
+        self.assertEqual(self._post({"scope_type": "default"}).status_code, 400)
+
+        # 不是JSON对象的请求体
+        response = self._post(["scope_type", "default"])
+        self.assertEqual(response.status_code, 400)
+        lexicon_id = ShallowAnswerLexicon.objects.get(scope_type='default').id
+        response = self.client.put(f'{self.base_url}{lexicon_id}/', data='[]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,111 @@
+"""
+压缩文本字段测试（按哈希去重、延迟解压、批量取回、共享字典）
+"""
+
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from resume_screening.models import (
+    CompressionDictionary, ResumeData, ResumeScreeningTask, ScreeningReport, TextBlob
+)
+from resume_screening.text_blobs import StoredText, prefetch_texts, text_sha256
+
+
+def make_report(name: str) -> str:
+    """结构相同、内容不同的初筛JSON报告"""
+    return json.dumps({
+        "candidate_name": name,
+        "scores": {"hr_score": 80, "technical_score": 75, "manager_score": 78, "comprehensive_score": 77},
+        "conversation_history": [
+            {"name": "HR", "content": f"{name} 的沟通能力良好，具备团队协作经验，建议进入下一轮面试。"},
+            {"name": "技术专家", "content": f"{name} 熟悉 Python 和 Django，有分布式系统项目经验。"},
+            {"name": "项目经理", "content": f"{name} 的项目管理经验符合岗位要求，综合评价良好。"},
+        ] * 5,
+    }, ensure_ascii=False, indent=2)
+
+
+class TextBlobTestCase(TestCase):
+    """简历内容和报告以压缩文本保存"""
+
+    def setUp(self):
+        self.task = ResumeScreeningTask.objects.create()
+        self.resume = '张三\n5年Python开发经验，熟悉Django、PostgreSQL和Redis。\n' * 50
+        self.report = make_report('张三')
+
+    def _create(self, name, index):
+        return ResumeData.objects.create(
+            position_title='Python开发', position_details={}, candidate_name=name,
+            resume_content=self.resume, json_report_content=make_report(name),
+            screening_summary=f'{name} 综合评分 77', resume_file_hash=f'{index:064d}', task=self.task,
+        )
+
+    def test_stored_once_and_compressed(self):
+        data = self._create('张三', 1)
+        ScreeningReport.objects.create(
+            task=self.task, original_filename='张三.md', resume_content=self.resume, json_report_content=self.report
+        )
+
+        # 行内只保存哈希，相同文本只有一条 TextBlob
+        ref = ResumeData.objects.values_list('resume_content', flat=True).get(id=data.id)
+        self.assertIsInstance(ref, StoredText)
+        self.assertEqual(ref.sha256, text_sha256(self.resume))
+        self.assertEqual(TextBlob.objects.count(), 3)
+        blob = TextBlob.objects.get(sha256=text_sha256(self.resume))
+        self.assertEqual(blob.codec, 'zlib')
+        self.assertLess(blob.stored_size * 5, blob.size)
+
+        # 等值查询和 update 可以直接使用文本
+        self.assertEqual(ScreeningReport.objects.filter(json_report_content=self.report).count(), 1)
+        ResumeData.objects.filter(id=data.id).update(screening_summary='已更新')
+        self.assertEqual(ResumeData.objects.get(id=data.id).screening_summary, '已更新')
+
+    def test_lazy_decompression_and_prefetch(self):
+        for index, name in enumerate(['张三', '李四', '王五']):
+            self._create(name, index)
+
+        data = ResumeData.objects.get(candidate_name='张三')
+        with self.assertNumQueries(1):
+            self.assertEqual(data.resume_content, self.resume)
+        with self.assertNumQueries(0):
+            self.assertEqual(data.resume_content, self.resume)
+        # 未访问的字段保存时不解压，也不重新写入 TextBlob（只有一条 UPDATE）
+        with self.assertNumQueries(1):
+            data.save(update_fields=['resume_content', 'json_report_content'])
+
+        resumes = list(ResumeData.objects.all())
+        with self.assertNumQueries(1):
+            prefetch_texts(resumes)
+        with self.assertNumQueries(0):
+            self.assertEqual({json.loads(r.json_report_content)['candidate_name'] for r in resumes}, {'张三', '李四', '王五'})
+
+    def test_shared_dictionary(self):
+        for index in range(5):
+            self._create(f'候选人{index}', index)
+
+        out = StringIO()
+        call_command('train_text_blob_dictionary', stdout=out)
+        dictionary = CompressionDictionary.objects.get()
+        self.assertIn(f'#{dictionary.id}', out.getvalue())
+
+        data = self._create('赵六', 9)
+        blob = TextBlob.objects.get(sha256=text_sha256(data.json_report_content))
+        self.assertEqual(blob.dictionary_id, dictionary.id)
+        previous = TextBlob.objects.get(sha256=text_sha256(make_report('候选人0')))
+        self.assertLess(blob.stored_size, previous.stored_size)
+        self.assertEqual(ResumeData.objects.get(id=data.id).json_report_content, make_report('赵六'))
+
+    def test_prune_unreferenced(self):
+        data = self._create('张三', 1)
+        data.screening_summary = '新的总结'
+        data.save()
+        TextBlob.objects.update(created_at=data.created_at - timedelta(days=2))
+
+        out = StringIO()
+        call_command('prune_text_blobs', stdout=out)
+        self.assertIn('已删除 1 条', out.getvalue())
+        self.assertFalse(TextBlob.objects.filter(sha256=text_sha256('张三 综合评分 77')).exists())
+        self.assertEqual(ResumeData.objects.get(id=data.id).screening_summary, '新的总结')
@@ -0,0 +1,122 @@
+"""
+视频抽帧解码测试（未安装 av / opencv-python，使用生成帧的测试后端）
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from unittest import mock
+
+import numpy as np
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from video_analysis import decoding, engine as engine_module
+from video_analysis.analyzers import VideoAnalyzer
+from video_analysis.models import VideoAnalysis
+
+CONFIG = decoding.DecodeConfig(sample_fps=2, width=8, height=6, batch_size=4)
+
+
+class FrameBrightnessAnalyzer(VideoAnalyzer):
+    """按采样帧平均亮度给出评分的分析器"""
+
+    uses_frames = True
+
+    def analyze(self, video_path, frames=None):
+        count = 0
+        total = 0.0
+        for timestamps, batch in frames:
+            assert batch.shape[1:] == (6, 8, 3) and len(timestamps) == len(batch)
+            count += len(batch)
+            total += float(batch.mean()) * len(batch)
+        return {'confidence_score': total / count / 255, 'summary': f"采样{count}帧"}
+
+
+class VideoDecodingTestCase(TestCase):
+    """抽帧、共享内存批次与采样帧缓存"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(
+            MEDIA_ROOT=self.tmpdir, VIDEO_DECODE_SAMPLE_FPS=2, VIDEO_DECODE_FRAME_SIZE=(8, 6),
+            VIDEO_DECODE_BATCH_SIZE=4, VIDEO_FRAME_CACHE_DIR=os.path.join(self.tmpdir, 'frames')
+        )
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.decoded = []
+        patcher = mock.patch.object(decoding, '_BACKENDS', (('fake', self._fake_backend),))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.video_path = os.path.join(self.tmpdir, 'video.mp4')
+        with open(self.video_path, 'wb') as f:
+            f.write(b'interview video')
+
+    def _fake_backend(self, video_path, config):
+        """10帧、每帧像素值为帧序号"""
+        self.decoded.append(video_path)
+        for index in range(10):
+            yield index * config.interval, np.full((config.height, config.width, 3), index, dtype=np.uint8)
+
+    def test_batches_and_cache(self):
+        result = decoding.decode_video(self.video_path, CONFIG, os.path.join(self.tmpdir, 'frames'))
+        self.addCleanup(decoding.release_batches, result.batches)
+        self.assertFalse(result.from_cache)
+        self.assertEqual([batch.count for batch in result.batches], [4, 4, 2])
+        self.assertEqual(result.video_hash, decoding.file_sha256(self.video_path))
+
+        values = []
+        for timestamps, frames in decoding.iter_frame_batches(result.batches):
+            values.extend(int(frame[0, 0, 0]) for frame in frames)
+        self.assertEqual(values, list(range(10)))
+
+        # 同一视频再次解码直接读取缓存
+        cached = decoding.decode_video(self.video_path, CONFIG, os.path.join(self.tmpdir, 'frames'))
+        self.addCleanup(decoding.release_batches, cached.batches)
+        self.assertTrue(cached.from_cache)
+        self.assertEqual(len(self.decoded), 1)
+        self.assertEqual(cached.batches[2].timestamps, [4.0, 4.5])
+
+        # 不同的输入尺寸不使用该缓存
+        resized = decoding.decode_video(
+            self.video_path, decoding.DecodeConfig(sample_fps=2, width=4, height=4, batch_size=4),
+            os.path.join(self.tmpdir, 'frames')
+        )
+        decoding.release_batches(resized.batches)
+        self.assertEqual(len(self.decoded), 2)
+
+        decoding.release_batches(result.batches)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=result.batches[0].name)
+
+    def test_missing_decoder(self):
+        with mock.patch.object(decoding, '_BACKENDS', ()):
+            with self.assertRaises(decoding.DecodeError):
+                decoding.decode_video(self.video_path, CONFIG, os.path.join(self.tmpdir, 'frames'))
+
+    def test_engine_decodes_once_per_video(self):
+        video = VideoAnalysis(video_name='张三.mp4', candidate_name='张三', position_applied='Python开发')
+        video.video_file.save('张三.mp4', ContentFile(b'interview video'), save=False)
+        video.save()
+
+        engine = engine_module.VideoAnalysisEngine(
+            analyzer='tests.test_video_decoding.FrameBrightnessAnalyzer', max_workers=1,
+            executor_factory=ThreadPoolExecutor, spawn=lambda target: target()
+        )
+        self.addCleanup(engine.shutdown)
+        engine.submit(video.id)
+        video.refresh_from_db()
+        self.assertEqual((video.status, video.summary), ('completed', '采样10帧'))
+        self.assertAlmostEqual(video.confidence_score, 4.5 / 255)
+
+        # 换用新模型重新分析时不再解码
+        VideoAnalysis.objects.filter(id=video.id).update(status='pending')
+        engine.submit(video.id)
+        video.refresh_from_db()
+        self.assertEqual(video.status, 'completed')
+        self.assertEqual(len(self.decoded), 1)
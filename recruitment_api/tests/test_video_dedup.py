@@ -0,0 +1,139 @@
+"""
+视频去重与分析结果复用测试
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+
+from video_analysis import engine as engine_module, views
+from video_analysis.analyzers import SimulatedVideoAnalyzer
+from video_analysis.models import VideoAnalysis
+
+CONTENT = b'interview video content' * 1000
+
+
+class UpgradedVideoAnalyzer(SimulatedVideoAnalyzer):
+    """升级版本后的分析器"""
+
+    version = '2'
+
+
+class VideoDedupTestCase(TestCase):
+    """相同内容的视频共享存储并复用分析结果"""
+
+    def setUp(self):
+        self.client = Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir, VIDEO_ANALYZER_OPTIONS={'delay': 0})
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.spawned = []
+        self.engine = engine_module.VideoAnalysisEngine(
+            executor_factory=ThreadPoolExecutor, spawn=self.spawned.append
+        )
+        self.addCleanup(self.engine.shutdown)
+        patcher = mock.patch.object(views, 'get_engine', lambda: self.engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _upload(self, name, content=CONTENT):
+        response = self.client.post('/video-analysis/', {
+            'video_file': SimpleUploadedFile(f'{name}.mp4', content, content_type='video/mp4'),
+            'candidate_name': name,
+            'position_applied': 'Python开发',
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def _run_spawned(self):
+        while self.spawned:
+            self.spawned.pop(0)()
+
+    def _video_files(self):
+        return [name for _, _, files in os.walk(os.path.join(self.tmpdir, 'video_analysis')) for name in files]
+
+    def test_duplicate_upload_reuses_storage_and_result(self):
+        first = self._upload('张三')
+        self.assertEqual(first['content_sha256'], hashlib.sha256(CONTENT).hexdigest())
+        self._run_spawned()
+        original = VideoAnalysis.objects.get(id=first['video_id'])
+        self.assertEqual(original.status, 'completed')
+        self.assertEqual(original.analyzer_version, 'video_analysis.analyzers.SimulatedVideoAnalyzer@1')
+
+        second = self._upload('张三_复用')
+        self.assertEqual(second['status'], 'completed')
+        self.assertIn('复用', second['message'])
+        self.assertEqual(self.spawned, [])
+        duplicate = VideoAnalysis.objects.get(id=second['video_id'])
+        self.assertEqual(duplicate.video_file.name, original.video_file.name)
+        self.assertEqual(duplicate.analysis_result, original.analysis_result)
+        self.assertEqual(len(self._video_files()), 1)
+
+        # 不同内容的视频正常保存和分析
+        other = self._upload('李四', content=b'another video')
+        self.assertEqual(other['status'], 'pending')
+        self.assertEqual(len(self._video_files()), 2)
+
+    def test_analyzer_upgrade_forces_reanalysis(self):
+        first = self._upload('张三')
+        self._run_spawned()
+
+        with override_settings(VIDEO_ANALYZER='tests.test_video_dedup.UpgradedVideoAnalyzer'):
+            self.engine.analyzer = 'tests.test_video_dedup.UpgradedVideoAnalyzer'
+            second = self._upload('张三_新模型')
+            self.assertEqual(second['status'], 'pending')
+            self._run_spawned()
+            upgraded = VideoAnalysis.objects.get(id=second['video_id'])
+            self.assertEqual(upgraded.analyzer_version, 'tests.test_video_dedup.UpgradedVideoAnalyzer@2')
+
+            # 旧版本的结果可重新分析，重新分析时复用新版本已有的结果
+            response = self.client.post(f"/video-analysis/{first['video_id']}/analyze/")
+            self.assertEqual(response.status_code, 202)
+            self._run_spawned()
+            reanalyzed = VideoAnalysis.objects.get(id=first['video_id'])
+            self.assertEqual(reanalyzed.analysis_result, upgraded.analysis_result)
+            self.assertEqual(self.client.post(f"/video-analysis/{first['video_id']}/analyze/").status_code, 409)
+
+    def test_chunked_upload_shares_existing_file(self):
+        first = self._upload('张三')
+        self._run_spawned()
+
+        response = self.client.post('/video-analysis/uploads/', data=json.dumps({
+            'video_name': '张三_分片.mp4', 'candidate_name': '张三', 'position_applied': 'Python开发',
+            'total_size': len(CONTENT),
+        }), content_type='application/json')
+        upload_id = response.json()['upload_id']
+        self.client.generic(
+            'PATCH', f'/video-analysis/uploads/{upload_id}/', CONTENT,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='0'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/video-analysis/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['status'], 'completed')
+
+        video = VideoAnalysis.objects.get(id=response.json()['video_id'])
+        self.assertEqual(video.video_file.name, VideoAnalysis.objects.get(id=first['video_id']).video_file.name)
+        self.assertEqual(len(self._video_files()), 1)
+
+    def test_backfill_command(self):
+        first = self._upload('张三')
+        VideoAnalysis.objects.filter(id=first['video_id']).update(content_sha256='')
+        out = StringIO()
+        call_command('backfill_video_hashes', stdout=out)
+        self.assertEqual(
+            VideoAnalysis.objects.get(id=first['video_id']).content_sha256, hashlib.sha256(CONTENT).hexdigest()
+        )
+        self.assertIn('已计算 1 个', out.getvalue())
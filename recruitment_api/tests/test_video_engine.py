@@ -0,0 +1,203 @@
+"""
+视频分析引擎测试（监督线程改为手动执行，进程池测试之外使用线程池代替）
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+
+from video_analysis import engine as engine_module, views
+from video_analysis.analyzers import SCORE_FIELDS, VideoAnalyzer
+from video_analysis.models import VideoAnalysis
+
+
+class BrokenAnalyzer(VideoAnalyzer):
+    """分析时抛出异常的分析器"""
+
+    def analyze(self, video_path, frames=None):
+        raise RuntimeError('模型加载失败')
+
+
+class VideoAnalysisEngineTestCase(TestCase):
+    """分析引擎的队列、超时与取消"""
+
+    def setUp(self):
+        self.client = Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.spawned = []
+
+    def _engine(self, **options):
+        defaults = {
+            'analyzer_options': {'delay': 0},
+            'max_workers': 1,
+            'queue_size': 10,
+            'timeout': 5,
+            'executor_factory': ThreadPoolExecutor,
+            'spawn': self.spawned.append,
+        }
+        defaults.update(options)
+        engine = engine_module.VideoAnalysisEngine(**defaults)
+        self.addCleanup(engine.shutdown, False)
+        return engine
+
+    def _video(self, name='张三'):
+        video = VideoAnalysis(video_name=f'{name}.mp4', candidate_name=name, position_applied='Python开发')
+        video.video_file.save(f'{name}.mp4', ContentFile(b'video'), save=False)
+        video.save()
+        return video
+
+    def _run_spawned(self):
+        while self.spawned:
+            self.spawned.pop(0)()
+
+    def test_reference_plugin_completes(self):
+        engine = self._engine()
+        video = self._video()
+        self.assertTrue(engine.submit(video.id))
+        self.assertFalse(engine.submit(video.id))
+        self._run_spawned()
+
+        video.refresh_from_db()
+        self.assertEqual(video.status, 'completed')
+        for name in SCORE_FIELDS:
+            self.assertTrue(0 <= getattr(video, name) <= 1)
+        self.assertIn('模拟分析完成', video.summary)
+
+    def test_bounded_queue_and_cancel(self):
+        engine = self._engine(queue_size=1)
+        first, second, third = self._video('张三'), self._video('李四'), self._video('王五')
+        engine.submit(first.id)
+        engine.submit(second.id)
+        self.assertEqual(engine.queue_position(second.id), 0)
+        with self.assertRaises(engine_module.QueueFullError):
+            engine.submit(third.id)
+
+        # 排队中的分析取消后不再执行
+        self.assertTrue(engine.cancel(second.id))
+        self.assertIsNone(engine.queue_position(second.id))
+        self._run_spawned()
+
+        statuses = dict(VideoAnalysis.objects.values_list('candidate_name', 'status'))
+        self.assertEqual(statuses, {'张三': 'completed', '李四': 'failed', '王五': 'pending'})
+        self.assertEqual(VideoAnalysis.objects.get(id=second.id).error_message, '视频分析已取消')
+        self.assertFalse(engine.cancel(first.id))
+
+    def test_timeout_and_analyzer_error(self):
+        slow = self._video('张三')
+        self._engine(analyzer_options={'delay': 1}, timeout=0.05).run_job(engine_module.AnalysisJob(slow.id))
+        slow.refresh_from_db()
+        self.assertEqual(slow.status, 'failed')
+        self.assertIn('超时', slow.error_message)
+
+        broken = self._video('李四')
+        self._engine(analyzer='tests.test_video_engine.BrokenAnalyzer').run_job(engine_module.AnalysisJob(broken.id))
+        broken.refresh_from_db()
+        self.assertEqual(broken.status, 'failed')
+        self.assertIn('模型加载失败', broken.error_message)
+
+    def test_process_pool_runs_plugin(self):
+        executor = engine_module.VideoAnalysisEngine._process_pool(1)
+        self.addCleanup(executor.shutdown)
+        result = executor.submit(
+            engine_module.run_analyzer, engine_module.DEFAULT_ANALYZER, {'delay': 0}, 'video.mp4'
+        ).result(timeout=60)
+        fields = engine_module.normalize_result(result)
+        self.assertEqual(set(fields), set(SCORE_FIELDS) | {'summary'})
+
+    def test_analyze_and_cancel_api(self):
+        engine = self._engine()
+        patcher = mock.patch.object(views, 'get_engine', lambda: engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        video = self._video()
+        response = self.client.post(f'/video-analysis/{video.id}/cancel/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.post(f'/video-analysis/{video.id}/cancel/').status_code, 409)
+
+        # 失败（含已取消）的分析可重新提交
+        response = self.client.post(f'/video-analysis/{video.id}/analyze/')
+        self.assertEqual(response.status_code, 202)
+        self._run_spawned()
+        video.refresh_from_db()
+        self.assertEqual(video.status, 'completed')
+        self.assertEqual(self.client.post(f'/video-analysis/{video.id}/analyze/').status_code, 409)
+
+
+class VideoAnalysisWorkerProcessTestCase(TransactionTestCase):
+    """真实工作进程中的超时与取消（分析在后台线程中运行，使用 TransactionTestCase 共享数据）"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def _video(self, name):
+        video = VideoAnalysis(video_name=f'{name}.mp4', candidate_name=name, position_applied='Python开发')
+        video.video_file.save(f'{name}.mp4', ContentFile(b'video'), save=False)
+        video.save()
+        return video
+
+    def test_timeout_terminates_stuck_worker(self):
+        spawned = []
+        engine = engine_module.VideoAnalysisEngine(
+            analyzer_options={'delay': 60}, max_workers=1, timeout=1, spawn=spawned.append
+        )
+        self.addCleanup(engine.shutdown, False)
+        stuck, queued = self._video('张三'), self._video('李四')
+        engine.submit(stuck.id)
+        engine.submit(queued.id)
+
+        started = time.monotonic()
+        spawned.pop(0)()
+        self.assertLess(time.monotonic() - started, 30)
+        stuck.refresh_from_db()
+        self.assertEqual(stuck.status, 'failed')
+        self.assertIn('超时', stuck.error_message)
+
+        # 排队的分析使用新的工作进程，超时从进程就绪后开始计算
+        engine.analyzer_options = {'delay': 0}
+        spawned.pop(0)()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'completed')
+        self.assertEqual(len(engine._idle_workers), 1)
+
+    def test_cancel_terminates_running_worker(self):
+        threads = []
+
+        def spawn(target):
+            thread = threading.Thread(target=target)
+            threads.append(thread)
+            thread.start()
+
+        engine = engine_module.VideoAnalysisEngine(
+            analyzer_options={'delay': 60}, max_workers=1, timeout=120, spawn=spawn
+        )
+        self.addCleanup(engine.shutdown, False)
+        video = self._video('张三')
+        engine.submit(video.id)
+        job = engine._running[str(video.id)]
+        for _ in range(600):
+            if job.worker is not None:
+                break
+            time.sleep(0.05)
+
+        self.assertTrue(engine.cancel(video.id))
+        threads[0].join(timeout=30)
+        self.assertFalse(threads[0].is_alive())
+        self.assertEqual(engine._running, {})
+        self.assertEqual(engine._idle_workers, [])
+        video.refresh_from_db()
+        self.assertEqual(video.error_message, '视频分析已取消')
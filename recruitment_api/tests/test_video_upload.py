@@ -0,0 +1,102 @@
+"""
+视频分片上传测试
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import Client, TestCase, override_settings
+
+from video_analysis import chunked_upload, views
+from video_analysis.models import VideoAnalysis, VideoUpload
+
+
+class VideoUploadTestCase(TestCase):
+    """分片上传与断点续传测试"""
+
+    def setUp(self):
+        self.client = Client()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.tmpdir)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        patcher = mock.patch.object(views, 'start_video_analysis')
+        self.start_analysis = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.content = os.urandom(300 * 1024)
+
+    def _create(self, **extra):
+        data = {
+            'video_name': '张三_面试视频.mp4',
+            'candidate_name': '张三',
+            'position_applied': 'Python开发',
+            'total_size': len(self.content),
+            **extra
+        }
+        response = self.client.post('/video-analysis/uploads/', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def _patch(self, upload_id, offset, chunk):
+        return self.client.generic(
+            'PATCH', f'/video-analysis/uploads/{upload_id}/', chunk,
+            content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_resume_and_complete_without_copy(self):
+        upload = self._create(sha256=hashlib.sha256(self.content).hexdigest())
+        upload_id = upload['upload_id']
+
+        response = self._patch(upload_id, 0, self.content[:100 * 1024])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Upload-Offset'], str(100 * 1024))
+
+        # 偏移量不一致时返回服务端已接收的字节数
+        response = self._patch(upload_id, 0, self.content[:100 * 1024])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 100 * 1024)
+
+        # 模拟服务重启：增量哈希从已写入的文件补算
+        chunked_upload._hashers.clear()
+        offset = int(self.client.head(f'/video-analysis/uploads/{upload_id}/')['Upload-Offset'])
+        self.assertEqual(self._patch(upload_id, offset, self.content[offset:]).status_code, 200)
+
+        response = self.client.post(f'/video-analysis/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, 201)
+        video = VideoAnalysis.objects.get(id=response.json()['video_id'])
+        record = VideoUpload.objects.get(id=upload_id)
+        self.assertEqual(video.video_file.name, record.file_name)
+        self.assertEqual(video.file_size, len(self.content))
+        with video.video_file.open('rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(len(os.listdir(os.path.dirname(video.video_file.path))), 1)
+        self.start_analysis.assert_called_once_with(video.id)
+
+        # 重复完成返回同一记录
+        response = self.client.post(f'/video-analysis/uploads/{upload_id}/complete/')
+        self.assertEqual((response.status_code, response.json()['video_id']), (200, str(video.id)))
+
+    def test_incomplete_and_checksum_mismatch(self):
+        upload_id = self._create(sha256='0' * 64)['upload_id']
+        self._patch(upload_id, 0, self.content[:1000])
+        response = self.client.post(f'/video-analysis/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, 409)
+
+        # 超出文件总大小的分片被拒绝
+        self.assertEqual(self._patch(upload_id, 1000, self.content + b'x').status_code, 413)
+
+        self._patch(upload_id, 1000, self.content[1000:])
+        response = self.client.post(f'/video-analysis/uploads/{upload_id}/complete/')
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(VideoAnalysis.objects.exists())
+
+        response = self.client.delete(f'/video-analysis/uploads/{upload_id}/')
+        self.assertEqual(response.json()['status'], 'aborted')
+        self.assertFalse(os.path.exists(os.path.join(chunked_upload.staging_dir(), VideoUpload.objects.get().file_name)))
@@ -0,0 +1,81 @@
+"""
+视频分析插件
+分析器在分析进程池的工作进程中运行：输入视频文件路径，输出各维度评分和摘要，不访问数据库。
+接入新的分析模型时继承 VideoAnalyzer 并实现 analyze()，在 settings.VIDEO_ANALYZER 中配置类路径即可，
+接口视图和分析引擎无需修改。需要视频帧的模型设置 uses_frames = True，由引擎先抽帧（见 decoding.py）。
+"""
+
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 分析结果中的评分字段（取值0-1之间，与 VideoAnalysis 模型字段一致）
+SCORE_FIELDS = (
+    'fraud_score',
+    'neuroticism_score',
+    'extraversion_score',
+    'openness_score',
+    'agreeableness_score',
+    'conscientiousness_score',
+    'confidence_score',
+)
+
+
+class VideoAnalyzer:
+    """
+    视频分析器接口
+
+    Args:
+        **options: 分析器参数（来自 settings.VIDEO_ANALYZER_OPTIONS）
+    """
+
+    name = 'base'
+    version = '0'
+    # 为 True 时引擎先按 settings.VIDEO_DECODE_* 抽帧，通过 frames 参数传入采样帧
+    uses_frames = False
+
+    def __init__(self, **options):
+        self.options = options
+
+    def analyze(self, video_path: str, frames: Optional[Iterator[Tuple[List[float], Any]]] = None) -> Dict[str, Any]:
+        """
+        分析视频
+
+        Args:
+            video_path: 视频文件的本地路径
+            frames: 采样帧（uses_frames 为 True 时提供），按批次产出 (时间戳列表, 形状为 (n, 高, 宽, 3) 的
+                uint8 RGB 数组)；数组映射自共享内存，取下一批后失效
+
+        Returns:
+            SCORE_FIELDS 中的评分（可缺省）和 summary 摘要
+        """
+        raise NotImplementedError
+
+
+class SimulatedVideoAnalyzer(VideoAnalyzer):
+    """
+    模拟分析器（参考实现）：等待一段时间后生成随机评分
+
+    Args:
+        delay: 模拟分析耗时（秒），默认随机1-2秒
+    """
+
+    name = 'simulated'
+    version = '1'
+
+    def analyze(self, video_path: str, frames=None) -> Dict[str, Any]:
+        delay = self.options.get('delay')
+        time.sleep(random.randint(1, 2) if delay is None else delay)
+
+        result = {
+            'fraud_score': round(random.uniform(0.05, 0.3), 3),  # 欺诈评分
+            'neuroticism_score': round(random.uniform(0.2, 0.8), 3),  # 神经质评分
+            'extraversion_score': round(random.uniform(0.3, 0.9), 3),  # 外倾性评分
+            'openness_score': round(random.uniform(0.4, 0.95), 3),  # 开放性评分
+            'agreeableness_score': round(random.uniform(0.5, 0.95), 3),  # 宜人性评分
+            'conscientiousness_score': round(random.uniform(0.6, 0.98), 3),  # 尽责性评分
+            'confidence_score': round(random.uniform(0.8, 0.99), 3),  # 置信度评分
+        }
+        trait = '外倾性' if result['extraversion_score'] > 0.7 else '尽责性'
+        result['summary'] = f"模拟分析完成。候选人表现出较强的{trait}特征。"
+        return result
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class VideoAnalysisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'video_analysis'
\ No newline at end of file
+    name = 'video_analysis'
+
+    def ready(self):
+        from . import signals  # noqa: F401
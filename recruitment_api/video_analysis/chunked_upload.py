@@ -0,0 +1,286 @@
+"""
+面试视频分片上传（参考 tus 协议）
+1. 创建上传：登记文件总大小，在暂存目录创建文件
+2. 追加分片：请求体按 Upload-Offset 写入文件对应位置，边写边更新 SHA-256
+3. 完成上传：校验大小和哈希后把暂存文件保存到制品存储（本地存储建立硬链接，不复制文件），
+   以存储键创建视频分析记录，事务提交后删除暂存文件；已有相同内容的视频时直接引用已存储的文件
+
+连接中断时已写入的字节保留，客户端查询当前偏移量后从断点继续上传。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .dedup import find_stored_video
+
+logger = logging.getLogger(__name__)
+
+# 读取请求体和补算哈希时的缓冲区大小
+READ_BLOCK_SIZE = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class UploadError(Exception):
+    """上传请求无效（status_code 为建议的HTTP状态码）"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class OffsetMismatchError(UploadError):
+    """分片偏移量与已接收的字节数不一致"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"分片偏移量不匹配，服务端已接收 {offset} 字节", status_code=409)
+        self.offset = offset
+
+
+def recommended_chunk_size() -> int:
+    return int(getattr(settings, 'VIDEO_UPLOAD_CHUNK_SIZE', DEFAULT_CHUNK_SIZE))
+
+
+def max_chunk_size() -> int:
+    return int(getattr(settings, 'VIDEO_UPLOAD_MAX_CHUNK_SIZE', DEFAULT_MAX_CHUNK_SIZE))
+
+
+# 进程内保存各上传的增量哈希 {upload_id: (已哈希的字节数, hashlib 对象)}；
+# 服务重启或请求落到其他进程时，从已写入的文件内容补算
+_hashers: Dict[str, Tuple[int, "hashlib._Hash"]] = {}
+_hashers_lock = threading.Lock()
+
+
+def staging_dir() -> str:
+    """分片暂存目录（settings.VIDEO_UPLOAD_STAGING_DIR，默认在 MEDIA_ROOT 下）"""
+    return str(getattr(settings, 'VIDEO_UPLOAD_STAGING_DIR', None) or os.path.join(
+        str(settings.MEDIA_ROOT), 'video_analysis', 'uploads'
+    ))
+
+
+def _file_path(upload) -> str:
+    """上传中的暂存文件路径（完成后 file_name 改为制品存储的键）"""
+    return os.path.join(staging_dir(), upload.file_name)
+
+
+def _remove_staged(file_name: str):
+    try:
+        os.remove(os.path.join(staging_dir(), file_name))
+    except FileNotFoundError:
+        pass
+
+
+def _hasher_at(upload):
+    """获取与已接收字节数一致的增量哈希"""
+    with _hashers_lock:
+        cached = _hashers.pop(str(upload.id), None)
+    if cached and cached[0] == upload.offset:
+        return cached[1]
+
+    hasher = hashlib.sha256()
+    remaining = upload.offset
+    with open(_file_path(upload), 'rb') as f:
+        while remaining > 0:
+            block = f.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _store_hasher(upload, hasher):
+    with _hashers_lock:
+        _hashers[str(upload.id)] = (upload.offset, hasher)
+
+
+def _discard_hasher(upload):
+    with _hashers_lock:
+        _hashers.pop(str(upload.id), None)
+
+
+def create_upload(video_name: str, candidate_name: str, position_applied: str, total_size: int,
+                  resume_data_id=None, expected_sha256: str = ''):
+    """
+    创建上传会话，并在暂存目录创建空文件
+
+    Raises:
+        UploadError: 参数无效
+    """
+    from .models import VideoAnalysis, VideoUpload
+
+    if total_size <= 0:
+        raise UploadError("total_size 必须是正整数")
+
+    file_name = uuid.uuid4().hex + os.path.splitext(video_name)[1].lower()
+    os.makedirs(staging_dir(), exist_ok=True)
+    open(os.path.join(staging_dir(), file_name), 'xb').close()
+    return VideoUpload.objects.create(
+        video_name=video_name,
+        candidate_name=candidate_name,
+        position_applied=position_applied,
+        resume_data_id=resume_data_id,
+        file_name=file_name,
+        total_size=total_size,
+        expected_sha256=(expected_sha256 or '').lower(),
+    )
+
+
+def append_chunk(upload_id, offset: int, stream, length: Optional[int]):
+    """
+    把请求体写入文件的 offset 位置
+
+    连接中断时已读到的字节同样写入并计入偏移量，客户端从新的偏移量继续。
+
+    Args:
+        upload_id: 上传ID
+        offset: 客户端声明的分片起始位置（必须等于已接收字节数）
+        stream: 请求体流
+        length: 请求体长度（Content-Length）
+
+    Returns:
+        更新后的上传会话
+
+    Raises:
+        OffsetMismatchError: 偏移量不一致
+        UploadError: 上传已结束或分片超出文件大小
+    """
+    from .models import VideoUpload
+
+    if length is not None and length > max_chunk_size():
+        raise UploadError(f"分片不能超过 {max_chunk_size()} 字节", status_code=413)
+
+    with transaction.atomic():
+        # 锁定上传记录，同一上传的分片串行写入
+        upload = VideoUpload.objects.select_for_update().get(id=upload_id)
+        if upload.status != 'uploading':
+            raise UploadError("上传已结束", status_code=409)
+        if offset != upload.offset:
+            raise OffsetMismatchError(upload.offset)
+        if length is not None and offset + length > upload.total_size:
+            raise UploadError("分片超出文件总大小", status_code=413)
+
+        hasher = _hasher_at(upload)
+        remaining = upload.total_size - offset if length is None else length
+        interrupted = None
+        with open(_file_path(upload), 'r+b') as f:
+            f.seek(offset)
+            try:
+                while remaining > 0:
+                    block = stream.read(min(READ_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    f.write(block)
+                    hasher.update(block)
+                    upload.offset += len(block)
+                    remaining -= len(block)
+            except OSError as e:
+                # 客户端断开：保留已写入的部分
+                interrupted = e
+            f.truncate(upload.offset)
+
+        upload.save(update_fields=['offset', 'updated_at'])
+        _store_hasher(upload, hasher)
+
+    if interrupted is not None:
+        logger.warning(f"视频上传 {upload_id} 在偏移量 {upload.offset} 处中断: {interrupted}")
+    return upload
+
+
+def complete_upload(upload_id):
+    """
+    完成上传：校验文件大小和哈希，把暂存文件保存到制品存储并创建视频分析记录（重复调用返回同一记录）
+
+    Returns:
+        (upload, video_analysis, created)
+
+    Raises:
+        UploadError: 文件未上传完整或哈希不一致
+    """
+    from resume_screening.models import ResumeData
+    from .models import VideoAnalysis, VideoUpload
+
+    with transaction.atomic():
+        upload = VideoUpload.objects.select_for_update().get(id=upload_id)
+        if upload.status == 'completed' and upload.video_analysis_id:
+            return upload, upload.video_analysis, False
+        if upload.status != 'uploading':
+            raise UploadError("上传已取消", status_code=409)
+        if upload.offset != upload.total_size:
+            raise UploadError(f"文件未上传完整（{upload.offset}/{upload.total_size} 字节）", status_code=409)
+
+        digest = _hasher_at(upload).hexdigest()
+        if upload.expected_sha256 and digest != upload.expected_sha256:
+            raise UploadError("文件SHA-256校验失败，请重新上传", status_code=422)
+
+        video_analysis = VideoAnalysis(
+            video_name=upload.video_name,
+            file_size=upload.total_size,
+            content_sha256=digest,
+            candidate_name=upload.candidate_name,
+            position_applied=upload.position_applied,
+            status='pending'
+        )
+        # 已有相同内容的视频时共享其存储文件，否则以已知的哈希保存暂存文件（事务提交后删除暂存文件，
+        # 事务回滚时暂存文件保留，可再次完成上传）
+        duplicate = find_stored_video(digest)
+        staged_file_name = upload.file_name
+        if duplicate is not None:
+            upload.file_name = duplicate.video_file.name
+        else:
+            name = VideoAnalysis._meta.get_field('video_file').generate_filename(None, upload.video_name)
+            upload.file_name = default_storage.save_file(_file_path(upload), name, digest=digest)
+        transaction.on_commit(lambda: _remove_staged(staged_file_name))
+        video_analysis.video_file.name = upload.file_name
+        video_analysis.save()
+
+        if upload.resume_data_id:
+            ResumeData.objects.filter(id=upload.resume_data_id).update(video_analysis=video_analysis)
+
+        upload.sha256 = digest
+        upload.status = 'completed'
+        upload.video_analysis = video_analysis
+        upload.save(update_fields=['sha256', 'status', 'video_analysis', 'file_name', 'updated_at'])
+
+    _discard_hasher(upload)
+    return upload, video_analysis, True
+
+
+def abort_upload(upload_id):
+    """取消上传并删除暂存文件"""
+    from .models import VideoUpload
+
+    with transaction.atomic():
+        upload = VideoUpload.objects.select_for_update().get(id=upload_id)
+        if upload.status != 'uploading':
+            raise UploadError("上传已结束", status_code=409)
+        upload.status = 'aborted'
+        upload.save(update_fields=['status', 'updated_at'])
+    _remove_staged(upload.file_name)
+    _discard_hasher(upload)
+    return upload
+
+
+def serialize_upload(upload) -> Dict:
+    """上传会话的接口返回格式"""
+    data = {
+        "upload_id": str(upload.id),
+        "status": upload.status,
+        "offset": upload.offset,
+        "total_size": upload.total_size,
+        "chunk_size": recommended_chunk_size(),
+        "upload_url": f"/video-analysis/uploads/{upload.id}/",
+        "complete_url": f"/video-analysis/uploads/{upload.id}/complete/",
+    }
+    if upload.status == 'completed':
+        data["sha256"] = upload.sha256
+        data["video_id"] = str(upload.video_analysis_id) if upload.video_analysis_id else None
+    return data
@@ -0,0 +1,389 @@
+"""
+视频抽帧解码
+分析模型只需要按固定频率采样的帧，不逐帧解码整段面试录像：
+
+- 按 sample_fps 采样；相邻采样点间隔超过 seek_threshold 秒时跳转到采样点之前的关键帧再向后解码，
+  关键帧与采样点相差不到半个采样间隔时直接取关键帧
+- 采样帧缩放到模型输入尺寸（RGB、uint8）
+- 帧按批次写入共享内存，分析进程直接映射为 numpy 数组，不经过 pickle 传输
+- 采样结果按视频内容哈希缓存为 .npy 文件，换用新的分析模型重新分析时不再解码
+
+解码优先使用 PyAV（pip install av），其次 OpenCV（pip install opencv-python）。
+本模块的函数在分析进程中运行，不依赖 Django。
+"""
+
+import hashlib
+import logging
+import math
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SAMPLE_FPS = 1.0
+DEFAULT_FRAME_SIZE = (224, 224)
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_SEEK_THRESHOLD = 2.0
+
+
+class DecodeError(Exception):
+    """视频无法解码"""
+
+
+@dataclass(frozen=True)
+class DecodeConfig:
+    """
+    抽帧参数
+
+    Args:
+        sample_fps: 每秒采样帧数
+        width: 模型输入宽度
+        height: 模型输入高度
+        batch_size: 每批帧数（一个共享内存块）
+        seek_threshold: 相邻采样点间隔超过该秒数时跳转到关键帧
+    """
+    sample_fps: float = DEFAULT_SAMPLE_FPS
+    width: int = DEFAULT_FRAME_SIZE[0]
+    height: int = DEFAULT_FRAME_SIZE[1]
+    batch_size: int = DEFAULT_BATCH_SIZE
+    seek_threshold: float = DEFAULT_SEEK_THRESHOLD
+
+    @classmethod
+    def from_settings(cls) -> 'DecodeConfig':
+        from django.conf import settings
+
+        width, height = getattr(settings, 'VIDEO_DECODE_FRAME_SIZE', DEFAULT_FRAME_SIZE)
+        return cls(
+            sample_fps=float(getattr(settings, 'VIDEO_DECODE_SAMPLE_FPS', DEFAULT_SAMPLE_FPS)),
+            width=int(width),
+            height=int(height),
+            batch_size=max(1, int(getattr(settings, 'VIDEO_DECODE_BATCH_SIZE', DEFAULT_BATCH_SIZE))),
+            seek_threshold=float(getattr(settings, 'VIDEO_DECODE_SEEK_THRESHOLD', DEFAULT_SEEK_THRESHOLD)),
+        )
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.sample_fps
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.sample_fps:g}fps_{self.width}x{self.height}"
+
+
+@dataclass
+class SharedFrameBatch:
+    """一批采样帧在共享内存中的位置（只含元数据，可在进程间传递）"""
+    name: str
+    capacity: int
+    height: int
+    width: int
+    timestamps: List[float] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        return self.capacity, self.height, self.width, 3
+
+
+@dataclass
+class DecodedVideo:
+    """解码结果"""
+    video_hash: str
+    batches: List[SharedFrameBatch]
+    from_cache: bool
+
+    @property
+    def frame_count(self) -> int:
+        return sum(batch.count for batch in self.batches)
+
+
+def file_sha256(path: str) -> str:
+    """分块计算文件的 SHA-256"""
+    sha256_hash = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+# ============ 解码后端：按采样点产出 (时间戳, 缩放后的RGB帧) ============
+
+def _next_target(frame_time: float, config: DecodeConfig) -> float:
+    """取到 frame_time 处的帧后，下一个采样点"""
+    return (math.floor((frame_time + config.interval / 2) / config.interval) + 1) * config.interval
+
+
+def _sample_with_av(video_path: str, config: DecodeConfig) -> Iterator[Tuple[float, np.ndarray]]:
+    import av
+
+    try:
+        container = av.open(video_path)
+    except Exception as e:
+        raise DecodeError(f"无法打开视频: {e}")
+
+    with container:
+        if not container.streams.video:
+            raise DecodeError("视频中没有视频流")
+        stream = container.streams.video[0]
+        stream.thread_type = 'AUTO'
+        tolerance = config.interval / 2
+        target = 0.0
+        last_time = None
+        frames = None
+        while True:
+            if frames is None or last_time is None or target - last_time > config.seek_threshold:
+                # 跳转到采样点之前的关键帧
+                container.seek(int(target / stream.time_base), stream=stream, backward=True, any_frame=False)
+                frames = container.decode(stream)
+
+            sampled = None
+            for frame in frames:
+                if frame.time is None:
+                    continue
+                last_time = frame.time
+                if frame.time >= target - tolerance:
+                    sampled = frame
+                    break
+            if sampled is None:
+                return
+            yield float(sampled.time), sampled.to_ndarray(
+                width=config.width, height=config.height, format='rgb24'
+            )
+            target = _next_target(sampled.time, config)
+
+
+def _sample_with_cv2(video_path: str, config: DecodeConfig) -> Iterator[Tuple[float, np.ndarray]]:
+    import cv2
+
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise DecodeError("无法打开视频")
+    try:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        position = 0
+        target = 0.0
+        while True:
+            index = int(round(target * fps))
+            if frame_count and index >= frame_count:
+                return
+            if (index - position) / fps > config.seek_threshold:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+                position = index
+            # 采样点之间的帧只解码不做颜色转换和缩放
+            while position < index:
+                if not capture.grab():
+                    return
+                position += 1
+            ok, image = capture.read()
+            if not ok:
+                return
+            position += 1
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            image = cv2.resize(image, (config.width, config.height), interpolation=cv2.INTER_AREA)
+            timestamp = index / fps
+            yield timestamp, image
+            target = _next_target(timestamp, config)
+    finally:
+        capture.release()
+
+
+_BACKENDS: Sequence[Tuple[str, Callable[[str, DecodeConfig], Iterator[Tuple[float, np.ndarray]]]]] = (
+    ('av', _sample_with_av),
+    ('cv2', _sample_with_cv2),
+)
+
+
+def sample_frames(video_path: str, config: DecodeConfig) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    按采样频率解码视频
+
+    Yields:
+        (时间戳秒数, 形状为 (height, width, 3) 的 uint8 RGB 帧)
+
+    Raises:
+        DecodeError: 未安装解码库或视频无法解码
+    """
+    for name, backend in _BACKENDS:
+        try:
+            frames = backend(video_path, config)
+            first = next(frames, None)
+        except ImportError:
+            continue
+        if first is not None:
+            yield first
+            yield from frames
+        return
+    raise DecodeError("视频解码需要安装 av 或 opencv-python: pip install av")
+
+
+# ============ 共享内存批次 ============
+
+def _allocate_batch(config: DecodeConfig) -> Tuple[SharedFrameBatch, shared_memory.SharedMemory, np.ndarray]:
+    batch = SharedFrameBatch(name='', capacity=config.batch_size, height=config.height, width=config.width)
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(batch.shape)))
+    batch.name = shm.name
+    return batch, shm, np.ndarray(batch.shape, dtype=np.uint8, buffer=shm.buf)
+
+
+def _close(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+    except BufferError:
+        # 调用方仍持有帧数组的引用，映射在数组回收后释放
+        pass
+
+
+@contextmanager
+def open_batch(batch: SharedFrameBatch) -> Iterator[np.ndarray]:
+    """映射共享内存中的一批帧（数组只在 with 块内有效）"""
+    shm = shared_memory.SharedMemory(name=batch.name)
+    frames = np.ndarray(batch.shape, dtype=np.uint8, buffer=shm.buf)[:batch.count]
+    try:
+        yield frames
+    finally:
+        del frames
+        _close(shm)
+
+
+def iter_frame_batches(batches: Sequence[SharedFrameBatch]) -> Iterator[Tuple[List[float], np.ndarray]]:
+    """
+    依次映射各批采样帧（分析器的 frames 参数）
+
+    Yields:
+        (时间戳列表, 形状为 (n, height, width, 3) 的帧数组)；数组在取下一批时失效，需要保留时自行复制
+    """
+    for batch in batches:
+        with open_batch(batch) as frames:
+            yield batch.timestamps, frames
+
+
+def release_batches(batches: Sequence[SharedFrameBatch]):
+    """删除各批次的共享内存（分析结束后由分析引擎调用）"""
+    for batch in batches:
+        try:
+            shm = shared_memory.SharedMemory(name=batch.name)
+        except FileNotFoundError:
+            continue
+        _close(shm)
+        shm.unlink()
+
+
+# ============ 采样帧缓存 ============
+
+def _cache_paths(cache_dir: str, video_hash: str, config: DecodeConfig) -> Tuple[str, str]:
+    prefix = os.path.join(cache_dir, video_hash[:2], f"{video_hash}_{config.cache_key}")
+    return f"{prefix}.frames.npy", f"{prefix}.timestamps.npy"
+
+
+def load_cached_frames(cache_dir: str, video_hash: str,
+                       config: DecodeConfig) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """读取缓存的采样帧（内存映射，不整体读入内存），不存在时返回 None"""
+    frames_path, timestamps_path = _cache_paths(cache_dir, video_hash, config)
+    if not (os.path.exists(frames_path) and os.path.exists(timestamps_path)):
+        return None
+    try:
+        timestamps = np.load(timestamps_path)
+        frames = np.load(frames_path, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        logger.warning(f"采样帧缓存损坏，重新解码: {e}")
+        return None
+    if frames.shape[0] != timestamps.shape[0] or frames.shape[1:] != (config.height, config.width, 3):
+        return None
+    return frames, timestamps
+
+
+def store_cached_frames(cache_dir: str, video_hash: str, config: DecodeConfig,
+                        batches: Sequence[SharedFrameBatch]):
+    """把共享内存中的采样帧写入缓存（先写临时文件再替换，读取方不会看到写了一半的文件）"""
+    frames_path, timestamps_path = _cache_paths(cache_dir, video_hash, config)
+    os.makedirs(os.path.dirname(frames_path), exist_ok=True)
+    total = sum(batch.count for batch in batches)
+
+    tmp_frames = f"{frames_path}.{os.getpid()}.tmp"
+    tmp_timestamps = f"{timestamps_path}.{os.getpid()}.tmp"
+    try:
+        output = np.lib.format.open_memmap(
+            tmp_frames, mode='w+', dtype=np.uint8, shape=(total, config.height, config.width, 3)
+        )
+        offset = 0
+        timestamps = []
+        for batch in batches:
+            with open_batch(batch) as frames:
+                output[offset:offset + batch.count] = frames
+            offset += batch.count
+            timestamps.extend(batch.timestamps)
+        output.flush()
+        del output
+        with open(tmp_timestamps, 'wb') as f:
+            np.save(f, np.asarray(timestamps, dtype=np.float64))
+        os.replace(tmp_timestamps, timestamps_path)
+        os.replace(tmp_frames, frames_path)
+    finally:
+        for path in (tmp_frames, tmp_timestamps):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# ============ 解码阶段（在分析进程中运行） ============
+
+def decode_video(video_path: str, config: DecodeConfig, cache_dir: str,
+                 video_hash: Optional[str] = None) -> DecodedVideo:
+    """
+    抽帧并写入共享内存；已有缓存时直接从缓存读取
+
+    Args:
+        video_path: 视频文件路径
+        config: 抽帧参数
+        cache_dir: 采样帧缓存目录
+        video_hash: 视频内容的 SHA-256（未提供时计算）
+
+    Returns:
+        DecodedVideo，调用方用完后需 release_batches(result.batches)
+    """
+    video_hash = video_hash or file_sha256(video_path)
+    batches: List[SharedFrameBatch] = []
+    try:
+        cached = load_cached_frames(cache_dir, video_hash, config)
+        if cached is not None:
+            frames, timestamps = cached
+            for start in range(0, len(timestamps), config.batch_size):
+                batch, shm, array = _allocate_batch(config)
+                batches.append(batch)
+                chunk = frames[start:start + config.batch_size]
+                array[:len(chunk)] = chunk
+                batch.timestamps = [float(value) for value in timestamps[start:start + config.batch_size]]
+                del array
+                _close(shm)
+            return DecodedVideo(video_hash=video_hash, batches=batches, from_cache=True)
+
+        batch = shm = array = None
+        for timestamp, frame in sample_frames(video_path, config):
+            if batch is None or batch.count == batch.capacity:
+                if shm is not None:
+                    del array
+                    _close(shm)
+                batch, shm, array = _allocate_batch(config)
+                batches.append(batch)
+            array[batch.count] = frame
+            batch.timestamps.append(timestamp)
+        if shm is not None:
+            del array
+            _close(shm)
+
+        if not batches:
+            raise DecodeError("视频中没有可解码的帧")
+        store_cached_frames(cache_dir, video_hash, config, batches)
+        return DecodedVideo(video_hash=video_hash, batches=batches, from_cache=False)
+    except Exception:
+        release_batches(batches)
+        raise
@@ -0,0 +1,119 @@
+"""
+视频去重与分析结果复用
+上传时计算视频内容的 SHA-256（直接上传在解析请求体时逐块计算，分片上传在写入分片时累计）：
+
+- 已有相同内容的视频时，新记录引用已存储的文件，不再重复保存
+- 相同内容已由当前分析器（类路径 + 版本）完成分析时，直接复制分析结果，不再提交分析；
+  分析器升级版本后旧结果不再复用，重新分析
+"""
+
+import hashlib
+import logging
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .analyzers import SCORE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+class SHA256UploadHandler(FileUploadHandler):
+    """解析上传请求时计算各文件的 SHA-256（数据原样交给后续的上传处理器保存）"""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests: Dict[str, str] = {}
+        self._hasher = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = self._hasher.hexdigest()
+        return None
+
+
+def uploaded_file_sha256(uploaded_file, handler: Optional[SHA256UploadHandler] = None, field_name: str = '') -> str:
+    """上传文件的 SHA-256：优先取上传时计算的结果，请求体已提前解析时再读取文件计算"""
+    if handler is not None and field_name in handler.digests:
+        return handler.digests[field_name]
+    sha256_hash = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        sha256_hash.update(chunk)
+    uploaded_file.seek(0)
+    return sha256_hash.hexdigest()
+
+
+def analyzer_key(analyzer_path: Optional[str] = None) -> str:
+    """分析器标识（类路径@版本），作为分析结果的复用键"""
+    from .engine import DEFAULT_ANALYZER
+
+    analyzer_path = analyzer_path or getattr(settings, 'VIDEO_ANALYZER', DEFAULT_ANALYZER)
+    return f"{analyzer_path}@{getattr(import_string(analyzer_path), 'version', '0')}"
+
+
+def find_stored_video(content_sha256: str, exclude_id=None):
+    """内容相同且存储文件仍存在的视频记录（不存在时返回 None）"""
+    from .models import VideoAnalysis
+
+    if not content_sha256:
+        return None
+    candidates = VideoAnalysis.objects.filter(content_sha256=content_sha256).exclude(video_file='')
+    if exclude_id is not None:
+        candidates = candidates.exclude(id=exclude_id)
+    for video in candidates.order_by('created_at').only('id', 'video_file'):
+        if default_storage.exists(video.video_file.name):
+            return video
+    return None
+
+
+def find_reusable_result(content_sha256: str, key: str, exclude_id=None):
+    """内容相同、由同一分析器版本完成的分析记录"""
+    from .models import VideoAnalysis
+
+    if not content_sha256:
+        return None
+    results = VideoAnalysis.objects.filter(content_sha256=content_sha256, analyzer_version=key, status='completed')
+    if exclude_id is not None:
+        results = results.exclude(id=exclude_id)
+    return results.order_by('-created_at').first()
+
+
+def reuse_result(video_id, key: Optional[str] = None, from_status: str = 'pending') -> bool:
+    """
+    复用相同内容的已完成分析结果
+
+    Args:
+        video_id: 视频分析记录ID
+        key: 分析器标识（默认为当前配置的分析器）
+        from_status: 只更新处于该状态的记录
+
+    Returns:
+        是否复用了已有结果
+    """
+    from .models import VideoAnalysis
+
+    content_sha256 = VideoAnalysis.objects.filter(id=video_id).values_list('content_sha256', flat=True).first()
+    key = key or analyzer_key()
+    source = find_reusable_result(content_sha256, key, exclude_id=video_id)
+    if source is None:
+        return False
+
+    fields = {name: getattr(source, name) for name in SCORE_FIELDS}
+    updated = VideoAnalysis.objects.filter(id=video_id, status=from_status).update(
+        status='completed', summary=source.summary, analyzer_version=key, error_message=None,
+        updated_at=timezone.now(), **fields
+    )
+    if updated:
+        logger.info(f"视频分析 {video_id} 复用相同内容视频 {source.id} 的分析结果")
+    return bool(updated)
@@ -0,0 +1,393 @@
+"""
+视频分析引擎
+分析器（settings.VIDEO_ANALYZER）在工作进程中运行，CPU密集的分析不占用Web进程的解释器：
+
+- 有界队列：等待中的分析数超过 settings.VIDEO_ANALYSIS_QUEUE_SIZE 时拒绝提交
+- 并发上限：同时进行的分析数为 settings.VIDEO_ANALYSIS_WORKERS，每个分析独占一个工作进程，
+  正常结束的工作进程留给后续分析复用
+- 超时与取消：单个分析超过 settings.VIDEO_ANALYSIS_TIMEOUT 秒（从工作进程就绪时开始计算）记为失败；
+  排队中的分析取消后不再执行；超时或取消已开始的分析时结束其工作进程，卡住的分析器不会一直占用进程
+- 状态流转：pending → processing → completed / failed
+- 存储：视频位于对象存储时，分析前下载到本机临时文件
+- 抽帧：分析器需要视频帧时，先在工作进程中抽帧并写入共享内存（见 decoding.py），再交给分析器
+
+工作进程只执行解码和分析器，分析结果由Web进程中的监督线程写入数据库。
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from recruitment_api.artifacts import local_copy
+from .analyzers import SCORE_FIELDS
+from .decoding import DecodeConfig, decode_video, iter_frame_batches, release_batches
+from .dedup import analyzer_key, reuse_result
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANALYZER = 'video_analysis.analyzers.SimulatedVideoAnalyzer'
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_TIMEOUT = 600
+DEFAULT_START_METHOD = 'spawn'
+
+
+class QueueFullError(Exception):
+    """分析队列已满"""
+
+
+def run_analyzer(analyzer_path: str, options: Dict[str, Any], video_path: str,
+                 batches: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """在工作进程中实例化分析器并分析视频（batches 为共享内存中的采样帧）"""
+    analyzer = import_string(analyzer_path)(**options)
+    if batches is None:
+        return analyzer.analyze(video_path)
+    return analyzer.analyze(video_path, frames=iter_frame_batches(batches))
+
+
+def frame_cache_dir() -> str:
+    """采样帧缓存目录（settings.VIDEO_FRAME_CACHE_DIR，默认在 MEDIA_ROOT 下）"""
+    return getattr(settings, 'VIDEO_FRAME_CACHE_DIR', None) or os.path.join(
+        str(settings.MEDIA_ROOT), 'video_analysis', 'frames'
+    )
+
+
+def _terminate_workers(executor):
+    """强制结束执行器的工作进程（线程池无法中断，只停止接收新任务）"""
+    terminate = getattr(executor, 'terminate_workers', None)
+    if terminate is not None:
+        # Python 3.14 起 ProcessPoolExecutor 提供 terminate_workers()
+        terminate()
+        return
+    for process in list((getattr(executor, '_processes', None) or {}).values()):
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _release_when_done(future):
+    """放弃等待的解码结果在完成后释放其共享内存"""
+    def release(done):
+        if not done.cancelled() and done.exception() is None:
+            release_batches(done.result().batches)
+
+    future.add_done_callback(release)
+
+
+def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """把分析器的输出整理为模型字段（评分限制在0-1之间）"""
+    if not isinstance(result, dict):
+        raise ValueError(f"分析器返回结果格式错误: {type(result).__name__}")
+
+    fields = {}
+    for name in SCORE_FIELDS:
+        value = result.get(name)
+        if value is not None:
+            fields[name] = min(max(float(value), 0.0), 1.0)
+    fields['summary'] = str(result.get('summary') or '')
+    return fields
+
+
+@dataclass
+class AnalysisJob:
+    """一次视频分析"""
+    video_id: Any
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    future: Any = None
+    # 分析期间独占的工作进程（单进程执行器）及其所属的代次（shutdown 后的旧进程不再复用）
+    worker: Any = None
+    generation: int = 0
+
+
+def _start_thread(target: Callable[[], None]):
+    def run():
+        try:
+            target()
+        finally:
+            # 后台线程不经过请求周期，需要自行释放数据库连接
+            close_old_connections()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+class VideoAnalysisEngine:
+    """
+    视频分析引擎
+
+    Args:
+        analyzer: 分析器类路径（默认读取 settings.VIDEO_ANALYZER）
+        analyzer_options: 分析器参数（默认读取 settings.VIDEO_ANALYZER_OPTIONS）
+        max_workers: 同时进行的分析数（默认读取 settings.VIDEO_ANALYSIS_WORKERS）
+        queue_size: 等待队列容量（默认读取 settings.VIDEO_ANALYSIS_QUEUE_SIZE）
+        timeout: 单个分析的超时时间（秒，默认读取 settings.VIDEO_ANALYSIS_TIMEOUT）
+        executor_factory: 创建工作进程的函数 executor_factory(1)，返回单进程执行器（测试中可替换为线程池）
+        spawn: 启动监督线程的函数（测试中可替换为同步执行）
+    """
+
+    def __init__(self, analyzer: Optional[str] = None, analyzer_options: Optional[Dict[str, Any]] = None,
+                 max_workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 timeout: Optional[float] = None, executor_factory: Optional[Callable[[int], Any]] = None,
+                 spawn: Callable[[Callable[[], None]], None] = _start_thread):
+        self.analyzer = analyzer or getattr(settings, 'VIDEO_ANALYZER', DEFAULT_ANALYZER)
+        self.analyzer_options = dict(
+            analyzer_options if analyzer_options is not None else getattr(settings, 'VIDEO_ANALYZER_OPTIONS', {})
+        )
+        self.max_workers = max(1, int(max_workers or getattr(settings, 'VIDEO_ANALYSIS_WORKERS', DEFAULT_WORKERS)))
+        self.queue_size = int(queue_size if queue_size is not None else getattr(
+            settings, 'VIDEO_ANALYSIS_QUEUE_SIZE', DEFAULT_QUEUE_SIZE
+        ))
+        self.timeout = float(timeout or getattr(settings, 'VIDEO_ANALYSIS_TIMEOUT', DEFAULT_TIMEOUT))
+        self._executor_factory = executor_factory or self._process_pool
+        self._spawn = spawn
+        self._idle_workers: List[Any] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._queue: Deque[AnalysisJob] = deque()
+        self._running: Dict[str, AnalysisJob] = {}
+
+    @staticmethod
+    def _process_pool(max_workers: int):
+        start_method = getattr(settings, 'VIDEO_ANALYSIS_START_METHOD', DEFAULT_START_METHOD)
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method))
+
+    def _acquire_worker(self, job: AnalysisJob):
+        """为分析取得独占的工作进程：优先复用空闲进程，没有时新建并等待其就绪"""
+        with self._lock:
+            worker = self._idle_workers.pop() if self._idle_workers else None
+            job.generation = self._generation
+        job.worker = worker
+        if worker is None:
+            job.worker = worker = self._executor_factory(1)
+            # 进程启动（spawn 需重新导入模块）不计入分析超时
+            job.future = worker.submit(os.getpid)
+            job.future.result(timeout=self.timeout)
+        if job.cancelled.is_set():
+            raise CancelledError()
+        return worker
+
+    def _release_worker(self, job: AnalysisJob):
+        """归还工作进程：仍在执行（超时、取消）或已损坏的进程直接结束，正常的进程留给后续分析复用"""
+        worker, job.worker = job.worker, None
+        if worker is None:
+            return
+        future = job.future
+        healthy = future is None or (
+            future.done() and (future.cancelled() or not isinstance(future.exception(), BrokenProcessPool))
+        )
+        if healthy and not job.cancelled.is_set():
+            with self._lock:
+                if job.generation == self._generation and len(self._idle_workers) < self.max_workers:
+                    self._idle_workers.append(worker)
+                    return
+            worker.shutdown(wait=False)
+            return
+        _terminate_workers(worker)
+
+    def submit(self, video_id) -> bool:
+        """
+        提交视频分析
+
+        Returns:
+            是否新入队（已在队列中或分析中时返回 False）
+
+        Raises:
+            QueueFullError: 等待队列已满
+        """
+        key = str(video_id)
+        with self._lock:
+            if key in self._running or any(str(job.video_id) == key for job in self._queue):
+                return False
+            if len(self._queue) >= self.queue_size:
+                raise QueueFullError(f"视频分析队列已满（{self.queue_size}），请稍后重试")
+            self._queue.append(AnalysisJob(video_id=video_id))
+            dispatched = self._dispatch_locked()
+
+        for job in dispatched:
+            self._spawn(lambda job=job: self._execute(job))
+        return True
+
+    def _dispatch_locked(self) -> List[AnalysisJob]:
+        """在空闲的工作进程上取出排队的分析（调用方持有锁）"""
+        dispatched = []
+        while self._queue and len(self._running) < self.max_workers:
+            job = self._queue.popleft()
+            self._running[str(job.video_id)] = job
+            dispatched.append(job)
+        return dispatched
+
+    def _execute(self, job: AnalysisJob):
+        try:
+            self.run_job(job)
+        except Exception as e:
+            logger.error(f"视频分析 {job.video_id} 执行失败: {e}")
+        finally:
+            with self._lock:
+                self._running.pop(str(job.video_id), None)
+                dispatched = self._dispatch_locked()
+            for next_job in dispatched:
+                self._spawn(lambda next_job=next_job: self._execute(next_job))
+
+    def run_job(self, job: AnalysisJob):
+        """在当前线程中执行一次分析：领取记录、等待工作进程返回结果并写入数据库"""
+        from .models import VideoAnalysis
+
+        if job.cancelled.is_set():
+            return
+        # 领取记录，避免同一视频被重复分析
+        if not VideoAnalysis.objects.filter(id=job.video_id, status='pending').update(
+                status='processing', error_message=None, updated_at=timezone.now()):
+            return
+        # 相同内容的视频已由同一分析器版本分析过（如同时提交的重复视频）时直接复用
+        key = analyzer_key(self.analyzer)
+        if reuse_result(job.video_id, key, from_status='processing'):
+            return
+
+        decoding = decoded = None
+        local_files = ExitStack()
+        try:
+            video = VideoAnalysis.objects.get(id=job.video_id)
+            # 对象存储中的视频先下载到本机临时文件，分析结束后删除
+            video_path = local_files.enter_context(local_copy(video.video_file))
+            executor = self._acquire_worker(job)
+            # 超时从工作进程就绪、开始执行本次分析时计算
+            deadline = time.monotonic() + self.timeout
+            if getattr(import_string(self.analyzer), 'uses_frames', False):
+                job.future = decoding = executor.submit(
+                    decode_video, video_path, DecodeConfig.from_settings(), frame_cache_dir(),
+                    self._known_hash(video)
+                )
+                decoded = self._wait(job, deadline)
+                if not video.content_sha256:
+                    VideoAnalysis.objects.filter(id=job.video_id).update(content_sha256=decoded.video_hash)
+            job.future = executor.submit(
+                run_analyzer, self.analyzer, self.analyzer_options, video_path,
+                decoded.batches if decoded else None
+            )
+            fields = normalize_result(self._wait(job, deadline))
+        except CancelledError:
+            return
+        except FutureTimeoutError:
+            self._fail(job, f"视频分析超时（超过 {self.timeout:g} 秒）")
+            return
+        except BrokenProcessPool as e:
+            # 取消时工作进程被结束，不再记为异常退出
+            if not job.cancelled.is_set():
+                self._fail(job, f"视频分析进程异常退出: {str(e)}")
+            return
+        except Exception as e:
+            self._fail(job, f"视频分析过程中发生错误: {str(e)}")
+            return
+        finally:
+            if decoded is not None:
+                release_batches(decoded.batches)
+            elif decoding is not None:
+                # 解码仍在进行（超时或取消），结果返回后释放共享内存
+                _release_when_done(decoding)
+            local_files.close()
+            self._release_worker(job)
+
+        if job.cancelled.is_set():
+            return
+        VideoAnalysis.objects.filter(id=job.video_id, status='processing').update(
+            status='completed', analyzer_version=key, updated_at=timezone.now(), **fields
+        )
+
+    @staticmethod
+    def _known_hash(video) -> Optional[str]:
+        """已知的视频内容哈希（上传时已计算），未知时由解码进程计算"""
+        if video.content_sha256:
+            return video.content_sha256
+        upload = getattr(video, 'upload', None)
+        return upload.sha256 if upload is not None and upload.sha256 else None
+
+    @staticmethod
+    def _wait(job: AnalysisJob, deadline: float):
+        """等待当前阶段的结果（解码和分析共用同一超时时间）"""
+        if job.cancelled.is_set():
+            job.future.cancel()
+        try:
+            return job.future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            job.future.cancel()
+            raise
+
+    def _fail(self, job: AnalysisJob, message: str):
+        from .models import VideoAnalysis
+
+        logger.warning(f"视频分析 {job.video_id} 失败: {message}")
+        VideoAnalysis.objects.filter(id=job.video_id, status='processing').update(
+            status='failed', error_message=message, updated_at=timezone.now()
+        )
+
+    def cancel(self, video_id) -> bool:
+        """
+        取消视频分析：排队中的分析移出队列，已开始的分析结束其工作进程并丢弃结果
+
+        Returns:
+            是否取消了待处理或分析中的记录
+        """
+        from .models import VideoAnalysis
+
+        key = str(video_id)
+        with self._lock:
+            job = self._running.get(key)
+            for queued in list(self._queue):
+                if str(queued.video_id) == key:
+                    self._queue.remove(queued)
+                    job = queued
+        if job is not None:
+            job.cancelled.set()
+            if job.future is not None:
+                job.future.cancel()
+            # 监督线程随即返回，空出的位置调度下一个分析（使用新的工作进程）
+            worker = job.worker
+            if worker is not None:
+                _terminate_workers(worker)
+
+        return bool(VideoAnalysis.objects.filter(id=video_id, status__in=['pending', 'processing']).update(
+            status='failed', error_message="视频分析已取消", updated_at=timezone.now()
+        ))
+
+    def queue_position(self, video_id) -> Optional[int]:
+        """排在该视频之前的分析数（不在队列中时返回 None）"""
+        key = str(video_id)
+        with self._lock:
+            for index, job in enumerate(self._queue):
+                if str(job.video_id) == key:
+                    return index
+        return None
+
+    def shutdown(self, wait: bool = True):
+        """关闭所有工作进程（分析中的进程在当前阶段结束后退出，不再复用）"""
+        with self._lock:
+            workers, self._idle_workers = self._idle_workers, []
+            workers += [job.worker for job in self._running.values() if job.worker is not None]
+            self._generation += 1
+        for worker in workers:
+            worker.shutdown(wait=wait, cancel_futures=True)
+
+
+_engine: Optional[VideoAnalysisEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> VideoAnalysisEngine:
+    """获取进程内共享的视频分析引擎"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = VideoAnalysisEngine()
+        return _engine
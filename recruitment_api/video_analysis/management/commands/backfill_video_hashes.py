@@ -0,0 +1,38 @@
+import hashlib
+
+from django.core.management.base import BaseCommand
+
+from video_analysis.models import VideoAnalysis, VideoUpload
+
+
+class Command(BaseCommand):
+    help = '为尚无内容哈希的视频分析记录计算 SHA-256（之后上传的相同视频可共享存储并复用分析结果）'
+
+    def handle(self, *args, **options):
+        upload_hashes = dict(
+            VideoUpload.objects.filter(status='completed').exclude(sha256='').values_list('video_analysis_id', 'sha256')
+        )
+
+        updated, missing = 0, 0
+        for video in VideoAnalysis.objects.filter(content_sha256='').only('id', 'video_file').iterator():
+            digest = upload_hashes.get(video.id)
+            if not digest:
+                try:
+                    digest = self._file_sha256(video.video_file)
+                except (OSError, ValueError):
+                    missing += 1
+                    self.stdout.write(self.style.WARNING(f'视频文件不存在: {video.id}'))
+                    continue
+            VideoAnalysis.objects.filter(id=video.id).update(content_sha256=digest)
+            updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f'已计算 {updated} 个视频的内容哈希，{missing} 个视频文件缺失'))
+
+    @staticmethod
+    def _file_sha256(field_file) -> str:
+        """经存储读取文件内容计算哈希（本地存储和对象存储均适用）"""
+        sha256_hash = hashlib.sha256()
+        with field_file.storage.open(field_file.name, 'rb') as f:
+            for chunk in f.chunks():
+                sha256_hash.update(chunk)
+        return sha256_hash.hexdigest()
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:27
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('video_name', models.CharField(max_length=255, verbose_name='视频名称')),
+                ('candidate_name', models.CharField(max_length=100, verbose_name='候选人姓名')),
+                ('position_applied', models.CharField(max_length=255, verbose_name='应聘岗位')),
+                ('resume_data_id', models.UUIDField(blank=True, null=True, verbose_name='简历数据ID')),
+                ('file_name', models.CharField(max_length=255, verbose_name='存储文件名')),
+                ('total_size', models.BigIntegerField(verbose_name='文件总大小(字节)')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='已接收字节数')),
+                ('expected_sha256', models.CharField(blank=True, default='', max_length=64, verbose_name='客户端提供的SHA-256')),
+                ('sha256', models.CharField(blank=True, default='', max_length=64, verbose_name='文件SHA-256')),
+                ('status', models.CharField(choices=[('uploading', '上传中'), ('completed', '已完成'), ('aborted', '已取消')], default='uploading', max_length=20, verbose_name='上传状态')),
+                ('video_analysis', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='video_analysis.videoanalysis')),
+            ],
+            options={
+                'verbose_name': '视频分片上传',
+                'verbose_name_plural': '视频分片上传',
+                'db_table': 'video_uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-19 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_analysis', '0002_video_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoanalysis',
+            name='analyzer_version',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='分析器版本'),
+        ),
+        migrations.AddField(
+            model_name='videoanalysis',
+            name='content_sha256',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='内容SHA-256'),
+        ),
+        migrations.AddIndex(
+            model_name='videoanalysis',
+            index=models.Index(fields=['content_sha256', 'analyzer_version'], name='video_analy_content_58c282_idx'),
+        ),
+    ]
@@ -6,11 +6,15 @@ class VideoAnalysis(models.Model):
     """视频分析模型"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
+    # 状态查询接口的 ETag 由状态和更新时间计算，QuerySet.update() 修改记录时需同时设置 updated_at
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
     
     # 视频信息
     video_name = models.CharField(max_length=255, verbose_name="视频名称")
     video_file = models.FileField(upload_to='video_analysis/videos/%Y/%m/%d/', verbose_name="视频文件")
     file_size = models.BigIntegerField(verbose_name="文件大小(字节)", null=True, blank=True)
+    # 视频内容的 SHA-256：内容相同的视频共享存储文件并复用分析结果
+    content_sha256 = models.CharField(max_length=64, blank=True, default='', verbose_name="内容SHA-256")
     
     # 候选人信息
     candidate_name = models.CharField(max_length=100, verbose_name="候选人姓名")
@@ -37,6 +41,9 @@ class VideoAnalysis(models.Model):
     summary = models.TextField(null=True, blank=True, verbose_name="分析摘要")
     confidence_score = models.FloatField(null=True, blank=True, verbose_name="置信度评分")
     
+    # 产生分析结果的分析器及版本（分析器升级后不再复用旧结果）
+    analyzer_version = models.CharField(max_length=255, blank=True, default='', verbose_name="分析器版本")
+    
     # 错误信息
     error_message = models.TextField(null=True, blank=True, verbose_name="错误信息")
     
@@ -50,6 +57,7 @@ class VideoAnalysis(models.Model):
             models.Index(fields=['position_applied']),
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['content_sha256', 'analyzer_version']),
         ]
 
     def __str__(self):
@@ -65,4 +73,37 @@ class VideoAnalysis(models.Model):
             "openness_score": self.openness_score,
             "agreeableness_score": self.agreeableness_score,
             "conscientiousness_score": self.conscientiousness_score
-        }
\ No newline at end of file
+        }
+
+class VideoUpload(models.Model):
+    """分片上传会话 - 分片直接写入视频的最终存储位置，上传中断后从已接收的偏移量继续"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # 完成后创建视频分析记录所需的信息
+    video_name = models.CharField(max_length=255, verbose_name="视频名称")
+    candidate_name = models.CharField(max_length=100, verbose_name="候选人姓名")
+    position_applied = models.CharField(max_length=255, verbose_name="应聘岗位")
+    resume_data_id = models.UUIDField(null=True, blank=True, verbose_name="简历数据ID")
+
+    # 上传进度
+    file_name = models.CharField(max_length=255, verbose_name="存储文件名")  # 上传中为暂存文件名，完成后为视频分析记录 video_file 的存储键
+    total_size = models.BigIntegerField(verbose_name="文件总大小(字节)")
+    offset = models.BigIntegerField(default=0, verbose_name="已接收字节数")
+    expected_sha256 = models.CharField(max_length=64, blank=True, default='', verbose_name="客户端提供的SHA-256")
+    sha256 = models.CharField(max_length=64, blank=True, default='', verbose_name="文件SHA-256")
+
+    STATUS_CHOICES = [
+        ('uploading', '上传中'),
+        ('completed', '已完成'),
+        ('aborted', '已取消')
+    ]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading', verbose_name="上传状态")
+    video_analysis = models.OneToOneField(VideoAnalysis, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload')
+
+    class Meta:
+        db_table = 'video_uploads'
+        ordering = ['-created_at']
+        verbose_name = "视频分片上传"
+        verbose_name_plural = "视频分片上传"
@@ -0,0 +1,18 @@
+"""
+视频分析模块信号处理
+视频分析记录保存或删除后清除本进程缓存的分析状态响应（简历组详情中包含视频分析信息，一并清除）
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recruitment_api.http_cache import get_response_cache
+from .models import VideoAnalysis
+
+
+@receiver(post_save, sender=VideoAnalysis)
+@receiver(post_delete, sender=VideoAnalysis)
+def invalidate_video_analysis_responses(sender, instance, **kwargs):
+    cache = get_response_cache()
+    cache.invalidate('video_analysis', instance.pk)
+    cache.invalidate('resume_group')
@@ -5,5 +5,11 @@ urlpatterns = [
     path('', views.VideoAnalysisAPIView.as_view(), name='video-analysis'),
     path('<uuid:video_id>/status/', views.VideoAnalysisStatusAPIView.as_view(), name='video-analysis-status'),
     path('<uuid:video_id>/update/', views.VideoAnalysisUpdateAPIView.as_view(), name='video-analysis-update'),
+    path('<uuid:video_id>/video/', views.VideoAnalysisStreamAPIView.as_view(), name='video-analysis-stream'),
+    path('<uuid:video_id>/analyze/', views.VideoAnalysisRunAPIView.as_view(), name='video-analysis-run'),
+    path('<uuid:video_id>/cancel/', views.VideoAnalysisCancelAPIView.as_view(), name='video-analysis-cancel'),
     path('list/', views.VideoAnalysisListAPIView.as_view(), name='video-analysis-list'),
+    path('uploads/', views.VideoUploadCreateAPIView.as_view(), name='video-upload-create'),
+    path('uploads/<uuid:upload_id>/', views.VideoUploadAPIView.as_view(), name='video-upload'),
+    path('uploads/<uuid:upload_id>/complete/', views.VideoUploadCompleteAPIView.as_view(), name='video-upload-complete'),
 ]
\ No newline at end of file
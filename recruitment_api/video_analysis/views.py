@@ -1,57 +1,39 @@
-import threading
-import time
-import random
+import io
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import JsonResponse
-from .models import VideoAnalysis
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from .models import VideoAnalysis, VideoUpload
+from .engine import QueueFullError, get_engine
+from .dedup import SHA256UploadHandler, analyzer_key, find_stored_video, reuse_result, uploaded_file_sha256
+from .chunked_upload import (
+    UploadError, OffsetMismatchError, create_upload, append_chunk, complete_upload, abort_upload,
+    serialize_upload
+)
 from resume_screening.models import ResumeData
+from recruitment_api.downloads import serve_field_file
+from recruitment_api.http_cache import DEFAULT_CACHE_CONTROL, conditional_response, weak_etag
 import uuid
 
 
-def simulate_video_analysis(video_analysis_id):
+def start_video_analysis(video_analysis_id) -> bool:
     """
-    模拟视频分析过程的函数
-    这个函数会在后台线程中运行，模拟视频分析过程
+    把视频提交给分析引擎（分析器在进程池中运行）；相同内容已由当前分析器分析过时直接复用结果
+
+    Returns:
+        是否已复用结果或成功入队；队列已满时记录标记为失败，可通过 analyze 接口重新提交
     """
+    if reuse_result(video_analysis_id):
+        return True
     try:
-        # 等待一段时间模拟分析过程（5-10秒）
-        time.sleep(random.randint(1, 2))
-        
-        # 获取视频分析记录
-        video_analysis = VideoAnalysis.objects.get(id=video_analysis_id)
-        
-        # 生成模拟的分析结果
-        video_analysis.fraud_score = round(random.uniform(0.05, 0.3), 3)  # 欺诈评分
-        video_analysis.neuroticism_score = round(random.uniform(0.2, 0.8), 3)  # 神经质评分
-        video_analysis.extraversion_score = round(random.uniform(0.3, 0.9), 3)  # 外倾性评分
-        video_analysis.openness_score = round(random.uniform(0.4, 0.95), 3)  # 开放性评分
-        video_analysis.agreeableness_score = round(random.uniform(0.5, 0.95), 3)  # 宜人性评分
-        video_analysis.conscientiousness_score = round(random.uniform(0.6, 0.98), 3)  # 尽责性评分
-        video_analysis.confidence_score = round(random.uniform(0.8, 0.99), 3)  # 置信度评分
-        
-        # 生成模拟摘要
-        video_analysis.summary = f"模拟分析完成。候选人表现出较强的{'外倾性' if video_analysis.extraversion_score > 0.7 else '尽责性'}特征。"
-        
-        # 更新状态为完成
-        video_analysis.status = 'completed'
-        
-        # 保存分析结果
-        video_analysis.save()
-        
-    except VideoAnalysis.DoesNotExist:
-        # 视频分析记录不存在，记录错误但不抛出异常
-        pass
-    except Exception as e:
-        # 如果出现异常，更新状态为失败
-        try:
-            video_analysis = VideoAnalysis.objects.get(id=video_analysis_id)
-            video_analysis.status = 'failed'
-            video_analysis.error_message = f"模拟分析过程中发生错误: {str(e)}"
-            video_analysis.save()
-        except VideoAnalysis.DoesNotExist:
-            pass
+        get_engine().submit(video_analysis_id)
+    except QueueFullError as e:
+        VideoAnalysis.objects.filter(id=video_analysis_id, status='pending').update(
+            status='failed', error_message=str(e), updated_at=timezone.now()
+        )
+        return False
+    return True
 
 
 class VideoAnalysisAPIView(APIView):
@@ -70,6 +52,10 @@ class VideoAnalysisAPIView(APIView):
         - video_name: 视频名称（可选，默认为文件名）
         """
         try:
+            # 解析请求体的同时计算视频的 SHA-256
+            hasher = SHA256UploadHandler(request._request)
+            request._request.upload_handlers.insert(0, hasher)
+            
             # 获取请求数据
             video_file = request.FILES.get('video_file')
             candidate_name = request.data.get('candidate_name')
@@ -113,15 +99,22 @@ class VideoAnalysisAPIView(APIView):
                         status=status.HTTP_404_NOT_FOUND
                     )
             
-            # 创建视频分析记录
-            video_analysis = VideoAnalysis.objects.create(
+            # 创建视频分析记录；已有相同内容的视频时引用其存储文件，不再重复保存
+            content_sha256 = uploaded_file_sha256(video_file, hasher, 'video_file')
+            duplicate = find_stored_video(content_sha256)
+            video_analysis = VideoAnalysis(
                 video_name=video_name,
-                video_file=video_file,
                 file_size=video_file.size if video_file else None,
+                content_sha256=content_sha256,
                 candidate_name=candidate_name,
                 position_applied=position_applied,
                 status='pending'
             )
+            if duplicate is not None:
+                video_analysis.video_file.name = duplicate.video_file.name
+            else:
+                video_analysis.video_file = video_file
+            video_analysis.save()
             
             # 如果提供了简历数据ID且存在，则建立关联
             if resume_data:
@@ -129,23 +122,25 @@ class VideoAnalysisAPIView(APIView):
                 resume_data.video_analysis = video_analysis
                 resume_data.save()
             
-            # 启动模拟分析线程
-            print("启动线程")
-            analysis_thread = threading.Thread(
-                target=simulate_video_analysis,
-                args=(video_analysis.id,)
-            )
-            analysis_thread.daemon = True  # 设置为守护线程
-            analysis_thread.start()
+            # 提交给分析引擎
+            queued = start_video_analysis(video_analysis.id)
+            video_analysis.refresh_from_db()
+            if video_analysis.status == 'completed':
+                message = "视频数据接收成功，已复用相同视频的分析结果"
+            elif queued:
+                message = "视频数据接收成功，分析已在后台开始"
+            else:
+                message = "视频数据接收成功，但分析队列已满，请稍后重新提交分析"
             
             # 返回成功响应
             response_data = {
-                "message": "视频数据接收成功，分析已在后台开始",
+                "message": message,
                 "video_id": str(video_analysis.id),
                 "video_name": video_analysis.video_name,
                 "candidate_name": video_analysis.candidate_name,
                 "position_applied": video_analysis.position_applied,
                 "status": video_analysis.status,
+                "content_sha256": video_analysis.content_sha256,
                 "created_at": video_analysis.created_at.isoformat()
             }
             
@@ -170,7 +165,24 @@ class VideoAnalysisStatusAPIView(APIView):
     def get(self, request, video_id, format=None):
         """
         根据视频ID查询分析状态和结果
+        支持条件请求：ETag 由状态和 updated_at 计算；排队中的记录返回排队位置，不缓存
         """
+        version = VideoAnalysis.objects.filter(id=video_id).values_list('status', 'updated_at').first()
+        if version is None:
+            return Response(
+                {"error": "视频分析记录不存在"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        video_status, updated_at = version
+        etag = weak_etag(video_status, updated_at) if video_status != 'pending' else None
+        # 已完成/失败的结果按配置缓存，分析中的记录每次重新验证
+        cache_control = None if video_status in ('completed', 'failed') else DEFAULT_CACHE_CONTROL
+        return conditional_response(
+            request, 'video_analysis', video_id, etag, lambda: self._build_response(video_id),
+            last_modified=updated_at, cache_control=cache_control
+        )
+
+    def _build_response(self, video_id):
         try:
             # 获取视频分析记录
             try:
@@ -191,12 +203,17 @@ class VideoAnalysisStatusAPIView(APIView):
                 "created_at": video_analysis.created_at.isoformat()
             }
             
+            # 排队中的分析返回排在前面的分析数
+            if video_analysis.status == 'pending':
+                response_data["queue_position"] = get_engine().queue_position(video_analysis.id)
+            
             # 如果有分析结果，添加到响应中
             if video_analysis.status == 'completed':
                 response_data.update({
                     "analysis_result": video_analysis.analysis_result,
                     "summary": video_analysis.summary,
-                    "confidence_score": video_analysis.confidence_score
+                    "confidence_score": video_analysis.confidence_score,
+                    "analyzer_version": video_analysis.analyzer_version
                 })
             
             # 如果分析失败，添加错误信息
@@ -383,4 +400,235 @@ class VideoAnalysisListAPIView(APIView):
             return Response(
                 {"error": f"查询视频分析列表时发生错误: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class VideoAnalysisStreamAPIView(APIView):
+    """
+    面试视频播放API - 支持 Range 请求，浏览器中可拖动播放进度
+    """
+
+    def get(self, request, video_id, format=None):
+        try:
+            video_analysis = VideoAnalysis.objects.get(id=video_id)
+            return serve_field_file(
+                request, video_analysis.video_file,
+                filename=video_analysis.video_name,
+                as_attachment=request.GET.get('download') in ('1', 'true')
+            )
+        except (VideoAnalysis.DoesNotExist, Http404):
+            return Response({"error": "视频不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+
+class VideoAnalysisRunAPIView(APIView):
+    """
+    视频分析执行API - 重新提交失败的分析，或用升级后的分析器重新分析
+    """
+
+    def post(self, request, video_id, format=None):
+        try:
+            video_analysis = VideoAnalysis.objects.get(id=video_id)
+        except VideoAnalysis.DoesNotExist:
+            return Response({"error": "视频分析记录不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+        if video_analysis.status == 'processing' or (
+                video_analysis.status == 'completed' and video_analysis.analyzer_version == analyzer_key()):
+            return Response(
+                {"error": f"视频分析{video_analysis.get_status_display()}，不能重新提交"},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        VideoAnalysis.objects.filter(id=video_id, status__in=['failed', 'completed']).update(
+            status='pending', error_message=None, updated_at=timezone.now()
+        )
+        try:
+            get_engine().submit(video_id)
+        except QueueFullError as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        return Response({
+            "message": "视频分析已重新提交",
+            "video_id": str(video_id),
+            "status": 'pending',
+            "queue_position": get_engine().queue_position(video_id),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class VideoAnalysisCancelAPIView(APIView):
+    """
+    视频分析取消API - 取消排队中或分析中的视频
+    """
+
+    def post(self, request, video_id, format=None):
+        try:
+            video_analysis = VideoAnalysis.objects.get(id=video_id)
+        except VideoAnalysis.DoesNotExist:
+            return Response({"error": "视频分析记录不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+        if not get_engine().cancel(video_analysis.id):
+            return Response(
+                {"error": f"视频分析{video_analysis.get_status_display()}，无法取消"},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response({"message": "视频分析已取消", "video_id": str(video_id), "status": 'failed'})
+
+
+class VideoUploadCreateAPIView(APIView):
+    """
+    视频分片上传 - 创建上传
+    """
+
+    def post(self, request, format=None):
+        """
+        创建分片上传会话
+        请求参数：
+        - video_name: 视频名称（文件名）
+        - total_size: 文件总大小（字节）
+        - candidate_name: 候选人姓名
+        - position_applied: 应聘岗位
+        - resume_data_id: 简历数据ID（可选，完成上传时建立关联）
+        - sha256: 文件SHA-256（可选，完成上传时校验）
+        """
+        video_name = request.data.get('video_name')
+        candidate_name = request.data.get('candidate_name')
+        position_applied = request.data.get('position_applied')
+        resume_data_id = request.data.get('resume_data_id')
+
+        for field, value in [('video_name', video_name), ('candidate_name', candidate_name),
+                             ('position_applied', position_applied)]:
+            if not value:
+                return Response({"error": f"缺少参数: {field}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            total_size = int(request.data.get('total_size'))
+        except (TypeError, ValueError):
+            return Response({"error": "total_size 必须是正整数"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if resume_data_id and not ResumeData.objects.filter(id=resume_data_id).exists():
+            return Response({"error": "指定的简历数据不存在"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            upload = create_upload(
+                video_name=video_name,
+                candidate_name=candidate_name,
+                position_applied=position_applied,
+                total_size=total_size,
+                resume_data_id=resume_data_id or None,
+                expected_sha256=request.data.get('sha256', '')
+            )
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+
+        response = Response(serialize_upload(upload), status=status.HTTP_201_CREATED)
+        response['Location'] = f"/video-analysis/uploads/{upload.id}/"
+        return response
+
+
+class VideoUploadAPIView(APIView):
+    """
+    视频分片上传 - 查询偏移量 / 追加分片 / 取消上传
+    """
+
+    def _get_upload(self, upload_id):
+        try:
+            return VideoUpload.objects.get(id=upload_id)
+        except VideoUpload.DoesNotExist:
+            return None
+
+    def head(self, request, upload_id, format=None):
+        """查询已接收的字节数（响应头 Upload-Offset / Upload-Length），用于断点续传"""
+        upload = self._get_upload(upload_id)
+        if upload is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        response = Response(status=status.HTTP_200_OK)
+        response['Upload-Offset'] = str(upload.offset)
+        response['Upload-Length'] = str(upload.total_size)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def get(self, request, upload_id, format=None):
+        """查询上传状态"""
+        upload = self._get_upload(upload_id)
+        if upload is None:
+            return Response({"error": "上传不存在"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(serialize_upload(upload))
+
+    def patch(self, request, upload_id, format=None):
+        """
+        追加分片：请求体为分片的原始字节
+        请求头：
+        - Upload-Offset: 分片起始位置（必须等于已接收的字节数）
+        """
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+        except ValueError:
+            return Response({"error": "缺少或无效的请求头: Upload-Offset"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            length = int(request.headers['Content-Length']) if request.headers.get('Content-Length') else None
+        except ValueError:
+            return Response({"error": "无效的 Content-Length"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            upload = append_chunk(upload_id, offset, request.stream or io.BytesIO(), length)
+        except VideoUpload.DoesNotExist:
+            return Response({"error": "上传不存在"}, status=status.HTTP_404_NOT_FOUND)
+        except OffsetMismatchError as e:
+            response = Response({"error": str(e), "offset": e.offset}, status=e.status_code)
+            response['Upload-Offset'] = str(e.offset)
+            return response
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+
+        response = Response(serialize_upload(upload), status=status.HTTP_200_OK)
+        response['Upload-Offset'] = str(upload.offset)
+        return response
+
+    def delete(self, request, upload_id, format=None):
+        """取消上传并删除已写入的文件"""
+        try:
+            upload = abort_upload(upload_id)
+        except VideoUpload.DoesNotExist:
+            return Response({"error": "上传不存在"}, status=status.HTTP_404_NOT_FOUND)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+        return Response(serialize_upload(upload))
+
+
+class VideoUploadCompleteAPIView(APIView):
+    """
+    视频分片上传 - 完成上传并开始分析
+    """
+
+    def post(self, request, upload_id, format=None):
+        try:
+            upload, video_analysis, created = complete_upload(upload_id)
+        except VideoUpload.DoesNotExist:
+            return Response({"error": "上传不存在"}, status=status.HTTP_404_NOT_FOUND)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status_code)
+
+        message = "视频上传已完成"
+        if created:
+            start_video_analysis(video_analysis.id)
+            video_analysis.refresh_from_db()
+            if video_analysis.status == 'completed':
+                message = "视频上传完成，已复用相同视频的分析结果"
+            elif video_analysis.status == 'failed':
+                message = "视频上传完成，但分析队列已满，请稍后重新提交分析"
+            else:
+                message = "视频上传完成，分析已在后台开始"
+
+        response_data = {
+            "message": message,
+            "video_id": str(video_analysis.id),
+            "video_name": video_analysis.video_name,
+            "candidate_name": video_analysis.candidate_name,
+            "position_applied": video_analysis.position_applied,
+            "status": video_analysis.status,
+            "sha256": upload.sha256,
+            "created_at": video_analysis.created_at.isoformat()
+        }
+        if upload.resume_data_id:
+            response_data["resume_data_id"] = str(upload.resume_data_id)
+        return Response(response_data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)